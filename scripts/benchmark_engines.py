@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Game Engine Micro-Benchmark for ExoWin Bot
+Times registry dispatch for every quick-play game, compares cumulative
+weight sampling against random.choices rebuilding its weights per call, and
+benchmarks blackjack dealing and the basic-strategy simulator.
+
+Usage: python scripts/benchmark_engines.py [rounds]
+"""
+
+import itertools
+import os
+import sys
+import random
+import timeit
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.games.engines import get_engine, WeightedTable
+from src.games.blackjack import BlackjackGame, Shoe
+from src.games.blackjack_sim import simulate_rtp
+from src.games.payout_tables import SLOT_SYMBOLS, SLOT_WEIGHTS, WHEEL_SEGMENTS, WHEEL_WEIGHTS
+
+GAME_DATA = {
+    'coinflip': {'choice': 'heads'},
+    'crash': {'cash_out_at': 2.0},
+    'dice': {'target': 50, 'over_under': 'over'},
+    'plinko': {'risk': 'medium'},
+    'mines': {'mines': 3, 'action': 'reveal', 'position': 0},
+    'roulette': {'bet_type': 'color', 'bet_value': 'red'},
+    'slots': {},
+    'blackjack': {'action': 'deal'},
+    'tower': {'action': 'select_tile', 'tile': 0},
+    'wheel': {'selected_segment': 1},
+}
+
+def report(label, seconds, rounds):
+    """Print one benchmark line"""
+    print(f"  {label:<28} {seconds / rounds * 1e6:8.3f} µs/op  {rounds / seconds:12,.0f} ops/s")
+
+def benchmark_dispatch(rounds):
+    """Time a full round of every game through the registry"""
+    print("🎮 Registry dispatch (get_engine + play)")
+    users = itertools.count()
+    for game_type, game_data in GAME_DATA.items():
+        # A fresh user per call, so multi-step games open a new round each time
+        seconds = timeit.timeit(lambda: get_engine(game_type).play(1.0, dict(game_data, user_id=next(users))),
+                                number=rounds)
+        report(game_type, seconds, rounds)
+        get_engine(game_type).expire(now=float('inf'))
+
+def benchmark_sampling(rounds):
+    """Compare precomputed cumulative tables with random.choices"""
+    print("\n🎲 Weighted sampling")
+    rng = random.Random()
+    for name, outcomes, weights in (
+        ('slots reel', SLOT_SYMBOLS, SLOT_WEIGHTS),
+        ('wheel', WHEEL_SEGMENTS, WHEEL_WEIGHTS),
+    ):
+        table = WeightedTable(outcomes, weights)
+        report(f"{name} random.choices", timeit.timeit(lambda: rng.choices(outcomes, weights=weights)[0], number=rounds), rounds)
+        report(f"{name} WeightedTable", timeit.timeit(lambda: table.sample(rng), number=rounds), rounds)
+
+def benchmark_blackjack(rounds):
+    """Time dealing from the shared shoe and the vectorized simulator"""
+    print("\n🃏 Blackjack")
+    shoe = Shoe()
+    report("deal + stand", timeit.timeit(lambda: BlackjackGame(0, 1.0, shoe).stand(), number=rounds), rounds)
+
+    hands = rounds * 50
+    for label, stand_on in (("basic strategy", None), ("stand on 17", 17)):
+        start = timeit.default_timer()
+        rtp = simulate_rtp(hands, stand_on=stand_on)
+        report(f"simulator {label}", timeit.default_timer() - start, hands)
+        print(f"  {'':<28} RTP {rtp:.4f}")
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"⏱️  {rounds:,} rounds per benchmark\n")
+    benchmark_dispatch(rounds)
+    benchmark_sampling(rounds)
+    benchmark_blackjack(rounds)
+
+if __name__ == "__main__":
+    main()
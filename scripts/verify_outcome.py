@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Offline Provably Fair Verifier for ExoWin Bot
+Recomputes a historical outcome from its revealed seeds without any server access.
+
+Usage:
+  python scripts/verify_outcome.py crash --round-hash HASH [--terminal-hash HASH] [--salt SALT]
+  python scripts/verify_outcome.py mines --server-seed S --client-seed C --nonce N [--mines-count 5]
+  python scripts/verify_outcome.py tower --server-seed S --client-seed C --nonce N [--levels 8 --tiles-per-level 4]
+  python scripts/verify_outcome.py plinko --server-seed S --client-seed C --nonce N [--rows 16]
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.games.provably_fair import verify_outcome, CRASH_CHAIN_SALT
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Verify a provably fair game outcome")
+    parser.add_argument('game', choices=['crash', 'mines', 'tower', 'plinko'])
+    parser.add_argument('--round-hash')
+    parser.add_argument('--terminal-hash')
+    parser.add_argument('--salt', default=CRASH_CHAIN_SALT)
+    parser.add_argument('--server-seed')
+    parser.add_argument('--server-seed-hash')
+    parser.add_argument('--client-seed')
+    parser.add_argument('--nonce', type=int)
+    parser.add_argument('--grid-size', type=int, default=25)
+    parser.add_argument('--mines-count', type=int, default=5)
+    parser.add_argument('--levels', type=int, default=8)
+    parser.add_argument('--tiles-per-level', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=16)
+    args = parser.parse_args()
+
+    if args.game == 'crash' and not args.round_hash:
+        parser.error("crash needs --round-hash")
+    if args.game != 'crash' and (args.server_seed is None or args.client_seed is None or args.nonce is None):
+        parser.error(f"{args.game} needs --server-seed, --client-seed and --nonce")
+    return args
+
+def main():
+    args = parse_args()
+    params = {key: value for key, value in vars(args).items() if value is not None and key != 'game'}
+    result = verify_outcome(args.game, params)
+
+    print(f"🔍 {args.game} outcome")
+    print(json.dumps(result, indent=2))
+
+    if result.get('chain_valid') is False or result.get('seed_valid') is False:
+        print("❌ Verification failed")
+        sys.exit(1)
+    print("✅ Outcome recomputed")
+
+if __name__ == "__main__":
+    main()
@@ -1 +1 @@
-from src.admin.admin_panel import admin_command, admin_callback, admin_message_handler, is_admin, broadcast_command
\ No newline at end of file
+from src.admin.admin_panel import admin_command, admin_callback, admin_message_handler, is_admin, broadcast_command, loglevel_command, dbstats_command, traces_command, profile_command
\ No newline at end of file
@@ -1,9 +1,14 @@
+import io
 import os
+import time
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction
 from src.utils.formatting import format_money, format_user_stats
-from src.utils.logger import bot_logger
+from src.utils.logger import bot_logger, get_log_levels, set_log_level
+from src.utils.mongo_monitor import command_monitor
+from src.utils.tracing import format_slowest
+from src.utils.profiler import profiler
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -52,6 +57,87 @@ async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     await update.message.reply_text(message, reply_markup=reply_markup, parse_mode='Markdown')
 
+async def loglevel_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /loglevel [logger level]: show or change log levels without a restart"""
+    user_id = update.effective_user.id
+    
+    if not await is_admin(user_id):
+        await update.message.reply_text("❌ You don't have permission to change log levels.")
+        return
+    
+    if len(context.args) == 2:
+        name, level = context.args
+        try:
+            previous = set_log_level(name, level)
+        except ValueError as e:
+            await update.message.reply_text(f"❌ {e}")
+            return
+        bot_logger.warning(f"Admin {user_id} set log level of {name}: {previous} -> {level.upper()}")
+        await update.message.reply_text(f"✅ {name}: {previous} → {level.upper()}")
+        return
+    
+    levels = "\n".join(f"• {name}: {level}" for name, level in get_log_levels().items())
+    await update.message.reply_text(
+        f"📝 Log Levels\n\n{levels}\n\n"
+        "Usage: /loglevel <logger> <DEBUG|INFO|WARNING|ERROR>"
+    )
+
+async def dbstats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /dbstats: Mongo latency, round trips per update and slow queries"""
+    if not await is_admin(update.effective_user.id):
+        await update.message.reply_text("❌ You don't have permission to view database stats.")
+        return
+    
+    await update.message.reply_text(command_monitor.summary())
+
+async def traces_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /traces [count]: the slowest recent traces broken down by span"""
+    if not await is_admin(update.effective_user.id):
+        await update.message.reply_text("❌ You don't have permission to view traces.")
+        return
+    
+    count = int(context.args[0]) if context.args and context.args[0].isdigit() else 5
+    # Telegram rejects messages over 4096 characters
+    await update.message.reply_text(format_slowest(min(count, 20))[:4096])
+
+async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /profile [seconds] [idle]: sample the running bot and send back a flamegraph file"""
+    user_id = update.effective_user.id
+    
+    if not await is_admin(user_id):
+        await update.message.reply_text("❌ You don't have permission to profile the bot.")
+        return
+    
+    if profiler.running:
+        await update.message.reply_text("⏳ A profile is already running.")
+        return
+    
+    seconds = float(context.args[0]) if context.args and context.args[0].replace(".", "", 1).isdigit() else 10
+    include_idle = "idle" in context.args
+    if not 0 < seconds <= profiler.max_seconds:
+        await update.message.reply_text(f"❌ Profile length must be between 0 and {profiler.max_seconds:g} seconds.")
+        return
+    
+    bot_logger.warning(f"Admin {user_id} started a {seconds:g}s profile")
+    await update.message.reply_text(f"🔥 Profiling for {seconds:g}s...")
+    # Run in the background so other updates keep being handled while sampling
+    context.application.create_task(_send_profile(update, seconds, include_idle))
+
+async def _send_profile(update: Update, seconds: float, include_idle: bool):
+    try:
+        profile = await profiler.profile(seconds, include_idle)
+    except (RuntimeError, ValueError) as e:
+        await update.message.reply_text(f"❌ {e}")
+        return
+    
+    filename = f"profile-{int(time.time())}.collapsed.txt"
+    await update.message.reply_document(
+        document=io.BytesIO(profile.collapsed().encode()),
+        filename=filename,
+        caption="Collapsed stacks for flamegraph.pl or speedscope.app"
+    )
+    await update.message.reply_text(profile.top()[:4096])
+
 async def broadcast_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /broadcast command for quick broadcasting"""
     user_id = update.effective_user.id
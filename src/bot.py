@@ -1,13 +1,16 @@
 import os
 import logging
 from dotenv import load_dotenv
+import time
 from telegram import Update, BotCommand
+from telegram.request import HTTPXRequest
 from telegram.ext import (
     Application,
     CommandHandler,
     CallbackQueryHandler,
     MessageHandler,
     PreCheckoutQueryHandler,
+    TypeHandler,
     ContextTypes,
     filters
 )
@@ -15,7 +18,7 @@ from telegram.ext import (
 # Import utilities
 from src.utils.logger import bot_logger
 from src.utils.config_validator import config_validator
-from src.utils.error_handler import handle_errors, handle_callback_errors
+from src.utils.error_handler import handle_errors, handle_callback_errors, instrument_handlers
 from src.utils.rate_limiter import rate_limiter
 from src.utils.validators import validator
 
@@ -36,6 +39,14 @@ from src.games.bowling_animated import bowling_callback
 
 # Web App Games (complex interactive games) - no Telegram callbacks needed
 from src.games.wheel_animated import wheel_callback
+from src.games.lobbies import lobby_manager
+from src.database.user_context import load_user_context
+from src.utils.mongo_monitor import begin_update_scope, end_update_scope
+from src.utils.metrics import telegram_in_flight, telegram_latency
+from src.utils.tracing import span, begin_update_trace, end_update_trace
+from src.utils.loop_monitor import loop_monitor
+from src.wallet.rates import rate_service
+from src.wallet.provider_metadata import provider_metadata
 from src.wallet import (
     wallet_command,
     wallet_callback,
@@ -47,7 +58,7 @@ from src.wallet import (
     crypto_callback,
     crypto_message_handler
 )
-from src.admin import admin_command, admin_callback, admin_message_handler, broadcast_command
+from src.admin import admin_command, admin_callback, admin_message_handler, broadcast_command, loglevel_command, dbstats_command, traces_command, profile_command
 from src.menus import (
     main_menu_command, main_menu_callback,
     games_menu_command, games_menu_callback,
@@ -301,6 +312,20 @@ async def withdrawal_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
         # Show withdrawal menu
         await withdrawal_system.show_withdrawal_menu(update, context)
 
+class InstrumentedRequest(HTTPXRequest):
+    """HTTPXRequest that reports queued/in-flight calls, their latency per API method and a trace span"""
+    
+    async def do_request(self, url, method, *args, **kwargs):
+        api_method = url.rsplit("/", 1)[-1]
+        telegram_in_flight.labels().inc()
+        started = time.perf_counter()
+        try:
+            with span(f"telegram {api_method}"):
+                return await super().do_request(url, method, *args, **kwargs)
+        finally:
+            telegram_in_flight.labels().dec()
+            telegram_latency.labels(api_method).observe(time.perf_counter() - started)
+
 async def post_init(application):
     """Set up bot commands and database after initialization."""
     # Setup database first
@@ -317,6 +342,22 @@ async def post_init(application):
     
     await application.bot.set_my_commands(commands)
     logger.info("Bot commands have been set up")
+    
+    # Expire abandoned multiplayer lobbies in the background
+    lobby_manager.start()
+    
+    # Measure event-loop lag and report what blocks it
+    loop_monitor.start()
+    
+    # Keep exchange rates and provider metadata warm so wallet screens never wait on the provider
+    rate_service.start()
+    await provider_metadata.warm()
+    provider_metadata.start()
+
+async def post_shutdown(application):
+    """Release pooled connections when the bot stops."""
+    from src.wallet.nowpayments import nowpayments_client
+    await nowpayments_client.close()
 
 async def setup_bot():
     """Setup bot database and configurations"""
@@ -346,7 +387,21 @@ def main():
     bot_logger.info(config_validator.get_config_status())
     
     # Create the Application
-    application = Application.builder().token(BOT_TOKEN).post_init(post_init).build()
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .request(InstrumentedRequest(connection_pool_size=256))
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
+    
+    # Trace each update, count its database round trips, and load its user at most once
+    application.add_handler(TypeHandler(Update, begin_update_trace), group=-3)
+    application.add_handler(TypeHandler(Update, begin_update_scope), group=-2)
+    application.add_handler(TypeHandler(Update, load_user_context), group=-1)
+    application.add_handler(TypeHandler(Update, end_update_scope), group=100)
+    application.add_handler(TypeHandler(Update, end_update_trace), group=101)
     
     # Basic commands
     application.add_handler(CommandHandler("start", start))
@@ -366,6 +421,10 @@ def main():
     # Admin commands
     application.add_handler(CommandHandler("admin", admin_command))
     application.add_handler(CommandHandler("broadcast", broadcast_command))
+    application.add_handler(CommandHandler("loglevel", loglevel_command))
+    application.add_handler(CommandHandler("dbstats", dbstats_command))
+    application.add_handler(CommandHandler("traces", traces_command))
+    application.add_handler(CommandHandler("profile", profile_command))
     
     # Menu callback handlers
     application.add_handler(CallbackQueryHandler(main_menu_callback, pattern="^menu_"))
@@ -403,6 +462,9 @@ def main():
     # Message handler
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
     
+    # Time and trace the handlers the error decorators do not cover
+    instrument_handlers(application)
+    
     # Start the Bot
     application.run_polling()
     
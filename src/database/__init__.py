@@ -3,6 +3,8 @@ from src.database.db import (
     update_user_balance,
     record_transaction,
     record_game,
+    apply_balance_changes,
+    record_games,
     can_withdraw,
     claim_daily_bonus,
     add_referral,
@@ -30,6 +32,16 @@ from src.database.db import (
     games_collection
 )
 
+# Batched user loading
+from src.database.db import user_loader
+from src.database.loader import DataLoader
+
+# Request-scoped user context
+from src.database.user_context import (
+    load_user_context,
+    current_user_context
+)
+
 # Import leaderboard functions
 from src.database.leaderboard import (
     get_game_leaderboard,
@@ -1,10 +1,17 @@
 import os
+import secrets
 import motor.motor_asyncio
+from pymongo import ReturnDocument, UpdateOne
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Tuple
 from src.utils.logger import db_logger
 from src.utils.error_handler import DatabaseError
+from src.utils.mongo_monitor import command_monitor
+from src.utils.metrics import bet_volume, bets_total, cache_requests, settlement_latency
+from src.utils.tracing import span
+from src.database.user_context import amend_cached_user, cached_user, context_user_data, remember_user
+from src.database.loader import DataLoader
 
 load_dotenv()
 
@@ -14,19 +21,96 @@ DATABASE_NAME = os.getenv("DATABASE_NAME", "exowin_bot")
 if not MONGODB_URI or not DATABASE_NAME:
     raise ValueError("MONGODB_URI and DATABASE_NAME must be set in environment variables")
 
-client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
+client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI, event_listeners=[command_monitor])
+command_monitor.attach(client.delegate)
 db = client[DATABASE_NAME]
 users_collection = db["users"]
 transactions_collection = db["transactions"]
 games_collection = db["games"]
 
+# Recent balance batch ids kept on each user, to tell which conditional updates applied
+WALLET_BATCH_HISTORY = 20
+
+# Fields left out of user documents handed to handlers
+USER_PROJECTION = {"_id": 0, "wallet_batches": 0}
+
+def _profile_fields(user_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "username": user_data.get('username'),
+        "first_name": user_data.get('first_name'),
+        "last_name": user_data.get('last_name')
+    }
+
+async def _update_user(user_id: int, update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Apply an update to one user, returning the new document and keeping it in the user context"""
+    user = await users_collection.find_one_and_update(
+        {"user_id": user_id}, update,
+        projection=USER_PROJECTION, return_document=ReturnDocument.AFTER
+    )
+    if user:
+        remember_user(user)
+    return user
+
+async def _load_users(profiles: Dict[int, Optional[Dict[str, Any]]]) -> Dict[int, Dict[str, Any]]:
+    """Users loader batch: touch last_active (and names) and read every requested user at once
+
+    The batch is traced under the request that scheduled it.
+    """
+    with span("db load_users", batch=len(profiles)):
+        return await _touch_and_read_users(profiles)
+
+async def _touch_and_read_users(profiles: Dict[int, Optional[Dict[str, Any]]]) -> Dict[int, Dict[str, Any]]:
+    now = datetime.now()
+    if len(profiles) == 1:
+        # A lone lookup touches and reads the user in one round trip
+        (user_id, user_data), = profiles.items()
+        user = await users_collection.find_one_and_update(
+            {"user_id": user_id}, {"$set": {"last_active": now, **(_profile_fields(user_data) if user_data else {})}},
+            projection=USER_PROJECTION, return_document=ReturnDocument.AFTER
+        )
+        return {user_id: user} if user else {}
+    await users_collection.bulk_write([
+        UpdateOne({"user_id": user_id}, {"$set": {"last_active": now, **(_profile_fields(user_data) if user_data else {})}})
+        for user_id, user_data in profiles.items()
+    ], ordered=False)
+    cursor = users_collection.find({"user_id": {"$in": list(profiles)}}, USER_PROJECTION)
+    return {user["user_id"]: user async for user in cursor}
+
+# Coalesces concurrent get_user() calls into one query per event-loop tick
+user_loader = DataLoader(_load_users, name="users")
+
+_USER_CONTEXT_HITS = cache_requests.labels("user_context", "hit")
+_USER_CONTEXT_MISSES = cache_requests.labels("user_context", "miss")
+_WALLET_BATCH_LATENCY = settlement_latency.labels("wallet_batch")
+
+def _count_bet(game_type: str, bet_amount: float):
+    bets_total.labels(game_type).inc()
+    bet_volume.labels(game_type).inc(bet_amount)
+
 # User operations
 async def get_user(user_id: int, user_data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-    """Get user from database or create if not exists"""
+    """Get user from database or create if not exists
+
+    Within an update, the acting user is read once and then served from the
+    request's user context. Lookups from concurrent coroutines are batched by
+    user_loader.
+    """
     try:
-        db_logger.debug(f"Getting user {user_id}")
-        user = await users_collection.find_one({"user_id": user_id})
-        if not user:
+        user = cached_user(user_id)
+        if user is not None and (not user_data or all(
+                user.get(field) == value for field, value in _profile_fields(user_data).items())):
+            _USER_CONTEXT_HITS.inc()
+            return user
+        _USER_CONTEXT_MISSES.inc()
+        
+        db_logger.debug("Getting user %s", user_id)
+        user_data = user_data or context_user_data(user_id)
+        user = await user_loader.load(user_id, user_data or None)
+        if user:
+            # Coalesced callers share one loaded document; each gets its own copy
+            user = dict(user)
+            remember_user(user)
+        else:
             user = {
                 "user_id": user_id,
                 "balance": 1.0,  # Starting balance of $1
@@ -61,58 +145,27 @@ async def get_user(user_id: int, user_data: Optional[Dict[str, Any]] = None) ->
             
             # Add user data if provided
             if user_data:
-                user.update({
-                    "username": user_data.get('username'),
-                    "first_name": user_data.get('first_name'),
-                    "last_name": user_data.get('last_name')
-                })
+                user.update(_profile_fields(user_data))
             
             await users_collection.insert_one(user)
+            user.pop("_id", None)
+            remember_user(user)
             db_logger.info(f"Created new user {user_id}")
-        else:
-            # Update last active and user info if provided
-            update_data = {"last_active": datetime.now()}
-            if user_data:
-                update_data.update({
-                    "username": user_data.get('username'),
-                    "first_name": user_data.get('first_name'),
-                    "last_name": user_data.get('last_name')
-                })
-            
-            await users_collection.update_one(
-                {"user_id": user_id},
-                {"$set": update_data}
-            )
         return user
     except Exception as e:
         db_logger.error(f"Database error in get_user: {e}")
         raise DatabaseError(f"Failed to get user {user_id}: {e}")
 
 async def update_user_balance(user_id: int, amount: float):
-    """Update user balance"""
-    await users_collection.update_one(
-        {"user_id": user_id},
-        {"$inc": {"balance": amount}, "$set": {"last_active": datetime.now()}}
-    )
-    
+    """Update user balance and bet stats, returning the updated user"""
+    increments = {"balance": amount, "total_bets": 1}
     # Update stats based on transaction type
     if amount > 0:
-        await users_collection.update_one(
-            {"user_id": user_id},
-            {"$inc": {"total_wins": 1}}
-        )
+        increments["total_wins"] = 1
     elif amount < 0:
-        await users_collection.update_one(
-            {"user_id": user_id},
-            {"$inc": {"total_losses": 1}}
-        )
-    
-    await users_collection.update_one(
-        {"user_id": user_id},
-        {"$inc": {"total_bets": 1}}
-    )
+        increments["total_losses"] = 1
     
-    return await get_user(user_id)
+    return await _update_user(user_id, {"$inc": increments, "$set": {"last_active": datetime.now()}})
 
 async def record_transaction(user_id: int, amount: float, transaction_type: str, game_id: str = None, description: str = None):
     """Record a transaction"""
@@ -128,15 +181,9 @@ async def record_transaction(user_id: int, amount: float, transaction_type: str,
     
     # Update user stats for deposits and withdrawals
     if transaction_type == "deposit":
-        await users_collection.update_one(
-            {"user_id": user_id},
-            {"$inc": {"total_deposits": amount}}
-        )
+        await _update_user(user_id, {"$inc": {"total_deposits": amount}})
     elif transaction_type == "withdrawal":
-        await users_collection.update_one(
-            {"user_id": user_id},
-            {"$inc": {"total_withdrawals": amount}}
-        )
+        await _update_user(user_id, {"$inc": {"total_withdrawals": amount}})
     
     return transaction
 
@@ -151,10 +198,101 @@ async def record_game(user_id: int, game_type: str, bet_amount: float, outcome:
         "timestamp": datetime.now()
     }
     result = await games_collection.insert_one(game)
+    _count_bet(game_type, bet_amount)
     return str(result.inserted_id)
 
+async def apply_balance_changes(changes: Iterable[Tuple[int, float, str]], game_id: str = None,
+                                description: str = None, record_stats: bool = True) -> Dict[int, Dict[str, Any]]:
+    """Apply balance changes for many users in one conditional bulk write
+
+    changes is a list of (user_id, delta, reason). A user's changes are merged
+    into a single UpdateOne that only matches while their balance covers all
+    of their debits, so a batch never overdraws anyone. Which updates applied
+    is read back in one query, ledger rows for those users are inserted in
+    bulk, and {user_id: {"applied": bool, "balance": float}} is returned.
+    """
+    with _WALLET_BATCH_LATENCY.time(), span("db apply_balance_changes", game_id=game_id):
+        return await _apply_balance_changes(changes, game_id, description, record_stats)
+
+async def _apply_balance_changes(changes, game_id, description, record_stats) -> Dict[int, Dict[str, Any]]:
+    batch_id = secrets.token_hex(8)
+    now = datetime.now()
+    merged = {}
+    for user_id, delta, reason in changes:
+        entry = merged.setdefault(user_id, {"net": 0.0, "debits": 0.0, "rows": []})
+        entry["net"] += delta
+        if delta < 0:
+            entry["debits"] -= delta
+        entry["rows"].append((delta, reason))
+    if not merged:
+        return {}
+    
+    updates = []
+    pending = {}
+    for user_id, entry in merged.items():
+        increments = {"balance": entry["net"]}
+        if record_stats:
+            # Same counters update_user_balance keeps per call
+            increments["total_bets"] = 1
+            if entry["net"] > 0:
+                increments["total_wins"] = 1
+            elif entry["net"] < 0:
+                increments["total_losses"] = 1
+        pending[user_id] = increments
+        query = {"user_id": user_id}
+        if entry["debits"] > 0:
+            query["balance"] = {"$gte": entry["debits"]}
+        updates.append(UpdateOne(query, {
+            "$inc": increments,
+            "$set": {"last_active": now},
+            "$push": {"wallet_batches": {"$each": [batch_id], "$slice": -WALLET_BATCH_HISTORY}}
+        }))
+    await users_collection.bulk_write(updates, ordered=False)
+    
+    results = {user_id: {"applied": False, "balance": None} for user_id in merged}
+    cursor = users_collection.find(
+        {"user_id": {"$in": list(merged)}},
+        {"_id": 0, "user_id": 1, "balance": 1, "wallet_batches": 1}
+    )
+    async for user in cursor:
+        results[user["user_id"]] = {
+            "applied": batch_id in user.get("wallet_batches", []),
+            "balance": user.get("balance", 0.0)
+        }
+        if results[user["user_id"]]["applied"]:
+            amend_cached_user(user["user_id"], pending[user["user_id"]])
+    
+    transactions = [
+        {"user_id": user_id, "amount": delta, "type": reason, "game_id": game_id,
+         "description": description, "timestamp": now}
+        for user_id, entry in merged.items() if results[user_id]["applied"]
+        for delta, reason in entry["rows"]
+    ]
+    if transactions:
+        await transactions_collection.insert_many(transactions, ordered=False)
+    
+    rejected = [user_id for user_id, result in results.items() if not result["applied"]]
+    if rejected:
+        db_logger.warning(f"Balance batch {game_id or batch_id}: rejected {len(rejected)} of {len(merged)} users")
+    return results
+
+async def record_games(game_type: str, results: Iterable[Tuple[int, float, str, float]]) -> int:
+    """Record several (user_id, bet_amount, outcome, winnings) game results at once"""
+    now = datetime.now()
+    games = [
+        {"user_id": user_id, "game_type": game_type, "bet_amount": bet_amount,
+         "outcome": outcome, "winnings": winnings, "timestamp": now}
+        for user_id, bet_amount, outcome, winnings in results
+    ]
+    if not games:
+        return 0
+    result = await games_collection.insert_many(games, ordered=False)
+    for game in games:
+        _count_bet(game_type, game["bet_amount"])
+    return len(result.inserted_ids)
+
 async def can_withdraw(user_id: int):
-    """Check if user can withdraw (balance >= $50)"""
+    """Check if user can withdraw (balance >= $50); reuses the update's loaded user"""
     user = await get_user(user_id)
     return user["balance"] >= 50.0
 
@@ -180,8 +318,8 @@ async def claim_daily_bonus(user_id: int):
     # Update user
     new_streak = streak + 1 if last_bonus and (now - last_bonus) < timedelta(hours=48) else 1
     
-    await users_collection.update_one(
-        {"user_id": user_id},
+    await _update_user(
+        user_id,
         {
             "$inc": {
                 "balance": total_bonus,
@@ -208,8 +346,8 @@ async def add_referral(referrer_id: int, referred_id: int):
     
     # Give bonus to referrer
     referrer_bonus = 2.0
-    await users_collection.update_one(
-        {"user_id": referrer_id},
+    await _update_user(
+        referrer_id,
         {
             "$inc": {
                 "balance": referrer_bonus,
@@ -221,8 +359,8 @@ async def add_referral(referrer_id: int, referred_id: int):
     
     # Give bonus to referred user
     referred_bonus = 1.0
-    await users_collection.update_one(
-        {"user_id": referred_id},
+    await _update_user(
+        referred_id,
         {
             "$inc": {"balance": referred_bonus},
             "$set": {"referred_by": referrer_id}
@@ -236,11 +374,8 @@ async def add_referral(referrer_id: int, referred_id: int):
     return True, (referrer_bonus, referred_bonus)
 
 async def update_user_settings(user_id: int, settings: dict):
-    """Update user settings"""
-    await users_collection.update_one(
-        {"user_id": user_id},
-        {"$set": settings}
-    )
+    """Update user settings, returning the updated user"""
+    return await _update_user(user_id, {"$set": settings})
 
 # Admin functions
 async def get_all_users(limit: int = 50, skip: int = 0, sort_by: str = "created_at", sort_order: int = -1):
@@ -281,11 +416,7 @@ async def get_user_games(user_id: int, limit: int = 20):
 
 async def ban_user(user_id: int, banned: bool = True):
     """Ban or unban a user"""
-    await users_collection.update_one(
-        {"user_id": user_id},
-        {"$set": {"is_banned": banned}}
-    )
-    return await get_user(user_id)
+    return await _update_user(user_id, {"$set": {"is_banned": banned}})
 
 async def get_top_users_by_balance(limit: int = 10):
     """Get top users by balance"""
@@ -371,6 +502,11 @@ async def setup_database():
         await games_collection.create_index([("user_id", 1), ("timestamp", -1)])
         await games_collection.create_index([("game_type", 1), ("timestamp", -1)])
         
+        # Scheduled lottery tickets (webapp/sync_db.py MongoLotteryStore)
+        await db["lottery_tickets"].create_index([("status", 1), ("draw_id", 1)])
+        await db["lottery_tickets"].create_index("drawn_in")
+        await db["lottery_draws"].create_index("status")
+        
         db_logger.info("Database indexes created successfully")
         return True
     except Exception as e:
@@ -0,0 +1,110 @@
+"""
+DataLoader-style request coalescing
+
+Keys loaded during the same event-loop tick are collected and fetched with a
+single call to the batch function once the tick ends. Repeated keys share one
+future, so a user requested by several coroutines is only fetched once.
+get_user() loads through the users loader in src.database.db, turning
+concurrent lookups into one find({"user_id": {"$in": [...]}}).
+"""
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from src.utils.logger import db_logger
+from src.utils.metrics import cache_requests, registry
+
+# Largest batch sent to the database in one call
+LOADER_MAX_BATCH = int(os.getenv("LOADER_MAX_BATCH", 500))
+
+BatchFunction = Callable[[Dict[Hashable, Any]], Awaitable[Dict[Hashable, Any]]]
+
+
+class DataLoader:
+    """Coalesces loads issued in the same tick into one batch call
+
+    batch_fn receives {key: payload} for every distinct key in the batch and
+    returns {key: value}; keys missing from its result resolve to None.
+    """
+
+    def __init__(self, batch_fn: BatchFunction, name: str = "loader", max_batch: int = LOADER_MAX_BATCH):
+        self.batch_fn = batch_fn
+        self.name = name
+        self.max_batch = max_batch
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._payloads: Dict[Hashable, Any] = {}
+        self._queued_at: Optional[float] = None
+        self._scheduled = False
+        self.stats = {"loads": 0, "duplicates": 0, "batches": 0, "keys": 0, "largest_batch": 0, "wait_seconds": 0.0}
+        self._coalesced = cache_requests.labels(name, "coalesced")
+        self._fetched = cache_requests.labels(name, "fetched")
+        self._batch_sizes = registry.histogram(
+            "loader_batch_size", "Distinct keys per loader batch", ("loader",), (1, 2, 5, 10, 25, 50, 100, 250, 500)
+        ).labels(name)
+        self._waits = registry.histogram("loader_wait_seconds", "Queue wait before a loader batch", ("loader",),
+                                         (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)).labels(name)
+
+    def load(self, key: Hashable, payload: Any = None) -> Awaitable[Any]:
+        """Queue a key for the current batch and return a future for its value"""
+        self.stats["loads"] += 1
+        future = self._pending.get(key)
+        if future is not None:
+            self.stats["duplicates"] += 1
+            self._coalesced.inc()
+            if payload is not None:
+                self._payloads[key] = payload
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._fetched.inc()
+        self._pending[key] = future
+        self._payloads[key] = payload
+        if self._queued_at is None:
+            self._queued_at = time.perf_counter()
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._dispatch)
+        return future
+
+    def _dispatch(self):
+        self._scheduled = False
+        if not self._pending:
+            return
+        futures, self._pending = self._pending, {}
+        payloads, self._payloads = self._payloads, {}
+        wait = time.perf_counter() - self._queued_at
+        self._queued_at = None
+
+        self.stats["batches"] += 1
+        self.stats["keys"] += len(futures)
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(futures))
+        self.stats["wait_seconds"] += wait
+        self._batch_sizes.observe(len(futures))
+        self._waits.observe(wait)
+        db_logger.debug("%s: batch of %d keys after %.2fms", self.name, len(futures), wait * 1000)
+        asyncio.get_running_loop().create_task(self._run(futures, payloads))
+
+    async def _run(self, futures: Dict[Hashable, asyncio.Future], payloads: Dict[Hashable, Any]):
+        try:
+            values = await self.batch_fn(payloads)
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in futures.items():
+            if not future.done():
+                future.set_result(values.get(key))
+
+    def metrics(self) -> Dict[str, float]:
+        """Counters plus average batch size and wait"""
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "average_batch": self.stats["keys"] / batches if batches else 0.0,
+            "average_wait_seconds": self.stats["wait_seconds"] / batches if batches else 0.0
+        }
@@ -0,0 +1,78 @@
+"""
+Request-scoped user context
+
+A TypeHandler in group -1 starts a fresh UserContext for every Telegram
+update. The first get_user() for the acting user loads the document and keeps
+it here, later calls in the same update return it without another read, and
+the mutating database functions replace it with the document their update
+returned. Contexts live in a ContextVar, so concurrently processed updates
+never see each other's users.
+"""
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from src.utils.logger import reset_log_fields
+
+
+class UserContext:
+    """The acting user of one update, loaded at most once"""
+
+    def __init__(self, user_id: Optional[int], user_data: Optional[Dict[str, Any]] = None):
+        self.user_id = user_id
+        self.user_data = user_data or None
+        self.user: Optional[Dict[str, Any]] = None
+
+
+_current: ContextVar[Optional[UserContext]] = ContextVar("user_context", default=None)
+
+
+def begin_user_context(user_id: Optional[int], user_data: Optional[Dict[str, Any]] = None) -> UserContext:
+    """Start the context of a new update, replacing the previous one"""
+    context = UserContext(user_id, user_data)
+    _current.set(context)
+    return context
+
+
+def current_user_context() -> Optional[UserContext]:
+    return _current.get()
+
+
+def _context_for(user_id: int) -> Optional[UserContext]:
+    context = _current.get()
+    return context if context is not None and context.user_id == user_id else None
+
+
+def cached_user(user_id: int) -> Optional[Dict[str, Any]]:
+    """The user loaded earlier in this update, if user_id is the acting user"""
+    context = _context_for(user_id)
+    return context.user if context else None
+
+
+def context_user_data(user_id: int) -> Optional[Dict[str, Any]]:
+    """Telegram profile fields of the acting user, to refresh on first load"""
+    context = _context_for(user_id)
+    return context.user_data if context else None
+
+
+def remember_user(user: Dict[str, Any]):
+    """Keep a freshly read or updated document if it belongs to the acting user"""
+    context = _context_for(user.get("user_id"))
+    if context:
+        context.user = user
+
+
+def amend_cached_user(user_id: int, increments: Dict[str, float]):
+    """Apply $inc-style increments to the cached user after a bulk write"""
+    user = cached_user(user_id)
+    if user is not None:
+        for field, amount in increments.items():
+            user[field] = user.get(field, 0) + amount
+
+
+async def load_user_context(update, context):
+    """Group -1 handler: give each update its own user context"""
+    from src.database.db import extract_user_data_from_update
+
+    user_data = extract_user_data_from_update(update)
+    begin_user_context(user_data.get("user_id"), user_data)
+    reset_log_fields(user_id=user_data.get("user_id"))
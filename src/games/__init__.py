@@ -9,3 +9,34 @@ from src.games.basketball_animated import basketball_command, basketball_callbac
 from src.games.football_animated import football_command, football_callback
 
 # Webapp games don't need callback imports - they're handled through the webapp
+
+# Open sessions per game, read by the active_game_sessions gauge at scrape time
+from src.games import (
+    basketball_animated, bowling_animated, coinflip_animated, football_animated,
+    blackjack, crash, lottery, mines, plinko, poker, roulette, tower
+)
+from src.games.lobbies import lobby_manager
+from src.utils.metrics import registry
+
+SESSION_STORES = {
+    'basketball': basketball_animated.active_basketball_games,
+    'bowling': bowling_animated.active_bowling_games,
+    'coinflip': coinflip_animated.active_coinflip_games,
+    'football': football_animated.active_football_games,
+    'blackjack': blackjack.active_blackjack_games,
+    'crash': crash.active_crash_games,
+    'lottery': lottery.active_lottery_games,
+    'mines': mines.active_mines_games,
+    'plinko': plinko.active_plinko_games,
+    'poker': poker.active_poker_games,
+    'roulette': roulette.active_roulette_games,
+    'tower': tower.active_tower_games,
+}
+
+def active_sessions():
+    counts = {game: len(store) for game, store in SESSION_STORES.items()}
+    for lobby in list(lobby_manager.lobbies.values()):
+        counts[lobby.game_type] = counts.get(lobby.game_type, 0) + 1
+    return counts
+
+registry.gauge("active_game_sessions", "Open game sessions and lobbies per game", ("game",), callback=active_sessions)
@@ -4,6 +4,7 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction, record_game
 from src.utils.formatting import format_money
+from src.games.engines import ScoredDiceEngine, register_engine
 
 # Active basketball competitions
 active_basketball_games = {}
@@ -17,6 +18,8 @@ BASKETBALL_SCORING = {
     5: {"name": "Perfect Shot", "multiplier": 8, "emoji": "🏀"}
 }
 
+basketball_engine = register_engine(ScoredDiceEngine('telegram_basketball', BASKETBALL_SCORING))
+
 async def basketball_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /basketball command"""
     # Handle both direct commands and callback queries
@@ -164,8 +167,9 @@ async def execute_solo_basketball_game(query, bet_amount: float):
     
     # Get result (1-5)
     result = basketball_message.dice.value
-    scoring = BASKETBALL_SCORING[result]
-    winnings = bet_amount * scoring['multiplier']
+    outcome = basketball_engine.play(bet_amount, {'value': result})
+    scoring = outcome['scoring']
+    winnings = outcome['winnings']
     
     # Record game
     game_id = await record_game(
@@ -0,0 +1,223 @@
+"""
+Vectorized outcome engine for bulk rounds
+
+Generates K outcomes per game type as NumPy arrays and applies payouts through
+precomputed multiplier tables. Used for auto-bet, tournaments and RTP
+simulation where drawing outcomes one at a time is far too slow.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.games.payout_tables import (
+    COINFLIP_MULTIPLIER,
+    INSTANT_CRASH_MIN, INSTANT_CRASH_MAX,
+    DICE_SIDES, DICE_RTP,
+    PLINKO_QUICK_ROWS, PLINKO_MULTIPLIERS,
+    ROULETTE_NUMBERS, RED_NUMBERS,
+    ROULETTE_STRAIGHT_MULTIPLIER, ROULETTE_EVEN_MONEY_MULTIPLIER,
+    SLOT_WEIGHTS, SLOT_TRIPLE_MULTIPLIERS, SLOT_PAIR_MULTIPLIER,
+    WHEEL_SEGMENTS, WHEEL_MULTIPLIERS, WHEEL_WEIGHTS
+)
+
+# Default number of rounds generated per chunk when simulating
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def _cumulative(weights) -> np.ndarray:
+    """Normalized cumulative weights for inverse-CDF sampling"""
+    cumulative = np.cumsum(np.asarray(weights, dtype=np.float64))
+    return cumulative / cumulative[-1]
+
+
+# Precomputed sampling and payout tables
+PLINKO_TABLES = {board: np.asarray(table, dtype=np.float64) for board, table in PLINKO_MULTIPLIERS.items()}
+
+SLOT_CDF = _cumulative(SLOT_WEIGHTS)
+SLOT_TRIPLE_TABLE = np.asarray(SLOT_TRIPLE_MULTIPLIERS, dtype=np.float64)
+
+WHEEL_CDF = _cumulative(WHEEL_WEIGHTS)
+WHEEL_SEGMENT_TABLE = np.asarray(WHEEL_SEGMENTS, dtype=np.int64)
+WHEEL_MULTIPLIER_TABLE = np.asarray(WHEEL_MULTIPLIERS, dtype=np.float64)
+
+# Roulette color per number: 0 = green, 1 = red, 2 = black
+ROULETTE_COLOR_TABLE = np.array(
+    [0] + [1 if n in RED_NUMBERS else 2 for n in range(1, ROULETTE_NUMBERS)],
+    dtype=np.int8
+)
+ROULETTE_COLOR_CODES = {'green': 0, 'red': 1, 'black': 2}
+
+
+class BatchOutcomeEngine:
+    """Draw outcomes and payouts for many rounds at once"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+
+    # ------------------------------------------------------------------
+    # Raw outcomes
+    # ------------------------------------------------------------------
+    def coinflips(self, k: int) -> np.ndarray:
+        """0 = heads, 1 = tails"""
+        return self.rng.integers(0, 2, size=k, dtype=np.int8)
+
+    def dice_rolls(self, k: int, sides: int = DICE_SIDES) -> np.ndarray:
+        """Uniform rolls in 1..sides"""
+        return self.rng.integers(1, sides + 1, size=k, dtype=np.int16)
+
+    def plinko_buckets(self, k: int, rows: int = PLINKO_QUICK_ROWS) -> np.ndarray:
+        """Bucket indexes 0..rows, drawn directly from Binomial(rows, 1/2)"""
+        return self.rng.binomial(rows, 0.5, size=k)
+
+    def roulette_numbers(self, k: int) -> np.ndarray:
+        """Winning numbers 0..36"""
+        return self.rng.integers(0, ROULETTE_NUMBERS, size=k, dtype=np.int8)
+
+    def slot_reels(self, k: int) -> np.ndarray:
+        """K x 3 array of symbol indexes into SLOT_SYMBOLS"""
+        return np.searchsorted(SLOT_CDF, self.rng.random((k, 3)), side='right')
+
+    def wheel_segments(self, k: int) -> np.ndarray:
+        """Winning segment ids (1-based, as in WHEEL_SEGMENTS)"""
+        return WHEEL_SEGMENT_TABLE[np.searchsorted(WHEEL_CDF, self.rng.random(k), side='right')]
+
+    def crash_points(self, k: int) -> np.ndarray:
+        """Crash points with the same distribution as CrashGame.generate_crash_point"""
+        r = self.rng.random(k)
+        points = 0.9 / ((1.0 - self.rng.random(k)) ** 0.7)
+        very_early = r < 0.01
+        early = (r >= 0.01) & (r < 0.05)
+        points[very_early] = self.rng.uniform(1.0, 1.1, size=int(very_early.sum()))
+        points[early] = self.rng.uniform(1.1, 1.5, size=int(early.sum()))
+        return points
+
+    def instant_crash_points(self, k: int) -> np.ndarray:
+        """Crash points for the quick-play crash game in /api/game/bet"""
+        return np.round(self.rng.uniform(INSTANT_CRASH_MIN, INSTANT_CRASH_MAX, size=k), 2)
+
+    # ------------------------------------------------------------------
+    # Payout multipliers (0 = loss)
+    # ------------------------------------------------------------------
+    def coinflip_multipliers(self, k: int, choice: str = 'heads') -> np.ndarray:
+        side = 0 if choice == 'heads' else 1
+        return np.where(self.coinflips(k) == side, COINFLIP_MULTIPLIER, 0.0)
+
+    def dice_multipliers(self, k: int, target: int = 50, over_under: str = 'over') -> np.ndarray:
+        rolls = self.dice_rolls(k)
+        if over_under == 'over':
+            won = rolls > target
+            probability = (DICE_SIDES - target) / DICE_SIDES
+        else:
+            won = rolls < target
+            probability = target / DICE_SIDES
+        if probability <= 0:
+            return np.zeros(k)
+        return np.where(won, DICE_RTP / probability, 0.0)
+
+    def plinko_multipliers(self, k: int, risk: str = 'medium', rows: int = PLINKO_QUICK_ROWS) -> np.ndarray:
+        return PLINKO_TABLES[(rows, risk)][self.plinko_buckets(k, rows)]
+
+    def roulette_multipliers(self, k: int, bet_type: str = 'number', bet_value: Any = 0) -> np.ndarray:
+        numbers = self.roulette_numbers(k)
+        if bet_type == 'number':
+            won = numbers == bet_value
+            return np.where(won, float(ROULETTE_STRAIGHT_MULTIPLIER), 0.0)
+        if bet_type == 'color':
+            won = ROULETTE_COLOR_TABLE[numbers] == ROULETTE_COLOR_CODES.get(bet_value, -1)
+        elif bet_type == 'odd_even':
+            parity = 1 if bet_value == 'odd' else 0
+            won = (numbers != 0) & (numbers % 2 == parity)
+        else:
+            return np.zeros(k)
+        return np.where(won, float(ROULETTE_EVEN_MONEY_MULTIPLIER), 0.0)
+
+    def slot_multipliers(self, k: int) -> np.ndarray:
+        reels = self.slot_reels(k)
+        first, second, third = reels[:, 0], reels[:, 1], reels[:, 2]
+        triple = (first == second) & (second == third)
+        pair = ~triple & ((first == second) | (second == third) | (first == third))
+        multipliers = np.where(pair, float(SLOT_PAIR_MULTIPLIER), 0.0)
+        multipliers[triple] = SLOT_TRIPLE_TABLE[first[triple]]
+        return multipliers
+
+    def wheel_multipliers(self, k: int, selected_segment: int = 1) -> np.ndarray:
+        index = np.searchsorted(WHEEL_CDF, self.rng.random(k), side='right')
+        won = WHEEL_SEGMENT_TABLE[index] == selected_segment
+        return np.where(won, WHEEL_MULTIPLIER_TABLE[index], 0.0)
+
+    def crash_multipliers(self, k: int, cash_out_at: float = 2.0) -> np.ndarray:
+        return np.where(self.crash_points(k) >= cash_out_at, cash_out_at, 0.0)
+
+    def instant_crash_multipliers(self, k: int, cash_out_at: float = 2.0) -> np.ndarray:
+        return np.where(self.instant_crash_points(k) >= cash_out_at, cash_out_at, 0.0)
+
+    def multipliers(self, game_type: str, k: int, game_data: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """Payout multipliers for K rounds of a game, using the same game_data keys as /api/game/bet"""
+        game_data = game_data or {}
+
+        if game_type == 'coinflip':
+            return self.coinflip_multipliers(k, game_data.get('choice', 'heads'))
+        elif game_type in ('dice', 'roll'):
+            return self.dice_multipliers(k, game_data.get('target', 50), game_data.get('over_under', 'over'))
+        elif game_type == 'plinko':
+            return self.plinko_multipliers(k, game_data.get('risk', 'medium'), int(game_data.get('rows', PLINKO_QUICK_ROWS)))
+        elif game_type == 'roulette':
+            return self.roulette_multipliers(k, game_data.get('bet_type', 'number'), game_data.get('bet_value'))
+        elif game_type == 'slots':
+            return self.slot_multipliers(k)
+        elif game_type == 'wheel':
+            return self.wheel_multipliers(k, game_data.get('selected_segment', 1))
+        elif game_type == 'crash':
+            return self.instant_crash_multipliers(k, game_data.get('cash_out_at', 2.0))
+        elif game_type == 'crash_session':
+            return self.crash_multipliers(k, game_data.get('cash_out_at', 2.0))
+
+        raise ValueError(f"Batch outcomes not supported for game type: {game_type}")
+
+    def run_rounds(self, game_type: str, rounds: int, bet_amount: float = 1.0,
+                   game_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Play a number of rounds and return per-round multipliers and winnings"""
+        multipliers = self.multipliers(game_type, rounds, game_data)
+        winnings = multipliers * bet_amount
+        return {
+            'game_type': game_type,
+            'rounds': rounds,
+            'bet_amount': bet_amount,
+            'multipliers': multipliers,
+            'winnings': winnings,
+            'total_bet': bet_amount * rounds,
+            'total_winnings': float(winnings.sum()),
+            'wins': int(np.count_nonzero(multipliers > 1.0))
+        }
+
+    def simulate(self, game_type: str, rounds: int, game_data: Optional[Dict[str, Any]] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        """Aggregate statistics over many unit-stake rounds, generated in bounded chunks"""
+        total = 0.0
+        total_sq = 0.0
+        wins = 0
+        max_multiplier = 0.0
+        remaining = rounds
+
+        while remaining > 0:
+            k = min(chunk_size, remaining)
+            multipliers = self.multipliers(game_type, k, game_data)
+            total += float(multipliers.sum())
+            total_sq += float(np.dot(multipliers, multipliers))
+            wins += int(np.count_nonzero(multipliers > 1.0))
+            max_multiplier = max(max_multiplier, float(multipliers.max()))
+            remaining -= k
+
+        return {
+            'game_type': game_type,
+            'rounds': rounds,
+            'total_return': total,
+            'total_return_sq': total_sq,
+            'wins': wins,
+            'max_multiplier': max_multiplier,
+            'rtp': total / rounds if rounds else 0.0
+        }
+
+
+# Shared engine instance
+batch_engine = BatchOutcomeEngine()
@@ -1,57 +1,162 @@
-import random
+import threading
+
+from src.games.rng import derive_rng, new_nonce
 
 # Card suits and values
 SUITS = ["♠️", "♥️", "♦️", "♣️"]
 RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
 
+# Decks in the shared shoe and the share dealt before the cut card
+BLACKJACK_DECKS = 6
+BLACKJACK_PENETRATION = 0.75
+
+# Per-rank values (ace high) and hard values (ace low), indexed by rank index
+CARD_VALUES = (11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+HARD_VALUES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+
+_RANK_INDEX = {rank: index for index, rank in enumerate(RANKS)}
+_SUIT_INDEX = {suit: index for index, suit in enumerate(SUITS)}
+
 class Card:
+    """A card encoded as one integer: rank index * 4 + suit index"""
+    
+    __slots__ = ('code',)
+    
     def __init__(self, suit, rank):
-        self.suit = suit
-        self.rank = rank
+        self.code = _RANK_INDEX[rank] * 4 + _SUIT_INDEX[suit]
+    
+    @classmethod
+    def from_code(cls, code):
+        card = object.__new__(cls)
+        card.code = code
+        return card
+    
+    @property
+    def rank(self):
+        return RANKS[self.code >> 2]
+    
+    @property
+    def suit(self):
+        return SUITS[self.code & 3]
     
     def __str__(self):
         return f"{self.rank}{self.suit}"
     
+    def __eq__(self, other):
+        return isinstance(other, Card) and other.code == self.code
+    
+    def __hash__(self):
+        return self.code
+    
     def get_value(self):
-        if self.rank == "A":
-            return 11
-        elif self.rank in ["J", "Q", "K"]:
-            return 10
-        else:
-            return int(self.rank)
+        return CARD_VALUES[self.code >> 2]
     
     def to_dict(self):
-        return {
-            'suit': self.suit,
-            'rank': self.rank,
-            'value': self.get_value()
-        }
+        return dict(_CARD_DICTS[self.code])
 
-class Deck:
-    def __init__(self):
+# The 52 distinct cards; shoes hold references to these instead of new objects
+CARDS = tuple(Card.from_code(code) for code in range(52))
+_CARD_DICTS = tuple({'suit': card.suit, 'rank': card.rank, 'value': card.get_value()} for card in CARDS)
+
+def hand_value(cards):
+    """Best total of any iterable of cards"""
+    total = 0
+    aces = 0
+    for card in cards:
+        rank = card.code >> 2
+        total += HARD_VALUES[rank]
+        aces += rank == 0
+    # Count one ace as 11 if it does not bust
+    if aces and total + 10 <= 21:
+        return total + 10
+    return total
+
+class Hand(list):
+    """List of cards with its total maintained as cards are added"""
+    
+    __slots__ = ('hard_total', 'aces')
+    
+    def __init__(self, cards=()):
+        super().__init__()
+        self.hard_total = 0
+        self.aces = 0
+        for card in cards:
+            self.append(card)
+    
+    def append(self, card):
+        super().append(card)
+        rank = card.code >> 2
+        self.hard_total += HARD_VALUES[rank]
+        self.aces += rank == 0
+    
+    @property
+    def soft(self):
+        """True when an ace is counted as 11"""
+        return self.aces > 0 and self.hard_total + 10 <= 21
+    
+    @property
+    def value(self):
+        return self.hard_total + 10 if self.soft else self.hard_total
+
+class Shoe:
+    """Reusable multi-deck shoe, reshuffled between rounds once the cut card is reached"""
+    
+    def __init__(self, decks=BLACKJACK_DECKS, penetration=BLACKJACK_PENETRATION, rng=None):
+        self.decks = decks
+        self.cut_card = int(len(CARDS) * decks * (1 - penetration))
+        self.rng = rng  # Injected for simulations; otherwise every shuffle derives its own generator
+        self.nonce = None  # Nonce of the current shuffle, to reproduce it
+        self.shuffles = 0
+        self._lock = threading.Lock()
         self.cards = []
         self.build()
     
     def build(self):
-        self.cards = [Card(suit, rank) for suit in SUITS for rank in RANKS]
-        random.shuffle(self.cards)
+        self.cards = list(CARDS) * self.decks
+        rng = self.rng
+        if rng is None:
+            self.nonce = new_nonce()
+            rng = derive_rng(self.nonce, 'blackjack_shoe')
+        rng.shuffle(self.cards)
+        self.shuffles += 1
+    
+    @property
+    def needs_shuffle(self):
+        return len(self.cards) <= self.cut_card
+    
+    def start_round(self):
+        """Reshuffle if the cut card came out during the last round"""
+        with self._lock:
+            if self.needs_shuffle:
+                self.build()
     
     def draw(self):
-        if not self.cards:
-            self.build()
-        return self.cards.pop()
+        with self._lock:
+            if not self.cards:
+                self.build()
+            return self.cards.pop()
+
+class Deck(Shoe):
+    """Single 52-card deck, rebuilt only when empty"""
+    
+    def __init__(self):
+        super().__init__(decks=1, penetration=1.0)
+
+# Shoe shared by all webapp blackjack games
+blackjack_shoe = Shoe()
 
 class BlackjackGame:
-    def __init__(self, user_id, bet_amount):
+    def __init__(self, user_id, bet_amount, shoe=None):
         self.user_id = user_id
         self.bet_amount = bet_amount
-        self.deck = Deck()
-        self.player_hand = []
-        self.dealer_hand = []
+        self.deck = shoe or blackjack_shoe
+        self.player_hand = Hand()
+        self.dealer_hand = Hand()
         self.game_over = False
         self.result = None
         
         # Deal initial cards
+        self.deck.start_round()
         self.player_hand.append(self.deck.draw())
         self.dealer_hand.append(self.deck.draw())
         self.player_hand.append(self.deck.draw())
@@ -66,22 +171,9 @@ class BlackjackGame:
             self.game_over = True
     
     def get_hand_value(self, hand):
-        value = 0
-        aces = 0
-        
-        for card in hand:
-            if card.rank == "A":
-                aces += 1
-                value += 11
-            else:
-                value += card.get_value()
-        
-        # Adjust for aces
-        while value > 21 and aces > 0:
-            value -= 10
-            aces -= 1
-        
-        return value
+        if isinstance(hand, Hand):
+            return hand.value
+        return hand_value(hand)
     
     def hit(self):
         if self.game_over:
@@ -4,6 +4,7 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction, record_game
 from src.utils.formatting import format_money
+from src.games.engines import ScoredDiceEngine, register_engine
 
 # Active bowling competitions
 active_bowling_games = {}
@@ -18,6 +19,8 @@ BOWLING_SCORING = {
     6: {"name": "Strike!", "multiplier": 10, "emoji": "🎳"}
 }
 
+bowling_engine = register_engine(ScoredDiceEngine('telegram_bowling', BOWLING_SCORING))
+
 async def bowling_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /bowling command"""
     # Handle both direct commands and callback queries
@@ -167,8 +170,9 @@ async def execute_solo_bowling_game(query, bet_amount: float):
     
     # Get result (1-6)
     result = bowling_message.dice.value
-    scoring = BOWLING_SCORING[result]
-    winnings = bet_amount * scoring['multiplier']
+    outcome = bowling_engine.play(bet_amount, {'value': result})
+    scoring = outcome['scoring']
+    winnings = outcome['winnings']
     
     # Record game
     game_id = await record_game(
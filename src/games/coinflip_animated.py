@@ -4,10 +4,14 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction, record_game
 from src.utils.formatting import format_money
+from src.games.engines import GuessDiceEngine, register_engine
 
 # Active coinflip games for multiplayer
 active_coinflip_games = {}
 
+# 1 = heads, anything else = tails for the coin emoji
+coinflip_engine = register_engine(GuessDiceEngine('telegram_coinflip', 2, {1: 'heads'}, default='tails'))
+
 async def coinflip_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the coinflip command - Telegram animated coin game"""
     # Handle both direct commands and callback queries
@@ -168,11 +172,10 @@ async def handle_coinflip_bet(query, choice, bet_amount):
     
     # Get the result (1 = heads, 0 = tails for coin emoji)
     coin_result = coin_message.dice.value
-    result = "heads" if coin_result == 1 else "tails"
-    won = choice == result
-    
-    # Calculate winnings
-    winnings = bet_amount * 2 if won else 0
+    outcome = coinflip_engine.play(bet_amount, {'value': coin_result, 'guess': choice})
+    result = outcome['result']
+    won = outcome['outcome'] == 'win'
+    winnings = outcome['winnings']
     
     # Record game result
     game_id = await record_game(
@@ -1,6 +1,6 @@
-import random
 import time
 import math
+from src.games.provably_fair import next_crash_round
 from src.database import get_user, update_user_balance, record_transaction, record_game
 
 # Store active crash games for webapp
@@ -21,15 +21,17 @@ class CrashGame:
         self.winnings = 0
     
     def generate_crash_point(self):
-        """Generate a random crash point with house edge"""
-        # House edge of approximately 5%
-        r = random.random()
-        if r < 0.01:  # 1% chance for a very early crash (below 1.1x)
-            return random.uniform(1.0, 1.1)
-        elif r < 0.05:  # 4% chance for an early crash (1.1x to 1.5x)
-            return random.uniform(1.1, 1.5)
-        else:  # 95% chance for a normal distribution
-            return 0.9 / (random.random() ** 0.7)
+        """Take the next round of the provably fair crash hash chain"""
+        # House edge of approximately 5%, see provably_fair.crash_point_from_floats
+        self.chain_hash, self.round_id, self.round_hash, crash_point = next_crash_round()
+        return crash_point
+    
+    def get_fairness(self):
+        """Chain commitment, plus the round hash once the round is over"""
+        fairness = {'round_id': self.round_id, 'terminal_hash': self.chain_hash}
+        if self.game_over:
+            fairness['round_hash'] = self.round_hash
+        return fairness
     
     def start_game(self, bet_amount):
         """Start a new crash game"""
@@ -1,12 +1,11 @@
-import random
 import asyncio
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction, record_game
 from src.utils.formatting import format_money
-
-# Active darts competitions
-active_darts_games = {}
+from src.games.engines import ScoredDiceEngine, register_engine
+from src.utils.error_handler import GameError, InsufficientFundsError
+from src.games.lobbies import lobby_manager, roll_for_players, collect_entry_fees, pay_prizes, finish_lobby, LOBBY_CANCELLED
 
 # Darts scoring system (Telegram darts returns 1-6)
 DARTS_SCORING = {
@@ -18,6 +17,8 @@ DARTS_SCORING = {
     6: {"name": "Bullseye", "multiplier": 10, "emoji": "🎯"}
 }
 
+darts_engine = register_engine(ScoredDiceEngine('telegram_darts', DARTS_SCORING))
+
 async def darts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /darts command"""
     # Handle both direct commands and callback queries
@@ -110,7 +111,7 @@ async def darts_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             parse_mode='Markdown'
         )
     
-    elif action == "challenge":
+    elif action == "challenge" and len(data) == 2:
         # Show challenge options
         keyboard = [
             [
@@ -145,6 +146,14 @@ async def darts_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         bet_amount = float(data[3])
         await create_darts_challenge(query, bet_amount)
     
+    elif action == "accept":
+        # Accept a darts challenge and throw
+        await accept_darts_challenge(query, data[2])
+    
+    elif action == "cancel":
+        # Cancel an open darts challenge
+        await cancel_darts_challenge(query, data[2])
+    
     elif action == "scoring":
         # Show scoring system
         scoring_text = (
@@ -196,8 +205,9 @@ async def execute_solo_darts_game(query, bet_amount: float):
     
     # Get result (1-6)
     result = darts_message.dice.value
-    scoring = DARTS_SCORING[result]
-    winnings = bet_amount * scoring['multiplier']
+    outcome = darts_engine.play(bet_amount, {'value': result})
+    scoring = outcome['scoring']
+    winnings = outcome['winnings']
     
     # Record game
     game_id = await record_game(
@@ -261,20 +271,13 @@ async def create_darts_challenge(query, bet_amount: float):
         )
         return
     
-    game_id = f"darts_{query.message.chat.id}_{random.randint(1000, 9999)}"
-    
     # Create new challenge
-    active_darts_games[game_id] = {
-        'creator': query.from_user.id,
-        'creator_name': query.from_user.first_name,
-        'bet_amount': bet_amount,
-        'challenger': None,
-        'challenger_name': None,
-        'creator_score': None,
-        'challenger_score': None,
-        'status': 'waiting',
-        'chat_id': query.message.chat.id
-    }
+    lobby = lobby_manager.create(
+        "darts", query.from_user.id, query.from_user.first_name, bet_amount,
+        chat_id=query.message.chat.id, capacity=2
+    )
+    lobby.message = query.message
+    game_id = lobby.lobby_id
     
     keyboard = [
         [
@@ -300,5 +303,76 @@ async def create_darts_challenge(query, bet_amount: float):
         parse_mode='Markdown'
     )
 
+async def accept_darts_challenge(query, game_id: str):
+    """Accept a darts challenge: both players throw, best throw takes the pot"""
+    lobby = lobby_manager.get(game_id)
+    if lobby is None:
+        await query.edit_message_text("❌ Challenge not found or already finished!")
+        return
+    
+    user = await get_user(query.from_user.id)
+    if user["balance"] < lobby.entry_fee:
+        await query.answer(f"Insufficient funds! Need {format_money(lobby.entry_fee)}")
+        return
+    
+    try:
+        lobby.join(query.from_user.id, query.from_user.first_name)
+        lobby.start()
+    except GameError as e:
+        await query.answer(str(e))
+        return
+    
+    try:
+        try:
+            await collect_entry_fees(lobby)
+        except InsufficientFundsError:
+            await query.edit_message_text("❌ Challenge cancelled! A player has insufficient funds.")
+            return
+        
+        await query.edit_message_text(
+            f"⚔️ **DARTS CHALLENGE**\n\n"
+            f"🎯 " + " vs ".join(lobby.players.values()) + "\n"
+            f"💰 Pot: {format_money(lobby.pot)}\n\n"
+            f"🎯 Throwing darts...",
+            parse_mode='Markdown'
+        )
+        
+        standings = await roll_for_players(lobby, query.message, "🎯", delay=3)
+        prizes = lobby.winner_takes_all()
+        await pay_prizes(lobby, prizes)
+        
+        result_text = "⚔️ **DARTS CHALLENGE RESULT**\n\n"
+        for player_id, score in standings:
+            scoring = DARTS_SCORING[int(score)]
+            result_text += f"{scoring['emoji']} {lobby.players[player_id]}: **{scoring['name']}**\n"
+        
+        winners = lobby.leaders()
+        if len(winners) > 1:
+            result_text += "\n🤝 **It's a tie!** Bets returned."
+        else:
+            result_text += f"\n🏆 **{lobby.players[winners[0]]}** wins {format_money(lobby.pot)}!"
+        
+        keyboard = [[
+            InlineKeyboardButton("⚔️ New Challenge", callback_data="darts_challenge"),
+            InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+        ]]
+        await query.message.reply_text(result_text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='Markdown')
+    finally:
+        await finish_lobby(lobby)
+
+async def cancel_darts_challenge(query, game_id: str):
+    """Cancel an open darts challenge"""
+    lobby = lobby_manager.get(game_id)
+    if lobby is None:
+        await query.edit_message_text("❌ Challenge not found!")
+        return
+    
+    if query.from_user.id != lobby.host_id:
+        await query.answer("Only the challenger can cancel!")
+        return
+    
+    lobby_manager.close(game_id, LOBBY_CANCELLED)
+    await query.edit_message_text("❌ Challenge cancelled.")
+
 # Export the callback handler
 darts_callback_handler = darts_callback
\ No newline at end of file
@@ -4,9 +4,18 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction, record_game
 from src.utils.formatting import format_money
+from src.games.engines import GuessDiceEngine, register_engine
+from src.utils.error_handler import GameError, InsufficientFundsError
+from src.games.lobbies import lobby_manager, roll_for_players, collect_entry_fees, pay_prizes, finish_lobby, LOBBY_CANCELLED
 
-# Active dice games for multiplayer
-active_dice_games = {}
+# Players per multiplayer dice game and per duel
+DICE_MAX_PLAYERS = 10
+DICE_DUEL_PLAYERS = 2
+
+# Guessing the face pays 5x from the dice menu and 6x from the games menu
+DICE_FACES = {face: face for face in range(1, 7)}
+dice_engine = register_engine(GuessDiceEngine('telegram_dice', 5, DICE_FACES))
+dice_menu_engine = register_engine(GuessDiceEngine('telegram_dice_menu', 6, DICE_FACES))
 
 async def dice_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /dice command - Telegram animated dice game"""
@@ -149,6 +158,18 @@ async def dice_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             parse_mode='Markdown'
         )
 
+    elif action in ("mp", "duel") and len(data) == 4:
+        # Multiplayer games and duels: create, join, start, cancel
+        mode, step, value = action, data[2], data[3]
+        if step == "create":
+            await create_dice_lobby(query, mode, float(value))
+        elif step == "join":
+            await join_dice_lobby(query, value)
+        elif step == "start":
+            await start_dice_lobby(query, value)
+        elif step == "cancel":
+            await cancel_dice_lobby(query, value)
+
     elif action == "duel":
         # Show duel options
         keyboard = [
@@ -234,10 +255,9 @@ async def execute_solo_dice_game(query, choice: int, bet_amount: float):
 
     # Get the dice result from Telegram's animation
     result = dice_message.dice.value
-    won = choice == result
-
-    # Calculate winnings (5x for correct guess)
-    winnings = bet_amount * 5 if won else 0
+    outcome = dice_engine.play(bet_amount, {'value': result, 'guess': choice})
+    won = outcome['outcome'] == 'win'
+    winnings = outcome['winnings']
 
     # Record game result
     game_id = await record_game(
@@ -320,10 +340,9 @@ async def handle_dice_bet(query, number: int, bet_amount: float):
 
     # Get dice result
     dice_result = dice_message.dice.value
-    won = dice_result == number
-
-    # Calculate winnings
-    winnings = bet_amount * 6 if won else 0
+    outcome = dice_menu_engine.play(bet_amount, {'value': dice_result, 'guess': number})
+    won = outcome['outcome'] == 'win'
+    winnings = outcome['winnings']
 
     if won:
         await update_user_balance(user_id, winnings)
@@ -376,5 +395,129 @@ async def handle_dice_bet(query, number: int, bet_amount: float):
 
     await query.message.reply_text(result_text, reply_markup=reply_markup, parse_mode='Markdown')
 
+def dice_lobby_text(lobby) -> str:
+    title = "⚔️ **DICE DUEL**" if lobby.capacity == DICE_DUEL_PLAYERS else "👥 **MULTIPLAYER DICE**"
+    return (
+        f"{title}\n\n"
+        f"💰 Entry Fee: {format_money(lobby.entry_fee)}\n"
+        f"🏆 Pot: {format_money(lobby.pot)}\n"
+        f"👥 Players: {len(lobby.players)}/{lobby.capacity}\n" +
+        "\n".join(f"• {name}" for name in lobby.players.values()) +
+        "\n\nEveryone rolls once, highest number wins the pot!"
+    )
+
+def dice_lobby_keyboard(lobby) -> InlineKeyboardMarkup:
+    mode = "duel" if lobby.capacity == DICE_DUEL_PLAYERS else "mp"
+    join_label = "⚔️ Accept Duel" if mode == "duel" else "🎲 Join Game"
+    buttons = [InlineKeyboardButton(join_label, callback_data=f"dice_{mode}_join_{lobby.lobby_id}")]
+    if mode == "mp":
+        buttons.append(InlineKeyboardButton("🎲 Roll!", callback_data=f"dice_mp_start_{lobby.lobby_id}"))
+    return InlineKeyboardMarkup([
+        buttons,
+        [InlineKeyboardButton("❌ Cancel", callback_data=f"dice_{mode}_cancel_{lobby.lobby_id}")]
+    ])
+
+async def create_dice_lobby(query, mode: str, bet_amount: float):
+    """Open a multiplayer dice game or duel"""
+    user = await get_user(query.from_user.id)
+    if user["balance"] < bet_amount:
+        await query.edit_message_text(
+            f"❌ Insufficient funds!\n"
+            f"Balance: {format_money(user['balance'])}\n"
+            f"Required: {format_money(bet_amount)}"
+        )
+        return
+    
+    capacity = DICE_DUEL_PLAYERS if mode == "duel" else DICE_MAX_PLAYERS
+    lobby = lobby_manager.create(
+        "dice", query.from_user.id, query.from_user.first_name, bet_amount,
+        chat_id=query.message.chat.id, capacity=capacity
+    )
+    lobby.message = query.message
+    await query.edit_message_text(dice_lobby_text(lobby), reply_markup=dice_lobby_keyboard(lobby), parse_mode='Markdown')
+
+async def join_dice_lobby(query, lobby_id: str):
+    """Join a dice game; a duel starts as soon as it is accepted"""
+    lobby = lobby_manager.get(lobby_id)
+    if lobby is None:
+        await query.edit_message_text("❌ Game not found or already finished!")
+        return
+    
+    user = await get_user(query.from_user.id)
+    if user["balance"] < lobby.entry_fee:
+        await query.answer(f"Insufficient funds! Need {format_money(lobby.entry_fee)}")
+        return
+    
+    try:
+        lobby.join(query.from_user.id, query.from_user.first_name)
+    except GameError as e:
+        await query.answer(str(e))
+        return
+    
+    if lobby.capacity == DICE_DUEL_PLAYERS:
+        await play_dice_lobby(query, lobby)
+    else:
+        await query.edit_message_text(dice_lobby_text(lobby), reply_markup=dice_lobby_keyboard(lobby), parse_mode='Markdown')
+
+async def start_dice_lobby(query, lobby_id: str):
+    """Host starts the multiplayer dice game"""
+    lobby = lobby_manager.get(lobby_id)
+    if lobby is None:
+        await query.edit_message_text("❌ Game not found!")
+        return
+    
+    if query.from_user.id != lobby.host_id:
+        await query.answer("Only the host can start the game!")
+        return
+    
+    await play_dice_lobby(query, lobby)
+
+async def cancel_dice_lobby(query, lobby_id: str):
+    """Host cancels a dice game before it starts"""
+    lobby = lobby_manager.get(lobby_id)
+    if lobby is None:
+        await query.edit_message_text("❌ Game not found!")
+        return
+    
+    if query.from_user.id != lobby.host_id:
+        await query.answer("Only the host can cancel the game!")
+        return
+    
+    lobby_manager.close(lobby_id, LOBBY_CANCELLED)
+    await query.edit_message_text("❌ Game cancelled. No entry fees were taken.")
+
+async def play_dice_lobby(query, lobby):
+    """Everyone rolls once; the highest roll takes the pot, ties split it"""
+    try:
+        lobby.start()
+    except GameError as e:
+        await query.answer(str(e))
+        return
+    
+    try:
+        try:
+            await collect_entry_fees(lobby)
+        except InsufficientFundsError as e:
+            await query.edit_message_text(f"❌ Game cancelled!\n{e}")
+            return
+        
+        await query.edit_message_text(f"🎲 **ROLLING!**\n\n💰 Pot: {format_money(lobby.pot)}", parse_mode='Markdown')
+        standings = await roll_for_players(lobby, query.message, "🎲")
+        prizes = lobby.winner_takes_all()
+        await pay_prizes(lobby, prizes)
+        
+        result_text = "🎲 **DICE RESULTS**\n\n"
+        for player_id, score in standings:
+            prize = prizes[player_id]
+            result_text += f"🎲 {lobby.players[player_id]}: **{int(score)}**" + (f" 🏆 +{format_money(prize)}" if prize else "") + "\n"
+        
+        keyboard = [[
+            InlineKeyboardButton("🎲 New Game", callback_data="dice_multiplayer"),
+            InlineKeyboardButton("🏠 Main Menu", callback_data="menu_main")
+        ]]
+        await query.message.reply_text(result_text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='Markdown')
+    finally:
+        await finish_lobby(lobby)
+
 # Export the callback handler
 dice_callback_handler = dice_callback
@@ -0,0 +1,680 @@
+"""
+Table-driven game engine registry
+
+Each quick-play game is a GameEngine with immutable payout tables and
+cumulative weight arrays built once at import, plus its own RNG instance.
+Callers dispatch with a single dictionary lookup through get_engine()
+instead of walking an if/elif chain that rebuilds its tables per call.
+"""
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.games.payout_tables import (
+    COINFLIP_SIDES, COINFLIP_MULTIPLIER,
+    INSTANT_CRASH_MIN, INSTANT_CRASH_MAX,
+    DICE_SIDES, DICE_RTP,
+    PLINKO_QUICK_ROWS, plinko_multipliers,
+    ROULETTE_NUMBERS, ROULETTE_STRAIGHT_MULTIPLIER, ROULETTE_EVEN_MONEY_MULTIPLIER, roulette_color,
+    SLOT_SYMBOLS, SLOT_WEIGHTS, SLOT_TRIPLE_MULTIPLIERS, SLOT_PAIR_MULTIPLIER,
+    WHEEL_SEGMENTS, WHEEL_MULTIPLIERS, WHEEL_WEIGHTS,
+    MINES_GRID_SIZE, mines_ladder,
+    TOWER_QUICK_TILES, TOWER_QUICK_SAFE_TILES, TOWER_QUICK_LEVELS, TOWER_QUICK_MULTIPLIERS,
+    BLACKJACK_PAYOUT
+)
+from src.games.provably_fair import plinko_bucket, plinko_path
+from src.games.rng import derive_rng, new_nonce
+
+# Seconds an untouched mines round or tower climb is kept before it is forfeited
+QUICK_ROUND_TIMEOUT = float(os.getenv("QUICK_ROUND_TIMEOUT", 900))
+
+
+class WeightedTable:
+    """Immutable weighted outcomes sampled in O(log n) with a cumulative array"""
+
+    __slots__ = ('outcomes', 'cumulative', 'total')
+
+    def __init__(self, outcomes: Sequence[Any], weights: Sequence[float]):
+        if len(outcomes) != len(weights):
+            raise ValueError("outcomes and weights must have the same length")
+        self.outcomes = tuple(outcomes)
+        self.cumulative = tuple(accumulate(weights))
+        self.total = self.cumulative[-1]
+
+    def sample_index(self, rng: random.Random) -> int:
+        return bisect_right(self.cumulative, rng.random() * self.total)
+
+    def sample(self, rng: random.Random) -> Any:
+        return self.outcomes[self.sample_index(rng)]
+
+
+class GameEngine:
+    """Base class for a registered game engine"""
+
+    game_type: str = None
+    # Whether the webapp may play it; engines scoring values rolled elsewhere must not take them from clients
+    quick_play: bool = True
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    def stake(self, bet_amount: float, game_data: Dict[str, Any]) -> float:
+        """Amount to charge before play; raises ValueError for input that must not be charged"""
+        if bet_amount <= 0:
+            raise ValueError("Bet amount must be positive")
+        return bet_amount
+
+    def expire(self, now: Optional[float] = None) -> List[Tuple[Any, Dict[str, Any]]]:
+        """Rounds forfeited since the last call; single-shot games keep none"""
+        return []
+
+    def play(self, bet_amount: float, game_data: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class RoundEngine(GameEngine):
+    """Multi-step rounds kept on the server, one per user
+
+    The call that opens a round is charged its stake, which the round keeps
+    and pays out of; later moves are free. Rounds untouched for `timeout`
+    seconds sit in an expiry heap and are forfeited by expire().
+    """
+
+    opening_actions: Tuple[str, ...] = ()
+    default_action: str = None
+
+    def __init__(self, seed: Optional[int] = None, timeout: float = QUICK_ROUND_TIMEOUT):
+        super().__init__(seed)
+        self.timeout = timeout
+        self.rounds: Dict[Any, Dict[str, Any]] = {}
+        self._expiry: List[Tuple[float, int, Any, Dict[str, Any]]] = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    def check(self, game_data: Dict[str, Any]):
+        """Validate a move's input; raises ValueError"""
+
+    def _user(self, game_data: Dict[str, Any]):
+        user_id = game_data.get('user_id')
+        if user_id is None:
+            raise ValueError(f"{self.game_type.capitalize()} rounds need a user")
+        return user_id
+
+    def _action(self, game_data: Dict[str, Any]) -> str:
+        return game_data.get('action', self.default_action)
+
+    def stake(self, bet_amount, game_data):
+        user_id = self._user(game_data)
+        self.check(game_data)
+        action = self._action(game_data)
+        with self._lock:
+            opens = self.rounds.get(user_id) is None
+        if opens and action not in self.opening_actions:
+            raise ValueError(f"No {self.game_type} round in progress")
+        if not opens and action == 'start':
+            raise ValueError(f"A {self.game_type} round is already in progress")
+        return super().stake(bet_amount, game_data) if opens else 0.0
+
+    def _current(self, user_id, bet_amount: float, action: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """The user's open round, or None when this charged call may open one; call under the lock"""
+        current = self.rounds.get(user_id)
+        if current is None:
+            if bet_amount <= 0 or action not in self.opening_actions:
+                raise ValueError(f"No {self.game_type} round in progress")
+            return None
+        if bet_amount > 0 or action == 'start':
+            raise ValueError(f"A {self.game_type} round is already in progress")
+        current['expires_at'] = (time.monotonic() if now is None else now) + self.timeout
+        return current
+
+    def _open(self, user_id, current: Dict[str, Any], now: Optional[float] = None) -> Dict[str, Any]:
+        current['expires_at'] = (time.monotonic() if now is None else now) + self.timeout
+        self.rounds[user_id] = current
+        heapq.heappush(self._expiry, (current['expires_at'], next(self._order), user_id, current))
+        return current
+
+    def expire(self, now=None):
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self._lock:
+            while self._expiry and self._expiry[0][0] <= now:
+                _, _, user_id, current = heapq.heappop(self._expiry)
+                # Finished rounds are already gone; rounds played since were pushed back
+                if self.rounds.get(user_id) is not current:
+                    continue
+                if current['expires_at'] > now:
+                    heapq.heappush(self._expiry, (current['expires_at'], next(self._order), user_id, current))
+                    continue
+                del self.rounds[user_id]
+                expired.append((user_id, current))
+        return expired
+
+
+class CoinflipEngine(GameEngine):
+    game_type = 'coinflip'
+
+    def play(self, bet_amount, game_data):
+        user_choice = game_data.get('choice', 'heads')  # heads or tails
+        result = COINFLIP_SIDES[self.rng.getrandbits(1)]
+
+        if user_choice == result:
+            return {
+                'outcome': 'win',
+                'winnings': bet_amount * COINFLIP_MULTIPLIER,
+                'result': result,
+                'user_choice': user_choice,
+                'multiplier': COINFLIP_MULTIPLIER,
+                'message': f'You chose {user_choice} and it landed on {result}! You won!'
+            }
+        return {
+            'outcome': 'loss',
+            'winnings': 0,
+            'result': result,
+            'user_choice': user_choice,
+            'message': f'You chose {user_choice} but it landed on {result}. Better luck next time!'
+        }
+
+
+class InstantCrashEngine(GameEngine):
+    game_type = 'crash'
+
+    def play(self, bet_amount, game_data):
+        crash_point = round(self.rng.uniform(INSTANT_CRASH_MIN, INSTANT_CRASH_MAX), 2)
+        cash_out_at = game_data.get('cash_out_at', 2.0)
+
+        if cash_out_at <= crash_point:
+            return {
+                'outcome': 'win',
+                'winnings': bet_amount * cash_out_at,
+                'crash_point': crash_point,
+                'cash_out_at': cash_out_at,
+                'multiplier': cash_out_at,
+                'message': f'Cashed out at {cash_out_at}x! Crash was at {crash_point}x'
+            }
+        return {
+            'outcome': 'loss',
+            'winnings': 0,
+            'crash_point': crash_point,
+            'cash_out_at': cash_out_at,
+            'message': f'Crashed at {crash_point}x before your cash out at {cash_out_at}x!'
+        }
+
+
+class DiceEngine(GameEngine):
+    game_type = 'dice'
+
+    def play(self, bet_amount, game_data):
+        target = game_data.get('target', 50)  # Target number (1-100)
+        over_under = game_data.get('over_under', 'over')  # 'over' or 'under'
+
+        roll = self.rng.randint(1, DICE_SIDES)
+
+        if over_under == 'over':
+            won = roll > target
+            probability = (DICE_SIDES - target) / DICE_SIDES
+        else:
+            won = over_under == 'under' and roll < target
+            probability = target / DICE_SIDES
+
+        if won:
+            multiplier = DICE_RTP / probability  # 95% RTP
+            return {
+                'outcome': 'win',
+                'winnings': bet_amount * multiplier,
+                'roll': roll,
+                'target': target,
+                'over_under': over_under,
+                'multiplier': multiplier,
+                'message': f'Rolled {roll}! You won with {over_under} {target}!'
+            }
+        return {
+            'outcome': 'loss',
+            'winnings': 0,
+            'roll': roll,
+            'target': target,
+            'over_under': over_under,
+            'message': f'Rolled {roll}. You needed {over_under} {target}.'
+        }
+
+
+class PlinkoEngine(GameEngine):
+    game_type = 'plinko'
+
+    def play(self, bet_amount, game_data):
+        risk_level = game_data.get('risk', 'medium')  # low, medium, high
+        rows = int(game_data.get('rows', PLINKO_QUICK_ROWS))
+        multipliers = plinko_multipliers(rows, risk_level)
+
+        # One random bit per peg row; the bucket is the number of right bounces
+        bits = self.rng.getrandbits(rows)
+        bucket = plinko_bucket(bits)
+        multiplier = multipliers[bucket]
+
+        result = {
+            'outcome': 'win' if multiplier > 1.0 else 'loss',
+            'winnings': bet_amount * multiplier,
+            'bucket': bucket,
+            'multiplier': multiplier,
+            'risk_level': risk_level,
+            'message': f'Ball landed in bucket {bucket + 1} with {multiplier}x multiplier!'
+        }
+        if game_data.get('include_path'):
+            result['ball_path'] = plinko_path(bits, rows)
+        return result
+
+
+class MinesEngine(RoundEngine):
+    """Mines rounds; clients only name the tile to reveal"""
+
+    game_type = 'mines'
+    opening_actions = ('start', 'reveal')
+    default_action = 'reveal'
+
+    GRID = tuple(range(MINES_GRID_SIZE))
+
+    def mine_positions(self, seed: int, mines_count: int) -> list:
+        """Mine layout for a session seed, from that session's own generator"""
+        return derive_rng(seed, 'mines').sample(self.GRID, mines_count)
+
+    def check(self, game_data):
+        action = self._action(game_data)
+        if action not in ('start', 'reveal', 'cashout'):
+            raise ValueError(f"Unknown mines action: {action}")
+        if action != 'cashout':
+            mines_ladder(MINES_GRID_SIZE, self._mines_count(game_data))
+        if action == 'reveal':
+            position = game_data.get('position')
+            if not isinstance(position, int) or not 0 <= position < MINES_GRID_SIZE:
+                raise ValueError(f"Tile must be 0-{MINES_GRID_SIZE - 1}")
+
+    @staticmethod
+    def _mines_count(game_data) -> int:
+        return int(game_data.get('mines', game_data.get('mines_count', 3)))
+
+    def play(self, bet_amount, game_data):
+        user_id = self._user(game_data)
+        self.check(game_data)
+        action = self._action(game_data)  # 'start', 'reveal' or 'cashout'
+
+        with self._lock:
+            current = self._current(user_id, bet_amount, action)
+            if current is None:
+                mines_count = self._mines_count(game_data)
+                seed = new_nonce()
+                current = self._open(user_id, {
+                    'seed': seed,
+                    'stake': bet_amount,
+                    'ladder': mines_ladder(MINES_GRID_SIZE, mines_count),
+                    'mine_positions': self.mine_positions(seed, mines_count),
+                    'revealed': set()
+                })
+                if action == 'start':
+                    return {
+                        'outcome': 'continue',
+                        'winnings': 0,
+                        'gems_found': 0,
+                        'multiplier': current['ladder'][0],
+                        'hit_mine': False,
+                        'seed': seed,
+                        'message': 'Round started! Pick a tile.'
+                    }
+
+            if action == 'cashout':
+                del self.rounds[user_id]
+                # Revealed tiles are unique safe tiles, so the count never passes the ladder
+                gems_found = len(current['revealed'])
+                multiplier = current['ladder'][gems_found]
+                return {
+                    'outcome': 'win',
+                    'winnings': current['stake'] * multiplier,
+                    'stake': current['stake'],
+                    'gems_found': gems_found,
+                    'multiplier': multiplier,
+                    'mine_positions': current['mine_positions'],
+                    'message': f'Cashed out with {gems_found} gems! Multiplier: {multiplier:.2f}x'
+                }
+
+            position = game_data['position']
+            if position in current['revealed']:
+                raise ValueError(f"Tile {position} is already revealed")
+
+            if position in current['mine_positions']:
+                del self.rounds[user_id]
+                return {
+                    'outcome': 'loss',
+                    'winnings': 0,
+                    'stake': current['stake'],
+                    'mine_positions': current['mine_positions'],
+                    'hit_mine': True,
+                    'position': position,
+                    'message': 'Hit a mine! Game over.'
+                }
+
+            current['revealed'].add(position)
+            gems_found = len(current['revealed'])
+            multiplier = current['ladder'][gems_found]
+            return {
+                'outcome': 'continue',
+                'winnings': 0,
+                'position': position,
+                'gems_found': gems_found,
+                'multiplier': multiplier,
+                'hit_mine': False,
+                'seed': current['seed'],
+                'message': f'Found a gem! Current multiplier: {multiplier:.2f}x'
+            }
+
+
+class RouletteEngine(GameEngine):
+    game_type = 'roulette'
+
+    COLORS = tuple(roulette_color(number) for number in range(ROULETTE_NUMBERS))
+
+    def play(self, bet_amount, game_data):
+        bet_type = game_data.get('bet_type', 'number')  # number, color, odd_even
+        bet_value = game_data.get('bet_value')
+
+        winning_number = self.rng.randrange(ROULETTE_NUMBERS)
+        winning_color = self.COLORS[winning_number]
+
+        multiplier = 0
+        if bet_type == 'number' and bet_value == winning_number:
+            multiplier = ROULETTE_STRAIGHT_MULTIPLIER  # 36:1 payout for single number
+        elif bet_type == 'color' and bet_value == winning_color:
+            multiplier = ROULETTE_EVEN_MONEY_MULTIPLIER  # 2:1 payout for color
+        elif bet_type == 'odd_even' and winning_number != 0:
+            if (bet_value == 'odd' and winning_number % 2 == 1) or (bet_value == 'even' and winning_number % 2 == 0):
+                multiplier = ROULETTE_EVEN_MONEY_MULTIPLIER
+
+        won = multiplier > 0
+        return {
+            'outcome': 'win' if won else 'loss',
+            'winnings': bet_amount * multiplier if won else 0,
+            'winning_number': winning_number,
+            'winning_color': winning_color,
+            'bet_type': bet_type,
+            'bet_value': bet_value,
+            'multiplier': multiplier,
+            'message': f'Ball landed on {winning_number} ({winning_color})!'
+        }
+
+
+class SlotsEngine(GameEngine):
+    game_type = 'slots'
+
+    REEL = WeightedTable(range(len(SLOT_SYMBOLS)), SLOT_WEIGHTS)
+
+    def play(self, bet_amount, game_data):
+        sample = self.REEL.sample_index
+        first, second, third = sample(self.rng), sample(self.rng), sample(self.rng)
+
+        multiplier = 0
+        if first == second == third:
+            # Three of a kind
+            multiplier = SLOT_TRIPLE_MULTIPLIERS[first]
+        elif first == second or second == third or first == third:
+            # Two of a kind
+            multiplier = SLOT_PAIR_MULTIPLIER
+
+        reels = [SLOT_SYMBOLS[first], SLOT_SYMBOLS[second], SLOT_SYMBOLS[third]]
+        return {
+            'outcome': 'win' if multiplier > 0 else 'loss',
+            'winnings': bet_amount * multiplier,
+            'reels': reels,
+            'multiplier': multiplier,
+            'message': f'Reels: {reels[0]} {reels[1]} {reels[2]}' + (f' - {multiplier}x win!' if multiplier > 0 else ' - No match')
+        }
+
+
+class BlackjackQuickEngine(GameEngine):
+    game_type = 'blackjack'
+
+    def play(self, bet_amount, game_data):
+        action = game_data.get('action', 'deal')
+        if action != 'deal':
+            return None
+
+        player_cards = [self.rng.randint(1, 11), self.rng.randint(1, 11)]
+        dealer_cards = [self.rng.randint(1, 11)]
+        player_total = sum(player_cards)
+
+        # Handle aces
+        if player_total > 21 and 11 in player_cards:
+            player_cards[player_cards.index(11)] = 1
+            player_total = sum(player_cards)
+
+        if player_total == 21:
+            return {
+                'outcome': 'win',
+                'winnings': bet_amount * BLACKJACK_PAYOUT,
+                'player_cards': player_cards,
+                'dealer_cards': dealer_cards,
+                'player_total': player_total,
+                'multiplier': BLACKJACK_PAYOUT,
+                'message': 'Blackjack! You won!'
+            }
+        elif player_total > 21:
+            return {
+                'outcome': 'loss',
+                'winnings': 0,
+                'player_cards': player_cards,
+                'dealer_cards': dealer_cards,
+                'player_total': player_total,
+                'message': 'Bust! You went over 21.'
+            }
+        return {
+            'outcome': 'continue',
+            'winnings': 0,
+            'player_cards': player_cards,
+            'dealer_cards': dealer_cards,
+            'player_total': player_total,
+            'message': f'Your total: {player_total}. Hit or Stand?'
+        }
+
+
+class TowerQuickEngine(RoundEngine):
+    """Tower climbs; clients only pick the tile"""
+
+    game_type = 'tower'
+    opening_actions = ('start', 'select_tile')
+    default_action = 'start'
+
+    TILES = tuple(range(TOWER_QUICK_TILES))
+
+    def check(self, game_data):
+        action = self._action(game_data)
+        if action not in self.opening_actions:
+            raise ValueError(f"Unknown tower action: {action}")
+        if action == 'select_tile':
+            tile = game_data.get('tile', 0)
+            if not isinstance(tile, int) or tile not in self.TILES:
+                raise ValueError(f"Tile must be 0-{TOWER_QUICK_TILES - 1}")
+
+    def play(self, bet_amount, game_data):
+        user_id = self._user(game_data)
+        self.check(game_data)
+        action = self._action(game_data)
+
+        with self._lock:
+            current = self._current(user_id, bet_amount, action)
+            if current is None:
+                current = self._open(user_id, {'stake': bet_amount, 'level': 0})
+                if action == 'start':
+                    return {
+                        'outcome': 'continue',
+                        'winnings': 0,
+                        'level': 0,
+                        'multiplier': TOWER_QUICK_MULTIPLIERS[0],
+                        'message': 'Climb started! Pick a tile.'
+                    }
+
+            # Each level has 2 safe tiles and 1 dangerous tile
+            safe_tiles = self.rng.sample(self.TILES, TOWER_QUICK_SAFE_TILES)
+            if game_data.get('tile', 0) not in safe_tiles:
+                del self.rounds[user_id]
+                return {
+                    'outcome': 'loss',
+                    'winnings': 0,
+                    'stake': current['stake'],
+                    'level': current['level'],
+                    'message': 'Hit a dangerous tile! Game over.'
+                }
+
+            current['level'] += 1
+            new_level = current['level']
+            if new_level >= TOWER_QUICK_LEVELS:
+                del self.rounds[user_id]
+                top_multiplier = TOWER_QUICK_MULTIPLIERS[-1]
+                return {
+                    'outcome': 'win',
+                    'winnings': current['stake'] * top_multiplier,
+                    'stake': current['stake'],
+                    'level': new_level,
+                    'multiplier': top_multiplier,
+                    'message': 'You reached the top of the tower!'
+                }
+
+        return {
+            'outcome': 'continue',
+            'winnings': 0,
+            'level': new_level,
+            'multiplier': TOWER_QUICK_MULTIPLIERS[new_level],
+            'message': f'Safe! Advanced to level {new_level + 1}'
+        }
+
+
+class WheelEngine(GameEngine):
+    game_type = 'wheel'
+
+    SEGMENTS = WeightedTable(range(len(WHEEL_SEGMENTS)), WHEEL_WEIGHTS)
+
+    def play(self, bet_amount, game_data):
+        selected_segment = game_data.get('selected_segment', 1)
+
+        # Spin the wheel (weighted towards lower multipliers)
+        index = self.SEGMENTS.sample_index(self.rng)
+        winning_segment = WHEEL_SEGMENTS[index]
+
+        if winning_segment == selected_segment:
+            multiplier = WHEEL_MULTIPLIERS[index]
+            return {
+                'outcome': 'win',
+                'winnings': bet_amount * multiplier,
+                'winning_segment': winning_segment,
+                'selected_segment': selected_segment,
+                'multiplier': multiplier,
+                'message': f'Perfect prediction! {multiplier}x multiplier!'
+            }
+        return {
+            'outcome': 'loss',
+            'winnings': 0,
+            'winning_segment': winning_segment,
+            'selected_segment': selected_segment,
+            'message': f'Wheel landed on segment {winning_segment}'
+        }
+
+
+class SegmentWheelEngine(GameEngine):
+    """Spin a wheel described by {segment_id: {'probability': p, ...}}"""
+
+    def __init__(self, game_type: str, segments: Dict[int, Dict[str, Any]], seed: Optional[int] = None):
+        super().__init__(seed)
+        self.game_type = game_type
+        self.segments = MappingProxyType(dict(segments))
+        self.table = WeightedTable(tuple(segments), [segment['probability'] for segment in segments.values()])
+
+    def spin(self) -> int:
+        """Winning segment id"""
+        return self.table.sample(self.rng)
+
+    def play(self, bet_amount, game_data):
+        selected_segment = game_data.get('selected_segment')
+        winning_segment = self.spin()
+        multiplier = self.segments[winning_segment]['multiplier'] if winning_segment == selected_segment else 0
+        return {
+            'outcome': 'win' if multiplier else 'loss',
+            'winnings': bet_amount * multiplier,
+            'winning_segment': winning_segment,
+            'selected_segment': selected_segment,
+            'multiplier': multiplier
+        }
+
+
+class ScoredDiceEngine(GameEngine):
+    """Pay a Telegram dice value from {value: {'multiplier': m, ...}}; Telegram supplies the value"""
+
+    quick_play = False
+
+    def __init__(self, game_type: str, scoring: Dict[int, Dict[str, Any]]):
+        super().__init__()
+        self.game_type = game_type
+        self.scoring = MappingProxyType(dict(scoring))
+
+    def play(self, bet_amount, game_data):
+        value = game_data['value']
+        scoring = self.scoring[value]
+        multiplier = scoring['multiplier']
+        return {
+            'outcome': 'win' if multiplier > 0 else 'loss',
+            'winnings': bet_amount * multiplier,
+            'value': value,
+            'multiplier': multiplier,
+            'scoring': scoring
+        }
+
+
+class GuessDiceEngine(GameEngine):
+    """Pay a fixed multiple when the guess matches the result of a Telegram dice value"""
+
+    quick_play = False
+
+    def __init__(self, game_type: str, multiplier: float, results: Dict[int, Any], default: Any = None):
+        super().__init__()
+        self.game_type = game_type
+        self.multiplier = multiplier
+        self.results = MappingProxyType(dict(results))
+        self.default = default
+
+    def play(self, bet_amount, game_data):
+        result = self.results.get(game_data['value'], self.default)
+        won = game_data.get('guess') == result
+        return {
+            'outcome': 'win' if won else 'loss',
+            'winnings': bet_amount * self.multiplier if won else 0,
+            'result': result,
+            'guess': game_data.get('guess'),
+            'multiplier': self.multiplier if won else 0
+        }
+
+
+# Registry: game_type -> engine
+_engines: Dict[str, GameEngine] = {}
+GAME_ENGINES = MappingProxyType(_engines)
+
+def register_engine(engine: GameEngine, *aliases: str) -> GameEngine:
+    """Register an engine under its game type and any aliases"""
+    for name in (engine.game_type,) + aliases:
+        _engines[name] = engine
+    return engine
+
+def get_engine(game_type: str) -> Optional[GameEngine]:
+    """O(1) engine lookup"""
+    return _engines.get(game_type)
+
+register_engine(CoinflipEngine())
+register_engine(InstantCrashEngine())
+register_engine(DiceEngine(), 'roll')
+register_engine(PlinkoEngine())
+register_engine(MinesEngine())
+register_engine(RouletteEngine())
+register_engine(SlotsEngine())
+register_engine(BlackjackQuickEngine())
+register_engine(TowerQuickEngine())
+register_engine(WheelEngine())
@@ -4,6 +4,7 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction, record_game
 from src.utils.formatting import format_money
+from src.games.engines import ScoredDiceEngine, register_engine
 
 # Active football competitions
 active_football_games = {}
@@ -17,6 +18,8 @@ FOOTBALL_SCORING = {
     5: {"name": "Perfect Goal", "multiplier": 8, "emoji": "⚽"}
 }
 
+football_engine = register_engine(ScoredDiceEngine('telegram_football', FOOTBALL_SCORING))
+
 async def football_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /football command"""
     # Handle both direct commands and callback queries
@@ -164,8 +167,9 @@ async def execute_solo_football_game(query, bet_amount: float):
     
     # Get result (1-5)
     result = football_message.dice.value
-    scoring = FOOTBALL_SCORING[result]
-    winnings = bet_amount * scoring['multiplier']
+    outcome = football_engine.play(bet_amount, {'value': result})
+    scoring = outcome['scoring']
+    winnings = outcome['winnings']
     
     # Record game
     game_id = await record_game(
@@ -0,0 +1,241 @@
+"""
+Lookup-table five-card poker hand evaluator
+
+Cards are 32-bit integers in the Cactus Kev layout:
+
+    xxxbbbbb bbbbbbbb cdhsrrrr xxpppppp
+
+b = one bit per rank, cdhs = suit bit, r = rank index (0 = deuce),
+p = rank prime (deuce = 2 ... ace = 41).
+
+Every five-card hand maps to one of 7462 equivalence classes. Flushes are
+looked up by their OR-ed rank bits, hands of five distinct ranks through the
+same bits in a second table, and everything else (pairs and up) by the
+product of its rank primes. All tables are built once at import. The
+returned strength is comparable across categories: higher beats lower and
+equal strengths are a true tie.
+"""
+from bisect import bisect_right
+from itertools import combinations
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+SUIT_BITS = {'♣️': 0x8000, '♦️': 0x4000, '♥️': 0x2000, '♠️': 0x1000}
+
+# Number of distinct five-card hand classes
+MAX_STRENGTH = 7462
+
+# Hand categories, matching PokerGame.get_hand_rank
+HAND_NAMES = {
+    10: 'Royal Flush',
+    9: 'Straight Flush',
+    8: 'Four of a Kind',
+    7: 'Full House',
+    6: 'Flush',
+    5: 'Straight',
+    4: 'Three of a Kind',
+    3: 'Two Pair',
+    2: 'One Pair',
+    1: 'High Card'
+}
+
+
+def encode_card(rank: int, suit_bit: int) -> int:
+    """Integer card from a rank index (0-12) and a suit bit"""
+    return (1 << (16 + rank)) | suit_bit | (rank << 8) | PRIMES[rank]
+
+CARD_CODES = {
+    (rank_name, suit): encode_card(rank, suit_bit)
+    for rank, rank_name in enumerate(RANKS)
+    for suit, suit_bit in SUIT_BITS.items()
+}
+
+# The 52 card codes, e.g. for dealing simulated hands
+DECK_CODES = np.array(sorted(CARD_CODES.values()), dtype=np.int32)
+
+def card_to_int(card: dict) -> int:
+    """Integer code of a {'rank': 'A', 'suit': '♠️'} card"""
+    return CARD_CODES[(card['rank'], card['suit'])]
+
+
+def _rank_mask(ranks: Iterable[int]) -> int:
+    mask = 0
+    for rank in ranks:
+        mask |= 1 << rank
+    return mask
+
+def _prime_product(ranks: Iterable[int]) -> int:
+    product = 1
+    for rank in ranks:
+        product *= PRIMES[rank]
+    return product
+
+def _build_tables():
+    """Assign every hand class a strength, best class first"""
+    flushes = [0] * (1 << 13)
+    unique5 = [0] * (1 << 13)
+    products = {}
+    # (lowest strength of a category, category), filled in ascending order at the end
+    floors = []
+
+    ranks_desc = tuple(range(12, -1, -1))
+    straights = [_rank_mask(range(high - 4, high + 1)) for high in range(12, 3, -1)]
+    straights.append(_rank_mask((12, 0, 1, 2, 3)))  # Ace-low "wheel"
+    straight_set = set(straights)
+    plain = [mask for mask in (_rank_mask(ranks) for ranks in combinations(ranks_desc, 5)) if mask not in straight_set]
+
+    strength = MAX_STRENGTH
+
+    def assign(table, key, category):
+        nonlocal strength
+        table[key] = strength
+        if not floors or floors[-1][1] != category:
+            floors.append([strength, category])
+        floors[-1][0] = strength
+        strength -= 1
+
+    # Royal flush is the ace-high straight flush
+    assign(flushes, straights[0], 10)
+    for mask in straights[1:]:
+        assign(flushes, mask, 9)
+    for quad in ranks_desc:
+        for kicker in ranks_desc:
+            if kicker != quad:
+                assign(products, PRIMES[quad] ** 4 * PRIMES[kicker], 8)
+    for trips in ranks_desc:
+        for pair in ranks_desc:
+            if pair != trips:
+                assign(products, PRIMES[trips] ** 3 * PRIMES[pair] ** 2, 7)
+    for mask in plain:
+        assign(flushes, mask, 6)
+    for mask in straights:
+        assign(unique5, mask, 5)
+    for trips in ranks_desc:
+        others = [rank for rank in ranks_desc if rank != trips]
+        for kickers in combinations(others, 2):
+            assign(products, PRIMES[trips] ** 3 * _prime_product(kickers), 4)
+    for high, low in combinations(ranks_desc, 2):
+        for kicker in ranks_desc:
+            if kicker not in (high, low):
+                assign(products, PRIMES[high] ** 2 * PRIMES[low] ** 2 * PRIMES[kicker], 3)
+    for pair in ranks_desc:
+        others = [rank for rank in ranks_desc if rank != pair]
+        for kickers in combinations(others, 3):
+            assign(products, PRIMES[pair] ** 2 * _prime_product(kickers), 2)
+    for mask in plain:
+        assign(unique5, mask, 1)
+
+    assert strength == 0, "hand class count mismatch"
+    floors.reverse()
+    return flushes, unique5, products, tuple(floor for floor, _ in floors), tuple(category for _, category in floors)
+
+FLUSHES, UNIQUE5, PRODUCTS, CATEGORY_FLOORS, CATEGORIES = _build_tables()
+
+# Multipliers for the product hash (64-bit, wrapping)
+_MASK64 = (1 << 64) - 1
+_HASH_MULTIPLY = 0x9E3779B97F4A7C15
+_HASH_DISPLACE = 0xC2B2AE3D27D4EB4F
+_HASH_FINALIZE = 0xFF51AFD7ED558CCD
+_BUCKET_BITS = 10
+_SLOT_BITS = 13
+
+def _build_product_hash(products):
+    """Collision-free hash-and-displace table over the prime products
+
+    A sorted-key binary search is the bottleneck of batch evaluation, so
+    products are placed in a perfect hash instead: keys are grouped into
+    buckets and each bucket gets the smallest displacement that sends all of
+    its keys to free slots. A lookup is then a few multiplies and two gathers.
+    """
+    def slot(hashed, displacement):
+        mixed = (hashed ^ ((displacement * _HASH_DISPLACE) & _MASK64)) * _HASH_FINALIZE
+        return (mixed & _MASK64) >> (64 - _SLOT_BITS)
+
+    buckets = {}
+    for key in products:
+        hashed = (key * _HASH_MULTIPLY) & _MASK64
+        buckets.setdefault(hashed >> (64 - _BUCKET_BITS), []).append(hashed)
+
+    displacements = [0] * (1 << _BUCKET_BITS)
+    slots = [0] * (1 << _SLOT_BITS)
+    used = set()
+    keys_by_hash = {(key * _HASH_MULTIPLY) & _MASK64: key for key in products}
+    for bucket, hashes in sorted(buckets.items(), key=lambda item: -len(item[1])):
+        displacement = 0
+        while True:
+            targets = [slot(hashed, displacement) for hashed in hashes]
+            if len(set(targets)) == len(targets) and used.isdisjoint(targets):
+                break
+            displacement += 1
+        displacements[bucket] = displacement
+        used.update(targets)
+        for hashed, target in zip(hashes, targets):
+            slots[target] = products[keys_by_hash[hashed]]
+
+    return np.array(displacements, dtype=np.uint64), np.array(slots, dtype=np.int32)
+
+# NumPy copies of the tables for batch evaluation
+FLUSH_TABLE = np.array(FLUSHES, dtype=np.int32)
+UNIQUE5_TABLE = np.array(UNIQUE5, dtype=np.int32)
+PRODUCT_DISPLACEMENTS, PRODUCT_SLOTS = _build_product_hash(PRODUCTS)
+
+def _lookup_products(products: np.ndarray) -> np.ndarray:
+    """Strengths of paired hands from their prime products (perfect hash)"""
+    hashed = products.astype(np.uint64) * np.uint64(_HASH_MULTIPLY)
+    displacement = PRODUCT_DISPLACEMENTS[hashed >> np.uint64(64 - _BUCKET_BITS)]
+    mixed = (hashed ^ (displacement * np.uint64(_HASH_DISPLACE))) * np.uint64(_HASH_FINALIZE)
+    return PRODUCT_SLOTS[mixed >> np.uint64(64 - _SLOT_BITS)]
+
+
+def evaluate(c1: int, c2: int, c3: int, c4: int, c5: int) -> int:
+    """Strength of five integer cards, 1 (worst) to 7462 (royal flush)"""
+    index = (c1 | c2 | c3 | c4 | c5) >> 16
+    if c1 & c2 & c3 & c4 & c5 & 0xF000:
+        return FLUSHES[index]
+    strength = UNIQUE5[index]
+    if strength:
+        return strength
+    return PRODUCTS[(c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF) * (c5 & 0xFF)]
+
+def evaluate_hand(hand: Sequence[dict]) -> int:
+    """Strength of a hand of five card dicts"""
+    return evaluate(*(CARD_CODES[(card['rank'], card['suit'])] for card in hand))
+
+def hand_category(strength: int) -> Tuple[int, str]:
+    """(category, name) of a strength, e.g. (2, 'One Pair')"""
+    category = CATEGORIES[bisect_right(CATEGORY_FLOORS, strength) - 1]
+    return category, HAND_NAMES[category]
+
+def evaluate_batch(hands: np.ndarray) -> np.ndarray:
+    """Strengths of an (N, 5) array of integer cards"""
+    c1, c2, c3, c4, c5 = np.ascontiguousarray(np.asarray(hands, dtype=np.int32).T)
+
+    index = (c1 | c2 | c3 | c4 | c5) >> 16
+    is_flush = (c1 & c2 & c3 & c4 & c5 & 0xF000) != 0
+    strengths = np.where(is_flush, FLUSH_TABLE[index], UNIQUE5_TABLE[index])
+
+    # Prime products fit in 32 bits (41^4 * 37 < 2^31)
+    products = (c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF) * (c5 & 0xFF)
+    return np.where(strengths == 0, _lookup_products(products), strengths)
+
+def batch_categories(strengths: np.ndarray) -> np.ndarray:
+    """Hand categories (1-10) of an array of strengths"""
+    floors = np.asarray(CATEGORY_FLOORS)
+    return np.asarray(CATEGORIES)[np.searchsorted(floors, strengths, side='right') - 1]
+
+def deal_batch(rng: np.random.Generator, count: int, cards: int = 5) -> np.ndarray:
+    """count hands of distinct cards each, as an (count, cards) array"""
+    order = rng.random((count, len(DECK_CODES))).argpartition(cards, axis=1)[:, :cards]
+    return DECK_CODES[order]
+
+def compare_hands(first: Sequence[dict], second: Sequence[dict]) -> int:
+    """1 if first wins, -1 if second wins, 0 on a true tie"""
+    a, b = evaluate_hand(first), evaluate_hand(second)
+    return (a > b) - (a < b)
+
+def best_of(cards: Sequence[int]) -> int:
+    """Best five-card strength among more cards (e.g. seven-card hands)"""
+    return max(evaluate(*combo) for combo in combinations(cards, 5))
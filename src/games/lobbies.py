@@ -0,0 +1,285 @@
+"""
+Multiplayer lobbies and tournaments
+
+Every multiplayer mode of the Telegram games (wheel parties, dice games,
+darts challenges, slots tournaments) runs through a Lobby held by one
+LobbyManager. Capacity and expiry are enforced in one place: lobbies sit in
+an expiry heap and are dropped as soon as their deadline passes, either on
+the next access or by the background sweeper, which also fires the game's
+expiry handler. Scores go into a max-heap as they arrive, so standings never
+need a sort. Entry fees are taken before play and prizes paid after it, each
+as one conditional batch through src.database.apply_balance_changes().
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import secrets
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.database import apply_balance_changes, record_games
+from src.utils.error_handler import GameError, InsufficientFundsError
+from src.utils.logger import bind_log_fields, game_logger
+
+# Seconds a lobby may wait for players before it expires
+LOBBY_TIMEOUT = int(os.getenv("LOBBY_TIMEOUT", 300))
+
+# Seconds between background expiry sweeps
+LOBBY_SWEEP_INTERVAL = int(os.getenv("LOBBY_SWEEP_INTERVAL", 15))
+
+LOBBY_OPEN = 'waiting'
+LOBBY_RUNNING = 'running'
+LOBBY_FINISHED = 'finished'
+LOBBY_EXPIRED = 'expired'
+LOBBY_CANCELLED = 'cancelled'
+
+
+class Lobby:
+    """Players, entry fee and incremental standings of one multiplayer game"""
+
+    def __init__(self, game_type: str, host_id: int, host_name: str, entry_fee: float,
+                 chat_id: Optional[int] = None, capacity: int = 10, min_players: int = 2,
+                 timeout: float = LOBBY_TIMEOUT, now: Optional[float] = None):
+        self.lobby_id = secrets.token_hex(4)
+        self.game_type = game_type
+        self.host_id = host_id
+        self.entry_fee = entry_fee
+        self.chat_id = chat_id
+        self.capacity = capacity
+        self.min_players = min_players
+        self.created_at = time.monotonic() if now is None else now
+        self.expires_at = self.created_at + timeout
+        self.status = LOBBY_OPEN
+        self.players: Dict[int, str] = {host_id: host_name}
+        self.scores: Dict[int, float] = {}
+        self.message = None  # Telegram message showing the lobby, for expiry notices
+        self.fees_held = False  # Entry fees taken but neither paid out nor refunded
+        self._heap: List[Tuple[float, int, int]] = []
+        self._order = itertools.count()
+
+    @property
+    def pot(self) -> float:
+        return self.entry_fee * len(self.players)
+
+    @property
+    def is_full(self) -> bool:
+        return len(self.players) >= self.capacity
+
+    @property
+    def can_start(self) -> bool:
+        return self.status == LOBBY_OPEN and len(self.players) >= self.min_players
+
+    @property
+    def all_scored(self) -> bool:
+        return len(self.scores) == len(self.players)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (time.monotonic() if now is None else now) >= self.expires_at
+
+    def join(self, user_id: int, name: str):
+        """Add a player, raising GameError when the lobby cannot take them"""
+        if self.status != LOBBY_OPEN or self.is_expired():
+            raise GameError("This game is no longer open")
+        if user_id in self.players:
+            raise GameError("You're already in this game!")
+        if self.is_full:
+            raise GameError("Game is full!")
+        self.players[user_id] = name
+
+    def leave(self, user_id: int):
+        if self.status != LOBBY_OPEN:
+            raise GameError("The game has already started")
+        self.players.pop(user_id, None)
+
+    def start(self):
+        if not self.can_start:
+            raise GameError(f"Need at least {self.min_players} players to start!")
+        self.status = LOBBY_RUNNING
+
+    def record_score(self, user_id: int, score: float):
+        """Record a player's score; earlier scores win ties"""
+        if user_id not in self.players:
+            raise GameError("Not a player in this game")
+        if user_id in self.scores:
+            raise GameError("Score already recorded")
+        self.scores[user_id] = score
+        heapq.heappush(self._heap, (-score, next(self._order), user_id))
+
+    def standings(self, count: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(user_id, score) from best to worst"""
+        top = heapq.nsmallest(count or len(self._heap), self._heap)
+        return [(user_id, -score) for score, _, user_id in top]
+
+    def leaders(self) -> List[int]:
+        """Every player tied on the best score"""
+        if not self._heap:
+            return []
+        best = self._heap[0][0]
+        return [user_id for score, _, user_id in self._heap if score == best]
+
+    def winner_takes_all(self) -> Dict[int, float]:
+        """Prize per player: the pot split between the leaders"""
+        leaders = self.leaders()
+        share = self.pot / len(leaders) if leaders else 0.0
+        return {user_id: (share if user_id in leaders else 0.0) for user_id in self.players}
+
+
+ExpiryHandler = Callable[[Lobby], Awaitable[None]]
+
+
+class LobbyManager:
+    """All open lobbies, with capacity checks and expiry"""
+
+    def __init__(self):
+        self.lobbies: Dict[str, Lobby] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self._expired: List[Lobby] = []
+        self._handlers: Dict[str, ExpiryHandler] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def on_expire(self, game_type: str, handler: ExpiryHandler):
+        """Register a coroutine called with each lobby of game_type that expires
+
+        Games without a handler get notify_expired().
+        """
+        self._handlers[game_type] = handler
+
+    def create(self, game_type: str, host_id: int, host_name: str, entry_fee: float, **kwargs) -> Lobby:
+        self.expire()
+        lobby = Lobby(game_type, host_id, host_name, entry_fee, **kwargs)
+        self.lobbies[lobby.lobby_id] = lobby
+        heapq.heappush(self._expiry, (lobby.expires_at, lobby.lobby_id))
+        return lobby
+
+    def get(self, lobby_id: str) -> Optional[Lobby]:
+        self.expire()
+        return self.lobbies.get(lobby_id)
+
+    def find_open(self, game_type: str, entry_fee: float, chat_id: Optional[int] = None) -> Optional[Lobby]:
+        """An open, not yet full lobby of a game and fee, e.g. to join a tournament"""
+        self.expire()
+        for lobby in self.lobbies.values():
+            if (lobby.game_type == game_type and lobby.entry_fee == entry_fee and lobby.chat_id == chat_id
+                    and lobby.status == LOBBY_OPEN and not lobby.is_full):
+                return lobby
+        return None
+
+    def close(self, lobby_id: str, status: str = LOBBY_FINISHED) -> Optional[Lobby]:
+        lobby = self.lobbies.pop(lobby_id, None)
+        if lobby:
+            lobby.status = status
+        return lobby
+
+    def expire(self, now: Optional[float] = None) -> List[Lobby]:
+        """Drop lobbies past their deadline that never started"""
+        now = time.monotonic() if now is None else now
+        expired = []
+        while self._expiry and self._expiry[0][0] <= now:
+            _, lobby_id = heapq.heappop(self._expiry)
+            lobby = self.lobbies.get(lobby_id)
+            # Running games finish on their own; closed ones are already gone
+            if lobby and lobby.status == LOBBY_OPEN:
+                expired.append(self.close(lobby_id, LOBBY_EXPIRED))
+        self._expired.extend(expired)
+        return expired
+
+    async def sweep(self, now: Optional[float] = None) -> int:
+        """Expire due lobbies and run their games' expiry handlers"""
+        self.expire(now)
+        expired, self._expired = self._expired, []
+        for lobby in expired:
+            handler = self._handlers.get(lobby.game_type, notify_expired)
+            try:
+                await handler(lobby)
+            except Exception as e:
+                game_logger.error(f"Expiry handler failed for {lobby.game_type} lobby {lobby.lobby_id}: {e}")
+        return len(expired)
+
+    async def run_sweeper(self, interval: float = LOBBY_SWEEP_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            await self.sweep()
+
+    def start(self, interval: float = LOBBY_SWEEP_INTERVAL):
+        """Start the background sweeper on the running event loop"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self.run_sweeper(interval))
+        return self._sweeper
+
+
+# Shared manager for all Telegram multiplayer games
+lobby_manager = LobbyManager()
+
+
+async def notify_expired(lobby: Lobby):
+    """Default expiry handler: tell the lobby's chat nobody was charged"""
+    if lobby.message is not None:
+        await lobby.message.edit_text(
+            "⏰ Game expired before it started.\n"
+            "No entry fees were taken."
+        )
+
+
+async def roll_for_players(lobby: Lobby, message, emoji: str, delay: float = 4) -> List[Tuple[int, float]]:
+    """Throw one animated Telegram dice per player and record the values as scores"""
+    throws = [(user_id, await message.reply_dice(emoji=emoji)) for user_id in lobby.players]
+    # All animations play at once, so wait for them together
+    await asyncio.sleep(delay)
+    for user_id, throw in throws:
+        lobby.record_score(user_id, throw.dice.value)
+    return lobby.standings()
+
+
+async def collect_entry_fees(lobby: Lobby) -> List[str]:
+    """Take every player's entry fee in one batch
+
+    Players who cannot pay are dropped from the lobby and their names
+    returned. If too few players remain, the fees already taken are refunded
+    and InsufficientFundsError is raised.
+    """
+    bind_log_fields(game_type=lobby.game_type)
+    results = await apply_balance_changes(
+        [(user_id, -lobby.entry_fee, f"{lobby.game_type} entry") for user_id in lobby.players],
+        game_id=lobby.lobby_id, description=f"Multiplayer game {lobby.lobby_id}"
+    )
+    dropped = [lobby.players.pop(user_id) for user_id, result in results.items() if not result["applied"]]
+    lobby.fees_held = True
+    if len(lobby.players) < lobby.min_players:
+        await refund_entry_fees(lobby)
+        raise InsufficientFundsError(f"Player {dropped[0]} has insufficient funds.")
+    return dropped
+
+
+async def refund_entry_fees(lobby: Lobby):
+    """Return the entry fee to every remaining player"""
+    await apply_balance_changes(
+        [(user_id, lobby.entry_fee, f"{lobby.game_type} refund") for user_id in lobby.players],
+        game_id=lobby.lobby_id, description=f"Multiplayer game {lobby.lobby_id}", record_stats=False
+    )
+    lobby.fees_held = False
+
+
+async def pay_prizes(lobby: Lobby, prizes: Dict[int, float]):
+    """Credit every prize in one batch and record each player's game"""
+    await apply_balance_changes(
+        [(user_id, prize, f"{lobby.game_type} win") for user_id, prize in prizes.items() if prize > 0],
+        game_id=lobby.lobby_id, description=f"Multiplayer game {lobby.lobby_id}"
+    )
+    lobby.fees_held = False
+    await record_games(lobby.game_type, [
+        (user_id, lobby.entry_fee, "win" if prizes.get(user_id, 0) > 0 else "loss", prizes.get(user_id, 0))
+        for user_id in lobby.players
+    ])
+
+
+async def finish_lobby(lobby: Lobby):
+    """Close a started lobby, refunding the entry fees if the game failed before paying out"""
+    try:
+        if lobby.fees_held:
+            game_logger.warning(f"Refunding {lobby.game_type} lobby {lobby.lobby_id} after a failed game")
+            await refund_entry_fees(lobby)
+    except Exception as e:
+        game_logger.error(f"Refund failed for {lobby.game_type} lobby {lobby.lobby_id}: {e}")
+    finally:
+        lobby_manager.close(lobby.lobby_id)
@@ -1,12 +1,38 @@
+import os
 import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.games.rng import derive_rng, new_nonce
+from src.utils.logger import game_logger
 from src.database import get_user, update_user_balance, record_transaction, record_game
 
+# Numbers are drawn 6 of 1-49
+LOTTERY_PICK = 6
+LOTTERY_MAX_NUMBER = 49
+
+# Fixed payout multipliers by number of matches
+LOTTERY_PAYOUTS = {
+    6: 1000,  # Jackpot
+    5: 100,   # 5 matches
+    4: 10,    # 4 matches
+    3: 3,     # 3 matches
+    2: 1.5,   # 2 matches
+    1: 0,     # 1 match - no payout
+    0: 0      # No matches
+}
+
 # Store active lottery games for webapp
 active_lottery_games = {}
 
 class LotteryGame:
-    def __init__(self, user_id):
+    def __init__(self, user_id, rng=None):
         self.user_id = user_id
+        self.rng = rng or random
         self.bet_amount = 0
         self.selected_numbers = []
         self.winning_numbers = []
@@ -15,15 +41,7 @@ class LotteryGame:
         self.game_over = False
         self.result = None
         self.winnings = 0
-        self.payout_multipliers = {
-            6: 1000,  # Jackpot
-            5: 100,   # 5 matches
-            4: 10,    # 4 matches
-            3: 3,     # 3 matches
-            2: 1.5,   # 2 matches
-            1: 0,     # 1 match - no payout
-            0: 0      # No matches
-        }
+        self.payout_multipliers = dict(LOTTERY_PAYOUTS)
     
     def start_game(self, bet_amount):
         """Start a new lottery game"""
@@ -51,11 +69,11 @@ class LotteryGame:
         
         # Draw 6 winning numbers from 1-49
         all_numbers = list(range(1, 50))
-        self.winning_numbers = sorted(random.sample(all_numbers, 6))
+        self.winning_numbers = sorted(self.rng.sample(all_numbers, 6))
         
         # Draw bonus number from remaining numbers
         remaining_numbers = [n for n in all_numbers if n not in self.winning_numbers]
-        self.bonus_number = random.choice(remaining_numbers)
+        self.bonus_number = self.rng.choice(remaining_numbers)
         
         # Count matches
         self.matches = len(set(self.selected_numbers) & set(self.winning_numbers))
@@ -115,4 +133,365 @@ def draw_lottery_numbers(user_id):
 def clear_lottery_game(user_id):
     """Clear lottery game for user"""
     if user_id in active_lottery_games:
-        del active_lottery_games[user_id]
\ No newline at end of file
+        del active_lottery_games[user_id]
+
+
+# ==================== POOLED SCHEDULED DRAWS ====================
+
+# Seconds between scheduled draws
+LOTTERY_DRAW_INTERVAL = int(os.getenv("LOTTERY_DRAW_INTERVAL", 3600))
+
+# Share of every stake that goes into the shared jackpot pool
+LOTTERY_JACKPOT_SHARE = 0.2
+
+# Results of recent draws kept in memory
+LOTTERY_RESULT_HISTORY = 50
+
+# Longest pause between checks for due or failed draws
+LOTTERY_POLL_INTERVAL = float(os.getenv("LOTTERY_POLL_INTERVAL", 60))
+
+# A draw still being settled after this many seconds is assumed abandoned and retried
+LOTTERY_SETTLE_TIMEOUT = float(os.getenv("LOTTERY_SETTLE_TIMEOUT", 600))
+
+# Payout multiplier by match count; the jackpot tier is paid from the pool instead
+PAYOUT_TABLE = np.array([LOTTERY_PAYOUTS[matches] for matches in range(LOTTERY_PICK + 1)], dtype=np.float64)
+PAYOUT_TABLE[LOTTERY_PICK] = 0.0
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+def _swar_popcount(values: np.ndarray) -> np.ndarray:
+    """Set bits of every uint64 in an array (SIMD-within-a-register)"""
+    values = values - ((values >> np.uint64(1)) & _M1)
+    values = (values & _M2) + ((values >> np.uint64(2)) & _M2)
+    values = (values + (values >> np.uint64(4))) & _M4
+    return (values * _H01) >> np.uint64(56)
+
+# NumPy 2.0+ has a native popcount ufunc
+popcount64 = getattr(np, 'bitwise_count', _swar_popcount)
+
+def numbers_to_mask(numbers: Iterable[int]) -> int:
+    """Ticket bitmask: bit n is set when number n is picked"""
+    mask = 0
+    for number in numbers:
+        mask |= 1 << number
+    return mask
+
+def mask_to_numbers(mask: int) -> List[int]:
+    return [number for number in range(1, LOTTERY_MAX_NUMBER + 1) if mask >> number & 1]
+
+def validate_ticket(numbers) -> bool:
+    """Six distinct numbers from 1-49"""
+    return (
+        len(numbers) == LOTTERY_PICK
+        and len(set(numbers)) == LOTTERY_PICK
+        and all(isinstance(number, int) and 1 <= number <= LOTTERY_MAX_NUMBER for number in numbers)
+    )
+
+
+class LotteryDraw:
+    """Tickets pooled into one scheduled draw, stored as parallel NumPy arrays"""
+
+    def __init__(self, draw_id: int, draw_at: float, jackpot: float = 0.0, capacity: int = 1024,
+                 nonce: Optional[int] = None):
+        self.draw_id = draw_id
+        self.draw_at = draw_at
+        self.jackpot = jackpot
+        self.nonce = new_nonce() if nonce is None else nonce
+        self.masks = np.zeros(capacity, dtype=np.uint64)
+        self.user_ids = np.zeros(capacity, dtype=np.int64)
+        self.stakes = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def _reserve(self, extra: int):
+        needed = self.count + extra
+        if needed <= len(self.masks):
+            return
+        capacity = max(needed, len(self.masks) * 2)
+        for name in ('masks', 'user_ids', 'stakes'):
+            grown = np.zeros(capacity, dtype=getattr(self, name).dtype)
+            grown[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, grown)
+
+    def add_ticket(self, user_id: int, numbers: List[int], stake: float) -> int:
+        """Add one ticket, returns its index in the draw"""
+        return self.add_tickets(np.array([user_id]), np.array([numbers_to_mask(numbers)], dtype=np.uint64), np.array([stake]))
+
+    def add_tickets(self, user_ids: np.ndarray, masks: np.ndarray, stakes: np.ndarray) -> int:
+        """Add tickets in bulk, returns the index of the first one"""
+        with self._lock:
+            if self.closed:
+                raise ValueError(f"Lottery draw {self.draw_id} is closed")
+            size = len(masks)
+            self._reserve(size)
+            start = self.count
+            self.masks[start:start + size] = masks
+            self.user_ids[start:start + size] = user_ids
+            self.stakes[start:start + size] = stakes
+            self.jackpot += float(np.sum(stakes)) * LOTTERY_JACKPOT_SHARE
+            self.count += size
+            return start
+
+    def run(self) -> Dict:
+        """Close the draw, match every ticket and total the winnings per user"""
+        with self._lock:
+            self.closed = True
+            count = self.count
+
+        rng = derive_rng(self.nonce, 'lottery')
+        winning_numbers = sorted(rng.sample(range(1, LOTTERY_MAX_NUMBER + 1), LOTTERY_PICK))
+        bonus_number = rng.choice([n for n in range(1, LOTTERY_MAX_NUMBER + 1) if n not in winning_numbers])
+        winning_mask = np.uint64(numbers_to_mask(winning_numbers))
+
+        masks, user_ids, stakes = self.masks[:count], self.user_ids[:count], self.stakes[:count]
+        matches = popcount64(masks & winning_mask).astype(np.int64)
+        payouts = stakes * PAYOUT_TABLE[matches]
+
+        # Jackpot winners split the pool in proportion to their stakes
+        jackpot_winners = matches == LOTTERY_PICK
+        jackpot_stakes = float(stakes[jackpot_winners].sum())
+        rollover = self.jackpot
+        if jackpot_stakes > 0:
+            payouts[jackpot_winners] += self.jackpot * stakes[jackpot_winners] / jackpot_stakes
+            rollover = 0.0
+
+        # Aggregate per user for bulk settlement
+        users, inverse = np.unique(user_ids, return_inverse=True)
+        user_winnings = np.bincount(inverse, weights=payouts, minlength=len(users))
+        user_stakes = np.bincount(inverse, weights=stakes, minlength=len(users))
+        user_best = np.zeros(len(users), dtype=np.int64)
+        np.maximum.at(user_best, inverse, matches)
+
+        return {
+            'draw_id': self.draw_id,
+            'nonce': self.nonce,
+            'winning_numbers': winning_numbers,
+            'bonus_number': bonus_number,
+            'tickets': count,
+            'total_stakes': float(stakes.sum()),
+            'total_payouts': float(payouts.sum()),
+            'jackpot': self.jackpot,
+            'jackpot_winners': int(jackpot_winners.sum()),
+            'rollover': rollover,
+            'match_counts': np.bincount(matches, minlength=LOTTERY_PICK + 1).tolist(),
+            'users': users,
+            'user_winnings': user_winnings,
+            'user_stakes': user_stakes,
+            'user_best_matches': user_best
+        }
+
+
+class MemoryLotteryStore:
+    """Draws and tickets of a single process; the webapp keeps them in MongoDB (webapp/sync_db.py)
+
+    A store opens draws, persists tickets, lets exactly one caller claim each
+    draw and applies the rollover when a draw is settled. Draw status goes
+    open -> drawing -> settled, or drawing -> failed -> drawing on retry.
+    """
+
+    def __init__(self):
+        self.draws: Dict[int, Dict] = {}
+        self.tickets: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def _create(self, draw_id: int, interval: float) -> Dict:
+        return self.draws.setdefault(draw_id, {
+            'draw_id': draw_id, 'draw_at': time.time() + interval, 'nonce': new_nonce(),
+            'rollover': 0.0, 'jackpot': 0.0, 'status': 'open'
+        })
+
+    def open_draw(self, interval: float) -> Dict:
+        with self._lock:
+            open_ids = [draw_id for draw_id, draw in self.draws.items() if draw['status'] == 'open']
+            if open_ids:
+                return dict(self.draws[max(open_ids)])
+            return dict(self._create(max(self.draws, default=0) + 1, interval))
+
+    def get_draw(self, draw_id: int) -> Optional[Dict]:
+        with self._lock:
+            draw = self.draws.get(draw_id)
+            return dict(draw) if draw else None
+
+    def add_ticket(self, draw_id: int, user_id: int, mask: int, stake: float, jackpot_share: float):
+        with self._lock:
+            self.tickets.append({'draw_id': draw_id, 'user_id': user_id, 'mask': mask, 'stake': stake, 'status': 'open'})
+            self.draws[draw_id]['jackpot'] += jackpot_share
+
+    def count_tickets(self, draw_id: int) -> int:
+        with self._lock:
+            return sum(1 for ticket in self.tickets if ticket['draw_id'] == draw_id and ticket['status'] == 'open')
+
+    def claim_draw(self, draw_id: int, interval: float) -> bool:
+        """Close an open draw for drawing and open the next one; False if someone else did"""
+        with self._lock:
+            draw = self.draws.get(draw_id)
+            if not draw or draw['status'] != 'open':
+                return False
+            draw.update(status='drawing', claimed_at=time.time())
+            self._create(draw_id + 1, interval)
+            return True
+
+    def reclaim_draws(self, timeout: float) -> List[int]:
+        """Claim failed draws, and draws abandoned mid-settlement, for a retry"""
+        now = time.time()
+        with self._lock:
+            claimed = []
+            for draw_id, draw in self.draws.items():
+                if draw['status'] == 'failed' or (draw['status'] == 'drawing' and draw['claimed_at'] < now - timeout):
+                    draw.update(status='drawing', claimed_at=now)
+                    claimed.append(draw_id)
+            return claimed
+
+    def draw_tickets(self, draw_id: int):
+        """Tickets of a claimed draw as (user_ids, masks, stakes); late tickets for it join the next one"""
+        with self._lock:
+            for ticket in self.tickets:
+                if ticket['status'] == 'open' and ticket['draw_id'] <= draw_id:
+                    ticket.update(status='drawn', drawn_in=draw_id)
+            tickets = [ticket for ticket in self.tickets if ticket.get('drawn_in') == draw_id]
+        return (
+            np.array([ticket['user_id'] for ticket in tickets], dtype=np.int64),
+            np.array([ticket['mask'] for ticket in tickets], dtype=np.uint64),
+            np.array([ticket['stake'] for ticket in tickets], dtype=np.float64)
+        )
+
+    def fail_draw(self, draw_id: int):
+        with self._lock:
+            if self.draws[draw_id]['status'] == 'drawing':
+                self.draws[draw_id]['status'] = 'failed'
+
+    def finish_draw(self, draw_id: int, result: Dict, rollover: float) -> bool:
+        """Mark a draw settled and roll its unclaimed jackpot into the open draw, once"""
+        with self._lock:
+            draw = self.draws[draw_id]
+            if draw['status'] not in ('drawing', 'failed'):
+                return False
+            draw.update(status='settled', result=result)
+            for ticket in self.tickets:
+                if ticket.get('drawn_in') == draw_id:
+                    ticket['status'] = 'settled'
+            if rollover:
+                for open_draw in self.draws.values():
+                    if open_draw['status'] == 'open':
+                        open_draw['rollover'] += rollover
+                        open_draw['jackpot'] += rollover
+            return True
+
+    def get_result(self, draw_id: int) -> Optional[Dict]:
+        with self._lock:
+            draw = self.draws.get(draw_id)
+            return draw.get('result') if draw else None
+
+
+class LotteryScheduler:
+    """Opens a draw every interval and settles the previous one in bulk
+
+    Tickets live in the store, so they survive a restart or a failed
+    settlement. Every process may run the loop: claiming a draw is atomic in
+    the store, so each draw is drawn and settled by exactly one of them, and
+    settle() must be safe to repeat because failed draws are retried.
+    """
+
+    def __init__(self, interval: int = LOTTERY_DRAW_INTERVAL, store=None):
+        self.interval = interval
+        self.store = store or MemoryLotteryStore()
+        self.results = deque(maxlen=LOTTERY_RESULT_HISTORY)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def current(self) -> Dict:
+        """The open draw"""
+        return self.store.open_draw(self.interval)
+
+    def buy_ticket(self, user_id: int, numbers: List[int], stake: float) -> Dict:
+        """Persist a ticket for the open draw and return that draw"""
+        draw = self.current
+        self.store.add_ticket(draw['draw_id'], user_id, numbers_to_mask(numbers), stake, stake * LOTTERY_JACKPOT_SHARE)
+        return draw
+
+    def run_draw(self, settle: Optional[Callable[[Dict], None]] = None) -> Optional[Dict]:
+        """Close the open draw, open the next one and settle the closed one; None if another process took it"""
+        draw_id = self.current['draw_id']
+        if not self.store.claim_draw(draw_id, self.interval):
+            return None
+        return self.settle_draw(draw_id, settle)
+
+    def settle_draw(self, draw_id: int, settle: Optional[Callable[[Dict], None]] = None) -> Optional[Dict]:
+        """Draw and settle a claimed draw; a failure leaves its tickets in the store for a retry"""
+        stored = self.store.get_draw(draw_id)
+        started = time.perf_counter()
+        draw = LotteryDraw(draw_id, stored['draw_at'], jackpot=stored['rollover'], nonce=stored['nonce'])
+        draw.add_tickets(*self.store.draw_tickets(draw_id))
+        result = draw.run()
+        try:
+            if settle and result['tickets']:
+                settle(result)
+        except Exception:
+            self.store.fail_draw(draw_id)
+            raise
+
+        # Unclaimed jackpot rolls over into the open draw
+        public = public_draw_result(result)
+        if not self.store.finish_draw(draw_id, public, result['rollover']):
+            return None
+
+        game_logger.info(
+            f"Lottery draw {result['draw_id']}: {result['tickets']} tickets, "
+            f"numbers {result['winning_numbers']}, paid {result['total_payouts']:.2f} "
+            f"in {time.perf_counter() - started:.3f}s"
+        )
+        with self._lock:
+            self.results.append(public)
+        return result
+
+    def retry_failed(self, settle: Callable[[Dict], None], timeout: float = LOTTERY_SETTLE_TIMEOUT):
+        for draw_id in self.store.reclaim_draws(timeout):
+            try:
+                self.settle_draw(draw_id, settle)
+            except Exception as e:
+                game_logger.error(f"Lottery draw {draw_id} failed again, will retry: {e}")
+
+    def get_result(self, draw_id: int) -> Optional[Dict]:
+        with self._lock:
+            cached = next((result for result in self.results if result['draw_id'] == draw_id), None)
+        return cached or self.store.get_result(draw_id)
+
+    def ensure_running(self, settle: Callable[[Dict], None]):
+        """Start the background draw loop once"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, args=(settle,), name='lottery-draws', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self, settle):
+        while not self._stop.wait(min(LOTTERY_POLL_INTERVAL, max(0.0, self.current['draw_at'] - time.time()))):
+            try:
+                self.retry_failed(settle)
+                if self.current['draw_at'] <= time.time():
+                    self.run_draw(settle)
+            except Exception as e:
+                game_logger.error(f"Lottery draw failed, tickets kept for a retry: {e}")
+
+    def status(self) -> Dict:
+        draw = self.current
+        return {
+            'draw_id': draw['draw_id'],
+            'draw_at': draw['draw_at'],
+            'tickets': self.store.count_tickets(draw['draw_id']),
+            'jackpot': draw['jackpot'],
+            'payout_multipliers': LOTTERY_PAYOUTS
+        }
+
+def public_draw_result(result: Dict) -> Dict:
+    """Draw result without the per-user arrays"""
+    return {key: value for key, value in result.items() if not key.startswith('user')}
@@ -1,11 +1,12 @@
-import random
+from src.games.payout_tables import mines_ladder
+from src.games.provably_fair import FairSession, mines_layout
 from src.database import get_user, update_user_balance, record_transaction, record_game
 
 # Store active mines games for webapp
 active_mines_games = {}
 
 class MinesGame:
-    def __init__(self, user_id, mines_count=5, grid_size=25):
+    def __init__(self, user_id, mines_count=5, grid_size=25, client_seed=None, fair=None):
         self.user_id = user_id
         self.mines_count = mines_count
         self.grid_size = grid_size
@@ -19,13 +20,15 @@ class MinesGame:
         self.result = None
         self.winnings = 0
         self.cashed_out = False
+        self.payout_ladder = mines_ladder(grid_size, mines_count)
+        self.fair = fair or FairSession(client_seed)
         
         # Place mines randomly
         self.place_mines()
     
     def place_mines(self):
-        """Randomly place mines on the grid"""
-        self.mines_positions = random.sample(range(self.grid_size), self.mines_count)
+        """Place mines from the session's provably fair seeds"""
+        self.mines_positions = mines_layout(self.fair.floats(), self.grid_size, self.mines_count)
         for pos in self.mines_positions:
             self.grid[pos] = True
     
@@ -43,6 +46,7 @@ class MinesGame:
         
         if self.grid[position]:  # Hit a mine
             self.game_over = True
+            self.fair.reveal()
             self.result = 'mine'
             self.winnings = 0
             return {'hit_mine': True, 'position': position}
@@ -53,15 +57,8 @@ class MinesGame:
     
     def calculate_multiplier(self):
         """Calculate current multiplier based on gems found"""
-        # Multiplier increases with each gem found
-        # Formula: multiplier = (total_safe_tiles / remaining_safe_tiles)
-        total_safe_tiles = self.grid_size - self.mines_count
-        remaining_safe_tiles = total_safe_tiles - self.gems_found
-        
-        if remaining_safe_tiles > 0:
-            self.current_multiplier = total_safe_tiles / remaining_safe_tiles
-        else:
-            self.current_multiplier = total_safe_tiles
+        # Fair odds of surviving this many picks, less the house edge
+        self.current_multiplier = self.payout_ladder[self.gems_found]
     
     def cash_out(self):
         """Cash out with current multiplier"""
@@ -70,6 +67,7 @@ class MinesGame:
         
         self.cashed_out = True
         self.game_over = True
+        self.fair.reveal()
         self.result = 'cashout'
         self.winnings = self.bet_amount * self.current_multiplier
         return True
@@ -82,16 +80,18 @@ class MinesGame:
             'revealed': self.revealed,
             'gems_found': self.gems_found,
             'current_multiplier': self.current_multiplier,
+            'payout_ladder': list(self.payout_ladder),
             'game_over': self.game_over,
             'result': self.result,
             'winnings': self.winnings,
             'bet_amount': self.bet_amount,
-            'cashed_out': self.cashed_out
+            'cashed_out': self.cashed_out,
+            'fairness': self.fair.public_state()
         }
 
-def create_mines_game(user_id, bet_amount, mines_count=5):
+def create_mines_game(user_id, bet_amount, mines_count=5, client_seed=None):
     """Create a new mines game"""
-    game = MinesGame(user_id, mines_count)
+    game = MinesGame(user_id, mines_count, client_seed=client_seed)
     game.start_game(bet_amount)
     active_mines_games[user_id] = game
     return game
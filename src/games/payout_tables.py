@@ -0,0 +1,144 @@
+"""
+Shared payout tables for the webapp quick-play games
+
+These tables are the single source of truth for the instant games played
+through /api/game/bet. Both the per-round logic in webapp/app.py and the
+vectorized batch engine read from here so the two can never drift apart.
+"""
+from math import comb
+
+# Coinflip
+COINFLIP_SIDES = ('heads', 'tails')
+COINFLIP_MULTIPLIER = 2.0
+
+# Instant crash (uniform crash point, rounded to 2 decimals)
+INSTANT_CRASH_MIN = 1.01
+INSTANT_CRASH_MAX = 10.0
+
+# Dice (roll 1-100, over/under a target)
+DICE_SIDES = 100
+DICE_RTP = 0.95
+
+# Plinko (ball bounces left/right on each of `rows` pegs, landing bucket is
+# the number of right bounces: Binomial(rows, 1/2))
+PLINKO_MIN_ROWS = 8
+PLINKO_MAX_ROWS = 16
+PLINKO_QUICK_ROWS = 8
+PLINKO_SESSION_ROWS = 16
+PLINKO_RTP = 0.97
+# Multiplier growth per bucket away from the center, by risk level
+PLINKO_RISK_GROWTH = {'low': 1.3, 'medium': 1.6, 'high': 2.2}
+
+# Roulette (European single zero)
+ROULETTE_NUMBERS = 37
+RED_NUMBERS = frozenset([1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36])
+ROULETTE_STRAIGHT_MULTIPLIER = 36
+ROULETTE_EVEN_MONEY_MULTIPLIER = 2
+
+# Slots (three independent weighted reels)
+SLOT_SYMBOLS = ('🍒', '🍋', '🍊', '🍇', '🔔', '💎', '7️⃣')
+SLOT_WEIGHTS = (30, 25, 20, 15, 7, 2, 1)
+SLOT_TRIPLE_MULTIPLIERS = (5, 10, 15, 20, 50, 100, 500)
+SLOT_PAIR_MULTIPLIER = 2
+
+# Wheel (segment id -> multiplier, weighted towards lower multipliers)
+WHEEL_SEGMENTS = (1, 2, 3, 4, 5, 6, 7, 8)
+WHEEL_MULTIPLIERS = (2, 3, 5, 2, 10, 3, 5, 20)
+WHEEL_WEIGHTS = (25, 20, 15, 25, 8, 20, 15, 2)
+
+# Mines (sessions and quick-play reveal/cashout through /api/game/bet)
+MINES_GRID_SIZE = 25
+MINES_GRID_SIZES = (9, 16, 25, 36)
+MINES_HOUSE_EDGE = 0.03
+
+# Tower (sessions: 8 levels, 1 safe tile out of 4)
+TOWER_LEVELS = 8
+TOWER_TILES = 4
+TOWER_SAFE_TILES = 1
+TOWER_MAX_LEVELS = 12
+TOWER_MAX_TILES = 5
+TOWER_HOUSE_EDGE = 0.03
+
+# Tower (quick-play: 8 levels, 2 safe tiles out of 3)
+TOWER_QUICK_LEVELS = 8
+TOWER_QUICK_TILES = 3
+TOWER_QUICK_SAFE_TILES = 2
+
+# Blackjack (quick-play deal)
+BLACKJACK_PAYOUT = 2.5
+
+
+def _mines_ladder(grid_size: int, mines_count: int, edge: float) -> tuple:
+    """Multiplier after 0..all gems: exact odds of surviving that many picks, less the edge"""
+    safe_tiles = grid_size - mines_count
+    return (1.0,) + tuple(
+        round(comb(grid_size, gems) / comb(safe_tiles, gems) * (1 - edge), 4)
+        for gems in range(1, safe_tiles + 1)
+    )
+
+def _tower_ladder(levels: int, tiles: int, safe_tiles: int, edge: float) -> tuple:
+    """Multiplier at levels 0..levels: exact odds of clearing that many levels, less the edge"""
+    return (1.0,) + tuple(
+        round((tiles / safe_tiles) ** level * (1 - edge), 4)
+        for level in range(1, levels + 1)
+    )
+
+# Payout ladders keyed by (grid size, mine count) and (levels, tiles, safe
+# tiles); sessions index into these instead of recomputing per reveal
+MINES_MULTIPLIERS = {
+    (grid_size, mines_count): _mines_ladder(grid_size, mines_count, MINES_HOUSE_EDGE)
+    for grid_size in MINES_GRID_SIZES
+    for mines_count in range(1, grid_size)
+}
+TOWER_MULTIPLIERS = {
+    (levels, tiles, safe_tiles): _tower_ladder(levels, tiles, safe_tiles, TOWER_HOUSE_EDGE)
+    for levels in range(1, TOWER_MAX_LEVELS + 1)
+    for tiles in range(2, TOWER_MAX_TILES + 1)
+    for safe_tiles in range(1, tiles)
+}
+
+TOWER_QUICK_MULTIPLIERS = TOWER_MULTIPLIERS[(TOWER_QUICK_LEVELS, TOWER_QUICK_TILES, TOWER_QUICK_SAFE_TILES)]
+
+
+def _plinko_table(rows: int, growth: float, rtp: float) -> tuple:
+    """Bucket multipliers growing by `growth` away from the center, scaled to `rtp`"""
+    probabilities = [comb(rows, bucket) / 2 ** rows for bucket in range(rows + 1)]
+    shape = [growth ** abs(bucket - rows / 2) for bucket in range(rows + 1)]
+    scale = rtp / sum(p * s for p, s in zip(probabilities, shape))
+    return tuple(round(scale * s, 2) for s in shape)
+
+# Bucket multipliers keyed by (rows, risk level)
+PLINKO_MULTIPLIERS = {
+    (rows, risk_level): _plinko_table(rows, growth, PLINKO_RTP)
+    for rows in range(PLINKO_MIN_ROWS, PLINKO_MAX_ROWS + 1)
+    for risk_level, growth in PLINKO_RISK_GROWTH.items()
+}
+
+
+def plinko_multipliers(rows: int, risk_level: str) -> tuple:
+    """Bucket multipliers for a board, indexed by landing bucket"""
+    try:
+        return PLINKO_MULTIPLIERS[(rows, risk_level)]
+    except KeyError:
+        raise ValueError(f"Unsupported plinko board: {rows} rows at {risk_level} risk") from None
+
+def mines_ladder(grid_size: int, mines_count: int) -> tuple:
+    """Payout ladder for a mines board, indexed by gems found"""
+    try:
+        return MINES_MULTIPLIERS[(grid_size, mines_count)]
+    except KeyError:
+        raise ValueError(f"Unsupported mines board: {mines_count} mines on {grid_size} tiles") from None
+
+def tower_ladder(levels: int, tiles: int, safe_tiles: int) -> tuple:
+    """Payout ladder for a tower, indexed by levels cleared"""
+    try:
+        return TOWER_MULTIPLIERS[(levels, tiles, safe_tiles)]
+    except KeyError:
+        raise ValueError(f"Unsupported tower: {levels} levels of {safe_tiles}/{tiles} safe tiles") from None
+
+
+def roulette_color(number: int) -> str:
+    """Get the color of a roulette number"""
+    if number == 0:
+        return 'green'
+    return 'red' if number in RED_NUMBERS else 'black'
@@ -1,33 +1,35 @@
-import random
+from src.games.payout_tables import PLINKO_SESSION_ROWS, plinko_multipliers
+from src.games.provably_fair import FairSession, plinko_bits, plinko_bucket, plinko_path
 from src.database import get_user, update_user_balance, record_transaction, record_game
 
 # Store active plinko games for webapp
 active_plinko_games = {}
 
 class PlinkoGame:
-    def __init__(self, user_id, rows=16):
+    def __init__(self, user_id, rows=PLINKO_SESSION_ROWS, client_seed=None, fair=None):
         self.user_id = user_id
         self.rows = rows
         self.bet_amount = 0
         self.risk_level = 'medium'  # low, medium, high
         self.multipliers = self.get_multipliers()
-        self.ball_path = []
+        self.path_bits = None
+        self._ball_path = None
         self.final_slot = None
         self.game_over = False
         self.result = None
         self.winnings = 0
+        self.fair = fair or FairSession(client_seed)
     
     def get_multipliers(self):
-        """Get multipliers based on risk level"""
-        if self.risk_level == 'low':
-            # Lower risk, more consistent payouts
-            return [0.5, 1.0, 1.2, 1.5, 2.0, 3.0, 5.0, 10.0, 5.0, 3.0, 2.0, 1.5, 1.2, 1.0, 0.5]
-        elif self.risk_level == 'medium':
-            # Medium risk
-            return [0.3, 0.5, 1.0, 1.5, 2.0, 5.0, 10.0, 50.0, 10.0, 5.0, 2.0, 1.5, 1.0, 0.5, 0.3]
-        else:  # high
-            # High risk, high reward
-            return [0.2, 0.3, 0.5, 1.0, 2.0, 10.0, 50.0, 1000.0, 50.0, 10.0, 2.0, 1.0, 0.5, 0.3, 0.2]
+        """Get multipliers for the board size and risk level"""
+        return list(plinko_multipliers(self.rows, self.risk_level))
+    
+    @property
+    def ball_path(self):
+        """Peg-by-peg path of the drop, built on first access"""
+        if self._ball_path is None and self.path_bits is not None:
+            self._ball_path = plinko_path(self.path_bits, self.rows)
+        return self._ball_path or []
     
     def start_game(self, bet_amount, risk_level='medium'):
         """Start a new plinko game"""
@@ -36,57 +38,50 @@ class PlinkoGame:
         self.multipliers = self.get_multipliers()
         return True
     
-    def drop_ball(self):
-        """Simulate dropping a ball through the plinko board"""
+    def drop_ball(self, include_path=True):
+        """Drop a ball: the bucket is the count of right bounces"""
         if self.game_over:
             return False
         
-        # Simulate ball path
-        position = self.rows // 2  # Start in the middle
-        self.ball_path = [position]
-        
-        # Ball bounces left or right at each peg
-        for row in range(self.rows):
-            # 50% chance to go left or right
-            if random.random() < 0.5:
-                position = max(0, position - 1)  # Go left
-            else:
-                position = min(len(self.multipliers) - 1, position + 1)  # Go right
-            
-            self.ball_path.append(position)
-        
-        # Final position determines the multiplier
-        self.final_slot = position
+        # One bit per row, drawn at once from the session's fair seeds
+        self.path_bits = plinko_bits(self.fair.floats(), self.rows)
+        self.final_slot = plinko_bucket(self.path_bits)
         multiplier = self.multipliers[self.final_slot]
         
         self.winnings = self.bet_amount * multiplier
         self.game_over = True
+        self.fair.reveal()
         self.result = 'win' if multiplier > 1.0 else 'lose'
         
-        return {
-            'ball_path': self.ball_path,
+        result = {
             'final_slot': self.final_slot,
             'multiplier': multiplier,
             'winnings': self.winnings
         }
+        if include_path:
+            result['ball_path'] = self.ball_path
+        return result
     
-    def get_game_state(self):
+    def get_game_state(self, include_path=True):
         """Get current game state"""
-        return {
+        state = {
             'rows': self.rows,
             'risk_level': self.risk_level,
             'multipliers': self.multipliers,
-            'ball_path': self.ball_path,
             'final_slot': self.final_slot,
             'game_over': self.game_over,
             'result': self.result,
             'winnings': self.winnings,
-            'bet_amount': self.bet_amount
+            'bet_amount': self.bet_amount,
+            'fairness': self.fair.public_state()
         }
+        if include_path:
+            state['ball_path'] = self.ball_path
+        return state
 
-def create_plinko_game(user_id, bet_amount, risk_level='medium'):
+def create_plinko_game(user_id, bet_amount, risk_level='medium', client_seed=None, rows=PLINKO_SESSION_ROWS):
     """Create a new plinko game"""
-    game = PlinkoGame(user_id)
+    game = PlinkoGame(user_id, rows, client_seed)
     game.start_game(bet_amount, risk_level)
     active_plinko_games[user_id] = game
     return game
@@ -95,11 +90,11 @@ def get_plinko_game(user_id):
     """Get active plinko game for user"""
     return active_plinko_games.get(user_id)
 
-def drop_plinko_ball(user_id):
+def drop_plinko_ball(user_id, include_path=True):
     """Drop a ball in plinko game"""
     game = active_plinko_games.get(user_id)
     if game:
-        return game.drop_ball()
+        return game.drop_ball(include_path)
     return None
 
 def clear_plinko_game(user_id):
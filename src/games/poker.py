@@ -1,12 +1,14 @@
 import random
+from src.games.hand_evaluator import evaluate_hand, hand_category
 from src.database import get_user, update_user_balance, record_transaction, record_game
 
 # Store active poker games for webapp
 active_poker_games = {}
 
 class PokerGame:
-    def __init__(self, user_id):
+    def __init__(self, user_id, rng=None):
         self.user_id = user_id
+        self.rng = rng or random
         self.bet_amount = 0
         self.deck = self.create_deck()
         self.player_hand = []
@@ -25,7 +27,7 @@ class PokerGame:
         for suit in suits:
             for rank in ranks:
                 deck.append({'rank': rank, 'suit': suit})
-        random.shuffle(deck)
+        self.rng.shuffle(deck)
         return deck
     
     def start_game(self, bet_amount):
@@ -40,66 +42,24 @@ class PokerGame:
         return True
     
     def get_hand_rank(self, hand):
-        """Get the rank of a poker hand"""
-        ranks = [card['rank'] for card in hand]
-        suits = [card['suit'] for card in hand]
-        
-        # Convert face cards to numbers for comparison
-        rank_values = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, 
-                      '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
-        
-        values = sorted([rank_values[rank] for rank in ranks])
-        
-        # Check for flush
-        is_flush = len(set(suits)) == 1
-        
-        # Check for straight
-        is_straight = all(values[i] == values[i-1] + 1 for i in range(1, 5))
-        
-        # Count occurrences of each rank
-        rank_counts = {}
-        for rank in ranks:
-            rank_counts[rank] = rank_counts.get(rank, 0) + 1
-        
-        counts = sorted(rank_counts.values(), reverse=True)
-        
-        # Determine hand rank
-        if is_straight and is_flush:
-            if values == [10, 11, 12, 13, 14]:
-                return (10, 'Royal Flush')
-            return (9, 'Straight Flush')
-        elif counts == [4, 1]:
-            return (8, 'Four of a Kind')
-        elif counts == [3, 2]:
-            return (7, 'Full House')
-        elif is_flush:
-            return (6, 'Flush')
-        elif is_straight:
-            return (5, 'Straight')
-        elif counts == [3, 1, 1]:
-            return (4, 'Three of a Kind')
-        elif counts == [2, 2, 1]:
-            return (3, 'Two Pair')
-        elif counts == [2, 1, 1, 1]:
-            return (2, 'One Pair')
-        else:
-            return (1, 'High Card')
+        """Get the (category, name) rank of a poker hand"""
+        return hand_category(evaluate_hand(hand))
     
     def finish_game(self):
         """Finish the poker game and determine winner"""
         if self.game_over:
             return False
         
-        self.player_hand_rank = self.get_hand_rank(self.player_hand)
-        self.dealer_hand_rank = self.get_hand_rank(self.dealer_hand)
-        
-        player_rank_value = self.player_hand_rank[0]
-        dealer_rank_value = self.dealer_hand_rank[0]
+        # Full strengths break ties within a category (pair vs pair, kickers)
+        player_strength = evaluate_hand(self.player_hand)
+        dealer_strength = evaluate_hand(self.dealer_hand)
+        self.player_hand_rank = hand_category(player_strength)
+        self.dealer_hand_rank = hand_category(dealer_strength)
         
-        if player_rank_value > dealer_rank_value:
+        if player_strength > dealer_strength:
             self.result = 'win'
             self.winnings = self.bet_amount * 2
-        elif player_rank_value < dealer_rank_value:
+        elif player_strength < dealer_strength:
             self.result = 'lose'
             self.winnings = 0
         else:
@@ -0,0 +1,233 @@
+"""
+Provably fair outcome service
+
+Session games (mines, tower, plinko) draw every random decision from
+HMAC-SHA256(server_seed, "client_seed:nonce:cursor"). Players see the SHA-256
+of the server seed before they play and the seed itself once the game is over,
+so any outcome can be recomputed offline with verify_outcome().
+
+Crash rounds come from a reverse hash chain: a random seed is hashed N times,
+the final hash is published as the commitment and rounds consume the chain
+backwards, so every revealed round hash hashes to the previous round's hash.
+All crash points of a chain are computed in bulk when the chain is built and
+each round is an O(1) lookup.
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.games.payout_tables import PLINKO_MIN_ROWS, PLINKO_MAX_ROWS, PLINKO_SESSION_ROWS, mines_ladder, tower_ladder
+from src.games.rng import SERVER_SEED, new_nonce
+from src.utils.logger import game_logger
+
+# Number of rounds precomputed per crash hash chain
+CRASH_CHAIN_LENGTH = int(os.getenv("CRASH_CHAIN_LENGTH", 10_000))
+
+# Public salt mixed into every crash round hash
+CRASH_CHAIN_SALT = os.getenv("CRASH_CHAIN_SALT", "exowin-crash")
+
+# Each HMAC digest is split into 8 floats of 4 bytes
+FLOATS_PER_DIGEST = 8
+
+
+def sha256_hex(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+def hmac_sha256(key: str, message: str) -> bytes:
+    return hmac.new(key.encode(), message.encode(), hashlib.sha256).digest()
+
+def digest_floats(digest: bytes) -> List[float]:
+    """Split a 32-byte digest into 8 uniform floats in [0, 1)"""
+    return [int.from_bytes(digest[i:i + 4], "big") / 2 ** 32 for i in range(0, 32, 4)]
+
+def fair_floats(server_seed: str, client_seed: str, nonce: int) -> Iterator[float]:
+    """Endless stream of uniform floats for one game"""
+    cursor = 0
+    while True:
+        yield from digest_floats(hmac_sha256(server_seed, f"{client_seed}:{nonce}:{cursor}"))
+        cursor += 1
+
+
+# ---- Outcome functions (shared by the games and the verifier) ----
+
+def mines_layout(floats: Iterator[float], grid_size: int, mines_count: int) -> List[int]:
+    """Mine positions picked without replacement (partial Fisher-Yates)"""
+    tiles = list(range(grid_size))
+    positions = []
+    for _ in range(mines_count):
+        positions.append(tiles.pop(int(next(floats) * len(tiles))))
+    return positions
+
+def tower_layout(floats: Iterator[float], levels: int, tiles_per_level: int) -> List[List[bool]]:
+    """One safe tile per level"""
+    layout = []
+    for _ in range(levels):
+        level_tiles = [False] * tiles_per_level
+        level_tiles[int(next(floats) * tiles_per_level)] = True
+        layout.append(level_tiles)
+    return layout
+
+def plinko_bits(floats: Iterator[float], rows: int) -> int:
+    """All bounces of a drop from one float, bit i set = right at row i"""
+    return int(next(floats) * (1 << rows))
+
+def plinko_bucket(bits: int) -> int:
+    """Landing bucket: the number of right bounces"""
+    return bin(bits).count("1")
+
+def plinko_path(bits: int, rows: int) -> List[int]:
+    """Bucket index after each row, only built when a client draws the drop"""
+    path = [0]
+    for row in range(rows):
+        path.append(path[-1] + ((bits >> row) & 1))
+    return path
+
+def crash_point_from_floats(r: float, u: float) -> float:
+    """Crash point with the CrashGame house-edge distribution"""
+    if r < 0.01:  # 1% chance for a very early crash (below 1.1x)
+        return 1.0 + 0.1 * u
+    elif r < 0.05:  # 4% chance for an early crash (1.1x to 1.5x)
+        return 1.1 + 0.4 * u
+    else:  # 95% chance for a normal distribution
+        return 0.9 / ((1.0 - u) ** 0.7)
+
+def crash_point(round_hash: str, salt: str = CRASH_CHAIN_SALT) -> float:
+    """Crash point of a round = f(HMAC-SHA256(round_hash, salt))"""
+    r, u = digest_floats(hmac_sha256(round_hash, salt))[:2]
+    return crash_point_from_floats(r, u)
+
+
+class FairSession:
+    """Seed pair for one session game"""
+
+    def __init__(self, client_seed: Optional[str] = None, nonce: Optional[int] = None,
+                 server_seed: Optional[str] = None):
+        self.nonce = new_nonce() if nonce is None else nonce
+        # Derived from the master seed, so revealing it never reveals GAME_SERVER_SEED
+        self.server_seed = server_seed or hmac.new(SERVER_SEED, f"fair:{self.nonce}".encode(), hashlib.sha256).hexdigest()
+        self.server_seed_hash = sha256_hex(self.server_seed)
+        self.client_seed = client_seed or secrets.token_hex(8)
+        self.revealed = False
+
+    def floats(self) -> Iterator[float]:
+        return fair_floats(self.server_seed, self.client_seed, self.nonce)
+
+    def reveal(self):
+        self.revealed = True
+
+    def public_state(self) -> Dict[str, Any]:
+        """Commitment while playing, full seed pair once revealed"""
+        state = {
+            'server_seed_hash': self.server_seed_hash,
+            'client_seed': self.client_seed,
+            'nonce': self.nonce
+        }
+        if self.revealed:
+            state['server_seed'] = self.server_seed
+        return state
+
+
+class CrashHashChain:
+    """Precomputed reverse hash chain of crash rounds"""
+
+    def __init__(self, length: int = CRASH_CHAIN_LENGTH, salt: str = CRASH_CHAIN_SALT, seed: Optional[str] = None):
+        hashes = [seed or secrets.token_hex(32)]
+        for _ in range(length - 1):
+            hashes.append(sha256_hex(hashes[-1]))
+        # Rounds are played backwards, the last generated hash comes first
+        hashes.reverse()
+
+        self.salt = salt
+        self.hashes = tuple(hashes)
+        self.terminal_hash = sha256_hex(hashes[0])
+        self.crash_points = tuple(crash_point(round_hash, salt) for round_hash in hashes)
+        self._next_round = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.hashes) - self._next_round
+
+    def next_round(self) -> Optional[Tuple[int, str, float]]:
+        """Claim the next round: (round_id, round_hash, crash_point), None when exhausted"""
+        with self._lock:
+            round_id = self._next_round
+            if round_id >= len(self.hashes):
+                return None
+            self._next_round += 1
+        return round_id, self.hashes[round_id], self.crash_points[round_id]
+
+
+_crash_chain: Optional[CrashHashChain] = None
+_crash_chain_lock = threading.Lock()
+
+def next_crash_round() -> Tuple[str, int, str, float]:
+    """Next crash round as (terminal_hash, round_id, round_hash, crash_point)"""
+    global _crash_chain
+    while True:
+        chain = _crash_chain
+        if chain is not None:
+            claimed = chain.next_round()
+            if claimed:
+                return (chain.terminal_hash,) + claimed
+
+        with _crash_chain_lock:
+            if _crash_chain is chain:
+                _crash_chain = CrashHashChain()
+                game_logger.info(f"New crash hash chain of {len(_crash_chain)} rounds, commitment {_crash_chain.terminal_hash}")
+
+def verify_crash_chain(round_hash: str, terminal_hash: str, max_rounds: int = CRASH_CHAIN_LENGTH) -> Optional[int]:
+    """Round id of round_hash in the chain committed to by terminal_hash, None if not part of it"""
+    current = round_hash
+    for steps in range(max_rounds):
+        current = sha256_hex(current)
+        if current == terminal_hash:
+            return steps
+    return None
+
+
+# ---- Verification ----
+
+def verify_outcome(game: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Recompute a historical outcome from its revealed seeds"""
+    if game == 'crash':
+        round_hash = params['round_hash']
+        result = {'crash_point': crash_point(round_hash, params.get('salt', CRASH_CHAIN_SALT))}
+        if params.get('terminal_hash'):
+            result['round_id'] = verify_crash_chain(round_hash, params['terminal_hash'])
+            result['chain_valid'] = result['round_id'] is not None
+        return result
+
+    server_seed = params['server_seed']
+    floats = fair_floats(server_seed, params['client_seed'], int(params['nonce']))
+    result = {'server_seed_hash': sha256_hex(server_seed)}
+
+    # Only boards the games actually offer; the ladder lookups raise ValueError otherwise
+    if game == 'mines':
+        grid_size, mines_count = int(params.get('grid_size', 25)), int(params.get('mines_count', 5))
+        mines_ladder(grid_size, mines_count)
+        result['mines_positions'] = mines_layout(floats, grid_size, mines_count)
+    elif game == 'tower':
+        levels, tiles_per_level = int(params.get('levels', 8)), int(params.get('tiles_per_level', 4))
+        tower_ladder(levels, tiles_per_level, 1)
+        result['tower_layout'] = tower_layout(floats, levels, tiles_per_level)
+    elif game == 'plinko':
+        rows = int(params.get('rows', PLINKO_SESSION_ROWS))
+        if not PLINKO_MIN_ROWS <= rows <= PLINKO_MAX_ROWS:
+            raise ValueError(f"Unsupported plinko board: {rows} rows")
+        bits = plinko_bits(floats, rows)
+        result['path_bits'] = bits
+        result['final_slot'] = plinko_bucket(bits)
+        result['ball_path'] = plinko_path(bits, rows)
+    else:
+        raise ValueError(f"Unsupported game for verification: {game}")
+
+    if params.get('server_seed_hash'):
+        result['seed_valid'] = result['server_seed_hash'] == params['server_seed_hash']
+    return result
@@ -0,0 +1,56 @@
+"""
+Per-session random number generators
+
+Every game session gets its own generator derived from the server seed and a
+nonce with HMAC-SHA256, so no code path ever reseeds the module-global
+`random` generator. Sessions on different threads never share state, and a
+nonce always reproduces the same generator for as long as the server seed is
+unchanged.
+"""
+import hashlib
+import hmac
+import os
+import random
+import secrets
+from typing import Tuple
+
+import numpy as np
+
+from src.utils.logger import game_logger
+
+# Nonces are handed to the browser, so keep them inside JavaScript's safe integer range
+NONCE_BITS = 53
+
+
+def _load_server_seed() -> bytes:
+    """Server seed from GAME_SERVER_SEED, or a per-process random one"""
+    seed = os.getenv("GAME_SERVER_SEED")
+    if seed:
+        return seed.encode()
+    game_logger.warning("GAME_SERVER_SEED not set, using a random per-process server seed")
+    return secrets.token_bytes(32)
+
+SERVER_SEED = _load_server_seed()
+
+def new_nonce() -> int:
+    """Fresh unpredictable session nonce"""
+    return secrets.randbits(NONCE_BITS)
+
+def derive_seed(nonce, namespace: str = "", server_seed: bytes = None) -> int:
+    """256-bit seed = HMAC-SHA256(server_seed, "namespace:nonce")"""
+    message = f"{namespace}:{nonce}".encode()
+    digest = hmac.new(server_seed or SERVER_SEED, message, hashlib.sha256).digest()
+    return int.from_bytes(digest, "big")
+
+def derive_rng(nonce, namespace: str = "", server_seed: bytes = None) -> random.Random:
+    """Private random.Random for one session"""
+    return random.Random(derive_seed(nonce, namespace, server_seed))
+
+def derive_generator(nonce, namespace: str = "", server_seed: bytes = None) -> np.random.Generator:
+    """Private NumPy Generator for one session"""
+    return np.random.default_rng(derive_seed(nonce, namespace, server_seed))
+
+def new_session_rng(namespace: str = "") -> Tuple[int, random.Random]:
+    """Allocate a nonce and its generator for a new session"""
+    nonce = new_nonce()
+    return nonce, derive_rng(nonce, namespace)
@@ -1,12 +1,141 @@
-import random
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.games.payout_tables import ROULETTE_NUMBERS, RED_NUMBERS, roulette_color
+from src.games.rng import derive_rng, new_nonce
+from src.utils.error_handler import InvalidBetError
 from src.database import get_user, update_user_balance, record_transaction, record_game
 
 # Store active roulette games for webapp
 active_roulette_games = {}
 
+# Total returned per unit stake (stake included) for each bet shape
+STRAIGHT_PAYOUT = 36
+SPLIT_PAYOUT = 18
+STREET_PAYOUT = 12
+CORNER_PAYOUT = 9
+LINE_PAYOUT = 6
+DOZEN_PAYOUT = 3
+EVEN_MONEY_PAYOUT = 2
+
+def _mask(numbers) -> int:
+    """37-bit mask with bit n set for every winning number n"""
+    mask = 0
+    for number in numbers:
+        mask |= 1 << number
+    return mask
+
+_BLACK_NUMBERS = frozenset(range(1, 37)) - RED_NUMBERS
+
+# Outside bets: fixed name -> (winning mask, payout)
+OUTSIDE_BETS = {
+    'red': (_mask(RED_NUMBERS), EVEN_MONEY_PAYOUT),
+    'black': (_mask(_BLACK_NUMBERS), EVEN_MONEY_PAYOUT),
+    'even': (_mask(range(2, 37, 2)), EVEN_MONEY_PAYOUT),
+    'odd': (_mask(range(1, 37, 2)), EVEN_MONEY_PAYOUT),
+    'low': (_mask(range(1, 19)), EVEN_MONEY_PAYOUT),
+    'high': (_mask(range(19, 37)), EVEN_MONEY_PAYOUT),
+    'first_dozen': (_mask(range(1, 13)), DOZEN_PAYOUT),
+    'second_dozen': (_mask(range(13, 25)), DOZEN_PAYOUT),
+    'third_dozen': (_mask(range(25, 37)), DOZEN_PAYOUT),
+    'first_column': (_mask(range(1, 37, 3)), DOZEN_PAYOUT),
+    'second_column': (_mask(range(2, 37, 3)), DOZEN_PAYOUT),
+    'third_column': (_mask(range(3, 37, 3)), DOZEN_PAYOUT),
+}
+for _index, _name in enumerate(('first', 'second', 'third'), start=1):
+    OUTSIDE_BETS[f'dozen_{_index}'] = OUTSIDE_BETS[f'{_name}_dozen']
+    OUTSIDE_BETS[f'column_{_index}'] = OUTSIDE_BETS[f'{_name}_column']
+
+def _adjacent(a: int, b: int) -> bool:
+    """Numbers sharing an edge on the layout (0 touches 1, 2 and 3)"""
+    a, b = min(a, b), max(a, b)
+    if a == 0:
+        return b in (1, 2, 3)
+    return b == a + 3 or (b == a + 1 and a % 3 != 0)
+
+def _parse_bet(bet_type: str) -> Tuple[int, int]:
+    """(winning mask, payout) of an inside bet spelled out as kind_numbers"""
+    kind, _, rest = bet_type.partition('_')
+    try:
+        numbers = [int(part) for part in rest.split('_')]
+    except ValueError:
+        raise InvalidBetError(f"Unknown roulette bet: {bet_type}")
+
+    if kind == 'number' and len(numbers) == 1 and 0 <= numbers[0] <= 36:
+        return _mask(numbers), STRAIGHT_PAYOUT
+    if kind == 'split' and len(numbers) == 2 and all(0 <= n <= 36 for n in numbers) and _adjacent(*numbers):
+        return _mask(numbers), SPLIT_PAYOUT
+    if len(numbers) == 1:
+        first = numbers[0]
+        # Streets and six lines start at the left of a row
+        if kind == 'street' and 1 <= first <= 34 and first % 3 == 1:
+            return _mask(range(first, first + 3)), STREET_PAYOUT
+        if kind == 'line' and 1 <= first <= 31 and first % 3 == 1:
+            return _mask(range(first, first + 6)), LINE_PAYOUT
+        # Corners are named by their top-left number
+        if kind == 'corner' and 1 <= first <= 32 and first % 3 != 0:
+            return _mask((first, first + 1, first + 3, first + 4)), CORNER_PAYOUT
+    raise InvalidBetError(f"Unknown roulette bet: {bet_type}")
+
+# Every valid bet under its canonical name, built once; lookups never grow it
+BET_TABLE = dict(OUTSIDE_BETS)
+for _number in range(37):
+    BET_TABLE[f'number_{_number}'] = _parse_bet(f'number_{_number}')
+    for _other in range(_number + 1, 37):
+        if _adjacent(_number, _other):
+            BET_TABLE[f'split_{_number}_{_other}'] = BET_TABLE[f'split_{_other}_{_number}'] = \
+                _parse_bet(f'split_{_number}_{_other}')
+for _kind in ('street', 'line', 'corner'):
+    for _number in range(1, 37):
+        try:
+            BET_TABLE[f'{_kind}_{_number}'] = _parse_bet(f'{_kind}_{_number}')
+        except InvalidBetError:
+            pass
+BET_TABLE = MappingProxyType(BET_TABLE)
+
+# Longest bet name the parser will look at
+MAX_BET_NAME = 32
+
+def compile_bet(bet_type: str) -> Tuple[int, int]:
+    """(winning mask, payout) of a bet type such as 'red', 'number_17',
+    'split_17_20', 'street_16', 'corner_17', 'line_16' or 'column_2'"""
+    compiled = BET_TABLE.get(bet_type)
+    if compiled is not None:
+        return compiled
+    # Spellings such as 'number_017' parse to a canonical bet
+    if not isinstance(bet_type, str) or len(bet_type) > MAX_BET_NAME:
+        raise InvalidBetError(f"Unknown roulette bet: {str(bet_type)[:MAX_BET_NAME]}")
+    return _parse_bet(bet_type)
+
+def compile_slip(bets: Dict[str, float]) -> np.ndarray:
+    """Payout of a whole bet slip for each of the 37 numbers"""
+    payouts = np.zeros(ROULETTE_NUMBERS)
+    numbers = np.arange(ROULETTE_NUMBERS)
+    for bet_type, amount in bets.items():
+        mask, payout = compile_bet(bet_type)
+        payouts += ((mask >> numbers) & 1) * (amount * payout)
+    return payouts
+
+def settle_bets(bets: Dict[str, float], winning_number: int) -> Tuple[float, List[Dict]]:
+    """Total winnings and per-bet details of a bet slip for one spin"""
+    total = 0
+    details = []
+    for bet_type, amount in bets.items():
+        mask, payout = compile_bet(bet_type)
+        if mask >> winning_number & 1:
+            won = amount * payout
+            total += won
+            details.append({'bet_type': bet_type, 'amount': amount, 'payout': won})
+    return total, details
+
 class RouletteGame:
-    def __init__(self, user_id):
+    def __init__(self, user_id, rng=None, nonce=None):
         self.user_id = user_id
+        # Each game spins its own derived generator; the nonce reproduces it
+        self.nonce = new_nonce() if nonce is None else nonce
+        self.rng = rng or derive_rng(self.nonce, 'roulette')
         self.bets = {}  # {bet_type: amount}
         self.total_bet = 0
         self.winning_number = None
@@ -14,10 +143,16 @@ class RouletteGame:
         self.game_over = False
         self.result = None
         self.winnings = 0
+        self.payouts = {}  # {bet_type: payout} for winning bets
         self.payout_details = []
     
     def place_bet(self, bet_type, amount):
         """Place a bet on the roulette table"""
+        try:
+            compile_bet(bet_type)
+        except InvalidBetError:
+            return False
+        
         if bet_type in self.bets:
             self.bets[bet_type] += amount
         else:
@@ -27,15 +162,8 @@ class RouletteGame:
     
     def spin(self):
         """Spin the roulette wheel"""
-        self.winning_number = random.randint(0, 36)
-        
-        # Determine color (0 is green, 1-10 and 19-28 red/black alternate, 11-18 and 29-36 black/red alternate)
-        if self.winning_number == 0:
-            self.winning_color = 'green'
-        elif self.winning_number in [1,3,5,7,9,12,14,16,18,19,21,23,25,27,30,32,34,36]:
-            self.winning_color = 'red'
-        else:
-            self.winning_color = 'black'
+        self.winning_number = self.rng.randint(0, 36)
+        self.winning_color = roulette_color(self.winning_number)
         
         # Calculate winnings
         self.calculate_winnings()
@@ -43,39 +171,68 @@ class RouletteGame:
         return self.winning_number
     
     def calculate_winnings(self):
-        """Calculate winnings based on bets and winning number"""
-        total_winnings = 0
+        """Settle every bet on the slip against the winning number"""
+        self.winnings, self.payout_details = settle_bets(self.bets, self.winning_number)
+        self.payouts = {detail['bet_type']: detail['payout'] for detail in self.payout_details}
+        self.result = 'win' if self.winnings > 0 else 'lose'
+    
+    def get_game_state(self):
+        """Get current game state"""
+        return {
+            'bets': self.bets,
+            'total_bet': self.total_bet,
+            'winning_number': self.winning_number,
+            'winning_color': self.winning_color,
+            'winnings': self.winnings,
+            'payout_details': self.payout_details,
+            'game_over': self.game_over,
+            'result': self.result,
+            'nonce': self.nonce
+        }
+
+class RouletteTable:
+    """Shared table: every player's bets are settled against one spin in bulk"""
+    
+    def __init__(self):
+        self.player_ids = []
+        self.masks = []
+        self.stakes = []
+        self.payouts = []
+        self.nonce = None  # Nonce of the last spin
+    
+    def place_bet(self, player_id, bet_type, amount):
+        mask, payout = compile_bet(bet_type)
+        self.player_ids.append(player_id)
+        self.masks.append(mask)
+        self.stakes.append(amount)
+        self.payouts.append(payout)
+        return True
+    
+    def settle(self, winning_number):
+        """{player_id: {'stake': total staked, 'winnings': total returned}} for one spin"""
+        if not self.player_ids:
+            return {}
         
-        for bet_type, bet_amount in self.bets.items():
-            payout = 0
-            
-            if bet_type == 'red' and self.winning_color == 'red':
-                payout = bet_amount * 2
-            elif bet_type == 'black' and self.winning_color == 'black':
-                payout = bet_amount * 2
-            elif bet_type == 'even' and self.winning_number % 2 == 0 and self.winning_number != 0:
-                payout = bet_amount * 2
-            elif bet_type == 'odd' and self.winning_number % 2 == 1:
-                payout = bet_amount * 2
-            elif bet_type == 'low' and 1 <= self.winning_number <= 18:
-                payout = bet_amount * 2
-            elif bet_type == 'high' and 19 <= self.winning_number <= 36:
-                payout = bet_amount * 2
-            elif bet_type.startswith('number_') and int(bet_type.split('_')[1]) == self.winning_number:
-                payout = bet_amount * 36
-            elif bet_type == 'first_dozen' and 1 <= self.winning_number <= 12:
-                payout = bet_amount * 3
-            elif bet_type == 'second_dozen' and 13 <= self.winning_number <= 24:
-                payout = bet_amount * 3
-            elif bet_type == 'third_dozen' and 25 <= self.winning_number <= 36:
-                payout = bet_amount * 3
-            
-            if payout > 0:
-                self.payouts[bet_type] = payout
-                total_winnings += payout
+        players, index = np.unique(np.asarray(self.player_ids), return_inverse=True)
+        masks = np.asarray(self.masks, dtype=np.uint64)
+        stakes = np.asarray(self.stakes, dtype=np.float64)
+        won = ((masks >> np.uint64(winning_number)) & np.uint64(1)).astype(bool)
+        returned = np.where(won, stakes * np.asarray(self.payouts, dtype=np.float64), 0.0)
         
-        self.winnings = total_winnings
-        self.result = 'win' if total_winnings > 0 else 'lose'
+        stake_totals = np.bincount(index, weights=stakes, minlength=len(players))
+        winnings = np.bincount(index, weights=returned, minlength=len(players))
+        return {
+            player: {'stake': stake, 'winnings': won_amount}
+            for player, stake, won_amount in zip(players.tolist(), stake_totals.tolist(), winnings.tolist())
+        }
+    
+    def spin(self, nonce=None):
+        """Spin once for the whole table, from a generator derived for this spin, and clear it"""
+        self.nonce = new_nonce() if nonce is None else nonce
+        winning_number = derive_rng(self.nonce, 'roulette_table').randint(0, 36)
+        results = self.settle(winning_number)
+        self.player_ids, self.masks, self.stakes, self.payouts = [], [], [], []
+        return winning_number, results
 
 def create_roulette_game(user_id):
     """Create a new roulette game"""
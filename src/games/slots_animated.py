@@ -4,9 +4,13 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction, record_game
 from src.utils.formatting import format_money
+from src.games.engines import ScoredDiceEngine, register_engine
+from src.utils.error_handler import GameError, InsufficientFundsError
+from src.games.lobbies import lobby_manager, roll_for_players, collect_entry_fees, pay_prizes, finish_lobby, LOBBY_CANCELLED
 
-# Active slots tournaments
-active_slots_tournaments = {}
+# Slots tournaments: everyone spins once, best spin takes the pot
+SLOTS_TOURNAMENT_PLAYERS = 8
+SLOTS_TOURNAMENT_DEFAULT_FEE = 10.0
 
 # Slot machine payouts (based on Telegram's slot machine values)
 SLOT_PAYOUTS = {
@@ -23,6 +27,27 @@ SLOT_PAYOUTS = {
     (1, 2, 3): {"multiplier": 5, "name": "🍋🍊🍇 Fruit Mix"},
     (4, 5, 6): {"multiplier": 8, "name": "🍒🔔💎 Premium Mix"}
 }
+
+# Telegram's slot machine returns 1-64; (first value, last value, multiplier, description)
+SLOT_VALUE_BANDS = (
+    (3, 5, 2, "Two of a Kind! 2x"),
+    (6, 9, 5, "🍋🍊🍇 Fruit Mix! 5x"),
+    (10, 14, 8, "🍒🔔💎 Premium Mix! 8x"),
+    (15, 24, 10, "🍋🍋🍋 Triple Lemons! 10x"),
+    (25, 34, 15, "🍊🍊🍊 Triple Oranges! 15x"),
+    (35, 44, 20, "🍇🍇🍇 Triple Grapes! 20x"),
+    (45, 54, 30, "🍒🍒🍒 Triple Cherries! 30x"),
+    (55, 59, 50, "🔔🔔🔔 Triple Bells! 50x"),
+    (60, 63, 100, "💎💎💎 Triple Diamonds! 100x"),
+    (64, 64, 777, "🎰 JACKPOT! 777x")
+)
+SLOT_VALUE_SCORING = {value: {"multiplier": 0, "name": "No match"} for value in range(1, 65)}
+for low, high, multiplier, name in SLOT_VALUE_BANDS:
+    for value in range(low, high + 1):
+        SLOT_VALUE_SCORING[value] = {"multiplier": multiplier, "name": name}
+
+slots_engine = register_engine(ScoredDiceEngine('telegram_slots', SLOT_VALUE_SCORING))
+
 async def slots_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /slots command"""
     # Handle both direct commands and callback queries
@@ -112,6 +137,20 @@ async def slots_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             parse_mode='Markdown'
         )
     
+    elif action == "tournament" and len(data) >= 3:
+        # Tournament lobby: join/create, enter, start, cancel
+        step = data[2]
+        if step == "join":
+            await join_slots_tournament(query, float(data[3]))
+        elif step == "create":
+            await join_slots_tournament(query, SLOTS_TOURNAMENT_DEFAULT_FEE, new_lobby=True)
+        elif step == "enter":
+            await enter_slots_tournament(query, data[3])
+        elif step == "start":
+            await start_slots_tournament(query, data[3])
+        elif step == "cancel":
+            await cancel_slots_tournament(query, data[3])
+    
     elif action == "tournament":
         # Show tournament options
         keyboard = [
@@ -199,40 +238,9 @@ async def execute_solo_slots_game(query, bet_amount: float):
     result = slots_message.dice.value
     
     # Calculate winnings based on result
-    winnings = 0
-    win_description = "No match"
-    
-    # Telegram slot machine returns values 1-64, we need to map this to our payout system
-    if result == 64:  # Jackpot (777)
-        winnings = bet_amount * 777
-        win_description = "🎰 JACKPOT! 777x"
-    elif result >= 60:  # Triple diamonds
-        winnings = bet_amount * 100
-        win_description = "💎💎💎 Triple Diamonds! 100x"
-    elif result >= 55:  # Triple bells
-        winnings = bet_amount * 50
-        win_description = "🔔🔔🔔 Triple Bells! 50x"
-    elif result >= 45:  # Triple cherries
-        winnings = bet_amount * 30
-        win_description = "🍒🍒🍒 Triple Cherries! 30x"
-    elif result >= 35:  # Triple grapes
-        winnings = bet_amount * 20
-        win_description = "🍇🍇🍇 Triple Grapes! 20x"
-    elif result >= 25:  # Triple oranges
-        winnings = bet_amount * 15
-        win_description = "🍊🍊🍊 Triple Oranges! 15x"
-    elif result >= 15:  # Triple lemons
-        winnings = bet_amount * 10
-        win_description = "🍋🍋🍋 Triple Lemons! 10x"
-    elif result >= 10:  # Premium mix
-        winnings = bet_amount * 8
-        win_description = "🍒🔔💎 Premium Mix! 8x"
-    elif result >= 6:   # Fruit mix
-        winnings = bet_amount * 5
-        win_description = "🍋🍊🍇 Fruit Mix! 5x"
-    elif result >= 3:   # Two of a kind
-        winnings = bet_amount * 2
-        win_description = "Two of a Kind! 2x"
+    outcome = slots_engine.play(bet_amount, {'value': result})
+    winnings = outcome['winnings']
+    win_description = outcome['scoring']['name']
     
     # Record game
     game_id = await record_game(
@@ -282,5 +290,133 @@ async def execute_solo_slots_game(query, bet_amount: float):
     
     await query.message.reply_text(result_text, reply_markup=reply_markup, parse_mode='Markdown')
 
+def tournament_text(lobby) -> str:
+    return (
+        f"🏆 **SLOTS TOURNAMENT**\n\n"
+        f"💰 Entry Fee: {format_money(lobby.entry_fee)}\n"
+        f"🏆 Prize Pool: {format_money(lobby.pot)}\n"
+        f"👥 Players: {len(lobby.players)}/{lobby.capacity}\n" +
+        "\n".join(f"• {name}" for name in lobby.players.values()) +
+        "\n\nEveryone spins once, the best spin wins the pot!"
+    )
+
+def tournament_keyboard(lobby) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("🎰 Enter", callback_data=f"slots_tournament_enter_{lobby.lobby_id}"),
+            InlineKeyboardButton("▶️ Start", callback_data=f"slots_tournament_start_{lobby.lobby_id}")
+        ],
+        [InlineKeyboardButton("❌ Cancel", callback_data=f"slots_tournament_cancel_{lobby.lobby_id}")]
+    ])
+
+async def join_slots_tournament(query, entry_fee: float, new_lobby: bool = False):
+    """Join the open tournament for this fee in the chat, or open one"""
+    user = await get_user(query.from_user.id)
+    if user["balance"] < entry_fee:
+        await query.edit_message_text(
+            f"❌ Insufficient funds!\n"
+            f"Balance: {format_money(user['balance'])}\n"
+            f"Required: {format_money(entry_fee)}"
+        )
+        return
+    
+    chat_id = query.message.chat.id
+    lobby = None if new_lobby else lobby_manager.find_open("slots", entry_fee, chat_id)
+    if lobby is None:
+        lobby = lobby_manager.create(
+            "slots", query.from_user.id, query.from_user.first_name, entry_fee,
+            chat_id=chat_id, capacity=SLOTS_TOURNAMENT_PLAYERS
+        )
+        lobby.message = query.message
+        await query.edit_message_text(tournament_text(lobby), reply_markup=tournament_keyboard(lobby), parse_mode='Markdown')
+    else:
+        await enter_slots_tournament(query, lobby.lobby_id)
+
+async def enter_slots_tournament(query, lobby_id: str):
+    """Enter a tournament; it starts by itself once full"""
+    lobby = lobby_manager.get(lobby_id)
+    if lobby is None:
+        await query.edit_message_text("❌ Tournament not found or already finished!")
+        return
+    
+    user = await get_user(query.from_user.id)
+    if user["balance"] < lobby.entry_fee:
+        await query.answer(f"Insufficient funds! Need {format_money(lobby.entry_fee)}")
+        return
+    
+    try:
+        lobby.join(query.from_user.id, query.from_user.first_name)
+    except GameError as e:
+        await query.answer(str(e))
+        return
+    
+    if lobby.is_full:
+        await play_slots_tournament(query, lobby)
+    else:
+        await query.edit_message_text(tournament_text(lobby), reply_markup=tournament_keyboard(lobby), parse_mode='Markdown')
+
+async def start_slots_tournament(query, lobby_id: str):
+    """Host starts the tournament with the players entered so far"""
+    lobby = lobby_manager.get(lobby_id)
+    if lobby is None:
+        await query.edit_message_text("❌ Tournament not found!")
+        return
+    
+    if query.from_user.id != lobby.host_id:
+        await query.answer("Only the host can start the tournament!")
+        return
+    
+    await play_slots_tournament(query, lobby)
+
+async def cancel_slots_tournament(query, lobby_id: str):
+    """Host cancels a tournament before it starts"""
+    lobby = lobby_manager.get(lobby_id)
+    if lobby is None:
+        await query.edit_message_text("❌ Tournament not found!")
+        return
+    
+    if query.from_user.id != lobby.host_id:
+        await query.answer("Only the host can cancel the tournament!")
+        return
+    
+    lobby_manager.close(lobby_id, LOBBY_CANCELLED)
+    await query.edit_message_text("❌ Tournament cancelled. No entry fees were taken.")
+
+async def play_slots_tournament(query, lobby):
+    """Spin once per player; the highest slot value (777 = 64) takes the pot"""
+    try:
+        lobby.start()
+    except GameError as e:
+        await query.answer(str(e))
+        return
+    
+    try:
+        try:
+            await collect_entry_fees(lobby)
+        except InsufficientFundsError as e:
+            await query.edit_message_text(f"❌ Tournament cancelled!\n{e}")
+            return
+        
+        await query.edit_message_text(
+            f"🎰 **TOURNAMENT SPINNING!**\n\n🏆 Prize Pool: {format_money(lobby.pot)}",
+            parse_mode='Markdown'
+        )
+        standings = await roll_for_players(lobby, query.message, "🎰", delay=3)
+        prizes = lobby.winner_takes_all()
+        await pay_prizes(lobby, prizes)
+        
+        result_text = "🏆 **TOURNAMENT RESULTS**\n\n"
+        for place, (player_id, score) in enumerate(standings, 1):
+            prize = prizes[player_id]
+            result_text += f"{place}. {lobby.players[player_id]}: 🎰 {int(score)}" + (f" 🏆 +{format_money(prize)}" if prize else "") + "\n"
+        
+        keyboard = [[
+            InlineKeyboardButton("🏆 New Tournament", callback_data="slots_tournament"),
+            InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+        ]]
+        await query.message.reply_text(result_text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='Markdown')
+    finally:
+        await finish_lobby(lobby)
+
 # Export the callback handler
 slots_callback_handler = slots_callback
\ No newline at end of file
@@ -1,11 +1,12 @@
-import random
+from src.games.payout_tables import TOWER_LEVELS, TOWER_TILES, TOWER_SAFE_TILES, tower_ladder
+from src.games.provably_fair import FairSession, tower_layout
 from src.database import get_user, update_user_balance, record_transaction, record_game
 
 # Store active tower games for webapp
 active_tower_games = {}
 
 class TowerGame:
-    def __init__(self, user_id, levels=8, tiles_per_level=4):
+    def __init__(self, user_id, levels=TOWER_LEVELS, tiles_per_level=TOWER_TILES, client_seed=None, fair=None):
         self.user_id = user_id
         self.levels = levels
         self.tiles_per_level = tiles_per_level
@@ -17,18 +18,16 @@ class TowerGame:
         self.result = None
         self.winnings = 0
         self.cashed_out = False
+        self.payout_ladder = tower_ladder(levels, tiles_per_level, TOWER_SAFE_TILES)
+        self.fair = fair or FairSession(client_seed)
         
         # Generate tower layout
         self.generate_tower()
     
     def generate_tower(self):
         """Generate the tower layout with safe tiles and traps"""
-        self.tower_layout = []
-        for level in range(self.levels):
-            # Each level has 1 safe tile and 3 traps (for 4 tiles per level)
-            level_tiles = [True] + [False] * (self.tiles_per_level - 1)
-            random.shuffle(level_tiles)
-            self.tower_layout.append(level_tiles)
+        # Each level has 1 safe tile and 3 traps (for 4 tiles per level)
+        self.tower_layout = tower_layout(self.fair.floats(), self.levels, self.tiles_per_level)
     
     def start_game(self, bet_amount):
         """Start a new tower game"""
@@ -55,6 +54,7 @@ class TowerGame:
             # Check if reached the top
             if self.current_level >= self.levels:
                 self.game_over = True
+                self.fair.reveal()
                 self.result = 'completed'
                 self.winnings = self.bet_amount * self.current_multiplier
             
@@ -62,15 +62,15 @@ class TowerGame:
         else:
             # Hit a trap
             self.game_over = True
+            self.fair.reveal()
             self.result = 'trap'
             self.winnings = 0
             return {'success': False, 'level': self.current_level}
     
     def calculate_multiplier(self):
         """Calculate current multiplier based on level reached"""
-        # Multiplier increases exponentially with each level
-        # Base multiplier of 1.5x per level
-        self.current_multiplier = (1.5 ** self.current_level)
+        # Fair odds of clearing this many levels, less the house edge
+        self.current_multiplier = self.payout_ladder[self.current_level]
     
     def cash_out(self):
         """Cash out at current level"""
@@ -79,6 +79,7 @@ class TowerGame:
         
         self.cashed_out = True
         self.game_over = True
+        self.fair.reveal()
         self.result = 'cashout'
         self.winnings = self.bet_amount * self.current_multiplier
         return True
@@ -90,16 +91,18 @@ class TowerGame:
             'tiles_per_level': self.tiles_per_level,
             'current_level': self.current_level,
             'current_multiplier': self.current_multiplier,
+            'payout_ladder': list(self.payout_ladder),
             'game_over': self.game_over,
             'result': self.result,
             'winnings': self.winnings,
             'bet_amount': self.bet_amount,
-            'cashed_out': self.cashed_out
+            'cashed_out': self.cashed_out,
+            'fairness': self.fair.public_state()
         }
 
-def create_tower_game(user_id, bet_amount):
+def create_tower_game(user_id, bet_amount, client_seed=None):
     """Create a new tower game"""
-    game = TowerGame(user_id)
+    game = TowerGame(user_id, client_seed=client_seed)
     game.start_game(bet_amount)
     active_tower_games[user_id] = game
     return game
@@ -1,12 +1,14 @@
-import random
 import asyncio
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction, record_game
 from src.utils.formatting import format_money
+from src.utils.error_handler import GameError, InsufficientFundsError
+from src.games.engines import SegmentWheelEngine, register_engine
+from src.games.lobbies import lobby_manager, collect_entry_fees, pay_prizes, finish_lobby, LOBBY_CANCELLED
 
-# Active wheel games for multiplayer
-active_wheel_games = {}
+# Most players in one multiplayer wheel game
+WHEEL_MAX_PLAYERS = 10
 
 # Wheel segments with different multipliers
 WHEEL_SEGMENTS = {
@@ -18,6 +20,8 @@ WHEEL_SEGMENTS = {
     6: {"color": "⚫", "multiplier": 50, "probability": 0.03}
 }
 
+wheel_engine = register_engine(SegmentWheelEngine('telegram_wheel', WHEEL_SEGMENTS))
+
 async def wheel_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /wheel command"""
     # Handle both direct commands and callback queries
@@ -183,6 +187,11 @@ async def wheel_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Handle starting multiplayer game
         game_id = data[2]
         await start_wheel_game(query, game_id)
+    
+    elif action == "cancel":
+        # Handle cancelling multiplayer game
+        game_id = data[2]
+        await cancel_wheel_game(query, game_id)
 
 async def execute_solo_wheel_game(query, segment_id: int, bet_amount: float):
     """Execute a solo wheel game with animation"""
@@ -224,15 +233,7 @@ async def execute_solo_wheel_game(query, segment_id: int, bet_amount: float):
         )
     
     # Determine result based on probability
-    rand = random.random()
-    cumulative_prob = 0
-    result_segment_id = 1
-    
-    for seg_id, seg_data in WHEEL_SEGMENTS.items():
-        cumulative_prob += seg_data['probability']
-        if rand <= cumulative_prob:
-            result_segment_id = seg_id
-            break
+    result_segment_id = wheel_engine.spin()
     
     result_segment = WHEEL_SEGMENTS[result_segment_id]
     won = segment_id == result_segment_id
@@ -281,6 +282,17 @@ async def execute_solo_wheel_game(query, segment_id: int, bet_amount: float):
     
     await query.message.reply_text(result_text, reply_markup=reply_markup, parse_mode='Markdown')
 
+def wheel_lobby_keyboard(lobby_id: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("🎯 Join Game", callback_data=f"wheel_join_{lobby_id}"),
+            InlineKeyboardButton("🎡 Start Spin", callback_data=f"wheel_start_{lobby_id}")
+        ],
+        [
+            InlineKeyboardButton("❌ Cancel", callback_data=f"wheel_cancel_{lobby_id}")
+        ]
+    ])
+
 async def start_multiplayer_wheel(query, context: ContextTypes.DEFAULT_TYPE, bet_amount: float):
     """Start a multiplayer wheel game"""
     user = await get_user(query.from_user.id)
@@ -293,207 +305,168 @@ async def start_multiplayer_wheel(query, context: ContextTypes.DEFAULT_TYPE, bet
         )
         return
     
-    game_id = f"wheel_{query.message.chat.id}_{random.randint(1000, 9999)}"
-    
     # Create new multiplayer game
-    active_wheel_games[game_id] = {
-        'creator': query.from_user.id,
-        'creator_name': query.from_user.first_name,
-        'bet_amount': bet_amount,
-        'players': {},
-        'status': 'waiting',
-        'chat_id': query.message.chat.id
-    }
-    
-    keyboard = [
-        [
-            InlineKeyboardButton("🎯 Join Game", callback_data=f"wheel_join_{game_id}"),
-            InlineKeyboardButton("🎡 Start Spin", callback_data=f"wheel_start_{game_id}")
-        ],
-        [
-            InlineKeyboardButton("❌ Cancel", callback_data=f"wheel_cancel_{game_id}")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    lobby = lobby_manager.create(
+        "wheel", query.from_user.id, query.from_user.first_name, bet_amount,
+        chat_id=query.message.chat.id, capacity=WHEEL_MAX_PLAYERS
+    )
+    lobby.message = query.message
     
     await query.edit_message_text(
         f"🎡 **MULTIPLAYER WHEEL GAME**\n\n"
         f"🎯 Host: {query.from_user.first_name}\n"
         f"💰 Entry Fee: {format_money(bet_amount)}\n"
-        f"👥 Players: 1/10\n\n"
+        f"👥 Players: 1/{WHEEL_MAX_PLAYERS}\n\n"
         f"**How to play:**\n"
         f"• Everyone pays entry fee\n"
         f"• Wheel spins once for all players\n"
         f"• Everyone wins based on result!\n"
         f"• Higher multipliers = bigger wins\n\n"
         f"⏰ Waiting for players to join...",
-        reply_markup=reply_markup,
+        reply_markup=wheel_lobby_keyboard(lobby.lobby_id),
         parse_mode='Markdown'
     )
 
 async def join_wheel_game(query, game_id: str):
     """Join a multiplayer wheel game"""
-    if game_id not in active_wheel_games:
+    lobby = lobby_manager.get(game_id)
+    if lobby is None:
         await query.edit_message_text("❌ Game not found or already finished!")
         return
     
-    game = active_wheel_games[game_id]
     user_id = query.from_user.id
-    
-    if user_id == game['creator']:
+    if user_id == lobby.host_id:
         await query.answer("You're already the host of this game!")
         return
     
-    if user_id in game['players']:
-        await query.answer("You're already in this game!")
-        return
-    
-    if len(game['players']) >= 9:  # Max 10 players (9 + creator)
-        await query.answer("Game is full!")
-        return
-    
     user = await get_user(user_id)
-    if user["balance"] < game['bet_amount']:
-        await query.answer(f"Insufficient funds! Need {format_money(game['bet_amount'])}")
+    if user["balance"] < lobby.entry_fee:
+        await query.answer(f"Insufficient funds! Need {format_money(lobby.entry_fee)}")
         return
     
-    # Add player to game
-    game['players'][user_id] = {
-        'name': query.from_user.first_name,
-        'paid': False
-    }
-    
-    # Update game message
-    player_count = len(game['players']) + 1  # +1 for creator
-    keyboard = [
-        [
-            InlineKeyboardButton("🎯 Join Game", callback_data=f"wheel_join_{game_id}"),
-            InlineKeyboardButton("🎡 Start Spin", callback_data=f"wheel_start_{game_id}")
-        ],
-        [
-            InlineKeyboardButton("❌ Cancel", callback_data=f"wheel_cancel_{game_id}")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    try:
+        lobby.join(user_id, query.from_user.first_name)
+    except GameError as e:
+        await query.answer(str(e))
+        return
     
+    host_name = lobby.players[lobby.host_id]
     await query.edit_message_text(
         f"🎡 **MULTIPLAYER WHEEL GAME**\n\n"
-        f"🎯 Host: {game['creator_name']}\n"
-        f"💰 Entry Fee: {format_money(game['bet_amount'])}\n"
-        f"👥 Players: {player_count}/10\n\n"
+        f"🎯 Host: {host_name}\n"
+        f"💰 Entry Fee: {format_money(lobby.entry_fee)}\n"
+        f"👥 Players: {len(lobby.players)}/{lobby.capacity}\n\n"
         f"**Players joined:**\n"
-        f"• {game['creator_name']} (Host)\n" +
-        "\n".join([f"• {p['name']}" for p in game['players'].values()]) +
+        f"• {host_name} (Host)\n" +
+        "\n".join([f"• {name}" for player_id, name in lobby.players.items() if player_id != lobby.host_id]) +
         f"\n\n⏰ Waiting for more players...",
-        reply_markup=reply_markup,
+        reply_markup=wheel_lobby_keyboard(lobby.lobby_id),
         parse_mode='Markdown'
     )
 
+async def cancel_wheel_game(query, game_id: str):
+    """Cancel a multiplayer wheel game before it starts"""
+    lobby = lobby_manager.get(game_id)
+    if lobby is None:
+        await query.edit_message_text("❌ Game not found!")
+        return
+    
+    if query.from_user.id != lobby.host_id:
+        await query.answer("Only the host can cancel the game!")
+        return
+    
+    lobby_manager.close(game_id, LOBBY_CANCELLED)
+    await query.edit_message_text("❌ Game cancelled. No entry fees were taken.")
+
 async def start_wheel_game(query, game_id: str):
     """Start the multiplayer wheel game"""
-    if game_id not in active_wheel_games:
+    lobby = lobby_manager.get(game_id)
+    if lobby is None:
         await query.edit_message_text("❌ Game not found!")
         return
     
-    game = active_wheel_games[game_id]
-    
-    if query.from_user.id != game['creator']:
+    if query.from_user.id != lobby.host_id:
         await query.answer("Only the host can start the game!")
         return
     
-    if len(game['players']) == 0:
-        await query.answer("Need at least 1 other player to start!")
+    try:
+        lobby.start()
+    except GameError as e:
+        await query.answer(str(e))
         return
     
-    # Collect entry fees from all players
-    all_players = [game['creator']] + list(game['players'].keys())
-    total_pot = 0
-    
-    for player_id in all_players:
-        user = await get_user(player_id)
-        if user["balance"] < game['bet_amount']:
+    try:
+        # Take every player's entry fee in one batch before spinning
+        try:
+            await collect_entry_fees(lobby)
+        except InsufficientFundsError as e:
+            lobby_manager.close(game_id, LOBBY_CANCELLED)
             await query.edit_message_text(
                 f"❌ Game cancelled!\n"
-                f"Player {user['username'] or 'Unknown'} has insufficient funds."
+                f"{e}"
             )
-            del active_wheel_games[game_id]
             return
         
-        await update_user_balance(player_id, -game['bet_amount'])
-        await record_transaction(player_id, -game['bet_amount'], "wheel entry", f"Multiplayer game {game_id}")
-        total_pot += game['bet_amount']
-    
-    # Start the game
-    await query.edit_message_text(
-        f"🎡 **WHEEL SPINNING!**\n\n"
-        f"💰 Total Pot: {format_money(total_pot)}\n"
-        f"👥 Players: {len(all_players)}\n\n"
-        f"🎡 The wheel is spinning... 🎡",
-        parse_mode='Markdown'
-    )
-    
-    # Create spinning animation
-    spin_frames = ["🎡", "🔄", "⭕", "🎯", "🌟", "✨", "💫", "🎊"]
-    
-    for i in range(16):  # Longer animation for suspense
-        await asyncio.sleep(0.3)
-        frame = spin_frames[i % len(spin_frames)]
+        total_pot = lobby.pot
+        player_count = len(lobby.players)
+        
+        # Start the game
         await query.edit_message_text(
             f"🎡 **WHEEL SPINNING!**\n\n"
             f"💰 Total Pot: {format_money(total_pot)}\n"
-            f"👥 Players: {len(all_players)}\n\n"
-            f"{frame} Spinning... {frame}",
+            f"👥 Players: {player_count}\n\n"
+            f"🎡 The wheel is spinning... 🎡",
             parse_mode='Markdown'
         )
-    
-    # Determine result
-    rand = random.random()
-    cumulative_prob = 0
-    result_segment_id = 1
-    
-    for seg_id, seg_data in WHEEL_SEGMENTS.items():
-        cumulative_prob += seg_data['probability']
-        if rand <= cumulative_prob:
-            result_segment_id = seg_id
-            break
-    
-    result_segment = WHEEL_SEGMENTS[result_segment_id]
-    
-    # Calculate winnings for each player
-    individual_winnings = game['bet_amount'] * result_segment['multiplier']
-    
-    # Award winnings to all players
-    for player_id in all_players:
-        await update_user_balance(player_id, individual_winnings)
-        await record_transaction(player_id, individual_winnings, "wheel win", f"Multiplayer game {game_id}")
-        await record_game(player_id, "wheel", game['bet_amount'], "win", individual_winnings)
-    
-    # Create result message
-    result_text = (
-        f"🎉 **WHEEL STOPPED!** 🎉\n\n"
-        f"🎡 **RESULT:** {result_segment['color']} **{result_segment['multiplier']}x**\n\n"
-        f"💰 Entry Fee: {format_money(game['bet_amount'])}\n"
-        f"🏆 Each Player Won: **{format_money(individual_winnings)}**\n"
-        f"📈 Profit per Player: **{format_money(individual_winnings - game['bet_amount'])}**\n\n"
-        f"**All Players Won:**\n"
-    )
-    
-    for player_id in all_players:
-        user = await get_user(player_id)
-        result_text += f"• {user['username'] or 'Unknown'}: +{format_money(individual_winnings - game['bet_amount'])}\n"
-    
-    keyboard = [
-        [
-            InlineKeyboardButton("🎡 New Game", callback_data="wheel_multiplayer"),
-            InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+        
+        # Create spinning animation
+        spin_frames = ["🎡", "🔄", "⭕", "🎯", "🌟", "✨", "💫", "🎊"]
+        
+        for i in range(16):  # Longer animation for suspense
+            await asyncio.sleep(0.3)
+            frame = spin_frames[i % len(spin_frames)]
+            await query.edit_message_text(
+                f"🎡 **WHEEL SPINNING!**\n\n"
+                f"💰 Total Pot: {format_money(total_pot)}\n"
+                f"👥 Players: {player_count}\n\n"
+                f"{frame} Spinning... {frame}",
+                parse_mode='Markdown'
+            )
+        
+        # Determine result
+        result_segment_id = wheel_engine.spin()
+        
+        result_segment = WHEEL_SEGMENTS[result_segment_id]
+        
+        # Every player wins their entry fee times the segment multiplier
+        individual_winnings = lobby.entry_fee * result_segment['multiplier']
+        await pay_prizes(lobby, {player_id: individual_winnings for player_id in lobby.players})
+        
+        # Create result message
+        result_text = (
+            f"🎉 **WHEEL STOPPED!** 🎉\n\n"
+            f"🎡 **RESULT:** {result_segment['color']} **{result_segment['multiplier']}x**\n\n"
+            f"💰 Entry Fee: {format_money(lobby.entry_fee)}\n"
+            f"🏆 Each Player Won: **{format_money(individual_winnings)}**\n"
+            f"📈 Profit per Player: **{format_money(individual_winnings - lobby.entry_fee)}**\n\n"
+            f"**All Players Won:**\n"
+        )
+        
+        for name in lobby.players.values():
+            result_text += f"• {name}: +{format_money(individual_winnings - lobby.entry_fee)}\n"
+        
+        keyboard = [
+            [
+                InlineKeyboardButton("🎡 New Game", callback_data="wheel_multiplayer"),
+                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+            ]
         ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await query.message.reply_text(result_text, reply_markup=reply_markup, parse_mode='Markdown')
-    
-    # Clean up game
-    del active_wheel_games[game_id]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        
+        await query.message.reply_text(result_text, reply_markup=reply_markup, parse_mode='Markdown')
+    finally:
+        # Clean up game, refunding the fees if it failed before paying out
+        await finish_lobby(lobby)
 
 # Export the callback handler
 wheel_callback_handler = wheel_callback
\ No newline at end of file
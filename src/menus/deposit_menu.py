@@ -3,6 +3,7 @@ from telegram.ext import ContextTypes
 from src.database import get_user
 from src.utils.formatting import format_money
 from src.wallet.nowpayments import create_deposit_payment, create_deposit_invoice, SUPPORTED_CRYPTOS
+from src.wallet.provider_metadata import provider_metadata
 from src.utils.logger import logger
 import asyncio
 import time
@@ -70,6 +71,8 @@ async def show_deposit_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"💳 Current balance: {format_money(user['balance'])}\n\n"
         f"Select deposit amount:"
     )
+    if not provider_metadata.is_available():
+        message += "\n\n⚠️ Crypto payments are temporarily unavailable. Please try again in a few minutes."
     
     keyboard = [
         [
@@ -100,6 +103,26 @@ async def show_deposit_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         await update.callback_query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
 
+# Currency selection buttons, in display order
+DEPOSIT_CURRENCY_BUTTONS = {
+    "BTC": "₿ Bitcoin",
+    "ETH": "⟠ Ethereum",
+    "USDT": "💰 USDT",
+    "USDC": "💰 USDC",
+    "LTC": "🪙 Litecoin",
+    "SOL": "🟣 Solana",
+    "BNB": "🟡 BNB",
+    "TRX": "🔴 Tron",
+    "XMR": "🔒 Monero",
+    "DAI": "🟠 DAI",
+    "DOGE": "🐕 Dogecoin",
+    "SHIB": "🐕 Shiba Inu",
+    "BCH": "₿ Bitcoin Cash",
+    "MATIC": "🟣 Polygon",
+    "TON": "💎 Toncoin",
+    "NOT": "🪙 NotCoin"
+}
+
 async def show_currency_selection(update: Update, context: ContextTypes.DEFAULT_TYPE, amount: float):
     """Show cryptocurrency selection menu matching Image 1 (without Card/PayPal option)"""
     message = (
@@ -110,43 +133,14 @@ async def show_currency_selection(update: Update, context: ContextTypes.DEFAULT_
     
     # Create the cryptocurrency selection keyboard matching Image 1 (without Card/PayPal)
     # Using consistent callback pattern: deposit_[crypto]_[amount]
-    keyboard = [
-        [
-            InlineKeyboardButton("₿ Bitcoin", callback_data=f"deposit_btc_{amount}"),
-            InlineKeyboardButton("⟠ Ethereum", callback_data=f"deposit_eth_{amount}")
-        ],
-        [
-            InlineKeyboardButton("💰 USDT", callback_data=f"deposit_usdt_{amount}"),
-            InlineKeyboardButton("💰 USDC", callback_data=f"deposit_usdc_{amount}")
-        ],
-        [
-            InlineKeyboardButton("🪙 Litecoin", callback_data=f"deposit_ltc_{amount}"),
-            InlineKeyboardButton("🟣 Solana", callback_data=f"deposit_sol_{amount}")
-        ],
-        [
-            InlineKeyboardButton("🟡 BNB", callback_data=f"deposit_bnb_{amount}"),
-            InlineKeyboardButton("🔴 Tron", callback_data=f"deposit_trx_{amount}")
-        ],
-        [
-            InlineKeyboardButton("🔒 Monero", callback_data=f"deposit_xmr_{amount}"),
-            InlineKeyboardButton("🟠 DAI", callback_data=f"deposit_dai_{amount}")
-        ],
-        [
-            InlineKeyboardButton("🐕 Dogecoin", callback_data=f"deposit_doge_{amount}"),
-            InlineKeyboardButton("🐕 Shiba Inu", callback_data=f"deposit_shib_{amount}")
-        ],
-        [
-            InlineKeyboardButton("₿ Bitcoin Cash", callback_data=f"deposit_bch_{amount}"),
-            InlineKeyboardButton("🟣 Polygon", callback_data=f"deposit_matic_{amount}")
-        ],
-        [
-            InlineKeyboardButton("💎 Toncoin", callback_data=f"deposit_ton_{amount}"),
-            InlineKeyboardButton("🪙 NotCoin", callback_data=f"deposit_not_{amount}")
-        ],
-        [
-            InlineKeyboardButton("🔙 Back", callback_data="menu_deposit")
-        ]
+    # Only currencies the provider currently accepts, two per row
+    symbols = provider_metadata.supported(DEPOSIT_CURRENCY_BUTTONS)
+    buttons = [
+        InlineKeyboardButton(DEPOSIT_CURRENCY_BUTTONS[symbol], callback_data=f"deposit_{symbol.lower()}_{amount}")
+        for symbol in symbols
     ]
+    keyboard = [buttons[i:i + 2] for i in range(0, len(buttons), 2)]
+    keyboard.append([InlineKeyboardButton("🔙 Back", callback_data="menu_deposit")])
     
     reply_markup = InlineKeyboardMarkup(keyboard)
     await update.callback_query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
@@ -170,7 +164,7 @@ async def deposit_menu_callback(update: Update, context: ContextTypes.DEFAULT_TY
             return
         
         action = data[1]
-        logger.debug(f"Processing deposit action: {action} for user {user_id}")
+        logger.debug("Processing deposit action: %s for user %s", action, user_id)
         
         if action == "amount":
             # Handle deposit amount selection
@@ -758,11 +752,9 @@ async def process_crypto_deposit(update: Update, context: ContextTypes.DEFAULT_T
             )
             return
         
-        # Check if NOWPayments API is available
-        from src.wallet.nowpayments import get_api_status
-        api_status = await get_api_status()
-        if not api_status or api_status.get("message") != "OK":
-            logger.error(f"NOWPayments API unavailable for user {user_id}: {api_status}")
+        # Check if NOWPayments API is available (last background status check)
+        if not provider_metadata.is_available():
+            logger.error(f"NOWPayments API unavailable for user {user_id}")
             await update.callback_query.edit_message_text(
                 "❌ **Payment Service Unavailable**\n\n"
                 "Our payment service is temporarily unavailable.\n"
@@ -777,7 +769,7 @@ async def process_crypto_deposit(update: Update, context: ContextTypes.DEFAULT_T
             return
         
         # Create payment using NOWPayments
-        logger.debug(f"Creating NOWPayments payment for user {user_id}")
+        logger.debug("Creating NOWPayments payment for user %s", user_id)
         payment = await create_deposit_payment(user_id, amount, crypto_currency)
         
         if payment and payment.get("payment_id"):
@@ -981,7 +973,7 @@ async def deposit_message_handler(update: Update, context: ContextTypes.DEFAULT_
             
             amount = float(cleaned_input)
             
-            logger.debug(f"Parsed amount from user {user_id}: ${amount}")
+            logger.debug("Parsed amount from user %s: $%s", user_id, amount)
             
             if amount < 10:
                 logger.warning(f"User {user_id} entered amount below minimum: ${amount}")
@@ -1009,7 +1001,7 @@ async def deposit_message_handler(update: Update, context: ContextTypes.DEFAULT_
             # Validate reasonable decimal places
             if len(str(amount).split('.')[-1]) > 2:
                 amount = round(amount, 2)
-                logger.debug(f"Rounded amount for user {user_id}: ${amount}")
+                logger.debug("Rounded amount for user %s: $%s", user_id, amount)
             
             # Clear the deposit action
             del context.user_data["deposit_action"]
@@ -100,7 +100,7 @@ async def toggle_setting(update: Update, context: ContextTypes.DEFAULT_TYPE, set
     """Toggle a user setting"""
     user_id = update.callback_query.from_user.id
     
-    from src.database import users_collection
+    from src.database import update_user_settings
     
     setting_map = {
         "notifications": "notifications_enabled",
@@ -118,10 +118,7 @@ async def toggle_setting(update: Update, context: ContextTypes.DEFAULT_TYPE, set
     new_value = not current_value
     
     # Update in database
-    await users_collection.update_one(
-        {"user_id": user_id},
-        {"$set": {db_field: new_value}}
-    )
+    await update_user_settings(user_id, {db_field: new_value})
     
     setting_names = {
         "notifications": "Notifications",
@@ -1,16 +1,53 @@
+import time
 import traceback
 from functools import wraps
 from telegram import Update
 from telegram.ext import ContextTypes
-from src.utils.logger import bot_logger
+from src.utils.logger import bot_logger, bind_log_fields
+from src.utils.metrics import handler_errors, handler_latency
+from src.utils.tracing import span
+
+def timed_handler(func):
+    """Time and trace a handler callback, counting exceptions before re-raising them"""
+    latency = handler_latency.labels(func.__name__)
+    errors = handler_errors.labels(func.__name__)
+
+    @wraps(func)
+    async def wrapper(update, context, *args, **kwargs):
+        bind_log_fields(handler=func.__name__)
+        started = time.perf_counter()
+        try:
+            with span(f"handler {func.__name__}"):
+                return await func(update, context, *args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - started)
+
+    wrapper.instrumented = True
+    return wrapper
+
+def instrument_handlers(application, group: int = 0):
+    """Wrap every callback in a handler group with timed_handler, skipping decorated ones"""
+    for handler in application.handlers.get(group, []):
+        if not getattr(handler.callback, "instrumented", False):
+            handler.callback = timed_handler(handler.callback)
 
 def handle_errors(func):
     """Decorator to handle errors in bot commands"""
+    latency = handler_latency.labels(func.__name__)
+    errors = handler_errors.labels(func.__name__)
+    
     @wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+        bind_log_fields(handler=func.__name__)
+        started = time.perf_counter()
         try:
-            return await func(update, context, *args, **kwargs)
+            with span(f"handler {func.__name__}"):
+                return await func(update, context, *args, **kwargs)
         except Exception as e:
+            errors.inc()
             # Log the error
             bot_logger.error(f"Error in {func.__name__}: {str(e)}")
             bot_logger.error(f"Traceback: {traceback.format_exc()}")
@@ -29,16 +66,28 @@ def handle_errors(func):
                     await update.callback_query.message.reply_text(error_message, parse_mode='Markdown')
             except Exception as send_error:
                 bot_logger.error(f"Failed to send error message: {send_error}")
+        finally:
+            elapsed = time.perf_counter() - started
+            latency.observe(elapsed)
+            bot_logger.debug("Handled %s", func.__name__, extra={"latency_ms": round(elapsed * 1000, 2)})
     
+    wrapper.instrumented = True
     return wrapper
 
 def handle_callback_errors(func):
     """Decorator to handle errors in callback queries"""
+    latency = handler_latency.labels(func.__name__)
+    errors = handler_errors.labels(func.__name__)
+    
     @wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+        bind_log_fields(handler=func.__name__)
+        started = time.perf_counter()
         try:
-            return await func(update, context, *args, **kwargs)
+            with span(f"handler {func.__name__}"):
+                return await func(update, context, *args, **kwargs)
         except Exception as e:
+            errors.inc()
             # Log the error
             bot_logger.error(f"Error in callback {func.__name__}: {str(e)}")
             bot_logger.error(f"Traceback: {traceback.format_exc()}")
@@ -49,7 +98,10 @@ def handle_callback_errors(func):
                     await update.callback_query.answer("❌ An error occurred. Please try again.", show_alert=True)
                 except Exception:
                     pass
+        finally:
+            latency.observe(time.perf_counter() - started)
     
+    wrapper.instrumented = True
     return wrapper
 
 class GameError(Exception):
@@ -1,30 +1,219 @@
+import atexit
+import gzip
+import json
 import logging
 import os
+import queue
+import shutil
+from collections import defaultdict
+from contextvars import ContextVar
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from typing import Any, Dict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Records waiting for the writer thread; beyond this new records are dropped
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+# Set LOG_ASYNC=0 to write from the calling thread, e.g. when debugging the logger itself
+LOG_ASYNC = os.getenv("LOG_ASYNC", "1") != "0"
+
+# Compress rotated log files
+LOG_COMPRESS = os.getenv("LOG_COMPRESS", "1") != "0"
+
+# "json" writes one compact JSON object per record instead of text lines
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+
+# Per-logger level overrides, e.g. LOG_LEVELS="database=DEBUG,games=WARNING"
+LOG_LEVELS = dict(
+    item.split("=", 1) for item in os.getenv("LOG_LEVELS", "").replace(" ", "").split(",") if "=" in item
+)
+
+# Fraction of DEBUG records kept per message template, e.g. LOG_SAMPLE_RATES='{"Getting user %s": 0.01}'
+LOG_SAMPLE_RATES: Dict[str, float] = {
+    "Getting user %s": 0.01,
+    "%s: batch of %d keys after %.2fms": 0.1,
+    **json.loads(os.getenv("LOG_SAMPLE_RATES", "{}"))
+}
+
+# Structured fields every JSON record may carry
+LOG_FIELDS = ("user_id", "handler", "game_type", "latency_ms")
+
+_log_fields: ContextVar[Dict[str, Any]] = ContextVar("log_fields", default={})
+
+
+def bind_log_fields(**fields):
+    """Attach structured fields to every record logged from the current task"""
+    _log_fields.set({**_log_fields.get(), **fields})
+
+
+def reset_log_fields(**fields):
+    """Replace the bound fields, e.g. at the start of each update"""
+    _log_fields.set(fields)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the task's bound fields onto records, unless passed via extra="""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for field, value in _log_fields.get().items():
+            if not hasattr(record, field):
+                setattr(record, field, value)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps one in every 1/rate DEBUG records of each sampled message template"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        rate = self.rates.get(record.msg)
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        count = self.counts[record.msg]
+        self.counts[record.msg] = count + 1
+        return count % round(1 / rate) == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per record, with the structured fields that are set"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for field in LOG_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+_context_filter = ContextFilter()
+_sampling_filter = SamplingFilter(LOG_SAMPLE_RATES)
+_loggers = []
+
+
+def set_log_level(name: str, level: str) -> str:
+    """Change a logger's level at runtime, returning the previous level name"""
+    numeric = logging.getLevelName(level.upper())
+    if not isinstance(numeric, int):
+        raise ValueError(f"Unknown log level: {level}")
+    logger = logging.getLogger(name)
+    previous = logging.getLevelName(logger.level)
+    logger.setLevel(numeric)
+    return previous
+
+
+def get_log_levels() -> Dict[str, str]:
+    """Level of every logger created by setup_logger"""
+    return {name: logging.getLevelName(logging.getLogger(name).level) for name in _loggers}
+
+
+def set_sample_rate(message: str, rate: float):
+    """Change the fraction of DEBUG records kept for a message template"""
+    _sampling_filter.rates[message] = rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: records are dropped while the queue is full
+
+    The number of dropped records is logged as a warning once space frees up.
+    Messages are only merged with their arguments here; formatting, file
+    writes and rotation happen on the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Keep the record unformatted, resolving only what may change after the call
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.dropped:
+                notice = logging.LogRecord(record.name, logging.WARNING, __file__, 0,
+                                           f"Log queue full: dropped {self.dropped} records", None, None)
+                self.queue.put_nowait(notice)
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _gzip_rotator(source: str, dest: str):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_listener = QueueListener(_queue, respect_handler_level=True)
+_queue_handler = DroppingQueueHandler(_queue)
+
+
+def _attach(handler: logging.Handler):
+    """Hand a handler to the writer thread, starting it on first use"""
+    _listener.handlers = _listener.handlers + (handler,)
+    if _listener._thread is None:
+        _listener.start()
+        atexit.register(_listener.stop)
+
 
 def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
-    """Set up a logger with file and console handlers"""
-    
+    """Set up a logger with file and console handlers
+
+    With LOG_ASYNC (the default) the logger only enqueues records; a single
+    background thread formats them, writes the files and rotates them.
+    """
+
     # Create logs directory if it doesn't exist
     os.makedirs("logs", exist_ok=True)
-    
+
     # Create logger
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level.upper()))
-    
+    logger.setLevel(getattr(logging, LOG_LEVELS.get(name, level).upper()))
+
     # Prevent duplicate handlers
     if logger.handlers:
         return logger
-    
+
+    _loggers.append(name)
+    logger.addFilter(_context_filter)
+    logger.addFilter(_sampling_filter)
+
     # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-    )
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    )
-    
+    if LOG_FORMAT == "json":
+        file_formatter = console_formatter = JsonFormatter()
+    else:
+        file_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
+        )
+        console_formatter = logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(message)s'
+        )
+
     # File handler with rotation
     file_handler = RotatingFileHandler(
         f"logs/{name}.log",
@@ -33,16 +222,56 @@ def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(file_formatter)
-    
+    if LOG_COMPRESS:
+        file_handler.namer = lambda default_name: default_name + ".gz"
+        file_handler.rotator = _gzip_rotator
+
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
+
+    if not LOG_ASYNC:
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
+        return logger
+
+    # The writer thread serves every logger, so route records to this logger's handlers by name
+    for handler in (file_handler, console_handler):
+        handler.addFilter(logging.Filter(name))
+        _attach(handler)
+    logger.addHandler(_queue_handler)
+    # Records are written by the listener; propagating would format them again on the caller's thread
+    logger.propagate = False
+
+    return logger
+
+
+def setup_file_logger(name: str, path: str) -> logging.Logger:
+    """Logger writing bare messages to one rotating file, e.g. JSON lines of traces"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if logger.handlers:
+        return logger
+
+    file_handler = RotatingFileHandler(path, maxBytes=10*1024*1024, backupCount=5)
+    file_handler.setFormatter(logging.Formatter('%(message)s'))
+    if LOG_COMPRESS:
+        file_handler.namer = lambda default_name: default_name + ".gz"
+        file_handler.rotator = _gzip_rotator
+
+    if not LOG_ASYNC:
+        logger.addHandler(file_handler)
+        return logger
+
+    file_handler.addFilter(logging.Filter(name))
+    _attach(file_handler)
+    logger.addHandler(_queue_handler)
     return logger
 
 # Game-specific loggers
@@ -50,4 +279,4 @@ bot_logger = setup_logger("bot")
 webapp_logger = setup_logger("webapp")
 game_logger = setup_logger("games")
 db_logger = setup_logger("database")
-wallet_logger = setup_logger("wallet")
\ No newline at end of file
+wallet_logger = setup_logger("wallet")
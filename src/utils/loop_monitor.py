@@ -0,0 +1,182 @@
+"""
+Event-loop lag watchdog
+
+A coroutine on the bot's loop sleeps LOOP_LAG_INTERVAL at a time and records
+how late each wake-up is into a lag histogram, plus p50/p90/p99 over the last
+LOOP_LAG_WINDOW samples. A watchdog thread checks the coroutine's heartbeat;
+once the loop has been stuck for LOOP_LAG_THRESHOLD_MS it grabs the loop
+thread's stack and current task, which are logged when the loop comes back.
+
+With LOOP_DEBUG=1 the loop also runs in asyncio debug mode (slow callbacks
+are logged) and an audit hook warns, once per call site, about blocking file,
+socket, sleep and subprocess calls made on the loop thread.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from src.utils.logger import bot_logger
+from src.utils.metrics import Registry, registry
+
+# Seconds between heartbeats; the lag is how late each one runs
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", 0.05))
+
+# Stalls at least this long are logged with the blocking stack
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", 200))
+
+# Recent samples behind the lag percentiles (600 × 50ms = 30s)
+LOOP_LAG_WINDOW = int(os.getenv("LOOP_LAG_WINDOW", 600))
+
+# Development mode: asyncio debug plus blocking-call warnings
+LOOP_DEBUG = os.getenv("LOOP_DEBUG", "0") == "1"
+
+LOOP_STACK_DEPTH = 12
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+LAG_QUANTILES = (0.5, 0.9, 0.99)
+
+# Audit events that block the calling thread (time.sleep is audited from Python 3.12)
+BLOCKING_EVENTS = {"open", "time.sleep", "socket.connect", "socket.getaddrinfo", "socket.gethostbyname",
+                   "subprocess.Popen", "os.system"}
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class LoopMonitor:
+    """Measures scheduling lag of one event loop and reports what blocked it"""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, threshold_ms: float = LOOP_LAG_THRESHOLD_MS,
+                 window: int = LOOP_LAG_WINDOW, metrics: Optional[Registry] = None):
+        self.interval = interval
+        self.threshold = threshold_ms / 1000
+        self.samples: Deque[float] = deque(maxlen=window)
+        metrics = metrics or Registry()
+        self.lag = metrics.histogram(
+            "event_loop_lag_seconds", "How late event-loop heartbeats run", buckets=LAG_BUCKETS)
+        self.stalls = metrics.counter(
+            "event_loop_stalls_total", "Event-loop stalls longer than LOOP_LAG_THRESHOLD_MS")
+        self.blocking_calls = metrics.counter(
+            "event_loop_blocking_calls_total", "Blocking calls seen on the loop thread in debug mode", ("event",))
+        metrics.gauge("event_loop_lag_quantile_seconds", "Event-loop lag percentiles over the recent window",
+                      ("quantile",), callback=self.quantiles)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._heartbeat: Optional[float] = None
+        self._captured: Optional[Tuple[str, str]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._flagged = set()
+        self._in_hook = threading.local()
+        self._hook_installed = False
+
+    def quantiles(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {}
+        return {f"{q:g}": ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in LAG_QUANTILES}
+
+    def start(self, debug: bool = LOOP_DEBUG) -> asyncio.Task:
+        """Start the heartbeat and watchdog for the running event loop"""
+        if self._task is not None and not self._task.done():
+            return self._task
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stopped.clear()
+        self._task = self._loop.create_task(self.run(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        if debug:
+            self._loop.set_debug(True)
+            self._loop.slow_callback_duration = self.threshold
+            if not self._hook_installed:
+                # Audit hooks cannot be removed; the hook goes quiet once the monitor stops
+                sys.addaudithook(self._audit)
+                self._hook_installed = True
+        return self._task
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+        self._loop_thread = None
+
+    async def run(self):
+        while True:
+            self._heartbeat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - self._heartbeat - self.interval)
+            self._heartbeat = None
+            self.record(lag)
+
+    def record(self, lag: float):
+        self.samples.append(lag)
+        self.lag.observe(lag)
+        if lag < self.threshold:
+            self._captured = None
+            return
+        self.stalls.inc()
+        task, stack = self._captured or ("unknown", "  (stack not captured)\n")
+        self._captured = None
+        bot_logger.warning("Event loop blocked for %.0fms in %s:\n%s", lag * 1000, task, stack.rstrip())
+
+    def _watch(self):
+        # Poll a few times per threshold so stalls are caught while they are happening
+        while not self._stopped.wait(self.threshold / 4):
+            heartbeat = self._heartbeat
+            if (heartbeat is not None and self._captured is None
+                    and time.perf_counter() - heartbeat - self.interval >= self.threshold):
+                self._captured = self.capture()
+
+    def capture(self) -> Optional[Tuple[str, str]]:
+        """Name of the loop's current task and the loop thread's stack"""
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        name = f"task {task.get_name()} ({task.get_coro().__qualname__})" if task else "a callback"
+        return name, "".join(traceback.format_stack(frame, limit=LOOP_STACK_DEPTH))
+
+    def _audit(self, event: str, args: tuple):
+        if (event not in BLOCKING_EVENTS or threading.get_ident() != self._loop_thread
+                or getattr(self._in_hook, "active", False)):
+            return
+        if event == "open" and isinstance(args[0], str) and args[0].endswith((".py", ".pyc", ".so")):
+            return  # imports
+        if event == "time.sleep" and not args[0]:
+            return
+        if event == "socket.connect" and not args[0].getblocking():
+            return  # asyncio's own non-blocking connects
+        self._in_hook.active = True
+        try:
+            self._flag(event, args)
+        finally:
+            self._in_hook.active = False
+
+    def _flag(self, event: str, args: tuple):
+        # Report at the innermost frame of our own code, once per call site
+        frame = sys._getframe(2)
+        while frame is not None and not (frame.f_code.co_filename.startswith(_PROJECT_ROOT)
+                                         and "site-packages" not in frame.f_code.co_filename):
+            frame = frame.f_back
+        if frame is None:
+            return
+        site = (event, frame.f_code.co_filename, frame.f_lineno)
+        self.blocking_calls.labels(event).inc()
+        if site in self._flagged:
+            return
+        self._flagged.add(site)
+        bot_logger.warning("Blocking %s%s on the event loop thread at %s:%d (%s)", event, args[:1],
+                           os.path.relpath(frame.f_code.co_filename, _PROJECT_ROOT), frame.f_lineno,
+                           frame.f_code.co_name)
+
+
+# Watches the bot's event loop; started from post_init
+loop_monitor = LoopMonitor(metrics=registry)
@@ -0,0 +1,292 @@
+"""
+In-process metrics registry
+
+Counters, gauges and histograms with optional labels, rendered in the
+Prometheus text exposition format by the /metrics endpoints of the webapp and
+webhook servers. Hot paths should resolve their labelled child once with
+labels() and then call inc()/observe() on it; each update is a lock-guarded
+add. Gauges that mirror existing state (sessions, queue depth) are read by
+callbacks at scrape time instead of being kept up to date.
+"""
+import bisect
+import hmac
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; covers fast handlers up to slow Telegram calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram with count and sum"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    @contextmanager
+    def time(self):
+        """Observe the seconds spent in the with block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= target and count:
+                return bound
+        return 0.0
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        result = []
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            result.append(("+Inf" if bound == float("inf") else f"{bound:g}", seen))
+        return result
+
+    def snapshot(self) -> Dict:
+        return {"count": self.count, "sum": round(self.total, 3), "buckets": dict(self.cumulative())}
+
+
+class CounterValue:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class GaugeValue(CounterValue):
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Metric:
+    """A named family of values, one child per label combination"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), **options):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.options = options
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values) -> object:
+        """The child for these label values, created on first use"""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def children(self) -> Iterable[Tuple[Tuple[str, ...], object]]:
+        return list(self._children.items())
+
+    def _label_text(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self.children()):
+            lines.append(f"{self.name}{self._label_text(values)} {child.value:g}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return CounterValue()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    """Gauge whose values are set directly, or read from a callback at scrape time
+
+    The callback returns {label values tuple: value}, or a number for an
+    unlabelled gauge.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], object]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _new_child(self):
+        return GaugeValue()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def children(self):
+        if self.callback is None:
+            return super().children()
+        values = self.callback()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [(tuple(str(v) for v in (key if isinstance(key, tuple) else (key,))), _Fixed(value))
+                for key, value in values.items()]
+
+
+class _Fixed:
+    def __init__(self, value: float):
+        self.value = value
+
+
+class HistogramMetric(Metric):
+    kind = "histogram"
+
+    def _new_child(self):
+        return Histogram(self.options.get("buckets", DEFAULT_BUCKETS))
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self.children(), key=lambda item: item[0]):
+            for bound, count in child.cumulative():
+                le = 'le="' + bound + '"'
+                lines.append(f"{self.name}_bucket{self._label_text(values, le)} {count}")
+            lines.append(f"{self.name}_sum{self._label_text(values)} {child.total:g}")
+            lines.append(f"{self.name}_count{self._label_text(values)} {child.count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Registry:
+    """All metrics of the process; registering a name twice returns the first metric"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              callback: Optional[Callable[[], object]] = None) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames, callback=callback)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> HistogramMetric:
+        return self._register(HistogramMetric, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric"""
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry served at /metrics
+registry = Registry()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+handler_latency = registry.histogram(
+    "bot_handler_duration_seconds", "Time spent in each Telegram handler", ("handler",))
+handler_errors = registry.counter(
+    "bot_handler_errors_total", "Telegram handlers that raised", ("handler",))
+route_latency = registry.histogram(
+    "http_request_duration_seconds", "Time spent serving each HTTP route", ("app", "route", "method", "status"))
+bets_total = registry.counter(
+    "bets_total", "Recorded game rounds", ("game",))
+bet_volume = registry.counter(
+    "bet_volume_total", "Amount wagered in recorded game rounds", ("game",))
+settlement_latency = registry.histogram(
+    "settlement_duration_seconds", "Time to settle balance batches and draws", ("kind",))
+cache_requests = registry.counter(
+    "cache_requests_total", "Cache lookups by cache and result", ("cache", "result"))
+telegram_in_flight = registry.gauge(
+    "telegram_outbound_requests", "Outbound Telegram API calls queued or in flight")
+telegram_latency = registry.histogram(
+    "telegram_request_duration_seconds", "Outbound Telegram API call latency", ("method",))
+payment_api_latency = registry.histogram(
+    "nowpayments_request_duration_seconds", "NOWPayments API attempt latency", ("method", "status"))
+payment_api_retries = registry.counter(
+    "nowpayments_retries_total", "NOWPayments API attempts that were retried", ("method",))
+
+
+def bearer_authorized(authorization: Optional[str], token: Optional[str]) -> bool:
+    """Whether an Authorization header carries the bearer token; no configured token denies everyone"""
+    if not token or not authorization:
+        return False
+    return hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode())
+
+
+def time_route(app, app_name: str):
+    """Flask middleware timing every route into http_request_duration_seconds"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_route_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_route(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            route_latency.labels(app_name, route, request.method, response.status_code).observe(
+                time.perf_counter() - started)
+        return response
+
+    return app
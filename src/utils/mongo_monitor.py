@@ -0,0 +1,243 @@
+"""
+MongoDB command monitoring
+
+One CommandMonitor is registered as a pymongo CommandListener on both the
+motor client (src/database/db.py) and the webapp's pymongo client
+(webapp/sync_db.py). It keeps latency histograms per command and per
+collection, counts round trips per Telegram update or HTTP request, adds a
+span per command to the current trace, and logs operations slower than
+MONGO_SLOW_MS with their filter shape. Reads that are slow get explained once
+per shape on a worker thread, so the log also shows the winning plan.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from pymongo import monitoring
+
+from src.utils.logger import db_logger
+from src.utils.metrics import Registry, registry
+from src.utils.tracing import current_span, record_span
+
+# Operations at least this slow are logged
+MONGO_SLOW_MS = float(os.getenv("MONGO_SLOW_MS", 100))
+
+# Set to 0 to skip explaining slow reads
+MONGO_EXPLAIN_SLOW = os.getenv("MONGO_EXPLAIN_SLOW", "1") != "0"
+
+LATENCY_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+ROUND_TRIP_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21)
+
+# Handshakes, heartbeats and our own explains are not application queries
+IGNORED_COMMANDS = {"explain", "hello", "isMaster", "ismaster", "ping", "buildInfo", "saslStart",
+                    "saslContinue", "endSessions", "getMore", "killCursors"}
+
+# Where each command keeps its filter
+FILTER_FIELDS = {"find": "filter", "count": "query", "distinct": "query", "findAndModify": "query"}
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify"}
+
+
+def filter_shape(value: Any) -> Any:
+    """A filter with its literal values replaced by '?', keeping fields and operators"""
+    if isinstance(value, dict):
+        return {key: filter_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = [filter_shape(item) for item in value if isinstance(item, dict)]
+        return shapes or "?"
+    return "?"
+
+
+def command_filter(command_name: str, command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The query part of a command, if it has one"""
+    if command_name in FILTER_FIELDS:
+        return command.get(FILTER_FIELDS[command_name])
+    if command_name == "aggregate":
+        for stage in command.get("pipeline", []):
+            if "$match" in stage:
+                return stage["$match"]
+        return None
+    if command_name in ("update", "delete"):
+        statements = command.get("updates" if command_name == "update" else "deletes") or [{}]
+        return statements[0].get("q")
+    return None
+
+
+def plan_summary(explain: Dict[str, Any]) -> str:
+    """'FETCH > IXSCAN(user_id_1)' style summary of an explain's winning plan"""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        # Aggregations nest the planner under their first stage
+        for stage in explain.get("stages", []):
+            planner = stage.get("$cursor", {}).get("queryPlanner")
+            if planner:
+                break
+    stage = (planner or {}).get("winningPlan", {})
+    stage = stage.get("queryPlan", stage)
+    parts = []
+    while stage:
+        name = stage.get("stage", "?")
+        parts.append(f"{name}({stage['indexName']})" if "indexName" in stage else name)
+        stage = stage.get("inputStage") or (stage.get("inputStages") or [None])[0]
+    return " > ".join(parts) or "unknown"
+
+
+class RoundTripScope:
+    """Database round trips made while handling one update or request"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.count = 0
+
+
+# Mutable scope object, so motor's executor threads (which copy the context) still count into it
+_scope: ContextVar[Optional[RoundTripScope]] = ContextVar("mongo_round_trips", default=None)
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Latency histograms, round-trip counts and slow-operation log for every Mongo command"""
+
+    def __init__(self, slow_ms: float = MONGO_SLOW_MS, explain_slow: bool = MONGO_EXPLAIN_SLOW,
+                 metrics: Optional[Registry] = None):
+        self.slow_ms = slow_ms
+        self.explain_slow = explain_slow
+        metrics = metrics or Registry()
+        self.by_command = metrics.histogram(
+            "mongo_command_duration_seconds", "Mongo command latency", ("command",), LATENCY_BUCKETS)
+        self.by_collection = metrics.histogram(
+            "mongo_collection_duration_seconds", "Mongo command latency per collection", ("collection",), LATENCY_BUCKETS)
+        self.round_trips = metrics.histogram(
+            "mongo_round_trips", "Mongo round trips per Telegram update or HTTP request", ("scope",), ROUND_TRIP_BUCKETS)
+        self.failures = metrics.counter("mongo_command_failures_total", "Mongo commands that failed")
+        self.slow_operations = metrics.counter("mongo_slow_operations_total", "Mongo commands slower than MONGO_SLOW_MS")
+        self.plans: Dict[str, str] = {}
+        self.explain_client = None
+        self._pending: Dict[tuple, tuple] = {}
+        self._explaining = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def attach(self, client):
+        """Use a pymongo client for explaining slow reads"""
+        self.explain_client = client
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        scope = _scope.get()
+        if scope is not None:
+            scope.count += 1
+        collection = event.command.get(event.command_name)
+        self._pending[(event.connection_id, event.request_id)] = (
+            event.command_name, collection if isinstance(collection, str) else None,
+            event.database_name, event.command, current_span()
+        )
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        command_name, collection, database, command, parent = pending
+        elapsed = event.duration_micros / 1e6
+        record_span(f"mongo {command_name} {collection}", elapsed * 1000, parent)
+        self.by_command.labels(command_name).observe(elapsed)
+        if collection:
+            self.by_collection.labels(collection).observe(elapsed)
+        if failed:
+            self.failures.inc()
+        if elapsed * 1000 >= self.slow_ms:
+            self._log_slow(command_name, collection, database, command, elapsed * 1000)
+
+    def _log_slow(self, command_name: str, collection: Optional[str], database: str,
+                  command: Dict[str, Any], elapsed_ms: float):
+        self.slow_operations.inc()
+        shape = filter_shape(command_filter(command_name, command))
+        key = f"{collection}.{command_name} {shape}"
+        db_logger.warning("Slow Mongo %s on %s: %.1fms filter=%s plan=%s",
+                          command_name, collection, elapsed_ms, shape, self.plans.get(key, "pending"))
+        if (self.explain_slow and self.explain_client is not None and command_name in EXPLAINABLE_COMMANDS
+                and key not in self.plans and key not in self._explaining):
+            self._explaining.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mongo-explain")
+            self._executor.submit(self._explain, key, database, command)
+
+    def _explain(self, key: str, database: str, command: Dict[str, Any]):
+        try:
+            target = {field: value for field, value in command.items()
+                      if not field.startswith("$") and field not in ("lsid", "txnNumber", "cursor")}
+            if "pipeline" in command:
+                target["cursor"] = {}
+            explain = self.explain_client[database].command("explain", target, verbosity="queryPlanner")
+            self.plans[key] = plan_summary(explain)
+            db_logger.warning("Plan for slow %s: %s", key, self.plans[key])
+        except Exception as e:
+            db_logger.error(f"Failed to explain slow query {key}: {e}")
+        finally:
+            self._explaining.discard(key)
+
+    def record_round_trips(self, scope: RoundTripScope):
+        self.round_trips.labels(scope.kind).observe(scope.count)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "commands": {name: h.snapshot() for (name,), h in self.by_command.children()},
+            "collections": {name: h.snapshot() for (name,), h in self.by_collection.children()},
+            "round_trips": {kind: h.snapshot() for (kind,), h in self.round_trips.children()},
+            "failures": self.failures.labels().value,
+            "slow_operations": self.slow_operations.labels().value,
+            "slow_plans": dict(self.plans)
+        }
+
+    def summary(self) -> str:
+        """Plain-text report for the admin command"""
+        lines = ["🗄 Mongo commands (count, avg, p95):"]
+        for (name,), h in sorted(self.by_command.children(), key=lambda item: -item[1].total):
+            lines.append(f"• {name}: {h.count}, {h.total / h.count * 1000:.1f}ms, ≤{h.quantile(0.95) * 1000:g}ms")
+        lines.append("\n📦 Collections (count, avg):")
+        for (name,), h in sorted(self.by_collection.children(), key=lambda item: -item[1].total):
+            lines.append(f"• {name}: {h.count}, {h.total / h.count * 1000:.1f}ms")
+        lines.append("\n🔁 Round trips (avg, p95):")
+        for (kind,), h in self.round_trips.children():
+            lines.append(f"• per {kind}: {h.total / h.count:.2f}, ≤{h.quantile(0.95):g}")
+        lines.append(f"\n🐢 Slow (≥{self.slow_ms:g}ms): {self.slow_operations.labels().value:g}   "
+                     f"❌ Failed: {self.failures.labels().value:g}")
+        for key, plan in list(self.plans.items())[-5:]:
+            lines.append(f"• {key}: {plan}")
+        return "\n".join(lines)
+
+
+# Shared by the motor and pymongo clients
+command_monitor = CommandMonitor(metrics=registry)
+
+
+def begin_scope(kind: str) -> RoundTripScope:
+    """Start counting round trips for one update or request"""
+    scope = RoundTripScope(kind)
+    _scope.set(scope)
+    return scope
+
+
+def end_scope() -> Optional[int]:
+    """Record the current scope's round trips and close it"""
+    scope = _scope.get()
+    if scope is None:
+        return None
+    command_monitor.record_round_trips(scope)
+    _scope.set(None)
+    return scope.count
+
+
+async def begin_update_scope(update, context):
+    """Group -1 handler: count the round trips of each Telegram update"""
+    begin_scope("update")
+
+
+async def end_update_scope(update, context):
+    """Last-group handler: record the update's round trips"""
+    end_scope()
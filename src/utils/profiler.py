@@ -0,0 +1,123 @@
+"""
+On-demand sampling profiler
+
+Nothing runs until an admin asks for a profile. While it runs, a sampler
+thread reads every other thread's current stack each PROFILE_INTERVAL_MS
+(sys._current_frames, no tracing hooks), so the bot only pays for one stack
+walk per thread per interval, for at most PROFILE_MAX_SECONDS. The samples
+are aggregated into collapsed stacks ("thread;outer;inner count" lines, the
+input format of flamegraph.pl and speedscope) and a top-N report of the
+functions seen most often on top of and anywhere in the stack.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Pause between samples
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 10))
+
+# Longest profile an admin can request
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", 60))
+
+# Deeper stacks keep their innermost frames
+PROFILE_MAX_DEPTH = 64
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Profile:
+    """Aggregated samples of one profiling run"""
+
+    def __init__(self):
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.duration = 0.0
+
+    def add(self, thread_name: str, frame):
+        labels = []
+        while frame is not None and len(labels) < PROFILE_MAX_DEPTH:
+            labels.append(frame_label(frame))
+            frame = frame.f_back
+        labels.append(thread_name)
+        self.stacks[";".join(reversed(labels))] += 1
+
+    def collapsed(self) -> str:
+        """One 'frame;frame;frame count' line per distinct stack"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top(self, count: int = 15) -> str:
+        """Functions by samples on top of the stack (self) and anywhere in it (total)"""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, hits in self.stacks.items():
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += hits
+            for label in set(frames):
+                total[label] += hits
+        thread_samples = sum(self.stacks.values()) or 1
+        lines = [f"🔥 {self.samples} samples over {self.duration:.1f}s", "", "Self:"]
+        lines += [f"{hits / thread_samples:6.1%}  {label}" for label, hits in own.most_common(count)]
+        lines += ["", "Total:"]
+        lines += [f"{hits / thread_samples:6.1%}  {label}" for label, hits in total.most_common(count)]
+        return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """Samples the process's threads for a bounded time; one run at a time"""
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS, max_seconds: float = PROFILE_MAX_SECONDS):
+        self.interval = interval_ms / 1000
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def sample(self, seconds: float, include_idle: bool = False) -> Profile:
+        """Blocking: sample every other thread for the given number of seconds"""
+        if not 0 < seconds <= self.max_seconds:
+            raise ValueError(f"Profile length must be between 0 and {self.max_seconds:g} seconds")
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            profile = Profile()
+            me = threading.get_ident()
+            started = time.perf_counter()
+            deadline = started + seconds
+            while time.perf_counter() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == me or (not include_idle and _is_idle(frame)):
+                        continue
+                    profile.add(names.get(thread_id, str(thread_id)), frame)
+                profile.samples += 1
+                time.sleep(self.interval)
+            profile.duration = time.perf_counter() - started
+            return profile
+        finally:
+            self._lock.release()
+
+    async def profile(self, seconds: float, include_idle: bool = False) -> Profile:
+        """Sample from a worker thread while the event loop keeps serving"""
+        return await asyncio.to_thread(self.sample, seconds, include_idle)
+
+
+# Threads parked in these are waiting, not working
+_IDLE_FUNCTIONS = {"wait", "select", "poll", "epoll", "accept", "_worker", "_wait_for_tstate_lock"}
+
+
+def _is_idle(frame) -> bool:
+    return frame.f_code.co_name in _IDLE_FUNCTIONS
+
+
+# Shared by the admin /profile command
+profiler = SamplingProfiler()
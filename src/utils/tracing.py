@@ -0,0 +1,244 @@
+"""
+Lightweight in-process tracing
+
+A span records the name, duration and attributes of one operation. The
+current span lives in a ContextVar, so it follows the code into awaited
+coroutines, asyncio tasks and motor's executor threads, and spans opened
+there become its children. When a trace's root span ends, the whole trace is
+handed to the exporters: an in-memory ring buffer behind the admin /traces
+command and, with TRACE_FILE set, a JSON-lines file written by the logging
+thread.
+
+Every Telegram update gets a root span from begin_update_trace(), with the
+handler that served it as a child; further spans are opened by the Mongo
+command listener, the bot's Telegram request class, NOWPaymentsAPI and a few
+database helpers.
+"""
+import functools
+import json
+import logging
+import os
+import secrets
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Finished traces kept in memory for the admin view
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", 500))
+
+# JSON-lines file receiving every finished trace, e.g. logs/traces.jsonl
+TRACE_FILE = os.getenv("TRACE_FILE")
+
+# Set to 0 to turn tracing off
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1") != "0"
+
+
+class Trace:
+    """All spans sharing one root"""
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(8)
+        self.spans: List["Span"] = []
+        self.root: Optional["Span"] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms if self.root else 0.0
+
+    def breakdown(self) -> Dict[str, float]:
+        """Milliseconds spent per span category (the name up to the first space or dot)"""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            if span is self.root:
+                continue
+            category = span.name.replace(".", " ").split(" ", 1)[0]
+            totals[category] = totals.get(category, 0.0) + span.duration_ms
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "root": self.root.name if self.root else None,
+            "duration_ms": round(self.duration_ms, 3),
+            "spans": [span.to_dict() for span in self.spans]
+        }
+
+
+class Span:
+    def __init__(self, name: str, trace: Trace, parent: Optional["Span"] = None, **attributes):
+        self.name = name
+        self.trace = trace
+        self.span_id = secrets.token_hex(4)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        entry = {"name": self.name, "span_id": self.span_id, "parent_id": self.parent_id,
+                 "duration_ms": round(self.duration_ms, 3)}
+        if self.attributes:
+            entry["attributes"] = self.attributes
+        if self.error:
+            entry["error"] = self.error
+        return entry
+
+
+class RingBufferExporter:
+    """Keeps the last TRACE_BUFFER_SIZE finished traces"""
+
+    def __init__(self, size: int = TRACE_BUFFER_SIZE):
+        self.traces: Deque[Trace] = deque(maxlen=size)
+
+    def export(self, trace: Trace):
+        self.traces.append(trace)
+
+    def slowest(self, count: int = 5) -> List[Trace]:
+        return sorted(list(self.traces), key=lambda trace: trace.duration_ms, reverse=True)[:count]
+
+
+class FileExporter:
+    """Writes each finished trace as one JSON line through the logging queue"""
+
+    def __init__(self, path: str):
+        from src.utils.logger import setup_file_logger
+        self.logger = setup_file_logger("traces", path)
+
+    def export(self, trace: Trace):
+        self.logger.info(json.dumps(trace.to_dict(), separators=(",", ":"), default=str))
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+ring_buffer = RingBufferExporter()
+exporters: List[Any] = [ring_buffer]
+if TRACE_FILE:
+    exporters.append(FileExporter(TRACE_FILE))
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def start_span(name: str, **attributes) -> Span:
+    """Open a span under the current one, or as the root of a new trace"""
+    parent = _current.get()
+    trace = parent.trace if parent else Trace()
+    span = Span(name, trace, parent, **attributes)
+    if parent is None:
+        trace.root = span
+    return span
+
+
+def finish_span(span: Span, error: Optional[BaseException] = None):
+    span.end = time.perf_counter()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+    span.trace.spans.append(span)
+    if span.trace.root is span:
+        for exporter in exporters:
+            try:
+                exporter.export(span.trace)
+            except Exception as e:
+                logging.getLogger("bot").error(f"Trace export failed: {e}")
+
+
+def record_span(name: str, duration_ms: float, parent: Optional[Span], **attributes):
+    """Add an already finished child span, e.g. from an event listener that only learns durations"""
+    if parent is None or not TRACING_ENABLED:
+        return
+    span = Span(name, parent.trace, parent, **attributes)
+    span.end = span.start
+    span.start -= duration_ms / 1000
+    parent.trace.spans.append(span)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """with span("name"): ... traces the block as a child of the current span"""
+    if not TRACING_ENABLED:
+        yield None
+        return
+    opened = start_span(name, **attributes)
+    token = _current.set(opened)
+    try:
+        yield opened
+    except BaseException as e:
+        finish_span(opened, e)
+        raise
+    else:
+        finish_span(opened)
+    finally:
+        _current.reset(token)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator tracing every call of a coroutine function"""
+    def decorator(func: Callable):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(span_name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def update_span_name(update) -> str:
+    """Root span name of a Telegram update: its command, callback prefix or kind"""
+    message = getattr(update, "message", None)
+    text = getattr(message, "text", None)
+    if isinstance(text, str) and text.startswith("/"):
+        return f"update {text.split()[0].split('@')[0]}"
+    query = getattr(update, "callback_query", None)
+    data = getattr(query, "data", None)
+    if isinstance(data, str):
+        return f"update callback {data.split('_')[0]}"
+    if message is not None:
+        return "update message"
+    return "update other"
+
+
+async def begin_update_trace(update, context):
+    """First-group handler: open the root span of each Telegram update"""
+    if not TRACING_ENABLED:
+        return
+    # Sequentially processed updates share one task, so never nest under a leftover span
+    _current.set(None)
+    _current.set(start_span(update_span_name(update), update_id=getattr(update, "update_id", None)))
+
+
+async def end_update_trace(update, context):
+    """Last-group handler: finish the update's root span and export its trace"""
+    root = _current.get()
+    if root is not None and root.trace.root is root:
+        finish_span(root)
+    _current.set(None)
+
+
+def format_slowest(count: int = 5) -> str:
+    """Plain-text report of the slowest recent traces for the admin command"""
+    traces = ring_buffer.slowest(count)
+    if not traces:
+        return "🧵 No traces recorded yet."
+    lines = [f"🧵 Slowest of the last {len(ring_buffer.traces)} traces:"]
+    for trace in traces:
+        lines.append(f"\n⏱ {trace.root.name}: {trace.duration_ms:.1f}ms")
+        breakdown = sorted(trace.breakdown().items(), key=lambda item: -item[1])
+        if breakdown:
+            lines.append("  " + ", ".join(f"{category} {ms:.1f}ms" for category, ms in breakdown))
+        for child in sorted((s for s in trace.spans if s is not trace.root),
+                            key=lambda s: -s.duration_ms)[:5]:
+            lines.append(f"  • {child.name}: {child.duration_ms:.1f}ms" + (" ❌" if child.error else ""))
+    return "\n".join(lines)
@@ -8,15 +8,14 @@ from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction
 from src.utils.formatting import format_money
 from src.wallet.nowpayments import (
-    get_api_status, 
-    get_crypto_price, 
     create_deposit_payment,
     create_deposit_invoice,
     check_payment_status,
-    get_minimum_deposit_amount,
     process_withdrawal,
     SUPPORTED_CRYPTOS as API_SUPPORTED_CRYPTOS
 )
+from src.wallet.rates import rate_service
+from src.wallet.provider_metadata import provider_metadata
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -132,23 +131,6 @@ SUPPORTED_CRYPTOS = {
 # Store active deposit sessions
 active_deposits = {}
 
-# Mock exchange rates (in a real bot, you would fetch these from an API)
-EXCHANGE_RATES = {
-    "BTC": 60000,
-    "ETH": 3000,
-    "USDT": 1,
-    "SOL": 100,
-    "LTC": 80,
-    "USDC": 1,
-    "BNB": 400,
-    "XRP": 0.5,
-    "ADA": 0.4,
-    "DOGE": 0.1,
-    "MATIC": 0.8,
-    "AVAX": 30,
-    "SHIB": 0.00001
-}
-
 def format_crypto_amount(amount, crypto):
     """Format crypto amount with appropriate decimals"""
     decimals = SUPPORTED_CRYPTOS[crypto]["decimals"]
@@ -195,18 +177,19 @@ def generate_wallet_address(crypto):
     return prefix + random_part
 
 def convert_to_usd(amount, crypto):
-    """Convert crypto amount to USD"""
-    return amount * EXCHANGE_RATES[crypto]
+    """Convert crypto amount to USD, or None while no rate is available"""
+    rate = rate_service.get_rate(crypto)
+    return amount * rate if rate else None
 
 def convert_from_usd(amount, crypto):
-    """Convert USD amount to crypto"""
-    return amount / EXCHANGE_RATES[crypto]
+    """Convert USD amount to crypto, or None while no rate is available"""
+    rate = rate_service.get_rate(crypto)
+    return amount / rate if rate else None
 
 async def crypto_deposit_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /deposit command for crypto deposits"""
-    # Check if NOWPayments API is operational
-    api_status = await get_api_status()
-    if not api_status:
+    # Check if NOWPayments API is operational (last background status check)
+    if not provider_metadata.is_available():
         await update.message.reply_text(
             "❌ Crypto deposit service is currently unavailable. Please try again later."
         )
@@ -348,8 +331,8 @@ async def crypto_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         crypto = data[2]
         if crypto in SUPPORTED_CRYPTOS and crypto in API_SUPPORTED_CRYPTOS:
-            # Get minimum deposit amount from API
-            min_deposit = await get_minimum_deposit_amount(crypto)
+            # Minimum deposit amount from the cached provider metadata
+            min_deposit = provider_metadata.minimum(crypto)
             if min_deposit is None:
                 min_deposit = SUPPORTED_CRYPTOS[crypto]['min_deposit']
             
@@ -842,14 +825,16 @@ async def crypto_message_handler(update: Update, context: ContextTypes.DEFAULT_T
                 )
                 return True
             
-            # Get current exchange rate
-            rate = await get_crypto_price(crypto)
+            # Cached USD price of one coin; never waits on the provider
+            rate = rate_service.get_rate(crypto)
             if not rate:
-                # Fallback to our static rates if API fails
-                rate = 1 / EXCHANGE_RATES[crypto]
+                await update.message.reply_text(
+                    "Exchange rates are temporarily unavailable. Please try again in a minute."
+                )
+                return True
             
             # Calculate crypto amount
-            crypto_amount = amount_usd * rate
+            crypto_amount = amount_usd / rate
             
             # Calculate fee (in a real implementation, get this from the API)
             fee_crypto = SUPPORTED_CRYPTOS[crypto]["fee"]
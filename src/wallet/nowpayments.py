@@ -1,10 +1,16 @@
 import os
 import json
+import time
+import random
+import asyncio
 import aiohttp
 import logging
 from dotenv import load_dotenv
 from datetime import datetime
 
+from src.utils.metrics import payment_api_latency, payment_api_retries
+from src.utils.tracing import traced
+
 load_dotenv()
 
 # Configure logging
@@ -16,9 +22,19 @@ logger = logging.getLogger(__name__)
 
 # NOWPayments API configuration
 NOWPAYMENTS_API_KEY = os.getenv("NOWPAYMENTS_API_KEY")
-NOWPAYMENTS_BASE_URL = "https://api.nowpayments.io/v1"
+NOWPAYMENTS_BASE_URL = os.getenv("NOWPAYMENTS_BASE_URL", "https://api.nowpayments.io/v1")
 NOWPAYMENTS_IPN_SECRET = os.getenv("NOWPAYMENTS_IPN_SECRET", "")  # For IPN verification
 
+# Pooled HTTP client settings
+NOWPAYMENTS_POOL_SIZE = int(os.getenv("NOWPAYMENTS_POOL_SIZE", 20))
+NOWPAYMENTS_KEEPALIVE = float(os.getenv("NOWPAYMENTS_KEEPALIVE", 30))  # Seconds an idle connection is kept
+NOWPAYMENTS_TIMEOUT = float(os.getenv("NOWPAYMENTS_TIMEOUT", 15))  # Seconds per attempt
+NOWPAYMENTS_CONNECT_TIMEOUT = float(os.getenv("NOWPAYMENTS_CONNECT_TIMEOUT", 5))
+NOWPAYMENTS_RETRIES = int(os.getenv("NOWPAYMENTS_RETRIES", 2))
+NOWPAYMENTS_BACKOFF = float(os.getenv("NOWPAYMENTS_BACKOFF", 0.25))  # First retry waits up to 2x this
+NOWPAYMENTS_BACKOFF_CAP = 5.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 if not NOWPAYMENTS_API_KEY:
     logger.warning("NOWPAYMENTS_API_KEY not set - crypto payments will not work")
 
@@ -30,71 +46,134 @@ SUPPORTED_CRYPTOS = [
 ]
 
 class NOWPaymentsAPI:
-    """Class to handle NOWPayments API interactions"""
+    """Class to handle NOWPayments API interactions
     
-    def __init__(self, api_key=NOWPAYMENTS_API_KEY):
+    All calls share one pooled, keep-alive session per event loop. Reads are
+    retried with jittered backoff on timeouts, connection errors and 429/5xx
+    answers; writes are only retried when the connection was never made.
+    """
+    
+    def __init__(self, api_key=NOWPAYMENTS_API_KEY, base_url=NOWPAYMENTS_BASE_URL):
         self.api_key = api_key
+        self.base_url = base_url
         self.headers = {
             "x-api-key": self.api_key,
             "Content-Type": "application/json"
         }
+        self._session = None
+        self._loop = None
+    
+    def _get_session(self):
+        """The pooled session, created on first use in the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # A session cannot outlive its loop, e.g. the webhook's asyncio.run() calls
+            connector = aiohttp.TCPConnector(
+                limit=NOWPAYMENTS_POOL_SIZE,
+                keepalive_timeout=NOWPAYMENTS_KEEPALIVE,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=NOWPAYMENTS_TIMEOUT, connect=NOWPAYMENTS_CONNECT_TIMEOUT)
+            )
+            self._loop = loop
+        return self._session
     
+    async def close(self):
+        """Close the pooled session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _request(self, name, method, path, params=None, json=None, timeout=None):
+        """Send a request and return (status, body); the body is JSON on 200 and text otherwise"""
+        idempotent = method == "GET"
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            status = "error"
+            options = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+            try:
+                async with self._get_session().request(
+                    method,
+                    f"{self.base_url}{path}",
+                    params=params,
+                    json=json,
+                    **options
+                ) as response:
+                    status = response.status
+                    if status in RETRY_STATUSES and idempotent and attempt < NOWPAYMENTS_RETRIES:
+                        logger.warning(f"NOWPayments {name} returned {status}, retrying")
+                    else:
+                        body = await response.json(content_type=None) if status == 200 else await response.text()
+                        return status, body
+            except aiohttp.ClientConnectorError as e:
+                # Nothing was sent, so even writes can be retried
+                if attempt >= NOWPAYMENTS_RETRIES:
+                    raise
+                logger.warning(f"NOWPayments {name} could not connect ({e}), retrying")
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if not idempotent or attempt >= NOWPAYMENTS_RETRIES:
+                    raise
+                logger.warning(f"NOWPayments {name} failed ({type(e).__name__}: {e}), retrying")
+            finally:
+                payment_api_latency.labels(name, status).observe(time.perf_counter() - started)
+            attempt += 1
+            payment_api_retries.labels(name).inc()
+            # Full jitter keeps retries from many handlers from arriving together
+            await asyncio.sleep(random.uniform(0, min(NOWPAYMENTS_BACKOFF_CAP, NOWPAYMENTS_BACKOFF * 2 ** attempt)))
+    
+    @traced("nowpayments get_status")
     async def get_status(self):
         """Get API status"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{NOWPAYMENTS_BASE_URL}/status",
-                    headers=self.headers
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    else:
-                        logger.error(f"Failed to get API status: {response.status}")
-                        return None
+            status, data = await self._request("get_status", "GET", "/status")
+            if status == 200:
+                return data
+            else:
+                logger.error(f"Failed to get API status: {status}")
+                return None
         except Exception as e:
             logger.error(f"Error getting API status: {str(e)}")
             return None
     
+    @traced("nowpayments get_available_currencies")
     async def get_available_currencies(self):
         """Get list of available currencies from NOWPayments"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{NOWPAYMENTS_BASE_URL}/currencies",
-                    headers=self.headers
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        # Filter to only include our supported cryptocurrencies
-                        currencies = [c for c in data["currencies"] if c in SUPPORTED_CRYPTOS]
-                        return currencies
-                    else:
-                        logger.error(f"Failed to get currencies: {response.status}")
-                        return []
+            status, data = await self._request("get_available_currencies", "GET", "/currencies")
+            if status == 200:
+                # Filter to only include our supported cryptocurrencies
+                # The API lists lower-case codes
+                currencies = [c.upper() for c in data["currencies"] if c.upper() in SUPPORTED_CRYPTOS]
+                return currencies
+            else:
+                logger.error(f"Failed to get currencies: {status}")
+                return []
         except Exception as e:
             logger.error(f"Error getting currencies: {str(e)}")
             return []
     
+    @traced("nowpayments get_exchange_rates")
     async def get_exchange_rates(self, currency_from, currency_to="USD"):
         """Get exchange rate for a specific cryptocurrency to USD"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{NOWPAYMENTS_BASE_URL}/estimate?amount=1&currency_from={currency_from}&currency_to={currency_to}",
-                    headers=self.headers
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data["estimated_amount"]
-                    else:
-                        logger.error(f"Failed to get exchange rate: {response.status}")
-                        return None
+            status, data = await self._request(
+                "get_exchange_rates", "GET", "/estimate",
+                params={"amount": 1, "currency_from": currency_from, "currency_to": currency_to}
+            )
+            if status == 200:
+                return data["estimated_amount"]
+            else:
+                logger.error(f"Failed to get exchange rate: {status}")
+                return None
         except Exception as e:
             logger.error(f"Error getting exchange rate: {str(e)}")
             return None
     
+    @traced("nowpayments create_payment")
     async def create_payment(self, price_amount, price_currency="USD", pay_currency=None, order_id=None, order_description=None, success_url=None, cancel_url=None):
         """Create a payment in NOWPayments"""
         try:
@@ -116,41 +195,31 @@ class NOWPaymentsAPI:
             if cancel_url:
                 payload["cancel_url"] = cancel_url
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{NOWPAYMENTS_BASE_URL}/payment",
-                    headers=self.headers,
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Failed to create payment: {response.status}, {error_text}")
-                        return None
+            status, data = await self._request("create_payment", "POST", "/payment", json=payload)
+            if status == 200:
+                return data
+            else:
+                logger.error(f"Failed to create payment: {status}, {data}")
+                return None
         except Exception as e:
             logger.error(f"Error creating payment: {str(e)}")
             return None
     
+    @traced("nowpayments get_payment_status")
     async def get_payment_status(self, payment_id):
         """Get status of a payment"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{NOWPAYMENTS_BASE_URL}/payment/{payment_id}",
-                    headers=self.headers
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    else:
-                        logger.error(f"Failed to get payment status: {response.status}")
-                        return None
+            status, data = await self._request("get_payment_status", "GET", f"/payment/{payment_id}")
+            if status == 200:
+                return data
+            else:
+                logger.error(f"Failed to get payment status: {status}")
+                return None
         except Exception as e:
             logger.error(f"Error getting payment status: {str(e)}")
             return None
     
+    @traced("nowpayments get_payments")
     async def get_payments(self, limit=10, page=0, sort_by="created_at", order_by="desc", date_from=None, date_to=None):
         """Get list of payments"""
         try:
@@ -166,22 +235,17 @@ class NOWPaymentsAPI:
             if date_to:
                 params["dateTo"] = date_to
                 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{NOWPAYMENTS_BASE_URL}/payment",
-                    headers=self.headers,
-                    params=params
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    else:
-                        logger.error(f"Failed to get payments: {response.status}")
-                        return None
+            status, data = await self._request("get_payments", "GET", "/payment", params=params)
+            if status == 200:
+                return data
+            else:
+                logger.error(f"Failed to get payments: {status}")
+                return None
         except Exception as e:
             logger.error(f"Error getting payments: {str(e)}")
             return None
     
+    @traced("nowpayments create_invoice")
     async def create_invoice(self, price_amount, price_currency="USD", order_id=None, order_description=None, success_url=None, cancel_url=None):
         """Create an invoice"""
         try:
@@ -199,23 +263,17 @@ class NOWPaymentsAPI:
             if cancel_url:
                 payload["cancel_url"] = cancel_url
                 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{NOWPAYMENTS_BASE_URL}/invoice",
-                    headers=self.headers,
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Failed to create invoice: {response.status}, {error_text}")
-                        return None
+            status, data = await self._request("create_invoice", "POST", "/invoice", json=payload)
+            if status == 200:
+                return data
+            else:
+                logger.error(f"Failed to create invoice: {status}, {data}")
+                return None
         except Exception as e:
             logger.error(f"Error creating invoice: {str(e)}")
             return None
     
+    @traced("nowpayments create_withdrawal")
     async def create_withdrawal(self, address, currency, amount, extra_id=None):
         """Create a withdrawal request"""
         try:
@@ -228,55 +286,43 @@ class NOWPaymentsAPI:
             if extra_id:
                 payload["extra_id"] = extra_id
                 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{NOWPAYMENTS_BASE_URL}/withdrawal",
-                    headers=self.headers,
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Failed to create withdrawal: {response.status}, {error_text}")
-                        return None
+            status, data = await self._request("create_withdrawal", "POST", "/withdrawal", json=payload)
+            if status == 200:
+                return data
+            else:
+                logger.error(f"Failed to create withdrawal: {status}, {data}")
+                return None
         except Exception as e:
             logger.error(f"Error creating withdrawal: {str(e)}")
             return None
     
+    @traced("nowpayments get_min_payment_amount")
     async def get_min_payment_amount(self, currency_from, currency_to="USD"):
         """Get minimum payment amount for a cryptocurrency"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{NOWPAYMENTS_BASE_URL}/min-amount?currency_from={currency_from}&currency_to={currency_to}",
-                    headers=self.headers
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data["min_amount"]
-                    else:
-                        logger.error(f"Failed to get min amount: {response.status}")
-                        return None
+            status, data = await self._request(
+                "get_min_payment_amount", "GET", "/min-amount",
+                params={"currency_from": currency_from, "currency_to": currency_to}
+            )
+            if status == 200:
+                return data["min_amount"]
+            else:
+                logger.error(f"Failed to get min amount: {status}")
+                return None
         except Exception as e:
             logger.error(f"Error getting min amount: {str(e)}")
             return None
             
+    @traced("nowpayments get_available_balance")
     async def get_available_balance(self):
         """Get available balance for withdrawals"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{NOWPAYMENTS_BASE_URL}/balance",
-                    headers=self.headers
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data["availableBalance"]
-                    else:
-                        logger.error(f"Failed to get balance: {response.status}")
-                        return None
+            status, data = await self._request("get_available_balance", "GET", "/balance")
+            if status == 200:
+                return data["availableBalance"]
+            else:
+                logger.error(f"Failed to get balance: {status}")
+                return None
         except Exception as e:
             logger.error(f"Error getting balance: {str(e)}")
             return None
@@ -352,7 +398,7 @@ async def create_deposit_invoice(user_id, amount_usd):
 
 async def check_payment_status(payment_id):
     """Check the status of a payment with enhanced logging"""
-    logger.debug(f"Checking status for payment: {payment_id}")
+    logger.debug("Checking status for payment: %s", payment_id)
     
     try:
         status = await nowpayments_client.get_payment_status(payment_id)
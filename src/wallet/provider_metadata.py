@@ -0,0 +1,123 @@
+"""
+Cached NOWPayments metadata
+
+The provider's status, the currencies it currently accepts and each
+currency's minimum payment are fetched at startup and refreshed in the
+background, so deposit menus render from memory. During an outage the last
+status check says so immediately instead of every click waiting on a timeout,
+and the last known currencies and minimums keep being served.
+"""
+import asyncio
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.utils.logger import bot_logger
+from src.utils.metrics import registry
+from src.wallet.nowpayments import SUPPORTED_CRYPTOS, nowpayments_client
+
+# Seconds between provider status checks
+PROVIDER_STATUS_INTERVAL = float(os.getenv("PROVIDER_STATUS_INTERVAL", 60))
+
+# Seconds between refreshes of the currency list and minimums
+PROVIDER_CATALOG_INTERVAL = float(os.getenv("PROVIDER_CATALOG_INTERVAL", 900))
+
+# Longest startup may wait for the first fetch
+PROVIDER_WARM_TIMEOUT = float(os.getenv("PROVIDER_WARM_TIMEOUT", 10))
+
+# Provider calls in flight while fetching minimums
+PROVIDER_FETCH_CONCURRENCY = int(os.getenv("PROVIDER_FETCH_CONCURRENCY", 5))
+
+
+class ProviderMetadata:
+    """In-memory provider status, currencies and minimum amounts"""
+
+    def __init__(self, client=nowpayments_client, symbols: Iterable[str] = SUPPORTED_CRYPTOS,
+                 status_interval: float = PROVIDER_STATUS_INTERVAL,
+                 catalog_interval: float = PROVIDER_CATALOG_INTERVAL):
+        self.client = client
+        self.symbols = list(symbols)
+        self.status_interval = status_interval
+        self.catalog_interval = catalog_interval
+        self.available: Optional[bool] = None
+        self.status_checked_at: Optional[float] = None
+        self.currencies: Optional[Set[str]] = None
+        self.minimums: Dict[str, float] = {}
+        self.catalog_refreshed_at: Optional[float] = None
+        self._refresher: Optional[asyncio.Task] = None
+
+    def is_available(self) -> bool:
+        """Whether deposits should be offered; unknown or outdated status counts as available"""
+        if self.available is None or time.monotonic() - self.status_checked_at > 3 * self.status_interval:
+            return True
+        return self.available
+
+    def supported(self, symbols: Iterable[str]) -> List[str]:
+        """The given symbols the provider accepts, in order; all of them until the list is known"""
+        if not self.currencies:
+            return list(symbols)
+        return [symbol for symbol in symbols if symbol.upper() in self.currencies]
+
+    def minimum(self, symbol: str) -> Optional[float]:
+        return self.minimums.get(symbol.upper())
+
+    async def refresh_status(self) -> bool:
+        status = await self.client.get_status()
+        available = bool(status) and status.get("message") == "OK"
+        if available != self.available and self.available is not None:
+            log = bot_logger.info if available else bot_logger.warning
+            log(f"NOWPayments is {'back up' if available else 'unavailable'}: {status}")
+        self.available = available
+        self.status_checked_at = time.monotonic()
+        return available
+
+    async def refresh_catalog(self):
+        """Refresh currencies and minimums, keeping the previous values for anything that fails"""
+        currencies = await self.client.get_available_currencies()
+        if currencies:
+            self.currencies = {currency.upper() for currency in currencies}
+
+        semaphore = asyncio.Semaphore(PROVIDER_FETCH_CONCURRENCY)
+
+        async def fetch_minimum(symbol: str):
+            async with semaphore:
+                return await self.client.get_min_payment_amount(symbol)
+
+        symbols = self.supported(self.symbols)
+        minimums = await asyncio.gather(*(fetch_minimum(symbol) for symbol in symbols), return_exceptions=True)
+        for symbol, minimum in zip(symbols, minimums):
+            if isinstance(minimum, (int, float)):
+                self.minimums[symbol.upper()] = float(minimum)
+        self.catalog_refreshed_at = time.monotonic()
+
+    async def warm(self, timeout: float = PROVIDER_WARM_TIMEOUT):
+        """First fetch at startup, bounded so a provider outage does not hold up the bot"""
+        try:
+            await asyncio.wait_for(asyncio.gather(self.refresh_status(), self.refresh_catalog()), timeout)
+        except Exception as e:
+            bot_logger.warning(f"Provider metadata not warmed: {type(e).__name__}: {e}")
+
+    async def run_refresher(self):
+        catalog_due = time.monotonic() + self.catalog_interval
+        while True:
+            await asyncio.sleep(self.status_interval)
+            try:
+                await self.refresh_status()
+                if time.monotonic() >= catalog_due:
+                    await self.refresh_catalog()
+                    catalog_due = time.monotonic() + self.catalog_interval
+            except Exception as e:
+                bot_logger.error(f"Provider metadata refresh failed: {e}")
+
+    def start(self):
+        """Start the background refresher on the running event loop"""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.get_running_loop().create_task(self.run_refresher())
+        return self._refresher
+
+
+# Shared by the deposit screens; warmed and started from post_init
+provider_metadata = ProviderMetadata()
+
+registry.gauge("payment_provider_up", "Whether the last NOWPayments status check succeeded",
+               callback=lambda: 1 if provider_metadata.is_available() else 0)
@@ -0,0 +1,141 @@
+"""
+Exchange-rate service
+
+One in-memory quote per (currency, USD) pair, refreshed for every supported
+currency by a single background job. Deposit and withdrawal screens read
+quotes with get_rate(), which never waits on the provider: a quote older than
+RATE_TTL is still served while a refresh runs in the background
+(stale-while-revalidate), and only quotes older than RATE_MAX_STALENESS are
+refused. Misses trigger the same refresh, so concurrent misses share one job.
+"""
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from src.utils.logger import bot_logger
+from src.utils.metrics import cache_requests, registry, settlement_latency
+from src.wallet.nowpayments import SUPPORTED_CRYPTOS, get_crypto_price
+
+# Quotes younger than this are fresh
+RATE_TTL = float(os.getenv("RATE_TTL", 60))
+
+# Quotes older than this are not served at all
+RATE_MAX_STALENESS = float(os.getenv("RATE_MAX_STALENESS", 900))
+
+# Pause between background refreshes; shorter than the TTL so quotes rarely go stale
+RATE_REFRESH_INTERVAL = float(os.getenv("RATE_REFRESH_INTERVAL", 30))
+
+# Provider calls in flight during one refresh
+RATE_FETCH_CONCURRENCY = int(os.getenv("RATE_FETCH_CONCURRENCY", 5))
+
+PriceFetcher = Callable[[str, str], Awaitable[Optional[float]]]
+
+
+class RateService:
+    """Cached USD prices for the supported currencies"""
+
+    def __init__(self, fetch: PriceFetcher = get_crypto_price, symbols: Iterable[str] = SUPPORTED_CRYPTOS,
+                 quote: str = "USD", ttl: float = RATE_TTL, max_staleness: float = RATE_MAX_STALENESS,
+                 refresh_interval: float = RATE_REFRESH_INTERVAL, concurrency: int = RATE_FETCH_CONCURRENCY):
+        self.fetch = fetch
+        self.symbols = list(symbols)
+        self.quote = quote
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        self.refresh_interval = refresh_interval
+        self.concurrency = concurrency
+        self.quotes: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._refreshing: Optional[asyncio.Task] = None
+        self._refresher: Optional[asyncio.Task] = None
+        self._hits = cache_requests.labels("rates", "hit")
+        self._stale = cache_requests.labels("rates", "stale")
+        self._misses = cache_requests.labels("rates", "miss")
+        self._refresh_latency = settlement_latency.labels("rate_refresh")
+
+    def get_rate(self, symbol: str, quote: Optional[str] = None) -> Optional[float]:
+        """Price of one unit of symbol from memory, or None when there is no usable quote"""
+        cached = self.quotes.get((symbol, quote or self.quote))
+        age = time.monotonic() - cached[1] if cached else None
+        if age is not None and age <= self.ttl:
+            self._hits.inc()
+            return cached[0]
+        self.refresh_soon()
+        if age is not None and age <= self.max_staleness:
+            self._stale.inc()
+            return cached[0]
+        self._misses.inc()
+        return None
+
+    async def fetch_rate(self, symbol: str, quote: Optional[str] = None) -> Optional[float]:
+        """Like get_rate, but waits for the refresh when there is no usable quote"""
+        rate = self.get_rate(symbol, quote)
+        if rate is None:
+            await self.refresh()
+            cached = self.quotes.get((symbol, quote or self.quote))
+            rate = cached[0] if cached else None
+        return rate
+
+    def age(self, symbol: str, quote: Optional[str] = None) -> Optional[float]:
+        cached = self.quotes.get((symbol, quote or self.quote))
+        return time.monotonic() - cached[1] if cached else None
+
+    def refresh_soon(self):
+        """Start a background refresh unless one is already running"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = loop.create_task(self._refresh_all())
+
+    async def refresh(self) -> int:
+        """Refresh every currency, joining the refresh already in flight if there is one"""
+        self.refresh_soon()
+        return await asyncio.shield(self._refreshing)
+
+    async def _refresh_all(self) -> int:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_one(symbol: str):
+            async with semaphore:
+                return await self.fetch(symbol, self.quote)
+
+        with self._refresh_latency.time():
+            prices = await asyncio.gather(*(fetch_one(symbol) for symbol in self.symbols), return_exceptions=True)
+        now = time.monotonic()
+        updated = 0
+        for symbol, price in zip(self.symbols, prices):
+            if isinstance(price, (int, float)) and price > 0:
+                self.quotes[(symbol, self.quote)] = (float(price), now)
+                updated += 1
+        if updated < len(self.symbols):
+            failed = [symbol for symbol, price in zip(self.symbols, prices)
+                      if not isinstance(price, (int, float)) or price <= 0]
+            bot_logger.warning(f"Rate refresh: no price for {', '.join(failed)}")
+        return updated
+
+    async def run_refresher(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                bot_logger.error(f"Rate refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """Start the background refresher on the running event loop"""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.get_running_loop().create_task(self.run_refresher())
+        return self._refresher
+
+    def ages(self) -> Dict[str, float]:
+        now = time.monotonic()
+        return {symbol: now - fetched_at for (symbol, _), (_, fetched_at) in self.quotes.items()}
+
+
+# Shared by the deposit and withdrawal screens; started from post_init
+rate_service = RateService()
+
+registry.gauge("exchange_rate_age_seconds", "Age of each cached exchange-rate quote", ("currency",),
+               callback=rate_service.ages)
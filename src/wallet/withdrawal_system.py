@@ -12,6 +12,7 @@ from telegram.ext import ContextTypes
 from src.database import get_user, update_user_balance, record_transaction
 from src.utils.formatting import format_money
 from src.utils.logger import bot_logger
+from src.wallet.rates import rate_service
 
 load_dotenv()
 
@@ -91,15 +92,7 @@ WITHDRAWAL_METHODS = {
     }
 }
 
-# Exchange rates (in production, these would be fetched from an API)
-EXCHANGE_RATES = {
-    "BTC": 65000.0,
-    "ETH": 3200.0,
-    "USDT": 1.0,
-    "USDC": 1.0,
-    "LTC": 85.0,
-    "TRX": 0.12
-}
+RATES_UNAVAILABLE = "❌ Exchange rates are temporarily unavailable. Please try again in a minute."
 
 class WithdrawalSystem:
     def __init__(self):
@@ -175,7 +168,10 @@ class WithdrawalSystem:
             return
         
         method = WITHDRAWAL_METHODS[crypto_symbol]
-        exchange_rate = EXCHANGE_RATES[crypto_symbol]
+        exchange_rate = rate_service.get_rate(crypto_symbol)
+        if not exchange_rate:
+            await update.callback_query.edit_message_text(RATES_UNAVAILABLE)
+            return
         
         # Calculate amounts
         max_crypto_amount = user['balance'] / exchange_rate
@@ -215,7 +211,10 @@ class WithdrawalSystem:
         user = await get_user(user_id)
         crypto_symbol = context.user_data['withdrawal_crypto']
         method = WITHDRAWAL_METHODS[crypto_symbol]
-        exchange_rate = EXCHANGE_RATES[crypto_symbol]
+        exchange_rate = rate_service.get_rate(crypto_symbol)
+        if not exchange_rate:
+            await update.message.reply_text(RATES_UNAVAILABLE)
+            return True
         
         try:
             amount = float(update.message.text.strip())
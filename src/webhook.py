@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 import hmac
 import hashlib
 import json
@@ -6,8 +6,20 @@ import os
 import asyncio
 from src.database import get_user, update_user_balance, record_transaction
 from src.wallet.nowpayments import verify_ipn_request, handle_ipn_notification
+from src.utils.metrics import registry, time_route, bearer_authorized, PROMETHEUS_CONTENT_TYPE
 
 app = Flask(__name__)
+time_route(app, 'webhook')
+
+# Bearer token required by /metrics; it stays closed until the token is set
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics of this process"""
+    if not bearer_authorized(request.headers.get('Authorization'), METRICS_TOKEN):
+        return jsonify({'error': 'Unauthorized'}), 401
+    return Response(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
 
 @app.route('/webhook/nowpayments', methods=['POST'])
 def nowpayments_webhook():
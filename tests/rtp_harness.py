@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo RTP / house-edge harness for every game
+
+Runs each game's real engine code (or a vectorized equivalent) for a large
+number of unit-stake rounds split across worker processes, and reports the
+return-to-player, variance, maximum single-round exposure and a confidence
+interval for the RTP.
+
+Usage:
+    python -m tests.rtp_harness                       # every scenario, 10^7 rounds
+    python -m tests.rtp_harness --rounds 1000000000 --processes 16 plinko_quick_high
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+# z-score for a two-sided 99.9% confidence interval
+DEFAULT_Z = 3.29
+
+# Rounds per vectorized chunk inside a worker
+VECTOR_CHUNK = 1_000_000
+
+
+# ----------------------------------------------------------------------
+# Scalar scenarios: one round of the real engine code, returns the payout
+# multiple of a unit stake. Every random draw comes from the worker's seeded
+# generator, so a worker's rounds are reproducible from its seed.
+# ----------------------------------------------------------------------
+def _fair_session(rng: random.Random):
+    """Provably fair seeds taken from the worker generator instead of GAME_SERVER_SEED"""
+    from src.games.provably_fair import FairSession
+    return FairSession(client_seed='rtp', nonce=0, server_seed='%032x' % rng.getrandbits(128))
+
+def play_mines(rng: random.Random, gems: int, mines_count: int) -> float:
+    from src.games.mines import MinesGame
+    game = MinesGame(0, mines_count, fair=_fair_session(rng))
+    game.start_game(1.0)
+    for position in range(gems):
+        if game.reveal_tile(position)['hit_mine']:
+            return 0.0
+    game.cash_out()
+    return game.winnings
+
+def play_tower(rng: random.Random, levels: int) -> float:
+    from src.games.tower import TowerGame
+    game = TowerGame(0, fair=_fair_session(rng))
+    game.start_game(1.0)
+    for _ in range(levels):
+        if not game.choose_tile(0)['success']:
+            return 0.0
+    if not game.game_over:
+        game.cash_out()
+    return game.winnings
+
+def play_plinko(rng: random.Random, risk_level: str) -> float:
+    from src.games.plinko import PlinkoGame
+    game = PlinkoGame(0, fair=_fair_session(rng))
+    game.start_game(1.0, risk_level)
+    return game.drop_ball()['multiplier']
+
+def play_lottery(rng: random.Random) -> float:
+    from src.games.lottery import LotteryGame
+    game = LotteryGame(0, rng=rng)
+    game.start_game(1.0)
+    game.select_numbers([1, 2, 3, 4, 5, 6])
+    game.draw_numbers()
+    return game.winnings
+
+def play_roulette(rng: random.Random, bets: Dict[str, float]) -> float:
+    from src.games.roulette import RouletteGame
+    game = RouletteGame(0, rng=rng)
+    for bet_type, amount in bets.items():
+        game.place_bet(bet_type, amount)
+    game.spin()
+    return game.winnings / game.total_bet
+
+def play_poker(rng: random.Random) -> float:
+    from src.games.poker import PokerGame
+    game = PokerGame(0, rng=rng)
+    game.start_game(1.0)
+    game.finish_game()
+    return game.winnings
+
+# One shoe per worker generator, dealt continuously like the shared webapp shoe
+_shoes: Dict[int, Any] = {}
+
+def play_blackjack(rng: random.Random, stand_on: int) -> float:
+    from src.games.blackjack import BlackjackGame, Shoe
+    shoe = _shoes.get(id(rng))
+    if shoe is None or shoe.rng is not rng:
+        shoe = _shoes[id(rng)] = Shoe(rng=rng)
+    game = BlackjackGame(0, 1.0, shoe=shoe)
+    while not game.game_over and game.get_hand_value(game.player_hand) < stand_on:
+        game.hit()
+    if not game.game_over:
+        game.stand()
+    return game.get_winnings()
+
+
+# ----------------------------------------------------------------------
+# Vectorized equivalents of the Telegram animated games
+# ----------------------------------------------------------------------
+def _telegram_table(scoring: Dict[int, Dict[str, Any]]) -> np.ndarray:
+    return np.array([scoring[value]['multiplier'] for value in sorted(scoring)], dtype=np.float64)
+
+def telegram_scoring_multipliers(rng: np.random.Generator, k: int, module: str, table_name: str) -> np.ndarray:
+    """Telegram dice-style games return a uniform value and pay from a scoring table"""
+    scoring = getattr(__import__(module, fromlist=[table_name]), table_name)
+    table = _telegram_table(scoring)
+    return table[rng.integers(0, len(table), size=k)]
+
+def telegram_dice_multipliers(rng: np.random.Generator, k: int, multiplier: float) -> np.ndarray:
+    return np.where(rng.integers(1, 7, size=k) == 1, multiplier, 0.0)
+
+def telegram_wheel_multipliers(rng: np.random.Generator, k: int, segment_id: int) -> np.ndarray:
+    from src.games.wheel_animated import WHEEL_SEGMENTS
+    ids = sorted(WHEEL_SEGMENTS)
+    cdf = np.cumsum([WHEEL_SEGMENTS[i]['probability'] for i in ids])
+    drawn = np.searchsorted(cdf, rng.random(k), side='left')
+    drawn = np.minimum(drawn, len(ids) - 1)
+    return np.where(np.asarray(ids)[drawn] == segment_id, float(WHEEL_SEGMENTS[segment_id]['multiplier']), 0.0)
+
+def roulette_slip_multipliers(rng: np.random.Generator, k: int, bets: Dict[str, float]) -> np.ndarray:
+    """Compiled bet slip payouts per number, looked up for each spin"""
+    from src.games.roulette import compile_slip
+    payouts = compile_slip(bets) / sum(bets.values())
+    return payouts[rng.integers(0, len(payouts), size=k)]
+
+def blackjack_basic_strategy_multipliers(rng: np.random.Generator, k: int) -> np.ndarray:
+    from src.games.blackjack_sim import simulate_hands
+    return simulate_hands(k, rng)
+
+
+# ----------------------------------------------------------------------
+# Scenario registry
+# ----------------------------------------------------------------------
+def _batch(game_type: str, game_data: Optional[Dict[str, Any]] = None) -> Tuple[str, Any]:
+    return ('batch', (game_type, game_data or {}))
+
+def _vector(func: Callable, *args) -> Tuple[str, Any]:
+    return ('vector', (func, args))
+
+def _scalar(func: Callable, *args) -> Tuple[str, Any]:
+    return ('scalar', (func, args))
+
+SCENARIOS: Dict[str, Tuple[str, Any]] = {
+    # Webapp quick-play games (/api/game/bet) through the batch engine
+    'coinflip_quick': _batch('coinflip', {'choice': 'heads'}),
+    'dice_quick_over_50': _batch('dice', {'target': 50, 'over_under': 'over'}),
+    'dice_quick_under_50': _batch('dice', {'target': 50, 'over_under': 'under'}),
+    'plinko_quick_low': _batch('plinko', {'risk': 'low'}),
+    'plinko_quick_medium': _batch('plinko', {'risk': 'medium'}),
+    'plinko_quick_high': _batch('plinko', {'risk': 'high'}),
+    'roulette_quick_number': _batch('roulette', {'bet_type': 'number', 'bet_value': 17}),
+    'roulette_quick_color': _batch('roulette', {'bet_type': 'color', 'bet_value': 'red'}),
+    'roulette_quick_odd': _batch('roulette', {'bet_type': 'odd_even', 'bet_value': 'odd'}),
+    'slots_quick': _batch('slots'),
+    'wheel_quick_segment_1': _batch('wheel', {'selected_segment': 1}),
+    'wheel_quick_segment_8': _batch('wheel', {'selected_segment': 8}),
+    'crash_quick_2x': _batch('crash', {'cash_out_at': 2.0}),
+    'crash_session_2x': _batch('crash_session', {'cash_out_at': 2.0}),
+    'crash_session_10x': _batch('crash_session', {'cash_out_at': 10.0}),
+    # Webapp session games through the real game classes
+    'mines_5_mines_3_gems': _scalar(play_mines, 3, 5),
+    'mines_3_mines_10_gems': _scalar(play_mines, 10, 3),
+    'tower_3_levels': _scalar(play_tower, 3),
+    'plinko_session_medium': _scalar(play_plinko, 'medium'),
+    'plinko_session_high': _scalar(play_plinko, 'high'),
+    'lottery_ticket': _scalar(play_lottery),
+    'roulette_session_red': _scalar(play_roulette, {'red': 1.0}),
+    'poker_vs_dealer': _scalar(play_poker),
+    'blackjack_stand_17': _scalar(play_blackjack, 17),
+    'blackjack_basic_strategy': _vector(blackjack_basic_strategy_multipliers),
+    'roulette_session_slip': _vector(roulette_slip_multipliers, {
+        'number_17': 1.0, 'split_17_20': 1.0, 'street_16': 1.0, 'corner_17': 1.0, 'line_16': 1.0,
+        'dozen_3': 1.0, 'column_2': 1.0, 'red': 1.0, 'odd': 1.0, 'high': 1.0
+    }),
+    # Telegram animated games
+    'telegram_dice_solo': _vector(telegram_dice_multipliers, 5.0),
+    'telegram_slots_solo': _vector(telegram_scoring_multipliers, 'src.games.slots_animated', 'SLOT_VALUE_SCORING'),
+    'telegram_darts_solo': _vector(telegram_scoring_multipliers, 'src.games.darts_animated', 'DARTS_SCORING'),
+    'telegram_bowling_solo': _vector(telegram_scoring_multipliers, 'src.games.bowling_animated', 'BOWLING_SCORING'),
+    'telegram_basketball_solo': _vector(telegram_scoring_multipliers, 'src.games.basketball_animated', 'BASKETBALL_SCORING'),
+    'telegram_football_solo': _vector(telegram_scoring_multipliers, 'src.games.football_animated', 'FOOTBALL_SCORING'),
+    'telegram_wheel_red': _vector(telegram_wheel_multipliers, 1),
+    'telegram_wheel_black': _vector(telegram_wheel_multipliers, 6),
+}
+
+
+# ----------------------------------------------------------------------
+# Workers and aggregation
+# ----------------------------------------------------------------------
+def _empty_stats() -> Dict[str, float]:
+    return {'rounds': 0, 'total': 0.0, 'total_sq': 0.0, 'wins': 0, 'max_multiplier': 0.0}
+
+def _accumulate(stats: Dict[str, float], multipliers: np.ndarray) -> None:
+    stats['rounds'] += int(multipliers.size)
+    stats['total'] += float(multipliers.sum())
+    stats['total_sq'] += float(np.dot(multipliers, multipliers))
+    stats['wins'] += int(np.count_nonzero(multipliers > 1.0))
+    stats['max_multiplier'] = max(stats['max_multiplier'], float(multipliers.max()))
+
+def run_worker(task: Tuple[str, int, int]) -> Dict[str, float]:
+    """Simulate one share of a scenario in a worker process"""
+    name, rounds, seed = task
+    kind, spec = SCENARIOS[name]
+    stats = _empty_stats()
+
+    if kind == 'batch':
+        from src.games.batch_engine import BatchOutcomeEngine
+        game_type, game_data = spec
+        result = BatchOutcomeEngine(seed).simulate(game_type, rounds, game_data, chunk_size=VECTOR_CHUNK)
+        stats.update({
+            'rounds': result['rounds'],
+            'total': result['total_return'],
+            'total_sq': result['total_return_sq'],
+            'wins': result['wins'],
+            'max_multiplier': result['max_multiplier']
+        })
+    elif kind == 'vector':
+        func, args = spec
+        rng = np.random.default_rng(seed)
+        remaining = rounds
+        while remaining > 0:
+            k = min(VECTOR_CHUNK, remaining)
+            _accumulate(stats, func(rng, k, *args))
+            remaining -= k
+    else:
+        func, args = spec
+        rng = random.Random(seed)
+        multipliers = np.fromiter((func(rng, *args) for _ in range(rounds)), dtype=np.float64, count=rounds)
+        _accumulate(stats, multipliers)
+
+    return stats
+
+def summarize(name: str, stats: Dict[str, float], elapsed: float, z: float = DEFAULT_Z) -> Dict[str, Any]:
+    """Turn raw sums into RTP, variance and a confidence interval"""
+    n = stats['rounds']
+    rtp = stats['total'] / n
+    variance = max(stats['total_sq'] / n - rtp * rtp, 0.0)
+    half_width = z * math.sqrt(variance / n)
+    return {
+        'scenario': name,
+        'rounds': n,
+        'rtp': rtp,
+        'house_edge': 1.0 - rtp,
+        'variance': variance,
+        'ci_low': rtp - half_width,
+        'ci_high': rtp + half_width,
+        'hit_rate': stats['wins'] / n,
+        'max_exposure': stats['max_multiplier'],
+        'rounds_per_second': n / elapsed if elapsed > 0 else float('inf')
+    }
+
+def simulate_scenario(name: str, rounds: int, processes: int = 1, seed: int = 0,
+                      z: float = DEFAULT_Z, pool: Optional[Pool] = None) -> Dict[str, Any]:
+    """Run a scenario across processes and return its summary"""
+    workers = max(1, min(processes, rounds))
+    seeds = np.random.SeedSequence([seed, sum(map(ord, name))]).generate_state(workers)
+    share, extra = divmod(rounds, workers)
+    tasks = [(name, share + (1 if i < extra else 0), int(seeds[i])) for i in range(workers)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [run_worker(tasks[0])]
+    elif pool is not None:
+        results = pool.map(run_worker, tasks)
+    else:
+        with Pool(workers) as worker_pool:
+            results = worker_pool.map(run_worker, tasks)
+    elapsed = time.perf_counter() - start
+
+    merged = _empty_stats()
+    for result in results:
+        for key in ('rounds', 'total', 'total_sq', 'wins'):
+            merged[key] += result[key]
+        merged['max_multiplier'] = max(merged['max_multiplier'], result['max_multiplier'])
+
+    return summarize(name, merged, elapsed, z)
+
+def check_bounds(summary: Dict[str, Any], bounds: Tuple[float, float]) -> bool:
+    """A scenario passes while its simulated RTP lies within the configured bounds"""
+    low, high = bounds
+    return low <= summary['rtp'] <= high
+
+def format_report(summaries: List[Dict[str, Any]]) -> str:
+    lines = [
+        f"{'scenario':<28} {'rounds':>12} {'rtp':>8} {'ci (99.9%)':>19} {'variance':>12} {'max':>8} {'rounds/s':>12}"
+    ]
+    for s in summaries:
+        lines.append(
+            f"{s['scenario']:<28} {s['rounds']:>12,} {s['rtp']:>8.4f} "
+            f"[{s['ci_low']:>7.4f}, {s['ci_high']:>7.4f}] {s['variance']:>12.3f} "
+            f"{s['max_exposure']:>8.1f} {s['rounds_per_second']:>12,.0f}"
+        )
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from tests.test_rtp import RTP_BOUNDS
+
+    parser = argparse.ArgumentParser(description="Monte Carlo RTP verification for every game")
+    parser.add_argument('scenarios', nargs='*', help="Scenario names (default: all)")
+    parser.add_argument('--rounds', type=int, default=10_000_000, help="Rounds per vectorized scenario")
+    parser.add_argument('--scalar-rounds', type=int, default=None,
+                        help="Rounds per real-engine scenario (default: rounds / 100)")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or list(SCENARIOS)
+    scalar_rounds = args.scalar_rounds or max(1, args.rounds // 100)
+    summaries = []
+    failures = []
+
+    with Pool(args.processes) as pool:
+        for name in names:
+            rounds = scalar_rounds if SCENARIOS[name][0] == 'scalar' else args.rounds
+            summary = simulate_scenario(name, rounds, args.processes, args.seed, pool=pool)
+            summaries.append(summary)
+            if name in RTP_BOUNDS and not check_bounds(summary, RTP_BOUNDS[name]):
+                failures.append(name)
+
+    print(format_report(summaries))
+    if failures:
+        print(f"\n❌ RTP outside configured bounds: {', '.join(failures)}")
+        return 1
+    print("\n✅ All scenarios within configured RTP bounds")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
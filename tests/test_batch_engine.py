@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from src.games.batch_engine import BatchOutcomeEngine
+from src.games.payout_tables import PLINKO_MULTIPLIERS, PLINKO_QUICK_ROWS, SLOT_TRIPLE_MULTIPLIERS, SLOT_PAIR_MULTIPLIER
+
+class TestBatchOutcomeEngine(unittest.TestCase):
+    """Test vectorized outcome generation"""
+
+    def setUp(self):
+        self.engine = BatchOutcomeEngine(seed=42)
+
+    def test_outcome_ranges(self):
+        """Test raw outcomes stay within each game's range"""
+        rolls = self.engine.dice_rolls(10000)
+        self.assertEqual(rolls.shape, (10000,))
+        self.assertGreaterEqual(rolls.min(), 1)
+        self.assertLessEqual(rolls.max(), 100)
+
+        numbers = self.engine.roulette_numbers(10000)
+        self.assertGreaterEqual(numbers.min(), 0)
+        self.assertLessEqual(numbers.max(), 36)
+
+        buckets = self.engine.plinko_buckets(10000)
+        self.assertGreaterEqual(buckets.min(), 0)
+        self.assertLessEqual(buckets.max(), 8)
+
+        reels = self.engine.slot_reels(10000)
+        self.assertEqual(reels.shape, (10000, 3))
+
+        segments = self.engine.wheel_segments(10000)
+        self.assertTrue(set(np.unique(segments)) <= set(range(1, 9)))
+
+        # 0.9 / u**0.7 bottoms out at 0.9 (an instant crash)
+        self.assertGreaterEqual(self.engine.crash_points(10000).min(), 0.9)
+
+    def test_payout_tables_applied(self):
+        """Test multipliers only take values from the payout tables"""
+        plinko = self.engine.plinko_multipliers(10000, 'high')
+        self.assertTrue(set(np.unique(plinko)) <= set(PLINKO_MULTIPLIERS[(PLINKO_QUICK_ROWS, 'high')]))
+
+        slots = self.engine.slot_multipliers(10000)
+        allowed = set(SLOT_TRIPLE_MULTIPLIERS) | {SLOT_PAIR_MULTIPLIER, 0}
+        self.assertTrue(set(np.unique(slots)) <= allowed)
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test the same seed gives the same outcomes"""
+        first = BatchOutcomeEngine(seed=7).multipliers('wheel', 1000, {'selected_segment': 1})
+        second = BatchOutcomeEngine(seed=7).multipliers('wheel', 1000, {'selected_segment': 1})
+        np.testing.assert_array_equal(first, second)
+
+    def test_simulate_matches_expected_rtp(self):
+        """Test simulated RTP converges on the analytic value"""
+        # Straight-up roulette pays 36x on a 1-in-37 chance
+        result = self.engine.simulate('roulette', 2_000_000, {'bet_type': 'number', 'bet_value': 17}, chunk_size=500_000)
+        self.assertEqual(result['rounds'], 2_000_000)
+        self.assertAlmostEqual(result['rtp'], 36 / 37, delta=0.02)
+
+    def test_unknown_game_type(self):
+        """Test unsupported games are rejected"""
+        with self.assertRaises(ValueError):
+            self.engine.multipliers('blackjack', 10)
+
+if __name__ == '__main__':
+    unittest.main()
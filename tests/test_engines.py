@@ -0,0 +1,138 @@
+import unittest
+import random
+import sys
+import time
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.games.engines import (
+    get_engine, register_engine, GAME_ENGINES, WeightedTable, SegmentWheelEngine, MinesEngine, TowerQuickEngine
+)
+from src.games.darts_animated import DARTS_SCORING
+from src.games.slots_animated import SLOT_VALUE_SCORING
+from src.games.payout_tables import SLOT_TRIPLE_MULTIPLIERS, SLOT_PAIR_MULTIPLIER, TOWER_QUICK_MULTIPLIERS
+
+class TestGameEngines(unittest.TestCase):
+    """Test the table-driven game engine registry"""
+
+    def test_registry_lookup(self):
+        """Test every quick-play game has an engine"""
+        for game_type in ('coinflip', 'crash', 'dice', 'roll', 'plinko', 'mines',
+                          'roulette', 'slots', 'blackjack', 'tower', 'wheel'):
+            self.assertIsNotNone(get_engine(game_type), game_type)
+        self.assertIs(get_engine('roll'), get_engine('dice'))
+        self.assertIsNone(get_engine('baccarat'))
+
+    def test_registry_is_read_only(self):
+        """Test the public registry view cannot be mutated"""
+        with self.assertRaises(TypeError):
+            GAME_ENGINES['coinflip'] = None
+
+    def test_weighted_table_sampling(self):
+        """Test sampling follows the configured weights"""
+        table = WeightedTable(('a', 'b'), (1, 3))
+        rng = random.Random(1)
+        draws = [table.sample(rng) for _ in range(20000)]
+        self.assertAlmostEqual(draws.count('b') / len(draws), 0.75, delta=0.02)
+
+    def test_mines_layout_is_seeded(self):
+        """Test a session seed always gives the same mines without reseeding random"""
+        engine = get_engine('mines')
+        state = random.getstate()
+        self.assertEqual(engine.mine_positions(99, 5), engine.mine_positions(99, 5))
+        self.assertEqual(random.getstate(), state)
+
+    def test_mines_round_is_kept_on_the_server(self):
+        """Test only the opening call is charged and cashouts pay the round's own stake"""
+        engine = MinesEngine()
+        user = {'user_id': 'mines-test'}
+        with self.assertRaises(ValueError):
+            engine.stake(1.0, dict(user, action='cashout', revealed=list(range(22))))
+
+        # Start rounds until the first tile is safe
+        self.assertEqual(engine.stake(2.0, dict(user, position=0)), 2.0)
+        while engine.play(2.0, dict(user, action='reveal', position=0, mines=3))['hit_mine']:
+            pass
+        self.assertEqual(engine.stake(50.0, dict(user, action='cashout')), 0.0)
+        for position in (0, 25, '1'):
+            with self.assertRaises(ValueError):
+                engine.play(0.0, dict(user, action='reveal', position=position))
+        # A second charged opening while the round is live is refused
+        with self.assertRaises(ValueError):
+            engine.play(50.0, dict(user, action='cashout'))
+
+        cashout = engine.play(0.0, dict(user, action='cashout', revealed=list(range(22))))
+        self.assertEqual((cashout['gems_found'], cashout['stake']), (1, 2.0))
+        self.assertEqual(cashout['winnings'], 2.0 * cashout['multiplier'])
+        self.assertNotIn('mines-test', engine.rounds)
+
+    def test_tower_climb_keeps_its_stake(self):
+        """Test tower climbs ignore the client's level and pay the opening stake"""
+        engine = TowerQuickEngine(seed=5)
+        user = {'user_id': 'tower-test'}
+        with self.assertRaises(ValueError):
+            engine.stake(1.0, dict(user, action='select_tile', tile=3))
+        self.assertEqual(engine.play(1.0, dict(user, action='start'))['level'], 0)
+
+        result = {'outcome': 'continue'}
+        while result['outcome'] == 'continue':
+            self.assertEqual(engine.stake(100.0, dict(user, action='select_tile', tile=0, current_level=7)), 0.0)
+            result = engine.play(0.0, dict(user, action='select_tile', tile=0, current_level=7))
+        self.assertEqual(result['stake'], 1.0)
+        if result['outcome'] == 'win':
+            self.assertEqual(result['winnings'], TOWER_QUICK_MULTIPLIERS[-1])
+        self.assertNotIn('tower-test', engine.rounds)
+
+    def test_abandoned_rounds_are_forfeited(self):
+        """Test rounds untouched past the timeout are dropped and handed back for settlement"""
+        engine = TowerQuickEngine(timeout=60)
+        engine.play(1.0, {'user_id': 1, 'action': 'start'})
+        engine.play(3.0, {'user_id': 2, 'action': 'start'})
+        engine.rounds[2]['expires_at'] = float('inf')  # still being played
+        self.assertEqual(engine.expire(now=0), [])
+        expired = engine.expire(now=time.monotonic() + 61)
+        self.assertEqual([(user_id, current['stake']) for user_id, current in expired], [(1, 1.0)])
+        self.assertEqual(list(engine.rounds), [2])
+
+    def test_play_results(self):
+        """Test result dicts keep their shape"""
+        slots = get_engine('slots').play(1.0, {})
+        self.assertEqual(len(slots['reels']), 3)
+        self.assertIn(slots['multiplier'], set(SLOT_TRIPLE_MULTIPLIERS) | {SLOT_PAIR_MULTIPLIER, 0})
+
+        dice = get_engine('dice').play(10.0, {'target': 50, 'over_under': 'over'})
+        self.assertEqual(dice['outcome'] == 'win', dice['roll'] > 50)
+
+        # Actions the quick-play engines do not handle fall back to the caller
+        self.assertIsNone(get_engine('blackjack').play(1.0, {'action': 'hit'}))
+
+    def test_register_segment_wheel(self):
+        """Test custom wheels can be registered and spun"""
+        engine = register_engine(SegmentWheelEngine('test_wheel', {
+            1: {'multiplier': 2, 'probability': 0.5},
+            2: {'multiplier': 3, 'probability': 0.5},
+        }, seed=3))
+        self.assertIs(get_engine('test_wheel'), engine)
+        self.assertIn(engine.spin(), (1, 2))
+
+    def test_telegram_games_registered(self):
+        """Test the animated Telegram games score dice values through the registry"""
+        darts = get_engine('telegram_darts').play(2.0, {'value': 6})
+        self.assertEqual(darts['winnings'], 2.0 * DARTS_SCORING[6]['multiplier'])
+        self.assertEqual(get_engine('telegram_darts').play(2.0, {'value': 1})['outcome'], 'loss')
+
+        self.assertEqual(get_engine('telegram_slots').play(1.0, {'value': 64})['winnings'], 777)
+        self.assertEqual(set(SLOT_VALUE_SCORING), set(range(1, 65)))
+
+        self.assertEqual(get_engine('telegram_dice').play(1.0, {'value': 4, 'guess': 4})['winnings'], 5)
+        self.assertEqual(get_engine('telegram_dice').play(1.0, {'value': 4, 'guess': 3})['winnings'], 0)
+        coin = get_engine('telegram_coinflip').play(1.0, {'value': 2, 'guess': 'tails'})
+        self.assertEqual((coin['result'], coin['winnings']), ('tails', 2))
+        # Their values come from Telegram, so the webapp must not offer them
+        self.assertFalse(get_engine('telegram_darts').quick_play)
+        self.assertTrue(get_engine('dice').quick_play)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,9 @@ import os
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.games.blackjack import Card, Deck, BlackjackGame
+from src.games.blackjack import CARDS, Card, Deck, Shoe, Hand, BlackjackGame
+from src.games.blackjack_sim import simulate_rtp
+from src.games.rng import derive_rng
 
 class TestBlackjackGame(unittest.TestCase):
     """Test blackjack game logic"""
@@ -71,5 +73,39 @@ class TestBlackjackGame(unittest.TestCase):
         value = game.get_hand_value(game.player_hand)
         self.assertEqual(value, 21)  # A + A + 9 = 1 + 1 + 9 = 11, then one ace becomes 11
 
+    def test_incremental_hand_totals(self):
+        """Test hand totals and soft state follow each added card"""
+        hand = Hand([Card("♠️", "A"), Card("♥️", "6")])
+        self.assertEqual(hand.value, 17)
+        self.assertTrue(hand.soft)
+        hand.append(Card("♦️", "9"))
+        self.assertEqual(hand.value, 16)
+        self.assertFalse(hand.soft)
+    
+    def test_shoe_reshuffles_at_cut_card(self):
+        """Test the shoe only reshuffles between rounds once past the cut card"""
+        shoe = Shoe(decks=2, penetration=0.5)
+        self.assertEqual(len(shoe.cards), 104)
+        while not shoe.needs_shuffle:
+            shoe.draw()
+        self.assertEqual(shoe.shuffles, 1)
+        shoe.start_round()
+        self.assertEqual(shoe.shuffles, 2)
+        self.assertEqual(len(shoe.cards), 104)
+    
+    def test_shoe_shuffles_are_reproducible(self):
+        """Test each shuffle derives its generator from a nonce that reproduces the order"""
+        shoe = Shoe(decks=1)
+        expected = list(CARDS)
+        derive_rng(shoe.nonce, 'blackjack_shoe').shuffle(expected)
+        self.assertEqual(shoe.cards, expected)
+        nonce = shoe.nonce
+        shoe.build()
+        self.assertNotEqual(shoe.nonce, nonce)
+    
+    def test_simulator_matches_game(self):
+        """Test the vectorized simulator reproduces the game's stand-on-17 RTP"""
+        self.assertAlmostEqual(simulate_rtp(500000, seed=3, stand_on=17), 0.945, delta=0.01)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+from itertools import combinations
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from src.games.hand_evaluator import (
+    DECK_CODES, MAX_STRENGTH, evaluate, evaluate_hand, evaluate_batch,
+    batch_categories, hand_category, deal_batch
+)
+from src.games.poker import PokerGame
+
+def hand(*cards):
+    """Build card dicts from strings like 'A♠️'"""
+    return [{'rank': card[:-2], 'suit': card[-2:]} for card in cards]
+
+class TestHandEvaluator(unittest.TestCase):
+    """Test the lookup-table poker evaluator"""
+
+    def test_all_hands_category_counts(self):
+        """Test every five-card hand lands in the right category"""
+        hands = np.array(list(combinations(DECK_CODES.tolist(), 5)), dtype=np.int64)
+        strengths = evaluate_batch(hands)
+        self.assertEqual(len(np.unique(strengths)), MAX_STRENGTH)
+
+        counts = np.bincount(batch_categories(strengths), minlength=11)
+        expected = {10: 4, 9: 36, 8: 624, 7: 3744, 6: 5108, 5: 10200, 4: 54912, 3: 123552, 2: 1098240, 1: 1302540}
+        for category, count in expected.items():
+            self.assertEqual(counts[category], count, f"category {category}")
+
+    def test_batch_matches_scalar(self):
+        """Test batch and scalar evaluation agree"""
+        hands = deal_batch(np.random.default_rng(5), 2000)
+        batch = evaluate_batch(hands)
+        for cards, strength in zip(hands.tolist(), batch.tolist()):
+            self.assertEqual(evaluate(*cards), strength)
+
+    def test_ace_low_straight(self):
+        """Test A-2-3-4-5 is the lowest straight"""
+        wheel = evaluate_hand(hand('A♠️', '2♥️', '3♦️', '4♣️', '5♠️'))
+        six_high = evaluate_hand(hand('2♥️', '3♦️', '4♣️', '5♠️', '6♠️'))
+        self.assertEqual(hand_category(wheel), (5, 'Straight'))
+        self.assertLess(wheel, six_high)
+
+    def test_ties_within_category(self):
+        """Test pairs and kickers break ties, identical ranks tie"""
+        aces = evaluate_hand(hand('A♠️', 'A♥️', '9♦️', '4♣️', '2♠️'))
+        kings = evaluate_hand(hand('K♠️', 'K♥️', 'Q♦️', 'J♣️', '9♠️'))
+        aces_better_kicker = evaluate_hand(hand('A♦️', 'A♣️', '10♦️', '4♥️', '2♥️'))
+        aces_same = evaluate_hand(hand('A♦️', 'A♣️', '9♠️', '4♥️', '2♥️'))
+        self.assertGreater(aces, kings)
+        self.assertGreater(aces_better_kicker, aces)
+        self.assertEqual(aces, aces_same)
+
+    def test_poker_game_settles_on_strength(self):
+        """Test PokerGame resolves same-category hands by strength"""
+        game = PokerGame(1)
+        game.start_game(10)
+        game.player_hand = hand('A♠️', 'A♥️', '9♦️', '4♣️', '2♠️')
+        game.dealer_hand = hand('K♠️', 'K♥️', 'Q♦️', 'J♣️', '9♠️')
+        game.finish_game()
+        self.assertEqual(game.result, 'win')
+        self.assertEqual(game.player_hand_rank, (2, 'One Pair'))
+        self.assertEqual(game.get_hand_rank(hand('10♠️', 'J♠️', 'Q♠️', 'K♠️', 'A♠️')), (10, 'Royal Flush'))
+
+if __name__ == '__main__':
+    unittest.main()
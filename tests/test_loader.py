@@ -0,0 +1,64 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.loader import DataLoader
+
+class TestDataLoader(unittest.TestCase):
+    """Test coalescing of loads issued in the same tick"""
+
+    def setUp(self):
+        self.batches = []
+
+        async def batch_fn(payloads):
+            self.batches.append(sorted(payloads))
+            return {key: {"user_id": key, "name": payload} for key, payload in payloads.items() if key != 404}
+
+        self.batch_fn = batch_fn
+
+    def test_same_tick_loads_share_one_batch(self):
+        """Test concurrent loads become one deduplicated batch"""
+        loader = DataLoader(self.batch_fn)
+
+        async def run():
+            first = await asyncio.gather(*(loader.load(key) for key in (3, 1, 3, 2, 404)))
+            second = await loader.load(5, "late")
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual(self.batches, [[1, 2, 3, 404], [5]])
+        self.assertEqual([user and user["user_id"] for user in first], [3, 1, 3, 2, None])
+        self.assertIs(first[0], first[2])
+        self.assertEqual(second["name"], "late")
+
+        metrics = loader.metrics()
+        self.assertEqual(metrics["duplicates"], 1)
+        self.assertEqual(metrics["largest_batch"], 4)
+        self.assertEqual(metrics["average_batch"], 2.5)
+
+    def test_max_batch_and_errors(self):
+        """Test full batches dispatch early and failures reach every waiter"""
+        loader = DataLoader(self.batch_fn, max_batch=2)
+
+        async def run():
+            return await asyncio.gather(*(loader.load(key) for key in range(5)))
+
+        asyncio.run(run())
+        self.assertEqual(self.batches, [[0, 1], [2, 3], [4]])
+
+        async def failing(payloads):
+            raise RuntimeError("down")
+
+        broken = DataLoader(failing)
+
+        async def run_broken():
+            return await asyncio.gather(broken.load(1), broken.load(2), return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in asyncio.run(run_broken())))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.games.lobbies import Lobby, LobbyManager, LOBBY_EXPIRED, LOBBY_RUNNING
+from src.utils.error_handler import GameError
+
+class TestLobbies(unittest.TestCase):
+    """Test multiplayer lobbies, standings and expiry"""
+
+    def test_capacity_and_duplicates(self):
+        """Test lobbies refuse duplicate players and players past capacity"""
+        lobby = Lobby('darts', 1, 'host', 10.0, capacity=2)
+        with self.assertRaises(GameError):
+            lobby.start()
+        with self.assertRaises(GameError):
+            lobby.join(1, 'host')
+        lobby.join(2, 'guest')
+        with self.assertRaises(GameError):
+            lobby.join(3, 'late')
+        lobby.start()
+        self.assertEqual(lobby.status, LOBBY_RUNNING)
+        self.assertEqual(lobby.pot, 20.0)
+
+    def test_standings_and_prizes(self):
+        """Test scores rank best first and tied leaders split the pot"""
+        lobby = Lobby('dice', 1, 'a', 5.0)
+        for user_id, name in ((2, 'b'), (3, 'c'), (4, 'd')):
+            lobby.join(user_id, name)
+        for user_id, score in ((1, 3), (2, 6), (3, 1), (4, 6)):
+            lobby.record_score(user_id, score)
+
+        self.assertEqual(lobby.standings(2), [(2, 6), (4, 6)])
+        self.assertEqual(sorted(lobby.leaders()), [2, 4])
+        self.assertEqual(lobby.winner_takes_all(), {1: 0.0, 2: 10.0, 3: 0.0, 4: 10.0})
+        with self.assertRaises(GameError):
+            lobby.record_score(1, 5)
+
+    def test_expiry_fires_handler(self):
+        """Test lobbies past their deadline are dropped and handled once"""
+        manager = LobbyManager()
+        expired = []
+
+        async def handler(lobby):
+            expired.append(lobby.lobby_id)
+
+        manager.on_expire('wheel', handler)
+        stale = manager.create('wheel', 1, 'host', 5.0, timeout=10, now=0)
+        fresh = manager.create('wheel', 2, 'host', 5.0, timeout=100, now=0)
+
+        self.assertEqual(asyncio.run(manager.sweep(now=50)), 1)
+        self.assertEqual(expired, [stale.lobby_id])
+        self.assertEqual(stale.status, LOBBY_EXPIRED)
+        self.assertIsNone(manager.lobbies.get(stale.lobby_id))
+        self.assertIs(manager.lobbies.get(fresh.lobby_id), fresh)
+        self.assertEqual(asyncio.run(manager.sweep(now=60)), 0)
+
+    def test_find_open_lobby(self):
+        """Test tournaments are found by game, fee and chat until full"""
+        manager = LobbyManager()
+        lobby = manager.create('slots', 1, 'host', 10.0, chat_id=7, capacity=2)
+        self.assertIs(manager.find_open('slots', 10.0, 7), lobby)
+        self.assertIsNone(manager.find_open('slots', 25.0, 7))
+        lobby.join(2, 'guest')
+        self.assertIsNone(manager.find_open('slots', 10.0, 7))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import gzip
+import json
+import logging
+import queue
+import sys
+import os
+import tempfile
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.logger import (
+    DroppingQueueHandler, JsonFormatter, SamplingFilter, ContextFilter,
+    _gzip_rotator, bind_log_fields, reset_log_fields, set_log_level
+)
+
+class TestQueueLogging(unittest.TestCase):
+    """Test the non-blocking logging pipeline"""
+
+    def test_full_queue_drops_and_reports(self):
+        """Test records are dropped instead of blocking and the loss is reported"""
+        log_queue = queue.Queue(maxsize=2)
+        logger = logging.getLogger("test_queue_logging")
+        logger.propagate = False
+        handler = DroppingQueueHandler(log_queue)
+        logger.addHandler(handler)
+        try:
+            for i in range(5):
+                logger.warning("record %d", i)
+            self.assertEqual(handler.dropped, 3)
+
+            first = log_queue.get_nowait()
+            self.assertEqual((first.msg, first.args), ("record 0", None))
+            log_queue.get_nowait()
+            logger.warning("after")
+            notice, after = log_queue.get_nowait(), log_queue.get_nowait()
+            self.assertIn("dropped 3 records", notice.msg)
+            self.assertEqual(after.msg, "after")
+        finally:
+            logger.removeHandler(handler)
+
+    def test_rotated_files_are_compressed(self):
+        """Test rotation gzips the old file"""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "bot.log")
+            with open(source, "w") as f:
+                f.write("line\n")
+            _gzip_rotator(source, source + ".1.gz")
+            self.assertFalse(os.path.exists(source))
+            with gzip.open(source + ".1.gz", "rt") as f:
+                self.assertEqual(f.read(), "line\n")
+
+class TestStructuredLogging(unittest.TestCase):
+    """Test JSON records, sampling and runtime levels"""
+
+    def make_record(self, msg, *args, level=logging.DEBUG, **extra):
+        record = logging.LogRecord("database", level, __file__, 1, msg, args, None)
+        record.__dict__.update(extra)
+        return record
+
+    def test_json_records_carry_bound_fields(self):
+        """Test bound fields and extras land in compact JSON"""
+        reset_log_fields(user_id=7)
+        bind_log_fields(handler="balance_command")
+        record = self.make_record("Getting user %s", 7, latency_ms=1.5)
+        ContextFilter().filter(record)
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry["msg"], "Getting user 7")
+        self.assertEqual((entry["user_id"], entry["handler"], entry["latency_ms"]), (7, "balance_command", 1.5))
+        self.assertNotIn("game_type", entry)
+        reset_log_fields()
+
+    def test_sampling_keeps_one_in_n_debug_records(self):
+        """Test sampled templates keep 1/rate DEBUG records and all warnings"""
+        sampler = SamplingFilter({"Getting user %s": 0.1})
+        kept = sum(sampler.filter(self.make_record("Getting user %s", i)) for i in range(100))
+        self.assertEqual(kept, 10)
+        self.assertTrue(sampler.filter(self.make_record("Getting user %s", 1, level=logging.WARNING)))
+        self.assertTrue(sampler.filter(self.make_record("Other %s", 1)))
+
+    def test_runtime_level_change(self):
+        """Test levels change per logger without touching others"""
+        previous = set_log_level("games", "debug")
+        try:
+            self.assertTrue(logging.getLogger("games").isEnabledFor(logging.DEBUG))
+            self.assertFalse(logging.getLogger("wallet").isEnabledFor(logging.DEBUG))
+        finally:
+            set_log_level("games", previous)
+        with self.assertRaises(ValueError):
+            set_log_level("games", "LOUD")
+
+if __name__ == '__main__':
+    unittest.main()
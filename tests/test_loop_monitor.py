@@ -0,0 +1,64 @@
+import unittest
+import asyncio
+import sys
+import os
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.loop_monitor import LoopMonitor
+
+def blocking_work():
+    time.sleep(0.3)
+
+class TestLoopMonitor(unittest.TestCase):
+    """Test event-loop lag measurement and blocking-call reports"""
+
+    def test_stall_is_reported_with_stack(self):
+        """Test a blocked loop is counted and logged with the blocking task's stack"""
+        monitor = LoopMonitor(interval=0.01, threshold_ms=100)
+
+        async def stalling_handler():
+            await asyncio.sleep(0.05)
+            blocking_work()
+            await asyncio.sleep(0.05)
+
+        async def main():
+            monitor.start(debug=False)
+            await asyncio.sleep(0)
+            await asyncio.create_task(stalling_handler(), name="handler")
+            monitor.stop()
+
+        with self.assertLogs("bot", level="WARNING") as logs:
+            asyncio.run(main())
+
+        self.assertEqual(monitor.stalls.labels().value, 1)
+        self.assertIn("task handler (", logs.output[0])
+        self.assertIn("blocking_work", logs.output[0])
+        self.assertGreaterEqual(float(monitor.quantiles()["0.99"]), 0.25)
+
+    def test_debug_mode_flags_blocking_calls(self):
+        """Test debug mode warns once per call site about file opens on the loop thread"""
+        monitor = LoopMonitor(interval=0.01, threshold_ms=1000)
+
+        async def main():
+            monitor.start(debug=True)
+            for _ in range(2):
+                with open(os.devnull):
+                    pass
+            await asyncio.sleep(0.001)
+            monitor.stop()
+
+        with self.assertLogs("bot", level="WARNING") as logs:
+            asyncio.run(main())
+        with open(os.devnull):
+            pass
+
+        flagged = [line for line in logs.output if "Blocking open" in line]
+        self.assertEqual(len(flagged), 1)
+        self.assertIn("test_loop_monitor.py", flagged[0])
+        self.assertEqual(monitor.blocking_calls.labels("open").value, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import time
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from src.games.lottery import (
+    LotteryDraw, LotteryScheduler, MemoryLotteryStore, numbers_to_mask, mask_to_numbers, popcount64, _swar_popcount, validate_ticket,
+    LOTTERY_PAYOUTS, LOTTERY_JACKPOT_SHARE
+)
+
+def random_masks(rng, count):
+    """Random 6-of-49 ticket masks"""
+    picks = rng.random((count, 49)).argpartition(6, axis=1)[:, :6] + 1
+    return np.bitwise_or.reduce(np.left_shift(np.uint64(1), picks.astype(np.uint64)), axis=1)
+
+class TestLotteryDraws(unittest.TestCase):
+    """Test pooled bitmask lottery draws"""
+
+    def test_masks_and_popcount(self):
+        """Test ticket masks round-trip and popcount counts matches"""
+        mask = numbers_to_mask([1, 7, 13, 25, 40, 49])
+        self.assertEqual(mask_to_numbers(mask), [1, 7, 13, 25, 40, 49])
+        values = np.array([0, mask, 2 ** 63 + 1, 2 ** 64 - 1], dtype=np.uint64)
+        self.assertEqual(popcount64(values).tolist(), [0, 6, 2, 64])
+        self.assertEqual(_swar_popcount(values).tolist(), [0, 6, 2, 64])
+        self.assertTrue(validate_ticket([1, 2, 3, 4, 5, 6]))
+        self.assertFalse(validate_ticket([1, 2, 3, 4, 5, 50]))
+        self.assertFalse(validate_ticket([1, 1, 3, 4, 5, 6]))
+
+    def test_draw_settles_every_ticket(self):
+        """Test payouts follow the match counts and are totalled per user"""
+        draw = LotteryDraw(1, time.time())
+        draw.add_ticket(10, [1, 2, 3, 4, 5, 6], 1.0)
+        draw.add_ticket(10, [7, 8, 9, 10, 11, 12], 2.0)
+        draw.add_ticket(20, [1, 2, 3, 4, 5, 6], 1.0)
+        result = draw.run()
+
+        winning = set(result['winning_numbers'])
+        expected = {10: 0.0, 20: 0.0}
+        for user_id, numbers, stake in ((10, range(1, 7), 1.0), (10, range(7, 13), 2.0), (20, range(1, 7), 1.0)):
+            matches = len(winning & set(numbers))
+            if matches < 6:
+                expected[user_id] += stake * LOTTERY_PAYOUTS[matches]
+        if result['jackpot_winners'] == 0:
+            self.assertEqual(dict(zip(result['users'].tolist(), result['user_winnings'].tolist())), expected)
+        self.assertEqual(sum(result['match_counts']), 3)
+        self.assertAlmostEqual(result['jackpot'], 4.0 * LOTTERY_JACKPOT_SHARE)
+
+        with self.assertRaises(ValueError):
+            draw.add_ticket(30, [1, 2, 3, 4, 5, 6], 1.0)
+
+    def test_scheduler_rolls_over_jackpot(self):
+        """Test an unclaimed jackpot carries into the next draw"""
+        scheduler = LotteryScheduler(interval=3600)
+        scheduler.buy_ticket(1, [1, 2, 3, 4, 5, 6], 10.0)
+        settled = []
+        result = scheduler.run_draw(settled.append)
+        self.assertEqual(len(settled), 1)
+        self.assertEqual(scheduler.current['draw_id'], 2)
+        if result['jackpot_winners'] == 0:
+            self.assertAlmostEqual(scheduler.current['jackpot'], 10.0 * LOTTERY_JACKPOT_SHARE)
+        self.assertNotIn('users', scheduler.get_result(1))
+
+    def test_failed_settlement_keeps_tickets(self):
+        """Test tickets of a draw whose settlement fails are drawn again on retry"""
+        store = MemoryLotteryStore()
+        scheduler = LotteryScheduler(interval=3600, store=store)
+        scheduler.buy_ticket(1, [1, 2, 3, 4, 5, 6], 10.0)
+
+        def broken(result):
+            raise RuntimeError("database down")
+
+        with self.assertRaises(RuntimeError):
+            scheduler.run_draw(broken)
+        self.assertEqual(store.get_draw(1)['status'], 'failed')
+
+        settled = []
+        scheduler.retry_failed(settled.append)
+        self.assertEqual(settled[0]['tickets'], 1)
+        self.assertEqual(store.get_draw(1)['status'], 'settled')
+        # Settling twice cannot roll the jackpot over twice
+        self.assertFalse(store.finish_draw(1, {}, 5.0))
+
+    def test_draw_is_claimed_once(self):
+        """Test two schedulers on one store never run the same draw"""
+        store = MemoryLotteryStore()
+        first, second = LotteryScheduler(interval=3600, store=store), LotteryScheduler(interval=3600, store=store)
+        draw_id = first.current['draw_id']
+        self.assertTrue(store.claim_draw(draw_id, 3600))
+        self.assertFalse(store.claim_draw(draw_id, 3600))
+        self.assertEqual(second.current['draw_id'], draw_id + 1)
+
+    def test_million_ticket_draw(self):
+        """Test a draw of a million tickets settles in seconds"""
+        rng = np.random.default_rng(1)
+        draw = LotteryDraw(1, time.time())
+        count = 1_000_000
+        draw.add_tickets(rng.integers(1, 50_000, size=count), random_masks(rng, count), np.ones(count))
+        started = time.perf_counter()
+        result = draw.run()
+        self.assertLess(time.perf_counter() - started, 5.0)
+        self.assertEqual(result['tickets'], count)
+        # About 1.8% of tickets match 3 numbers (C(6,3) * C(43,3) / C(49,6))
+        self.assertAlmostEqual(result['match_counts'][3] / count, 0.01765, delta=0.002)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.metrics import Registry, registry, handler_latency, handler_errors, bearer_authorized
+from src.utils.error_handler import handle_callback_errors
+
+class TestMetrics(unittest.TestCase):
+    """Test the metrics registry and its Prometheus rendering"""
+
+    def test_render_counters_gauges_histograms(self):
+        """Test every metric kind renders in the text exposition format"""
+        metrics = Registry()
+        bets = metrics.counter("bets_total", "Bets", ("game",))
+        bets.labels("dice").inc()
+        bets.labels("dice").inc(2)
+        metrics.gauge("sessions", "Sessions", ("game",), callback=lambda: {"mines": 3})
+        latency = metrics.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        latency.observe(0.05)
+        latency.observe(0.5)
+
+        text = metrics.render()
+        self.assertIn('bets_total{game="dice"} 3', text)
+        self.assertIn('sessions{game="mines"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 2', text)
+        self.assertIn('latency_seconds_count 2', text)
+        self.assertIs(metrics.counter("bets_total", "Bets", ("game",)), bets)
+        with self.assertRaises(ValueError):
+            bets.labels()
+
+    def test_handlers_are_timed(self):
+        """Test the error decorators time handlers and count failures"""
+        @handle_callback_errors
+        async def failing_metrics_handler(update, context):
+            raise RuntimeError("boom")
+
+        asyncio.run(failing_metrics_handler(SimpleNamespace(callback_query=None), None))
+        self.assertEqual(handler_latency.labels("failing_metrics_handler").count, 1)
+        self.assertEqual(handler_errors.labels("failing_metrics_handler").value, 1)
+        self.assertIn('bot_handler_errors_total{handler="failing_metrics_handler"} 1', registry.render())
+
+    def test_metrics_need_a_configured_token(self):
+        """Test the metrics endpoints are closed without a token and check the bearer header"""
+        self.assertFalse(bearer_authorized(None, None))
+        self.assertFalse(bearer_authorized("Bearer ", ""))
+        self.assertFalse(bearer_authorized("Bearer wrong", "secret"))
+        self.assertTrue(bearer_authorized("Bearer secret", "secret"))
+
+if __name__ == '__main__':
+    unittest.main()
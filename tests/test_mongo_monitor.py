@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.mongo_monitor import (
+    CommandMonitor, begin_scope, _scope, filter_shape, plan_summary
+)
+
+def command_event(request_id, name, command, duration_ms=0.0):
+    return SimpleNamespace(command_name=name, command={name: "users", **command}, database_name="exowin_bot",
+                           connection_id=("localhost", 27017), request_id=request_id,
+                           duration_micros=int(duration_ms * 1000))
+
+class FakeExplainClient:
+    def __init__(self):
+        self.explained = []
+
+    def __getitem__(self, database):
+        return self
+
+    def command(self, name, target, verbosity=None):
+        self.explained.append(target)
+        return {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "user_id_1"}}}}
+
+class TestMongoMonitor(unittest.TestCase):
+    """Test command latency, round trip and slow query monitoring"""
+
+    def run_command(self, monitor, request_id, name, command, duration_ms):
+        event = command_event(request_id, name, command, duration_ms)
+        monitor.started(event)
+        monitor.succeeded(event)
+
+    def test_histograms_and_round_trips(self):
+        """Test commands are timed per command and collection and counted per scope"""
+        monitor = CommandMonitor(slow_ms=1000)
+        scope = begin_scope("update")
+        try:
+            self.run_command(monitor, 1, "find", {"filter": {"user_id": 1}}, 3.0)
+            self.run_command(monitor, 2, "update", {"updates": [{"q": {"user_id": 1}}]}, 7.0)
+            monitor.started(command_event(3, "hello", {}))
+        finally:
+            _scope.set(None)
+        monitor.record_round_trips(scope)
+
+        snapshot = monitor.snapshot()
+        self.assertEqual(snapshot["commands"]["find"]["count"], 1)
+        self.assertEqual(snapshot["collections"]["users"]["sum"], 0.01)
+        self.assertEqual(snapshot["collections"]["users"]["buckets"]["0.005"], 1)
+        self.assertEqual(snapshot["round_trips"]["update"]["sum"], 2)
+        self.assertIn("per update: 2.00", monitor.summary())
+
+    def test_slow_reads_are_explained_once(self):
+        """Test slow reads log their shape and get one explain per shape"""
+        monitor = CommandMonitor(slow_ms=50)
+        client = FakeExplainClient()
+        monitor.attach(client)
+        with self.assertLogs("database", level="WARNING"):
+            for request_id, user_id in ((1, 5), (2, 6)):
+                self.run_command(monitor, request_id, "find", {"filter": {"user_id": user_id}, "lsid": {}}, 120.0)
+            monitor._executor.shutdown(wait=True)
+
+        self.assertEqual(monitor.snapshot()["slow_operations"], 2)
+        self.assertEqual(len(client.explained), 1)
+        self.assertNotIn("lsid", client.explained[0])
+        self.assertEqual(list(monitor.plans.values()), ["FETCH > IXSCAN(user_id_1)"])
+
+    def test_filter_shape_hides_values(self):
+        """Test filter shapes keep fields and operators only"""
+        shape = filter_shape({"user_id": {"$in": [1, 2]}, "$or": [{"a": 1}, {"b": {"$gte": 2}}]})
+        self.assertEqual(shape, {"user_id": {"$in": "?"}, "$or": [{"a": "?"}, {"b": {"$gte": "?"}}]})
+        self.assertEqual(plan_summary({"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}), "COLLSCAN")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import asyncio
+import sys
+import os
+
+from aiohttp import web
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.wallet import nowpayments
+from src.wallet.nowpayments import NOWPaymentsAPI
+
+class FakeNOWPayments:
+    """Local stand-in for the NOWPayments API"""
+
+    def __init__(self):
+        self.calls = []
+        self.peers = set()
+        self.status_failures = 0
+        app = web.Application()
+        app.router.add_get("/v1/status", self.status)
+        app.router.add_get("/v1/estimate", self.estimate)
+        app.router.add_post("/v1/payment", self.payment)
+        app.router.add_get("/v1/balance", self.balance)
+        self.runner = web.AppRunner(app)
+
+    async def start(self) -> str:
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    def record(self, request):
+        self.calls.append(request.path)
+        self.peers.add(request.transport.get_extra_info("peername"))
+
+    async def status(self, request):
+        self.record(request)
+        if self.status_failures:
+            self.status_failures -= 1
+            return web.Response(status=503, text="busy")
+        return web.json_response({"message": "OK"})
+
+    async def estimate(self, request):
+        self.record(request)
+        return web.json_response({"estimated_amount": 65000.0, "currency_from": request.query["currency_from"]})
+
+    async def payment(self, request):
+        self.record(request)
+        return web.Response(status=502, text="bad gateway")
+
+    async def balance(self, request):
+        self.record(request)
+        await asyncio.sleep(1)
+        return web.json_response({"availableBalance": 1})
+
+class TestNOWPaymentsClient(unittest.TestCase):
+    """Test the pooled NOWPayments client against a local fake server"""
+
+    def setUp(self):
+        self.backoff = nowpayments.NOWPAYMENTS_BACKOFF
+        nowpayments.NOWPAYMENTS_BACKOFF = 0.001
+
+    def tearDown(self):
+        nowpayments.NOWPAYMENTS_BACKOFF = self.backoff
+
+    def run_against_fake(self, scenario):
+        async def main():
+            server = FakeNOWPayments()
+            api = NOWPaymentsAPI(api_key="test", base_url=await server.start())
+            try:
+                return server, await scenario(server, api)
+            finally:
+                await api.close()
+                await server.runner.cleanup()
+        return asyncio.run(main())
+
+    def test_reads_share_connections_and_retry(self):
+        """Test calls reuse pooled connections and reads are retried on 5xx"""
+        async def scenario(server, api):
+            server.status_failures = 2
+            status = await api.get_status()
+            rate = await api.get_exchange_rates("BTC")
+            return status, rate
+
+        server, (status, rate) = self.run_against_fake(scenario)
+        self.assertEqual(status, {"message": "OK"})
+        self.assertEqual(rate, 65000.0)
+        self.assertEqual(server.calls, ["/v1/status"] * 3 + ["/v1/estimate"])
+        self.assertEqual(len(server.peers), 1)
+
+    def test_writes_are_not_retried(self):
+        """Test a failed payment creation is not sent twice"""
+        async def scenario(server, api):
+            return await api.create_payment(10, pay_currency="BTC")
+
+        server, payment = self.run_against_fake(scenario)
+        self.assertIsNone(payment)
+        self.assertEqual(server.calls, ["/v1/payment"])
+
+    def test_per_call_timeout(self):
+        """Test a per-call timeout cuts slow requests short"""
+        async def scenario(server, api):
+            with self.assertRaises(asyncio.TimeoutError):
+                await api._request("get_available_balance", "GET", "/balance", timeout=0.05)
+
+        nowpayments.NOWPAYMENTS_RETRIES, retries = 0, nowpayments.NOWPAYMENTS_RETRIES
+        try:
+            self.run_against_fake(scenario)
+        finally:
+            nowpayments.NOWPAYMENTS_RETRIES = retries
+
+if __name__ == '__main__':
+    unittest.main()
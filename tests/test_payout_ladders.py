@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+from math import comb
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.games.payout_tables import (
+    MINES_MULTIPLIERS, TOWER_MULTIPLIERS, MINES_HOUSE_EDGE, TOWER_HOUSE_EDGE,
+    TOWER_QUICK_MULTIPLIERS, mines_ladder, tower_ladder
+)
+from src.games.engines import get_engine
+from src.games.mines import MinesGame
+from src.games.tower import TowerGame
+
+class TestPayoutLadders(unittest.TestCase):
+    """Test precomputed mines and tower multiplier tables"""
+
+    def test_mines_ladders_return_fair_odds_less_edge(self):
+        """Test cashing out after any number of gems returns 1 - edge"""
+        for (grid_size, mines_count), ladder in MINES_MULTIPLIERS.items():
+            self.assertEqual(len(ladder), grid_size - mines_count + 1)
+            for gems in range(1, len(ladder)):
+                survive = comb(grid_size - mines_count, gems) / comb(grid_size, gems)
+                self.assertAlmostEqual(ladder[gems] * survive, 1 - MINES_HOUSE_EDGE, delta=1e-4)
+
+    def test_tower_ladders_return_fair_odds_less_edge(self):
+        """Test cashing out at any level returns 1 - edge"""
+        for (levels, tiles, safe_tiles), ladder in TOWER_MULTIPLIERS.items():
+            self.assertEqual(len(ladder), levels + 1)
+            self.assertAlmostEqual(ladder[1], tiles / safe_tiles * (1 - TOWER_HOUSE_EDGE), places=4)
+        self.assertEqual(TOWER_QUICK_MULTIPLIERS, tower_ladder(8, 3, 2))
+
+    def test_sessions_index_into_tables(self):
+        """Test games take their multipliers and ladders from the tables"""
+        mines = MinesGame(1, mines_count=3)
+        mines.start_game(1.0)
+        safe = next(pos for pos in range(25) if pos not in mines.mines_positions)
+        mines.reveal_tile(safe)
+        self.assertEqual(mines.current_multiplier, mines_ladder(25, 3)[1])
+        self.assertEqual(mines.get_game_state()['payout_ladder'], list(mines_ladder(25, 3)))
+
+        tower = TowerGame(1)
+        tower.start_game(1.0)
+        tower.choose_tile(tower.tower_layout[0].index(True))
+        self.assertEqual(tower.current_multiplier, tower_ladder(8, 4, 1)[1])
+
+        engine = get_engine('mines')
+        while engine.play(1.0, {'user_id': 'ladder-test', 'mines': 3, 'position': 0, 'action': 'reveal'})['hit_mine']:
+            pass
+        safe = next(tile for tile in range(1, 25) if tile not in engine.rounds['ladder-test']['mine_positions'])
+        engine.play(0.0, {'user_id': 'ladder-test', 'position': safe, 'action': 'reveal'})
+        cashout = engine.play(0.0, {'user_id': 'ladder-test', 'action': 'cashout'})
+        self.assertEqual(cashout['multiplier'], mines_ladder(25, 3)[2])
+
+    def test_unsupported_board(self):
+        """Test boards outside the tables are rejected"""
+        with self.assertRaises(ValueError):
+            mines_ladder(25, 25)
+        with self.assertRaises(ValueError):
+            MinesGame(1, mines_count=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+from math import comb
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from src.games.payout_tables import PLINKO_MULTIPLIERS, PLINKO_RTP, plinko_multipliers
+from src.games.provably_fair import plinko_bucket, plinko_path
+from src.games.batch_engine import BatchOutcomeEngine
+from src.games.engines import get_engine
+from src.games.plinko import PlinkoGame
+
+class TestPlinko(unittest.TestCase):
+    """Test binomial plinko sampling and derived multiplier tables"""
+
+    def test_tables_hit_target_rtp(self):
+        """Test every (rows, risk) table returns the target RTP"""
+        for (rows, risk_level), table in PLINKO_MULTIPLIERS.items():
+            self.assertEqual(len(table), rows + 1)
+            self.assertEqual(table, table[::-1])
+            rtp = sum(comb(rows, bucket) / 2 ** rows * m for bucket, m in enumerate(table))
+            self.assertAlmostEqual(rtp, PLINKO_RTP, delta=0.005, msg=f"{rows} rows {risk_level}")
+        with self.assertRaises(ValueError):
+            plinko_multipliers(16, 'extreme')
+
+    def test_path_matches_bucket(self):
+        """Test the lazily built path ends in the sampled bucket"""
+        for bits in (0, 0b1011, (1 << 16) - 1):
+            path = plinko_path(bits, 16)
+            self.assertEqual(len(path), 17)
+            self.assertEqual(path[-1], plinko_bucket(bits))
+            self.assertTrue(all(b - a in (0, 1) for a, b in zip(path, path[1:])))
+
+    def test_session_builds_path_on_demand(self):
+        """Test the session only builds the path when asked"""
+        game = PlinkoGame(1, client_seed='abc')
+        game.start_game(1.0, 'high')
+        result = game.drop_ball(include_path=False)
+        self.assertNotIn('ball_path', result)
+        self.assertIsNone(game._ball_path)
+        self.assertEqual(len(game.multipliers), 17)
+        self.assertEqual(game.ball_path[-1], result['final_slot'])
+
+    def test_quick_and_batch_are_binomial(self):
+        """Test scalar and batch buckets follow Binomial(8, 1/2)"""
+        engine = get_engine('plinko')
+        scalar = np.bincount([engine.play(1.0, {'risk': 'low'})['bucket'] for _ in range(20000)], minlength=9)
+        batch = np.bincount(BatchOutcomeEngine(seed=1).plinko_buckets(200000), minlength=9)
+        expected = np.array([comb(8, bucket) / 256 for bucket in range(9)])
+        np.testing.assert_allclose(scalar / scalar.sum(), expected, atol=0.01)
+        np.testing.assert_allclose(batch / batch.sum(), expected, atol=0.003)
+
+        with_path = engine.play(1.0, {'risk': 'low', 'include_path': True})
+        self.assertEqual(with_path['ball_path'][-1], with_path['bucket'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.profiler import SamplingProfiler
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+class TestProfiler(unittest.TestCase):
+    """Test the on-demand sampling profiler"""
+
+    def test_busy_thread_is_sampled(self):
+        """Test a busy thread shows up in collapsed stacks and the top report"""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+        worker.start()
+        try:
+            profile = SamplingProfiler(interval_ms=1).sample(0.2)
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = profile.collapsed().splitlines()
+        busy = [line for line in lines if line.startswith("busy;")]
+        self.assertTrue(busy)
+        self.assertIn("busy_loop (test_profiler.py:", busy[0])
+        self.assertTrue(busy[0].rsplit(" ", 1)[1].isdigit())
+        self.assertIn("busy_loop", profile.top())
+        # The waiting main thread is left out by default
+        self.assertFalse([line for line in lines if line.startswith("MainThread;")])
+
+    def test_one_bounded_run_at_a_time(self):
+        """Test profile length is bounded and runs do not overlap"""
+        profiler = SamplingProfiler(max_seconds=1)
+        with self.assertRaises(ValueError):
+            profiler.sample(5)
+        profiler._lock.acquire()
+        try:
+            self.assertTrue(profiler.running)
+            with self.assertRaises(RuntimeError):
+                profiler.sample(0.1)
+        finally:
+            profiler._lock.release()
+        self.assertFalse(profiler.running)
+
+if __name__ == '__main__':
+    unittest.main()
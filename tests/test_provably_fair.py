@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.games.provably_fair import (
+    CrashHashChain, FairSession, verify_outcome, crash_point, sha256_hex, next_crash_round
+)
+from src.games.mines import MinesGame
+from src.games.tower import TowerGame
+from src.games.plinko import PlinkoGame
+from src.games.crash import CrashGame
+
+class TestProvablyFair(unittest.TestCase):
+    """Test provably fair seeds, hash chains and verification"""
+
+    def test_session_commits_then_reveals(self):
+        """Test the server seed is hidden until the game is revealed"""
+        session = FairSession('player-seed')
+        self.assertNotIn('server_seed', session.public_state())
+        self.assertEqual(sha256_hex(session.server_seed), session.server_seed_hash)
+        session.reveal()
+        self.assertEqual(session.public_state()['server_seed'], session.server_seed)
+
+    def test_games_verify_offline(self):
+        """Test mines, tower and plinko outcomes recompute from revealed seeds"""
+        mines = MinesGame(1, mines_count=7, client_seed='abc')
+        tower = TowerGame(1, client_seed='abc')
+        plinko = PlinkoGame(1, client_seed='abc')
+        plinko.drop_ball()
+
+        for game, name, extra in ((mines, 'mines', {'mines_count': 7}), (tower, 'tower', {}), (plinko, 'plinko', {})):
+            params = dict(extra, server_seed=game.fair.server_seed, client_seed='abc',
+                          nonce=game.fair.nonce, server_seed_hash=game.fair.server_seed_hash)
+            result = verify_outcome(name, params)
+            self.assertTrue(result['seed_valid'])
+            if name == 'mines':
+                self.assertEqual(result['mines_positions'], mines.mines_positions)
+                self.assertEqual(len(set(mines.mines_positions)), 7)
+            elif name == 'tower':
+                self.assertEqual(result['tower_layout'], tower.tower_layout)
+            else:
+                self.assertEqual(result['ball_path'], plinko.ball_path)
+
+    def test_verify_rejects_unsupported_boards(self):
+        """Test verification only recomputes boards the games offer"""
+        seeds = {'server_seed': 'a' * 64, 'client_seed': 'abc', 'nonce': 1}
+        for game, extra in (('mines', {'grid_size': 10 ** 9}), ('mines', {'mines_count': 25}),
+                            ('tower', {'levels': 10 ** 9}), ('tower', {'tiles_per_level': 1}),
+                            ('plinko', {'rows': 10 ** 6})):
+            with self.assertRaises(ValueError):
+                verify_outcome(game, dict(seeds, **extra))
+
+    def test_crash_chain_links(self):
+        """Test every round hash hashes to the previous one and to the commitment"""
+        chain = CrashHashChain(length=50, seed='seed')
+        self.assertEqual(sha256_hex(chain.hashes[0]), chain.terminal_hash)
+        for previous, current in zip(chain.hashes, chain.hashes[1:]):
+            self.assertEqual(sha256_hex(current), previous)
+
+        for round_id in (0, 17, 49):
+            result = verify_outcome('crash', {'round_hash': chain.hashes[round_id], 'terminal_hash': chain.terminal_hash})
+            self.assertEqual(result['round_id'], round_id)
+            self.assertEqual(result['crash_point'], chain.crash_points[round_id])
+
+        self.assertFalse(verify_outcome('crash', {'round_hash': 'forged', 'terminal_hash': chain.terminal_hash})['chain_valid'])
+
+    def test_crash_chain_rounds(self):
+        """Test rounds are claimed once, in order, until the chain is exhausted"""
+        chain = CrashHashChain(length=3, seed='seed')
+        self.assertEqual([chain.next_round()[0] for _ in range(3)], [0, 1, 2])
+        self.assertIsNone(chain.next_round())
+
+    def test_crash_game_uses_chain(self):
+        """Test CrashGame takes its crash point from the chain"""
+        game = CrashGame(1)
+        self.assertEqual(game.crash_point, crash_point(game.round_hash))
+        self.assertNotIn('round_hash', game.get_fairness())
+        self.assertNotEqual(next_crash_round()[2], game.round_hash)
+
+if __name__ == '__main__':
+    unittest.main()
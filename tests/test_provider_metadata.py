@@ -0,0 +1,66 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.wallet.provider_metadata import ProviderMetadata
+
+class FakeClient:
+    def __init__(self):
+        self.status = {"message": "OK"}
+        self.currencies = ["BTC", "ETH"]
+        self.minimums = {"BTC": 0.0001, "ETH": 0.002}
+        self.calls = 0
+
+    async def get_status(self):
+        self.calls += 1
+        return self.status
+
+    async def get_available_currencies(self):
+        self.calls += 1
+        return self.currencies
+
+    async def get_min_payment_amount(self, symbol):
+        self.calls += 1
+        return self.minimums.get(symbol)
+
+class TestProviderMetadata(unittest.TestCase):
+    """Test the cached provider status, currencies and minimums"""
+
+    def test_menus_read_from_memory(self):
+        """Test warmed metadata answers without calling the provider"""
+        client = FakeClient()
+        metadata = ProviderMetadata(client=client, symbols=["BTC", "ETH", "LTC"])
+        self.assertTrue(metadata.is_available())
+        self.assertEqual(metadata.supported(["BTC", "LTC"]), ["BTC", "LTC"])
+
+        asyncio.run(metadata.warm())
+        calls = client.calls
+        self.assertTrue(metadata.is_available())
+        self.assertEqual(metadata.supported(["LTC", "ETH", "BTC"]), ["ETH", "BTC"])
+        self.assertEqual(metadata.minimum("btc"), 0.0001)
+        self.assertIsNone(metadata.minimum("LTC"))
+        self.assertEqual(client.calls, calls)
+
+    def test_outage_keeps_last_known_catalog(self):
+        """Test an outage flips availability and keeps the previous currencies and minimums"""
+        client = FakeClient()
+        metadata = ProviderMetadata(client=client, symbols=["BTC", "ETH"])
+        asyncio.run(metadata.warm())
+
+        client.status, client.currencies, client.minimums = None, [], {}
+        with self.assertLogs("bot", level="WARNING"):
+            asyncio.run(metadata.warm())
+        self.assertFalse(metadata.is_available())
+        self.assertEqual(metadata.supported(["BTC", "ETH"]), ["BTC", "ETH"])
+        self.assertEqual(metadata.minimum("ETH"), 0.002)
+
+        # A status check that is long overdue no longer blocks deposits
+        metadata.status_checked_at -= 10 * metadata.status_interval
+        self.assertTrue(metadata.is_available())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.wallet.rates import RateService
+
+class FakeProvider:
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+
+    async def __call__(self, symbol, quote):
+        self.calls.append(symbol)
+        await asyncio.sleep(0.01)
+        return self.prices.get(symbol)
+
+class TestRateService(unittest.TestCase):
+    """Test cached exchange rates with background refresh"""
+
+    def age_quotes(self, service, seconds):
+        for key, (price, fetched_at) in service.quotes.items():
+            service.quotes[key] = (price, fetched_at - seconds)
+
+    def test_concurrent_misses_share_one_refresh(self):
+        """Test misses coalesce into one batched refresh of every currency"""
+        provider = FakeProvider({"BTC": 65000.0, "ETH": 3200.0})
+        service = RateService(fetch=provider, symbols=["BTC", "ETH", "TRX"])
+
+        async def main():
+            self.assertIsNone(service.get_rate("BTC"))
+            return await asyncio.gather(*(service.fetch_rate(symbol) for symbol in ("BTC", "ETH", "BTC", "TRX")))
+
+        with self.assertLogs("bot", level="WARNING"):
+            rates = asyncio.run(main())
+        self.assertEqual(rates, [65000.0, 3200.0, 65000.0, None])
+        self.assertEqual(sorted(provider.calls), ["BTC", "ETH", "TRX"])
+
+    def test_stale_quotes_served_while_revalidating(self):
+        """Test stale quotes are served without waiting and expire after the staleness bound"""
+        provider = FakeProvider({"BTC": 65000.0})
+        service = RateService(fetch=provider, symbols=["BTC"], ttl=60, max_staleness=600)
+
+        async def main():
+            await service.refresh()
+            self.age_quotes(service, 120)
+            provider.prices["BTC"] = 70000.0
+            stale = service.get_rate("BTC")
+            await service._refreshing
+            fresh = service.get_rate("BTC")
+            self.age_quotes(service, 900)
+            expired = service.get_rate("BTC")
+            await service._refreshing
+            return stale, fresh, expired
+
+        self.assertEqual(asyncio.run(main()), (65000.0, 70000.0, None))
+        self.assertEqual(provider.calls, ["BTC"] * 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import random
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.games.rng import derive_rng, derive_generator, new_session_rng, NONCE_BITS
+from src.games.engines import get_engine, MinesEngine
+from src.games.mines import MinesGame
+
+class TestSessionRNG(unittest.TestCase):
+    """Test per-session generators derived from the server seed"""
+
+    def test_nonce_reproduces_generator(self):
+        """Test the same nonce and namespace give the same stream"""
+        self.assertEqual(derive_rng(42, 'mines').random(), derive_rng(42, 'mines').random())
+        self.assertEqual(derive_generator(42).integers(1000), derive_generator(42).integers(1000))
+
+    def test_namespaces_and_seeds_differ(self):
+        """Test namespaces and server seeds give independent streams"""
+        self.assertNotEqual(derive_rng(42, 'mines').random(), derive_rng(42, 'tower').random())
+        self.assertNotEqual(derive_rng(42, server_seed=b'a').random(), derive_rng(42, server_seed=b'b').random())
+
+    def test_global_generator_untouched(self):
+        """Test sessions never reseed the module-global generator"""
+        state = random.getstate()
+        nonce, rng = new_session_rng('mines')
+        self.assertLess(nonce, 2 ** NONCE_BITS)
+        MinesGame(user_id=1, mines_count=5)
+        MinesEngine().play(1.0, {'user_id': 1, 'mines': 3, 'position': 4, 'action': 'reveal'})
+        self.assertEqual(random.getstate(), state)
+
+    def test_concurrent_sessions_are_deterministic(self):
+        """Test mine layouts stay reproducible while sessions run on many threads"""
+        engine = get_engine('mines')
+        expected = {seed: engine.mine_positions(seed, 5) for seed in range(200)}
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            layouts = list(pool.map(lambda seed: (seed, engine.mine_positions(seed, 5)), list(range(200)) * 5))
+        for seed, layout in layouts:
+            self.assertEqual(layout, expected[seed])
+
+if __name__ == '__main__':
+    unittest.main()
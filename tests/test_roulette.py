@@ -0,0 +1,87 @@
+import unittest
+import random
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.games.roulette import RouletteGame, RouletteTable, BET_TABLE, compile_bet, compile_slip, settle_bets
+from src.utils.error_handler import InvalidBetError
+
+def winners(bet_type):
+    mask, _ = compile_bet(bet_type)
+    return [number for number in range(37) if mask >> number & 1]
+
+class TestRouletteBets(unittest.TestCase):
+    """Test precompiled roulette bet masks and settlement"""
+
+    def test_bet_masks(self):
+        """Test every bet shape covers the right numbers and pays the right odds"""
+        self.assertEqual(winners('number_0'), [0])
+        self.assertEqual(winners('split_17_20'), [17, 20])
+        self.assertEqual(winners('split_0_2'), [0, 2])
+        self.assertEqual(winners('street_34'), [34, 35, 36])
+        self.assertEqual(winners('corner_17'), [17, 18, 20, 21])
+        self.assertEqual(winners('line_31'), list(range(31, 37)))
+        self.assertEqual(winners('column_1'), list(range(1, 37, 3)))
+        self.assertEqual(winners('dozen_2'), list(range(13, 25)))
+        self.assertEqual(len(winners('red')) + len(winners('black')), 36)
+        self.assertNotIn(0, winners('even'))
+
+        # Every bet returns 36 units over the 37 numbers
+        for bet_type in ('number_5', 'split_1_2', 'street_1', 'corner_1', 'line_1', 'first_dozen', 'third_column', 'high'):
+            mask, payout = compile_bet(bet_type)
+            self.assertEqual(bin(mask).count('1') * payout, 36, bet_type)
+
+    def test_invalid_bets(self):
+        """Test malformed or impossible bets are rejected"""
+        for bet_type in ('number_37', 'split_3_4', 'street_2', 'corner_3', 'purple', 'number_x'):
+            with self.assertRaises(InvalidBetError, msg=bet_type):
+                compile_bet(bet_type)
+        self.assertFalse(RouletteGame(1).place_bet('split_3_4', 5))
+
+    def test_bet_spellings_share_the_table(self):
+        """Test other spellings of a bet resolve without growing any cache"""
+        size = len(BET_TABLE)
+        self.assertEqual(compile_bet('number_0017'), compile_bet('number_17'))
+        self.assertEqual(compile_bet('split_20_17'), compile_bet('split_17_20'))
+        with self.assertRaises(InvalidBetError):
+            compile_bet('number_' + '1' * 10000)
+        self.assertEqual(len(BET_TABLE), size)
+
+    def test_multi_bet_spin(self):
+        """Test a multi-bet slip settles without errors"""
+        game = RouletteGame(1)
+        game.place_bet('red', 10)
+        game.place_bet('number_17', 1)
+        game.place_bet('corner_17', 2)
+        game.spin()
+        expected, _ = settle_bets(game.bets, game.winning_number)
+        self.assertEqual(game.winnings, expected)
+        self.assertEqual(game.winnings, compile_slip(game.bets)[game.winning_number])
+        self.assertEqual(sum(game.payouts.values()), game.winnings)
+
+    def test_shared_table_bulk_settlement(self):
+        """Test one spin settles every player at the table"""
+        table = RouletteTable()
+        table.place_bet('alice', 'red', 10)
+        table.place_bet('alice', 'number_3', 1)
+        table.place_bet('bob', 'black', 5)
+        table.place_bet('carol', 'split_0_3', 2)
+        results = table.settle(3)
+        self.assertEqual(results['alice'], {'stake': 11.0, 'winnings': 56.0})
+        self.assertEqual(results['bob'], {'stake': 5.0, 'winnings': 0.0})
+        self.assertEqual(results['carol'], {'stake': 2.0, 'winnings': 36.0})
+
+    def test_spins_use_derived_generators(self):
+        """Test a nonce reproduces a game's and a table's spins without touching global random"""
+        state = random.getstate()
+        games = [RouletteGame(1, nonce=42), RouletteGame(2, nonce=42)]
+        self.assertEqual([game.spin() for game in games][0], games[1].winning_number)
+        self.assertEqual(games[0].get_game_state()['nonce'], 42)
+        self.assertEqual(RouletteTable().spin(nonce=9)[0], RouletteTable().spin(nonce=9)[0])
+        self.assertEqual(random.getstate(), state)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from tests.rtp_harness import SCENARIOS, simulate_scenario, check_bounds, format_report
+
+# Rounds per scenario for the unit-test run. Use tests/rtp_harness.py directly
+# (or raise these) for 10^7-10^9 round verification runs.
+RTP_ROUNDS = int(os.getenv('RTP_ROUNDS', 200_000))
+RTP_SCALAR_ROUNDS = int(os.getenv('RTP_SCALAR_ROUNDS', 20_000))
+RTP_PROCESSES = int(os.getenv('RTP_PROCESSES', 1))
+
+# Configured RTP bounds per scenario (payout multiple of a unit stake).
+# A scenario fails when its simulated RTP falls outside its bounds, i.e. when
+# a payout table or outcome distribution drifts. Each range is at least as
+# wide as the 99.9% sampling error at the default round counts, so the
+# high-variance games get wider ranges. Entries above 1.0 are tables where
+# the house loses money on average; they are pinned here so any change is
+# deliberate.
+RTP_BOUNDS = {
+    'coinflip_quick': (0.99, 1.01),
+    'dice_quick_over_50': (0.94, 0.96),
+    'dice_quick_under_50': (0.92, 0.94),
+    'plinko_quick_low': (0.965, 0.975),         # tables derived for a 97% RTP
+    'plinko_quick_medium': (0.965, 0.975),
+    'plinko_quick_high': (0.96, 0.98),
+    'roulette_quick_number': (0.93, 1.02),      # 36 / 37
+    'roulette_quick_color': (0.96, 0.99),
+    'roulette_quick_odd': (0.96, 0.99),
+    'slots_quick': (1.47, 1.52),
+    'wheel_quick_segment_1': (0.37, 0.40),
+    'wheel_quick_segment_8': (0.29, 0.33),
+    'crash_quick_2x': (1.77, 1.79),
+    'crash_session_2x': (0.59, 0.62),
+    'crash_session_10x': (0.29, 0.32),
+    'mines_5_mines_3_gems': (0.945, 0.995),     # fair odds less a 3% edge
+    'mines_3_mines_10_gems': (0.92, 1.02),
+    'tower_3_levels': (0.79, 1.15),
+    'plinko_session_medium': (0.95, 0.99),
+    'plinko_session_high': (0.925, 1.015),
+    'lottery_ticket': (0.245, 0.285),
+    'roulette_session_red': (0.95, 1.00),
+    'poker_vs_dealer': (0.98, 1.03),
+    'blackjack_stand_17': (0.92, 0.97),
+    'blackjack_basic_strategy': (0.97, 0.99),   # hit/stand only, no doubles or splits
+    'roulette_session_slip': (0.96, 0.985),     # every bet returns 36 / 37
+    'telegram_dice_solo': (0.82, 0.85),         # 5x on a 1-in-6 guess
+    'telegram_slots_solo': (34.35, 35.85),
+    'telegram_darts_solo': (3.475, 3.525),
+    'telegram_bowling_solo': (3.475, 3.525),
+    'telegram_basketball_solo': (2.975, 3.025),
+    'telegram_football_solo': (2.975, 3.025),
+    'telegram_wheel_red': (0.79, 0.81),
+    'telegram_wheel_black': (1.435, 1.565),
+}
+
+class TestGameRTP(unittest.TestCase):
+    """Monte Carlo verification of every game's return-to-player"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.summaries = {}
+        for name, (kind, _) in SCENARIOS.items():
+            rounds = RTP_SCALAR_ROUNDS if kind == 'scalar' else RTP_ROUNDS
+            cls.summaries[name] = simulate_scenario(name, rounds, RTP_PROCESSES)
+
+        if os.getenv('RTP_REPORT'):
+            print("\n" + format_report(list(cls.summaries.values())))
+
+    def test_every_scenario_has_bounds(self):
+        """Test each simulated scenario has configured RTP bounds"""
+        self.assertEqual(set(SCENARIOS), set(RTP_BOUNDS))
+
+    def test_rtp_within_bounds(self):
+        """Test simulated RTP stays within the configured bounds"""
+        for name, summary in self.summaries.items():
+            with self.subTest(scenario=name):
+                self.assertTrue(
+                    check_bounds(summary, RTP_BOUNDS[name]),
+                    f"{name}: RTP {summary['rtp']:.4f} "
+                    f"[{summary['ci_low']:.4f}, {summary['ci_high']:.4f}] outside {RTP_BOUNDS[name]}"
+                )
+
+    def test_summary_statistics(self):
+        """Test summaries report variance, exposure and a valid interval"""
+        for name, summary in self.summaries.items():
+            with self.subTest(scenario=name):
+                self.assertGreater(summary['rounds'], 0)
+                self.assertGreaterEqual(summary['variance'], 0)
+                self.assertLessEqual(summary['ci_low'], summary['rtp'])
+                self.assertGreaterEqual(summary['ci_high'], summary['rtp'])
+                self.assertGreaterEqual(summary['max_exposure'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
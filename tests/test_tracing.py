@@ -0,0 +1,88 @@
+import unittest
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils import tracing
+from src.utils.tracing import span, traced, current_span, format_slowest, begin_update_trace, end_update_trace
+from src.utils.mongo_monitor import CommandMonitor
+from src.utils.error_handler import handle_errors, instrument_handlers
+from src.utils.metrics import handler_latency
+
+class TestTracing(unittest.TestCase):
+    """Test span propagation, export and the slowest-trace report"""
+
+    def setUp(self):
+        tracing.ring_buffer.traces.clear()
+
+    def test_context_follows_tasks(self):
+        """Test spans opened in awaited coroutines and tasks join the caller's trace"""
+        @traced("nowpayments get_status")
+        async def api_call():
+            await asyncio.sleep(0)
+            return current_span()
+
+        async def handler():
+            with span("handler play") as root:
+                inner = await asyncio.gather(api_call(), asyncio.create_task(api_call()))
+            return root, inner
+
+        root, inner = asyncio.run(handler())
+        self.assertEqual([s.trace for s in inner], [root.trace, root.trace])
+        self.assertEqual([s.parent_id for s in inner], [root.span_id, root.span_id])
+        self.assertEqual(list(tracing.ring_buffer.traces), [root.trace])
+        self.assertEqual(set(root.trace.breakdown()), {"nowpayments"})
+        self.assertIsNone(current_span())
+
+    def test_handler_and_mongo_spans(self):
+        """Test decorated handlers open a root span and Mongo commands add children"""
+        monitor = CommandMonitor()
+
+        @handle_errors
+        async def traced_handler(update, context):
+            event = SimpleNamespace(command_name="find", command={"find": "users"}, database_name="exowin_bot",
+                                    connection_id=("localhost", 27017), request_id=1, duration_micros=4000)
+            monitor.started(event)
+            monitor.succeeded(event)
+            raise RuntimeError("boom")
+
+        asyncio.run(traced_handler(SimpleNamespace(message=None, callback_query=None), None))
+        trace = tracing.ring_buffer.traces[-1]
+        self.assertEqual(trace.root.name, "handler traced_handler")
+        self.assertIn("RuntimeError", trace.root.error)
+        self.assertEqual([s.name for s in trace.spans], ["mongo find users", "handler traced_handler"])
+        self.assertAlmostEqual(trace.breakdown()["mongo"], 4.0)
+        self.assertIn("mongo find users: 4.0ms", format_slowest())
+
+    def test_every_update_gets_a_root_span(self):
+        """Test updates are traced and undecorated handlers are timed under the update's span"""
+        async def plain_balance_handler(update, context):
+            with span("db get_user"):
+                pass
+
+        decorated = handle_errors(plain_balance_handler)
+        application = SimpleNamespace(handlers={0: [SimpleNamespace(callback=plain_balance_handler),
+                                                    SimpleNamespace(callback=decorated)]})
+        instrument_handlers(application)
+        self.assertIsNot(application.handlers[0][0].callback, plain_balance_handler)
+        self.assertIs(application.handlers[0][1].callback, decorated)
+
+        update = SimpleNamespace(update_id=7, message=SimpleNamespace(text="/balance@ExoWinBot"), callback_query=None)
+
+        async def process_update():
+            await begin_update_trace(update, None)
+            await application.handlers[0][0].callback(update, None)
+            await end_update_trace(update, None)
+
+        asyncio.run(process_update())
+        trace = tracing.ring_buffer.traces[-1]
+        self.assertEqual(trace.root.name, "update /balance")
+        self.assertEqual([s.name for s in trace.spans], ["db get_user", "handler plain_balance_handler", "update /balance"])
+        self.assertEqual(handler_latency.labels("plain_balance_handler").count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.database.db as db
+from src.database.user_context import begin_user_context, current_user_context
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+class CountingUsers:
+    """Motor-like users collection that counts reads"""
+
+    def __init__(self, users):
+        self.users = {user["user_id"]: dict(user) for user in users}
+        self.reads = 0
+
+    def _apply(self, user, update):
+        for field, amount in update.get("$inc", {}).items():
+            user[field] = user.get(field, 0) + amount
+        user.update(update.get("$set", {}))
+
+    async def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            if request._filter["user_id"] in self.users:
+                self._apply(self.users[request._filter["user_id"]], request._doc)
+
+    def find(self, query, projection=None):
+        self.reads += 1
+        return FakeCursor([dict(self.users[user_id]) for user_id in query["user_id"]["$in"] if user_id in self.users])
+
+    async def find_one_and_update(self, query, update, projection=None, return_document=None):
+        self.reads += 1
+        user = self.users.get(query["user_id"])
+        if user is None:
+            return None
+        self._apply(user, update)
+        return dict(user)
+
+class TestUserContext(unittest.TestCase):
+    """Test the acting user is read once per update"""
+
+    def setUp(self):
+        self.original = db.users_collection
+        db.users_collection = CountingUsers([{"user_id": 1, "balance": 60.0, "first_name": "Ann"}])
+
+    def tearDown(self):
+        db.users_collection = self.original
+
+    def test_one_read_per_update(self):
+        """Test repeated lookups and mutations share the loaded user"""
+        async def handle_update():
+            begin_user_context(1, {"user_id": 1, "first_name": "Ann"})
+            user = await db.get_user(1)
+            self.assertTrue(await db.can_withdraw(1))
+            await db.update_user_balance(1, -15.0)
+            self.assertIs(current_user_context().user, await db.get_user(1, {"first_name": "Ann"}))
+            return user, await db.get_user(1)
+
+        first, latest = asyncio.run(handle_update())
+        self.assertEqual(first["balance"], 60.0)
+        self.assertEqual(latest["balance"], 45.0)
+        self.assertEqual(latest["total_losses"], 1)
+        # One load plus the balance update itself
+        self.assertEqual(db.users_collection.reads, 2)
+
+    def test_other_users_are_not_cached(self):
+        """Test only the acting user is served from the context"""
+        async def handle_update():
+            begin_user_context(2)
+            await db.get_user(1)
+            await db.get_user(1)
+
+        asyncio.run(handle_update())
+        self.assertEqual(db.users_collection.reads, 2)
+
+    def test_concurrent_loads_get_copies(self):
+        """Test coalesced lookups share one read but not one document"""
+        db.users_collection.users[2] = {"user_id": 2, "balance": 5.0}
+
+        async def lookups():
+            return await asyncio.gather(db.get_user(1), db.get_user(1), db.get_user(2))
+
+        first, second, other = asyncio.run(lookups())
+        self.assertEqual(db.users_collection.reads, 1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        first["balance"] = 0.0
+        self.assertEqual(second["balance"], 60.0)
+        self.assertEqual(other["balance"], 5.0)
+
+if __name__ == '__main__':
+    unittest.main()
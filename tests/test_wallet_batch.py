@@ -0,0 +1,122 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.database.db as db
+from src.games.lobbies import Lobby, collect_entry_fees, pay_prizes, finish_lobby
+from src.utils.error_handler import InsufficientFundsError
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+class FakeUsers:
+    """Just enough of a motor collection to run conditional balance batches"""
+
+    def __init__(self, balances):
+        self.users = {user_id: {"user_id": user_id, "balance": balance} for user_id, balance in balances.items()}
+        self.bulk_writes = 0
+
+    async def bulk_write(self, requests, ordered=True):
+        self.bulk_writes += 1
+        for request in requests:
+            user = self.users.get(request._filter["user_id"])
+            floor = request._filter.get("balance", {}).get("$gte")
+            if user is None or (floor is not None and user["balance"] < floor):
+                continue
+            for field, amount in request._doc["$inc"].items():
+                user[field] = user.get(field, 0) + amount
+            user.setdefault("wallet_batches", []).extend(request._doc["$push"]["wallet_batches"]["$each"])
+
+    def find(self, query, projection=None):
+        return FakeCursor([dict(self.users[user_id]) for user_id in query["user_id"]["$in"] if user_id in self.users])
+
+class FakeInserts:
+    def __init__(self):
+        self.docs = []
+
+    async def insert_many(self, docs, ordered=True):
+        self.docs.extend(docs)
+
+        class Result:
+            inserted_ids = list(range(len(docs)))
+        return Result()
+
+class TestWalletBatch(unittest.TestCase):
+    """Test conditional multi-user balance batches"""
+
+    def setUp(self):
+        self.originals = (db.users_collection, db.transactions_collection, db.games_collection)
+        db.users_collection = FakeUsers({1: 50.0, 2: 5.0, 3: 20.0})
+        db.transactions_collection = FakeInserts()
+        db.games_collection = FakeInserts()
+
+    def tearDown(self):
+        db.users_collection, db.transactions_collection, db.games_collection = self.originals
+
+    def test_debits_only_apply_when_covered(self):
+        """Test a user's debits are merged and guarded, credits always apply"""
+        results = asyncio.run(db.apply_balance_changes([
+            (1, -30.0, "entry"), (1, -15.0, "entry"), (2, -10.0, "entry"), (3, 4.0, "win")
+        ]))
+        self.assertEqual(results[1], {"applied": True, "balance": 5.0})
+        self.assertEqual(results[2], {"applied": False, "balance": 5.0})
+        self.assertEqual(results[3], {"applied": True, "balance": 24.0})
+        self.assertEqual(db.users_collection.bulk_writes, 1)
+        self.assertEqual(sorted(row["user_id"] for row in db.transactions_collection.docs), [1, 1, 3])
+
+    def test_lobby_drops_players_who_cannot_pay(self):
+        """Test short players leave the lobby and the rest play for the pot"""
+        lobby = Lobby('dice', 1, 'a', 10.0)
+        lobby.join(2, 'b')
+        lobby.join(3, 'c')
+        self.assertEqual(asyncio.run(collect_entry_fees(lobby)), ['b'])
+        self.assertEqual(lobby.pot, 20.0)
+
+        lobby.record_score(1, 6)
+        lobby.record_score(3, 2)
+        asyncio.run(pay_prizes(lobby, lobby.winner_takes_all()))
+        self.assertEqual(db.users_collection.users[1]["balance"], 60.0)
+        self.assertEqual(len(db.games_collection.docs), 2)
+
+    def test_lobby_below_quorum_is_refunded(self):
+        """Test fees are returned when too few players can pay"""
+        lobby = Lobby('darts', 3, 'c', 10.0, capacity=2)
+        lobby.join(2, 'b')
+        with self.assertRaises(InsufficientFundsError):
+            asyncio.run(collect_entry_fees(lobby))
+        self.assertEqual(db.users_collection.users[3]["balance"], 20.0)
+
+    def test_failed_game_is_refunded(self):
+        """Test a game that fails after taking fees returns them, and a paid game does not"""
+        lobby = Lobby('wheel', 1, 'a', 10.0)
+        lobby.join(3, 'c')
+        asyncio.run(collect_entry_fees(lobby))
+        self.assertEqual(db.users_collection.users[1]["balance"], 40.0)
+        asyncio.run(finish_lobby(lobby))
+        self.assertEqual(db.users_collection.users[1]["balance"], 50.0)
+        self.assertEqual(db.users_collection.users[3]["balance"], 20.0)
+
+        lobby = Lobby('wheel', 1, 'a', 10.0)
+        lobby.join(3, 'c')
+        asyncio.run(collect_entry_fees(lobby))
+        asyncio.run(pay_prizes(lobby, {1: 20.0}))
+        asyncio.run(finish_lobby(lobby))
+        self.assertEqual(db.users_collection.users[1]["balance"], 60.0)
+        self.assertEqual(db.users_collection.users[3]["balance"], 10.0)
+
+if __name__ == '__main__':
+    unittest.main()
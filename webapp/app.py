@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory, session
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, session
 from flask_cors import CORS
 import os
 import sys
@@ -15,8 +15,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Load environment variables
 load_dotenv()
 
-from webapp.sync_db import get_user, update_user_balance, record_transaction, record_game, get_leaderboard
+from webapp.sync_db import get_user, update_user_balance, record_transaction, record_game, get_leaderboard, settle_lottery_draw, MongoLotteryStore
 from src.utils.logger import webapp_logger
+from src.utils.mongo_monitor import command_monitor, begin_scope, end_scope
+from src.utils.metrics import registry, time_route, bearer_authorized, PROMETHEUS_CONTENT_TYPE
 from src.utils.validators import validator
 from src.utils.error_handler import GameError, InsufficientFundsError, InvalidBetError
 from src.games.blackjack import create_blackjack_game, hit_blackjack, stand_blackjack, get_game, set_game, clear_game
@@ -26,7 +28,13 @@ from src.games.mines import create_mines_game, get_mines_game, reveal_mines_tile
 from src.games.tower import create_tower_game, get_tower_game, choose_tower_tile, cash_out_tower, clear_tower_game
 from src.games.plinko import create_plinko_game, get_plinko_game, drop_plinko_ball, clear_plinko_game
 from src.games.poker import create_poker_game, get_poker_game, finish_poker_game, clear_poker_game
-from src.games.lottery import create_lottery_game, get_lottery_game, select_lottery_numbers, draw_lottery_numbers, clear_lottery_game
+from src.games.lottery import create_lottery_game, get_lottery_game, select_lottery_numbers, draw_lottery_numbers, clear_lottery_game, LotteryScheduler, validate_ticket
+from src.games.engines import get_engine
+from src.games.provably_fair import verify_outcome
+from src.games.payout_tables import (
+    MINES_GRID_SIZE, TOWER_LEVELS, TOWER_TILES, TOWER_SAFE_TILES, PLINKO_SESSION_ROWS,
+    mines_ladder, tower_ladder, plinko_multipliers
+)
 
 app = Flask(__name__)
 CORS(app, origins="*", allow_headers="*", methods="*")
@@ -35,6 +43,27 @@ CORS(app, origins="*", allow_headers="*", methods="*")
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', secrets.token_hex(32))
 app.permanent_session_lifetime = timedelta(hours=24)
 
+# Scheduled lottery draws; tickets and draw state live in MongoDB, shared by every process
+lottery_scheduler = LotteryScheduler(store=MongoLotteryStore())
+
+# Bearer token required by the metrics endpoints; they stay closed until it is set
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+def metrics_authorized() -> bool:
+    return bearer_authorized(request.headers.get('Authorization'), METRICS_TOKEN)
+
+# Time every route
+time_route(app, 'webapp')
+
+# Count database round trips per request
+@app.before_request
+def begin_round_trip_scope():
+    begin_scope('request')
+
+@app.teardown_request
+def end_round_trip_scope(exc):
+    end_scope()
+
 # Security headers
 @app.after_request
 def add_security_headers(response):
@@ -48,6 +77,20 @@ def index():
     """Health check endpoint"""
     return jsonify({'status': 'ok', 'message': 'Gamble Bot Web App Server Running'})
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics of this process"""
+    if not metrics_authorized():
+        return jsonify({'error': 'Unauthorized'}), 401
+    return Response(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.route('/api/metrics/mongo')
+def mongo_metrics():
+    """Mongo command latency histograms, round trips per request and slow query plans"""
+    if not metrics_authorized():
+        return jsonify({'error': 'Unauthorized'}), 401
+    return jsonify(command_monitor.snapshot())
+
 @app.route('/games/<game_name>')
 def game_page(game_name):
     """Serve game pages"""
@@ -132,34 +175,58 @@ def place_bet():
         data = request.get_json()
         user_id = data.get('user_id')
         game_type = data.get('game_type')
-        bet_amount = float(data.get('bet_amount'))
+        bet_amount = float(data.get('bet_amount') or 0)
         game_data = data.get('game_data', {})
         
-        if not all([user_id, game_type, bet_amount]):
+        if not all([user_id, game_type]):
             return jsonify({'success': False, 'error': 'Missing required fields'}), 400
         
+        engine = get_engine(game_type)
+        if engine is None or not engine.quick_play:
+            return jsonify({'success': False, 'error': f'Unknown game: {game_type}'}), 400
+        
+        # Settle rounds abandoned past their timeout as forfeits of their stake
+        for expired_user, expired in engine.expire():
+            record_game(expired_user, game_type, expired['stake'], 'loss', 0)
+        
+        # Round state is kept per user; multi-step rounds are charged once, by the call that opens them
+        game_data = dict(game_data or {}, user_id=user_id)
+        try:
+            stake = engine.stake(bet_amount, game_data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
         # Get user and check balance
         user = get_user(user_id)
         
-        if user['balance'] < bet_amount:
+        if user['balance'] < stake:
             return jsonify({
                 'success': False, 
                 'error': 'Insufficient balance',
                 'balance': user['balance']
             }), 400
         
-        # Deduct bet amount
-        update_user_balance(user_id, -bet_amount)
-        record_transaction(user_id, -bet_amount, "bet", f"{game_type} bet")
-        
-        # Process game logic based on game type
-        result = process_game_logic(game_type, bet_amount, game_data)
-        
-        # Record game result
-        game_id = record_game(
-            user_id, game_type, bet_amount, 
-            result['outcome'], result['winnings']
-        )
+        # Deduct the stake
+        if stake > 0:
+            update_user_balance(user_id, -stake)
+            record_transaction(user_id, -stake, "bet", f"{game_type} bet")
+        
+        # Process game logic based on game type; a move the engine refuses costs nothing
+        try:
+            result = process_game_logic(game_type, stake, game_data)
+        except Exception as e:
+            if stake > 0:
+                update_user_balance(user_id, stake)
+                record_transaction(user_id, stake, "refund", f"{game_type} refund")
+            return jsonify({'success': False, 'error': str(e)}), 400 if isinstance(e, ValueError) else 500
+        
+        # Record game result once the round is settled
+        game_id = None
+        if result['outcome'] != 'continue':
+            game_id = record_game(
+                user_id, game_type, result.get('stake', stake),
+                result['outcome'], result['winnings']
+            )
         
         # Update balance if won
         if result['winnings'] > 0:
@@ -180,410 +247,18 @@ def place_bet():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 def process_game_logic(game_type, bet_amount, game_data):
-    """Process game logic and return result"""
-    try:
-        if game_type == 'coinflip':
-            # Coinflip game logic
-            user_choice = game_data.get('choice', 'heads')  # heads or tails
-            result = random.choice(['heads', 'tails'])
-            
-            if user_choice == result:
-                winnings = bet_amount * 2  # 2x multiplier for correct guess
-                return {
-                    'outcome': 'win',
-                    'winnings': winnings,
-                    'result': result,
-                    'user_choice': user_choice,
-                    'multiplier': 2.0,
-                    'message': f'You chose {user_choice} and it landed on {result}! You won!'
-                }
-            else:
-                return {
-                    'outcome': 'loss',
-                    'winnings': 0,
-                    'result': result,
-                    'user_choice': user_choice,
-                    'message': f'You chose {user_choice} but it landed on {result}. Better luck next time!'
-                }
-        
-        elif game_type == 'crash':
-            # Crash game logic
-            crash_point = round(random.uniform(1.01, 10.0), 2)
-            cash_out_at = game_data.get('cash_out_at', 2.0)
-            
-            if cash_out_at <= crash_point:
-                winnings = bet_amount * cash_out_at
-                return {
-                    'outcome': 'win',
-                    'winnings': winnings,
-                    'crash_point': crash_point,
-                    'cash_out_at': cash_out_at,
-                    'multiplier': cash_out_at,
-                    'message': f'Cashed out at {cash_out_at}x! Crash was at {crash_point}x'
-                }
-            else:
-                return {
-                    'outcome': 'loss',
-                    'winnings': 0,
-                    'crash_point': crash_point,
-                    'cash_out_at': cash_out_at,
-                    'message': f'Crashed at {crash_point}x before your cash out at {cash_out_at}x!'
-                }
-        
-        elif game_type == 'dice':
-            # Dice game logic
-            target = game_data.get('target', 50)  # Target number (1-100)
-            over_under = game_data.get('over_under', 'over')  # 'over' or 'under'
-            
-            roll = random.randint(1, 100)
-            
-            won = False
-            if over_under == 'over' and roll > target:
-                won = True
-            elif over_under == 'under' and roll < target:
-                won = True
-            
-            if won:
-                # Calculate multiplier based on probability
-                if over_under == 'over':
-                    probability = (100 - target) / 100
-                else:
-                    probability = target / 100
-                
-                multiplier = 0.95 / probability  # 95% RTP
-                winnings = bet_amount * multiplier
-                
-                return {
-                    'outcome': 'win',
-                    'winnings': winnings,
-                    'roll': roll,
-                    'target': target,
-                    'over_under': over_under,
-                    'multiplier': multiplier,
-                    'message': f'Rolled {roll}! You won with {over_under} {target}!'
-                }
-            else:
-                return {
-                    'outcome': 'loss',
-                    'winnings': 0,
-                    'roll': roll,
-                    'target': target,
-                    'over_under': over_under,
-                    'message': f'Rolled {roll}. You needed {over_under} {target}.'
-                }
-        
-        elif game_type == 'plinko':
-            # Plinko game logic
-            risk_level = game_data.get('risk', 'medium')  # low, medium, high
-            
-            # Define multipliers for different risk levels
-            multipliers = {
-                'low': [0.5, 0.7, 1.0, 1.2, 1.5, 1.2, 1.0, 0.7, 0.5],
-                'medium': [0.2, 0.5, 1.0, 2.0, 5.0, 2.0, 1.0, 0.5, 0.2],
-                'high': [0.1, 0.3, 0.5, 2.0, 10.0, 2.0, 0.5, 0.3, 0.1]
-            }
-            
-            # Simulate ball drop (weighted towards center)
-            weights = [1, 2, 4, 6, 8, 6, 4, 2, 1]
-            bucket = random.choices(range(9), weights=weights)[0]
-            multiplier = multipliers[risk_level][bucket]
-            
-            winnings = bet_amount * multiplier
-            
-            return {
-                'outcome': 'win' if multiplier > 1.0 else 'loss',
-                'winnings': winnings,
-                'bucket': bucket,
-                'multiplier': multiplier,
-                'risk_level': risk_level,
-                'message': f'Ball landed in bucket {bucket + 1} with {multiplier}x multiplier!'
-            }
-        
-        elif game_type == 'mines':
-            # Mines game logic
-            mines_count = game_data.get('mines', 3)
-            revealed_positions = game_data.get('revealed', [])
-            action = game_data.get('action', 'reveal')  # 'reveal' or 'cashout'
-            
-            # Generate consistent mine positions for this game session
-            seed = game_data.get('seed', random.randint(1, 1000000))
-            random.seed(seed)
-            mine_positions = random.sample(range(25), mines_count)
-            random.seed()  # Reset seed
-            
-            if action == 'reveal':
-                position = game_data.get('position')
-                if position in mine_positions:
-                    return {
-                        'outcome': 'loss',
-                        'winnings': 0,
-                        'mine_positions': mine_positions,
-                        'hit_mine': True,
-                        'position': position,
-                        'message': 'Hit a mine! Game over.'
-                    }
-                else:
-                    # Calculate current multiplier
-                    gems_found = len(revealed_positions) + 1
-                    safe_tiles = 25 - mines_count
-                    multiplier = 1.0
-                    for i in range(gems_found):
-                        multiplier *= (safe_tiles - i) / (25 - mines_count - i)
-                    
-                    return {
-                        'outcome': 'continue',
-                        'winnings': 0,
-                        'position': position,
-                        'gems_found': gems_found,
-                        'multiplier': multiplier,
-                        'hit_mine': False,
-                        'seed': seed,
-                        'message': f'Found a gem! Current multiplier: {multiplier:.2f}x'
-                    }
-            
-            elif action == 'cashout':
-                gems_found = len(revealed_positions)
-                if gems_found == 0:
-                    multiplier = 1.0
-                else:
-                    safe_tiles = 25 - mines_count
-                    multiplier = 1.0
-                    for i in range(gems_found):
-                        multiplier *= (safe_tiles - i) / (25 - mines_count - i)
-                
-                winnings = bet_amount * multiplier
-                
-                return {
-                    'outcome': 'win',
-                    'winnings': winnings,
-                    'gems_found': gems_found,
-                    'multiplier': multiplier,
-                    'message': f'Cashed out with {gems_found} gems! Multiplier: {multiplier:.2f}x'
-                }
-        
-        elif game_type == 'roulette':
-            # Roulette game logic
-            bet_type = game_data.get('bet_type', 'number')  # number, color, odd_even
-            bet_value = game_data.get('bet_value')
-            
-            # Generate winning number (0-36)
-            winning_number = random.randint(0, 36)
-            
-            # Determine color
-            if winning_number == 0:
-                winning_color = 'green'
-            elif winning_number in [1,3,5,7,9,12,14,16,18,19,21,23,25,27,30,32,34,36]:
-                winning_color = 'red'
-            else:
-                winning_color = 'black'
-            
-            won = False
-            multiplier = 0
-            
-            if bet_type == 'number' and bet_value == winning_number:
-                won = True
-                multiplier = 36  # 36:1 payout for single number
-            elif bet_type == 'color' and bet_value == winning_color:
-                won = True
-                multiplier = 2  # 2:1 payout for color
-            elif bet_type == 'odd_even':
-                if bet_value == 'odd' and winning_number % 2 == 1 and winning_number != 0:
-                    won = True
-                    multiplier = 2
-                elif bet_value == 'even' and winning_number % 2 == 0 and winning_number != 0:
-                    won = True
-                    multiplier = 2
-            
-            winnings = bet_amount * multiplier if won else 0
-            
-            return {
-                'outcome': 'win' if won else 'loss',
-                'winnings': winnings,
-                'winning_number': winning_number,
-                'winning_color': winning_color,
-                'bet_type': bet_type,
-                'bet_value': bet_value,
-                'multiplier': multiplier,
-                'message': f'Ball landed on {winning_number} ({winning_color})!'
-            }
-        
-        elif game_type == 'slots':
-            # Slots game logic
-            symbols = ['🍒', '🍋', '🍊', '🍇', '🔔', '💎', '7️⃣']
-            weights = [30, 25, 20, 15, 7, 2, 1]  # Weighted probabilities
-            
-            # Spin reels
-            reel1 = random.choices(symbols, weights=weights)[0]
-            reel2 = random.choices(symbols, weights=weights)[0]
-            reel3 = random.choices(symbols, weights=weights)[0]
-            
-            # Check for wins
-            multiplier = 0
-            if reel1 == reel2 == reel3:
-                # Three of a kind
-                symbol_multipliers = {
-                    '🍒': 5, '🍋': 10, '🍊': 15, '🍇': 20,
-                    '🔔': 50, '💎': 100, '7️⃣': 500
-                }
-                multiplier = symbol_multipliers.get(reel1, 5)
-            elif reel1 == reel2 or reel2 == reel3 or reel1 == reel3:
-                # Two of a kind
-                multiplier = 2
-            
-            winnings = bet_amount * multiplier
-            
-            return {
-                'outcome': 'win' if multiplier > 0 else 'loss',
-                'winnings': winnings,
-                'reels': [reel1, reel2, reel3],
-                'multiplier': multiplier,
-                'message': f'Reels: {reel1} {reel2} {reel3}' + (f' - {multiplier}x win!' if multiplier > 0 else ' - No match')
-            }
-        
-        elif game_type == 'blackjack':
-            # Simplified blackjack logic
-            action = game_data.get('action', 'deal')
-            
-            if action == 'deal':
-                # Deal initial cards
-                player_cards = [random.randint(1, 11), random.randint(1, 11)]
-                dealer_cards = [random.randint(1, 11)]
-                
-                player_total = sum(player_cards)
-                
-                # Handle aces
-                if player_total > 21 and 11 in player_cards:
-                    player_cards[player_cards.index(11)] = 1
-                    player_total = sum(player_cards)
-                
-                if player_total == 21:
-                    # Blackjack!
-                    winnings = bet_amount * 2.5
-                    return {
-                        'outcome': 'win',
-                        'winnings': winnings,
-                        'player_cards': player_cards,
-                        'dealer_cards': dealer_cards,
-                        'player_total': player_total,
-                        'multiplier': 2.5,
-                        'message': 'Blackjack! You won!'
-                    }
-                elif player_total > 21:
-                    # Bust
-                    return {
-                        'outcome': 'loss',
-                        'winnings': 0,
-                        'player_cards': player_cards,
-                        'dealer_cards': dealer_cards,
-                        'player_total': player_total,
-                        'message': 'Bust! You went over 21.'
-                    }
-                else:
-                    # Continue game
-                    return {
-                        'outcome': 'continue',
-                        'winnings': 0,
-                        'player_cards': player_cards,
-                        'dealer_cards': dealer_cards,
-                        'player_total': player_total,
-                        'message': f'Your total: {player_total}. Hit or Stand?'
-                    }
-        
-        elif game_type == 'tower':
-            # Tower game logic
-            action = game_data.get('action', 'start')
-            
-            if action == 'select_tile':
-                level = game_data.get('level', 0)
-                tile = game_data.get('tile', 0)
-                current_level = game_data.get('current_level', 0)
-                
-                # Each level has 2 safe tiles and 1 dangerous tile
-                safe_tiles = random.sample(range(3), 2)
-                
-                if tile in safe_tiles:
-                    # Safe tile - advance level
-                    new_level = current_level + 1
-                    multipliers = [1.0, 1.5, 2.25, 3.38, 5.06, 7.59, 11.39, 17.09]
-                    
-                    if new_level >= 8:
-                        # Reached the top!
-                        winnings = bet_amount * multipliers[7]
-                        return {
-                            'outcome': 'win',
-                            'winnings': winnings,
-                            'level': new_level,
-                            'multiplier': multipliers[7],
-                            'message': 'You reached the top of the tower!'
-                        }
-                    else:
-                        return {
-                            'outcome': 'continue',
-                            'winnings': 0,
-                            'level': new_level,
-                            'multiplier': multipliers[new_level],
-                            'message': f'Safe! Advanced to level {new_level + 1}'
-                        }
-                else:
-                    # Dangerous tile - game over
-                    return {
-                        'outcome': 'loss',
-                        'winnings': 0,
-                        'level': current_level,
-                        'message': 'Hit a dangerous tile! Game over.'
-                    }
-        
-        elif game_type == 'wheel':
-            # Wheel of Fortune game logic
-            selected_segment = game_data.get('selected_segment', 1)
-            
-            # Define wheel segments with their multipliers
-            segments = {
-                1: 2, 2: 3, 3: 5, 4: 2,
-                5: 10, 6: 3, 7: 5, 8: 20
-            }
-            
-            # Spin the wheel (weighted towards lower multipliers)
-            weights = [25, 20, 15, 25, 8, 20, 15, 2]  # Lower chance for higher multipliers
-            winning_segment = random.choices(list(segments.keys()), weights=weights)[0]
-            
-            if winning_segment == selected_segment:
-                multiplier = segments[winning_segment]
-                winnings = bet_amount * multiplier
-                return {
-                    'outcome': 'win',
-                    'winnings': winnings,
-                    'winning_segment': winning_segment,
-                    'selected_segment': selected_segment,
-                    'multiplier': multiplier,
-                    'message': f'Perfect prediction! {multiplier}x multiplier!'
-                }
-            else:
-                return {
-                    'outcome': 'loss',
-                    'winnings': 0,
-                    'winning_segment': winning_segment,
-                    'selected_segment': selected_segment,
-                    'message': f'Wheel landed on segment {winning_segment}'
-                }
-        
-        elif game_type == 'roll':
-            # Simple dice roll game (alias for dice)
-            return process_game_logic('dice', bet_amount, game_data)
-        
-        # Default case for unimplemented games
-        return {
-            'outcome': 'loss',
-            'winnings': 0,
-            'message': f'Game {game_type} not implemented yet'
-        }
-        
-    except Exception as e:
-        return {
-            'outcome': 'error',
-            'winnings': 0,
-            'message': f'Game error: {str(e)}'
-        }
+    """Process game logic and return result; engine errors propagate so the caller can refund"""
+    engine = get_engine(game_type)
+    result = engine.play(bet_amount, game_data) if engine else None
+    if result is not None:
+        return result
+    
+    # Default case for unimplemented games
+    return {
+        'outcome': 'loss',
+        'winnings': 0,
+        'message': f'Game {game_type} not implemented yet'
+    }
 
 # Blackjack specific endpoints
 @app.route('/api/blackjack/deal', methods=['POST'])
@@ -885,7 +560,8 @@ def crash_start():
                 'current_multiplier': game.current_multiplier,
                 'is_running': game.is_running,
                 'game_over': game.game_over,
-                'bet_amount': game.bet_amount
+                'bet_amount': game.bet_amount,
+                'fairness': game.get_fairness()
             },
             'new_balance': new_balance
         })
@@ -915,7 +591,8 @@ def crash_update():
                 'game_over': game.game_over,
                 'result': game.result,
                 'winnings': game.winnings,
-                'cashed_out': game.cashed_out
+                'cashed_out': game.cashed_out,
+                'fairness': game.get_fairness()
             }
         })
         
@@ -956,7 +633,8 @@ def crash_cashout():
                 'winnings': game.winnings,
                 'game_over': game.game_over,
                 'result': game.result,
-                'cashed_out': game.cashed_out
+                'cashed_out': game.cashed_out,
+                'fairness': game.get_fairness()
             },
             'new_balance': new_balance
         }
@@ -982,6 +660,11 @@ def mines_start():
         if not all([user_id, bet_amount]):
             return jsonify({'success': False, 'error': 'Missing required fields'}), 400
         
+        try:
+            mines_ladder(MINES_GRID_SIZE, mines_count)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
         # Get user and check balance
         user = get_user(user_id)
         if user['balance'] < bet_amount:
@@ -996,7 +679,7 @@ def mines_start():
         record_transaction(user_id, -bet_amount, 'mines_bet', 'Mines game bet')
         
         # Create game
-        game = create_mines_game(user_id, bet_amount, mines_count)
+        game = create_mines_game(user_id, bet_amount, mines_count, data.get('client_seed'))
         
         return jsonify({
             'success': True,
@@ -1007,6 +690,18 @@ def mines_start():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/mines/ladder', methods=['GET'])
+def mines_payout_ladder():
+    """Multiplier after each gem for a mine count"""
+    try:
+        mines_count = int(request.args.get('mines_count', 5))
+        grid_size = int(request.args.get('grid_size', MINES_GRID_SIZE))
+        ladder = mines_ladder(grid_size, mines_count)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({'success': True, 'grid_size': grid_size, 'mines_count': mines_count, 'payout_ladder': list(ladder)})
+
 @app.route('/api/mines/reveal', methods=['POST'])
 def mines_reveal():
     """Reveal a tile in mines game"""
@@ -1109,7 +804,7 @@ def tower_start():
         record_transaction(user_id, -bet_amount, 'tower_bet', 'Tower game bet')
         
         # Create game
-        game = create_tower_game(user_id, bet_amount)
+        game = create_tower_game(user_id, bet_amount, data.get('client_seed'))
         
         return jsonify({
             'success': True,
@@ -1120,6 +815,18 @@ def tower_start():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/tower/ladder', methods=['GET'])
+def tower_payout_ladder():
+    """Multiplier at each level of the tower"""
+    ladder = tower_ladder(TOWER_LEVELS, TOWER_TILES, TOWER_SAFE_TILES)
+    return jsonify({
+        'success': True,
+        'levels': TOWER_LEVELS,
+        'tiles_per_level': TOWER_TILES,
+        'safe_tiles': TOWER_SAFE_TILES,
+        'payout_ladder': list(ladder)
+    })
+
 @app.route('/api/tower/choose', methods=['POST'])
 def tower_choose():
     """Choose a tile in tower game"""
@@ -1194,6 +901,18 @@ def tower_cashout():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # ==================== PLINKO API ENDPOINTS ====================
+@app.route('/api/plinko/multipliers', methods=['GET'])
+def plinko_board_multipliers():
+    """Bucket multipliers for a board size and risk level"""
+    try:
+        rows = int(request.args.get('rows', PLINKO_SESSION_ROWS))
+        risk_level = request.args.get('risk_level', 'medium')
+        multipliers = plinko_multipliers(rows, risk_level)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({'success': True, 'rows': rows, 'risk_level': risk_level, 'multipliers': list(multipliers)})
+
 @app.route('/api/plinko/drop', methods=['POST'])
 def plinko_drop():
     """Drop a ball in plinko game"""
@@ -1202,10 +921,17 @@ def plinko_drop():
         user_id = data.get('user_id')
         bet_amount = float(data.get('bet_amount'))
         risk_level = data.get('risk_level', 'medium')
+        rows = int(data.get('rows', PLINKO_SESSION_ROWS))
+        include_path = data.get('include_path', True)
         
         if not all([user_id, bet_amount]):
             return jsonify({'success': False, 'error': 'Missing required fields'}), 400
         
+        try:
+            plinko_multipliers(rows, risk_level)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
         # Get user and check balance
         user = get_user(user_id)
         if user['balance'] < bet_amount:
@@ -1220,8 +946,8 @@ def plinko_drop():
         record_transaction(user_id, -bet_amount, 'plinko_bet', 'Plinko game bet')
         
         # Create game and drop ball
-        game = create_plinko_game(user_id, bet_amount, risk_level)
-        result = drop_plinko_ball(user_id)
+        game = create_plinko_game(user_id, bet_amount, risk_level, data.get('client_seed'), rows)
+        result = drop_plinko_ball(user_id, include_path)
         
         # Handle winnings
         if game.winnings > 0:
@@ -1234,7 +960,7 @@ def plinko_drop():
         response = {
             'success': True,
             'result': result,
-            'game': game.get_game_state(),
+            'game': game.get_game_state(include_path),
             'new_balance': new_balance
         }
         
@@ -1246,6 +972,26 @@ def plinko_drop():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# ==================== PROVABLY FAIR ====================
+@app.route('/api/fair/verify', methods=['POST'])
+def fair_verify():
+    """Recompute a crash, mines, tower or plinko outcome from its revealed seeds"""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Expected a JSON object'}), 400
+        game = data.get('game')
+        
+        if not game:
+            return jsonify({'success': False, 'error': 'Missing game'}), 400
+        
+        return jsonify({'success': True, 'game': game, 'result': verify_outcome(game, data)})
+        
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': f'Invalid verification request: {e}'}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 # ==================== POKER API ENDPOINTS ====================
 @app.route('/api/poker/start', methods=['POST'])
 def poker_start():
@@ -1425,6 +1171,65 @@ def lottery_draw():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# ==================== POOLED LOTTERY DRAWS ====================
+@app.route('/api/lottery/draws/current', methods=['GET'])
+def lottery_current_draw():
+    """Open draw, its jackpot and when it runs"""
+    lottery_scheduler.ensure_running(settle_lottery_draw)
+    return jsonify({'success': True, 'draw': lottery_scheduler.status()})
+
+@app.route('/api/lottery/draws/ticket', methods=['POST'])
+def lottery_buy_ticket():
+    """Buy a ticket for the next scheduled draw"""
+    try:
+        data = request.get_json()
+        user_id = data.get('user_id')
+        bet_amount = float(data.get('bet_amount'))
+        numbers = data.get('numbers')
+        
+        if not all([user_id, bet_amount, numbers]):
+            return jsonify({'success': False, 'error': 'Missing required fields'}), 400
+        
+        if not validate_ticket(numbers):
+            return jsonify({'success': False, 'error': 'Invalid number selection'}), 400
+        
+        # Get user and check balance
+        user = get_user(user_id)
+        if user['balance'] < bet_amount:
+            return jsonify({
+                'success': False,
+                'error': 'Insufficient balance',
+                'balance': user['balance']
+            }), 400
+        
+        # Deduct bet from balance; the stake is returned if the ticket cannot be stored
+        update_user_balance(user_id, -bet_amount)
+        try:
+            draw = lottery_scheduler.buy_ticket(user_id, numbers, bet_amount)
+        except Exception:
+            update_user_balance(user_id, bet_amount)
+            raise
+        record_transaction(user_id, -bet_amount, 'lottery_bet', f"lottery_draw_{draw['draw_id']}", 'Lottery draw ticket')
+        lottery_scheduler.ensure_running(settle_lottery_draw)
+        
+        return jsonify({
+            'success': True,
+            'draw': lottery_scheduler.status(),
+            'numbers': sorted(numbers),
+            'new_balance': get_user(user_id)['balance']
+        })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/lottery/draws/<int:draw_id>', methods=['GET'])
+def lottery_draw_result(draw_id):
+    """Result of a recent draw"""
+    result = lottery_scheduler.get_result(draw_id)
+    if not result:
+        return jsonify({'success': False, 'error': 'Draw not found'}), 404
+    return jsonify({'success': True, 'draw': result})
+
 @app.route('/static/<path:filename>')
 def static_files(filename):
     """Serve static files"""
@@ -1,26 +1,38 @@
 import os
+import time
+import numpy as np
 import pymongo
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from dotenv import load_dotenv
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from src.games.rng import new_nonce
 from src.utils.logger import db_logger
+from src.utils.mongo_monitor import command_monitor
+from src.utils.metrics import bet_volume, bets_total, settlement_latency
 
 load_dotenv()
 
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "exowin_bot")
 
+# Lottery draw ids remembered per user to keep draw payouts from being applied twice
+LOTTERY_PAID_HISTORY = 100
+
 # Use synchronous pymongo client for webapp
-client = pymongo.MongoClient(MONGODB_URI)
+client = pymongo.MongoClient(MONGODB_URI, event_listeners=[command_monitor])
+command_monitor.attach(client)
 db = client[DATABASE_NAME]
 users_collection = db["users"]
 transactions_collection = db["transactions"]
 games_collection = db["games"]
+lottery_draws_collection = db["lottery_draws"]
+lottery_tickets_collection = db["lottery_tickets"]
 
 def get_user(user_id: int, user_data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
     """Get user from database or create if not exists"""
     try:
-        db_logger.debug(f"Getting user {user_id}")
+        db_logger.debug("Getting user %s", user_id)
         user = users_collection.find_one({"user_id": user_id})
         if not user:
             user = {
@@ -164,15 +176,181 @@ def record_game(user_id: int, game_type: str, bet_amount: float, outcome: str, w
             "created_at": datetime.now()
         }
         result = games_collection.insert_one(game)
+        bets_total.labels(game_type).inc()
+        bet_volume.labels(game_type).inc(bet_amount)
         return str(result.inserted_id)
     except Exception as e:
         db_logger.error(f"Database error in record_game: {e}")
         raise
 
+def _insert_new(collection, documents) -> int:
+    """insert_many that skips documents whose _id already exists, returns how many were new"""
+    try:
+        return len(collection.insert_many(documents, ordered=False).inserted_ids)
+    except BulkWriteError as e:
+        if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+            raise
+        return e.details["nInserted"]
+
+def settle_lottery_draw(result: Dict[str, Any]) -> int:
+    """Credit every winner of a pooled lottery draw and record all players' games in bulk
+
+    Safe to repeat for the same draw: each balance update only applies to a
+    user not yet paid for the draw, and ledger rows have per-draw ids.
+    """
+    try:
+        started = time.perf_counter()
+        now = datetime.now()
+        draw_id = result['draw_id']
+        balance_updates = []
+        transactions = []
+        games = []
+        
+        for user_id, winnings, stakes, best in zip(
+            result['users'].tolist(), result['user_winnings'].tolist(),
+            result['user_stakes'].tolist(), result['user_best_matches'].tolist()
+        ):
+            if winnings > 0:
+                balance_updates.append(pymongo.UpdateOne(
+                    {"user_id": user_id, "lottery_draws_paid": {"$ne": draw_id}},
+                    {
+                        "$inc": {"balance": winnings, "total_wins": 1, "total_bets": 1},
+                        "$set": {"last_active": now},
+                        "$push": {"lottery_draws_paid": {"$each": [draw_id], "$slice": -LOTTERY_PAID_HISTORY}}
+                    }
+                ))
+                transactions.append({
+                    "_id": f"lottery_draw_{draw_id}_{user_id}",
+                    "user_id": user_id,
+                    "amount": winnings,
+                    "type": "lottery_win",
+                    "game_id": f"lottery_draw_{draw_id}",
+                    "description": f"Lottery draw {draw_id}: best {best} matches",
+                    "timestamp": now
+                })
+            games.append({
+                "_id": f"lottery_draw_{draw_id}_{user_id}",
+                "user_id": user_id,
+                "game_type": "lottery",
+                "bet_amount": stakes,
+                "outcome": "win" if winnings > 0 else "lose",
+                "winnings": winnings,
+                "profit": winnings - stakes,
+                "is_win": winnings > stakes,
+                "game_data": {"draw_id": draw_id, "winning_numbers": result['winning_numbers'], "best_matches": best},
+                "created_at": now
+            })
+        
+        paid = 0
+        if balance_updates:
+            paid = users_collection.bulk_write(balance_updates, ordered=False).modified_count
+        if transactions:
+            _insert_new(transactions_collection, transactions)
+        if games:
+            if _insert_new(games_collection, games):
+                bets_total.labels("lottery").inc(len(games))
+                bet_volume.labels("lottery").inc(sum(game["bet_amount"] for game in games))
+        settlement_latency.labels("lottery_draw").observe(time.perf_counter() - started)
+        
+        db_logger.info(f"Settled lottery draw {draw_id}: {paid} winners paid, {len(games)} players")
+        return paid
+    except Exception as e:
+        db_logger.error(f"Database error in settle_lottery_draw: {e}")
+        raise
+
+class MongoLotteryStore:
+    """Lottery draws and tickets in MongoDB, shared by every webapp process
+
+    Same interface as src.games.lottery.MemoryLotteryStore. Draw documents
+    use the draw id as _id; every status change is a single conditional
+    update, so only one process wins each claim and each rollover.
+    """
+    
+    def _create(self, draw_id: int, interval: float) -> Dict[str, Any]:
+        try:
+            lottery_draws_collection.insert_one({
+                "_id": draw_id, "draw_id": draw_id, "draw_at": time.time() + interval, "nonce": new_nonce(),
+                "rollover": 0.0, "jackpot": 0.0, "status": "open"
+            })
+        except DuplicateKeyError:
+            pass
+        return lottery_draws_collection.find_one({"_id": draw_id})
+    
+    def open_draw(self, interval: float) -> Dict[str, Any]:
+        draw = lottery_draws_collection.find_one({"status": "open"}, sort=[("_id", -1)])
+        if draw:
+            return draw
+        last = lottery_draws_collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        return self._create(last["_id"] + 1 if last else 1, interval)
+    
+    def get_draw(self, draw_id: int) -> Optional[Dict[str, Any]]:
+        return lottery_draws_collection.find_one({"_id": draw_id})
+    
+    def add_ticket(self, draw_id: int, user_id: int, mask: int, stake: float, jackpot_share: float):
+        lottery_tickets_collection.insert_one({
+            "draw_id": draw_id, "user_id": user_id, "mask": int(mask), "stake": stake,
+            "status": "open", "created_at": datetime.now()
+        })
+        lottery_draws_collection.update_one({"_id": draw_id}, {"$inc": {"jackpot": jackpot_share}})
+    
+    def count_tickets(self, draw_id: int) -> int:
+        return lottery_tickets_collection.count_documents({"draw_id": draw_id, "status": "open"})
+    
+    def claim_draw(self, draw_id: int, interval: float) -> bool:
+        claimed = lottery_draws_collection.update_one(
+            {"_id": draw_id, "status": "open"},
+            {"$set": {"status": "drawing", "claimed_at": time.time()}}
+        ).modified_count == 1
+        if claimed:
+            self._create(draw_id + 1, interval)
+        return claimed
+    
+    def reclaim_draws(self, timeout: float) -> List[int]:
+        claimed = []
+        now = time.time()
+        stuck = {"$or": [{"status": "failed"}, {"status": "drawing", "claimed_at": {"$lt": now - timeout}}]}
+        for draw in lottery_draws_collection.find(stuck, {"_id": 1}):
+            # Conditional again, so two processes never retry the same draw
+            if lottery_draws_collection.update_one(
+                {"_id": draw["_id"], **stuck}, {"$set": {"status": "drawing", "claimed_at": now}}
+            ).modified_count:
+                claimed.append(draw["_id"])
+        return claimed
+    
+    def draw_tickets(self, draw_id: int):
+        lottery_tickets_collection.update_many(
+            {"status": "open", "draw_id": {"$lte": draw_id}},
+            {"$set": {"status": "drawn", "drawn_in": draw_id}}
+        )
+        tickets = list(lottery_tickets_collection.find({"drawn_in": draw_id}, {"user_id": 1, "mask": 1, "stake": 1}))
+        return (
+            np.array([ticket["user_id"] for ticket in tickets], dtype=np.int64),
+            np.array([ticket["mask"] for ticket in tickets], dtype=np.uint64),
+            np.array([ticket["stake"] for ticket in tickets], dtype=np.float64)
+        )
+    
+    def fail_draw(self, draw_id: int):
+        lottery_draws_collection.update_one({"_id": draw_id, "status": "drawing"}, {"$set": {"status": "failed"}})
+    
+    def finish_draw(self, draw_id: int, result: Dict[str, Any], rollover: float) -> bool:
+        finished = lottery_draws_collection.update_one(
+            {"_id": draw_id, "status": {"$in": ["drawing", "failed"]}},
+            {"$set": {"status": "settled", "result": result}}
+        ).modified_count == 1
+        if finished:
+            lottery_tickets_collection.update_many({"drawn_in": draw_id}, {"$set": {"status": "settled"}})
+            if rollover:
+                lottery_draws_collection.update_one({"status": "open"}, {"$inc": {"rollover": rollover, "jackpot": rollover}})
+        return finished
+    
+    def get_result(self, draw_id: int) -> Optional[Dict[str, Any]]:
+        draw = lottery_draws_collection.find_one({"_id": draw_id, "status": "settled"}, {"result": 1})
+        return draw["result"] if draw else None
+
 def get_leaderboard(game_type: str = "all", period: str = "all_time", limit: int = 10):
     """Get leaderboard data for a specific game and time period"""
     try:
-        db_logger.debug(f"Getting leaderboard for {game_type} ({period})")
+        db_logger.debug("Getting leaderboard for %s (%s)", game_type, period)
         
         # Define time filter based on period
         time_filter = {}